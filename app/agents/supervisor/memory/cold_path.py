@@ -33,6 +33,7 @@ from .episodic import (
     _summarize_with_bedrock,
     _update_ctrl_for_new_turn,
 )
+from .trigger_gate import get_trigger_gate
 from .utils import _parse_iso, _utc_now_iso
 
 logger = logging.getLogger(__name__)
@@ -62,6 +63,12 @@ EPISODIC_MERGE_WINDOW_HOURS = config.EPISODIC_MERGE_WINDOW_HOURS
 EPISODIC_NOVELTY_MIN = config.EPISODIC_NOVELTY_MIN
 _MIN_OVERLAP_TOKEN_LENGTH: int = 3
 _OVERLAP_TOKEN_EXTRA_CHARS: frozenset[str] = frozenset({"-", "_"})
+NEAR_EXACT_MIN_JACCARD: float = 0.9
+_FACT_TOKEN_RE = re.compile(r"[\w']+", re.UNICODE)
+_NEGATION_TOKENS: frozenset[str] = frozenset(
+    {"not", "no", "never", "none", "nor", "without", "don't", "doesn't", "didn't", "isn't", "aren't", "wasn't",
+     "won't", "can't", "nunca", "nada", "sin", "ni"}
+)
 
 # Combined regex pattern for time sanitization (single pass)
 _TIME_SANITIZATION_PATTERN = re.compile(
@@ -80,6 +87,11 @@ _CLEANUP_PATTERNS = [
 
 
 def _trigger_decide(text: str) -> dict[str, Any]:
+    gate = get_trigger_gate().decide(text)
+    if gate.skip:
+        logger.debug("memory.trigger_gate.skip reason=%s score=%.3f", gate.reason, gate.score)
+        return {"should_create": False}
+
     categories_list = ", ".join([cat.value for cat in MemoryCategory])
     prompt = prompt_loader.load("memory_hotpath_trigger_classifier", text=text[:1000], categories=categories_list)
     bedrock = get_bedrock_runtime_client()
@@ -141,7 +153,7 @@ def _do_update(
     summary: str,
     existing_item: Any | None = None,
     candidate_value: dict[str, Any] | None = None,
-) -> None:
+) -> dict[str, Any] | None:
     base_value: dict[str, Any] | None = None
     if existing_item is not None:
         try:
@@ -151,7 +163,7 @@ def _do_update(
     if base_value is None:
         existing = store.get(namespace, existing_key)
         if not existing:
-            return
+            return None
         base_value = dict(existing.value)
     merged = dict(base_value)
     merged["last_accessed"] = _utc_now_iso()
@@ -161,7 +173,14 @@ def _do_update(
         cand_disp = candidate_value.get("display_summary", "").strip()
         if cand_disp:
             merged["display_summary"] = cand_disp
+    patch_values = getattr(store, "patch_values", None)
+    if patch_values is not None and merged.get("summary") == base_value.get("summary"):
+        # The indexed summary is unchanged, so only the metadata is rewritten and nothing is re-embedded.
+        changes = {field: value for field, value in merged.items() if base_value.get(field) != value}
+        if patch_values(namespace, {existing_key: changes}):
+            return merged
     store.put(namespace, existing_key, merged, index=["summary"])
+    return merged
 
 
 def _compose_summaries(existing_summary: str, candidate_summary: str, category: str) -> str:
@@ -248,7 +267,7 @@ def _compose_display_summaries(existing_display: str, candidate_display: str) ->
         return (b or a)[:280]
 
 
-def _do_recreate(
+def _recreate_memory(
     store: Any,
     namespace: tuple[str, ...],
     existing_key: str,
@@ -256,7 +275,7 @@ def _do_recreate(
     summary: str,
     category: str,
     candidate_value: dict[str, Any],
-) -> str:
+) -> dict[str, Any]:
     existing_value: dict[str, Any] = dict(getattr(existing_item, "value", {}) or {})
     existing_summary = str(existing_value.get("summary") or "")
     composed = _compose_summaries(existing_summary, summary, category)
@@ -295,7 +314,7 @@ def _do_recreate(
 
     store.put(namespace, new_id, new_val, index=["summary"])
     store.delete(namespace, existing_key)
-    return new_id
+    return new_val
 
 
 def _same_fact_classify(existing_summary: str, candidate_summary: str, category: str) -> bool:
@@ -344,6 +363,162 @@ def _same_fact_classify(existing_summary: str, candidate_summary: str, category:
         return False
 
 
+def _same_fact_classify_batch(existing_summaries: list[str], candidate_summary: str, category: str) -> int | None:
+    """Judge all neighbours in one call; returns the index of the first same-fact neighbour, or None."""
+    if not existing_summaries:
+        return None
+    if len(existing_summaries) == 1:
+        return 0 if _same_fact_classify(existing_summaries[0], candidate_summary, category) else None
+
+    numbered = "\n".join(f"{i}. {text[:500]}" for i, text in enumerate(existing_summaries, start=1))
+    prompt = prompt_loader.load(
+        "memory_same_fact_batch_classifier",
+        category=category[:64],
+        existing_summaries=numbered,
+        candidate_summary=candidate_summary[:500],
+    )
+    bedrock = get_bedrock_runtime_client()
+    try:
+        body_payload = {
+            "messages": [{"role": "user", "content": [{"text": prompt}]}],
+            "inferenceConfig": {"temperature": 0.0, "topP": 0.1, "maxTokens": 128, "stopSequences": []},
+        }
+        res = bedrock.invoke_model(modelId=MODEL_ID, body=json.dumps(body_payload))
+        body = res.get("body")
+        txt = body.read().decode("utf-8") if hasattr(body, "read") else str(body)
+        data = json.loads(txt)
+        out_text = ""
+        try:
+            contents = data.get("output", {}).get("message", {}).get("content", "")
+            if isinstance(contents, list):
+                for part in contents:
+                    if isinstance(part, dict) and part.get("text"):
+                        out_text += part.get("text", "")
+            elif isinstance(contents, str):
+                out_text = contents
+        except Exception:
+            out_text = ""
+        if not out_text:
+            out_text = data.get("outputText") or data.get("generation") or ""
+        if not out_text:
+            return None
+        try:
+            out = json.loads(out_text)
+        except Exception:
+            i, j = out_text.find("{"), out_text.rfind("}")
+            if i != -1 and j != -1 and j > i:
+                out = json.loads(out_text[i : j + 1])
+            else:
+                return None
+        matches = out.get("same_fact") if isinstance(out, dict) else None
+        if not isinstance(matches, list):
+            return None
+        positions = sorted(
+            int(m) - 1
+            for m in matches
+            if isinstance(m, int) and not isinstance(m, bool) and 1 <= m <= len(existing_summaries)
+        )
+        return positions[0] if positions else None
+    except Exception:
+        logger.exception("same_fact.batch.error")
+        return None
+
+
+def _canonical_fact_tokens(text: str) -> list[str]:
+    normalized = unicodedata.normalize("NFKC", _normalize_summary_text(text)).casefold()
+    return _FACT_TOKEN_RE.findall(normalized)
+
+
+def _is_near_exact_match(existing_summary: str, candidate_summary: str) -> bool:
+    """Return True when two summaries differ only by casing, punctuation or a negligible token."""
+    a = _canonical_fact_tokens(existing_summary)
+    b = _canonical_fact_tokens(candidate_summary)
+    if not a or not b:
+        return False
+    if a == b:
+        return True
+    sa, sb = set(a), set(b)
+    diff = sa ^ sb
+    if any(tok in _NEGATION_TOKENS or any(ch.isdigit() for ch in tok) for tok in diff):
+        return False
+    return len(sa & sb) / len(sa | sb) >= NEAR_EXACT_MIN_JACCARD
+
+
+def _neighbor_summary(item: Any) -> str:
+    return str((getattr(item, "value", {}) or {}).get("summary", ""))
+
+
+def _fallback_eligible(item: Any, summary: str) -> bool:
+    ts = _parse_iso(getattr(item, "updated_at", "")) or _parse_iso(getattr(item, "created_at", ""))
+    recent_ok = True
+    try:
+        if ts is not None:
+            age_days = (datetime.now(tz=timezone.utc) - ts).days
+            recent_ok = age_days <= max(1, FALLBACK_RECENCY_DAYS)
+    except Exception:
+        recent_ok = True
+    ex_sum = _neighbor_summary(item)
+    return recent_ok and (_has_min_token_overlap(ex_sum, summary) or _numeric_overlap_or_step(ex_sum, summary))
+
+
+def _find_merge_target(neighbors: list[Any], summary: str, category: str) -> tuple[Any | None, str | None]:
+    """Pick the neighbour the candidate should merge into, and how it was matched.
+
+    Exact and near-exact text matches settle without an LLM call. Otherwise the
+    classified band (score >= CHECK_LOW) and the guarded fallback band are judged
+    together in a single batched call, classified neighbours taking precedence.
+    """
+    for n in neighbors:
+        if _is_near_exact_match(_neighbor_summary(n), summary):
+            return n, "exact"
+
+    best = neighbors[0] if neighbors else None
+    if not best or not isinstance(getattr(best, "score", None), (int, float)):
+        return None, None
+
+    if float(best.score or 0.0) >= AUTO_UPDATE:
+        return best, "auto"
+
+    sorted_neigh = sorted(neighbors, key=lambda it: float(getattr(it, "score", 0.0) or 0.0), reverse=True)
+    judged: list[tuple[Any, str]] = [
+        (n, "classified") for n in sorted_neigh if float(getattr(n, "score", 0.0) or 0.0) >= CHECK_LOW
+    ]
+
+    if FALLBACK_ENABLED and (not FALLBACK_CATEGORIES or category in FALLBACK_CATEGORIES):
+        fallback = [
+            n
+            for n in sorted_neigh
+            if FALLBACK_LOW <= float(getattr(n, "score", 0.0) or 0.0) < CHECK_LOW and _fallback_eligible(n, summary)
+        ]
+        judged.extend((n, "fallback") for n in fallback[: max(1, FALLBACK_TOPK)])
+
+    match = _same_fact_classify_batch([_neighbor_summary(n) for n, _ in judged], summary, category)
+    if match is None:
+        return None, None
+    return judged[match]
+
+
+def _merge_into_neighbor(
+    store: Any,
+    namespace: tuple[str, ...],
+    neighbor: Any,
+    summary: str,
+    category: str,
+    candidate_value: dict[str, Any],
+    *,
+    in_place: bool = False,
+) -> tuple[str, dict[str, Any]] | None:
+    """Write the merged memory once and return ``(key, value)`` as stored, so no read-back is needed."""
+    key = getattr(neighbor, "key", "")
+    if MERGE_MODE == "recreate" and not in_place:
+        recreated = _recreate_memory(store, namespace, key, neighbor, summary, category, candidate_value)
+        return str(recreated["id"]), recreated
+    merged = _do_update(store, namespace, key, summary, neighbor, candidate_value)
+    if merged is None:
+        return None
+    return key, merged
+
+
 def _normalize_summary_text(text: str) -> str:
     if not isinstance(text, str):
         return ""
@@ -584,158 +759,44 @@ def run_semantic_memory_job(
         namespace = (user_id, "semantic")
         neighbors = _search_neighbors(store, namespace, summary, category)
 
-        best = neighbors[0] if neighbors else None
         did_update = False
-        sorted_neigh = sorted(neighbors, key=lambda it: float(getattr(it, "score", 0.0) or 0.0), reverse=True)
-
-        if best and isinstance(getattr(best, "score", None), (int, float)):
-            score_val = float(best.score or 0.0)
-            recency_ok = True
-
-            if score_val >= AUTO_UPDATE and recency_ok:
-                updated_key = None
-                if MERGE_MODE == "recreate":
-                    new_id = _do_recreate(store, namespace, best.key, best, summary, category, candidate_value)
-                    did_update = True
-                    logger.debug("memory.cold_path.recreate: mode=auto id=%s from=%s", candidate_id, best.key)
-                    updated_key = new_id
-                else:
-                    _do_update(store, namespace, best.key, summary, best, candidate_value)
-                    did_update = True
-                    logger.debug("memory.cold_path.update: mode=auto id=%s into=%s", candidate_id, best.key)
-                    updated_key = best.key
-
-                updated_memory = store.get(namespace, updated_key)
-                if updated_memory:
-                    _profile_sync_from_memory_sync(user_id, thread_id, updated_memory.value, event_loop)
-                    _emit_sse_safe(
-                        event_loop,
-                        thread_id,
-                        "memory.updated",
-                        {
-                            "id": updated_memory.key,
-                            "type": mem_type,
-                            "category": (updated_memory.value or {}).get("category"),
-                            "summary": (updated_memory.value or {}).get("display_summary")
-                            or (updated_memory.value or {}).get("summary"),
-                            "importance": (updated_memory.value or {}).get("importance"),
-                            "created_at": updated_memory.created_at,
-                            "updated_at": updated_memory.updated_at,
-                            "value": updated_memory.value,
-                        },
-                    )
-            else:
-                for n in sorted_neigh:
-                    s = float(getattr(n, "score", 0.0) or 0.0)
-                    if s < CHECK_LOW:
-                        break
-                    same = _same_fact_classify(
-                        existing_summary=str((getattr(n, "value", {}) or {}).get("summary", "")),
-                        candidate_summary=summary,
-                        category=category,
-                    )
-                    logger.debug("memory.cold_path.classify: id=%s result_same=%s", candidate_id, same)
-                    if same:
-                        updated_key = None
-                        if MERGE_MODE == "recreate":
-                            new_id = _do_recreate(
-                                store, namespace, getattr(n, "key", ""), n, summary, category, candidate_value
-                            )
-                            logger.debug(
-                                "memory.cold_path.recreate: mode=classified id=%s from=%s",
-                                candidate_id,
-                                getattr(n, "key", ""),
-                            )
-                            updated_key = new_id
-                        else:
-                            _do_update(store, namespace, getattr(n, "key", ""), summary, n, candidate_value)
-                            logger.debug(
-                                "memory.cold_path.update: mode=classified id=%s into=%s",
-                                candidate_id,
-                                getattr(n, "key", ""),
-                            )
-                            updated_key = getattr(n, "key", "")
-                        did_update = True
-                        updated_memory = store.get(namespace, updated_key)
-                        if updated_memory:
-                            _profile_sync_from_memory_sync(user_id, thread_id, updated_memory.value, event_loop)
-                            _emit_sse_safe(
-                                event_loop,
-                                thread_id,
-                                "memory.updated",
-                                {
-                                    "id": updated_memory.key,
-                                    "type": mem_type,
-                                    "category": (updated_memory.value or {}).get("category"),
-                                    "summary": (updated_memory.value or {}).get("display_summary")
-                                    or (updated_memory.value or {}).get("summary"),
-                                    "importance": (updated_memory.value or {}).get("importance"),
-                                    "created_at": updated_memory.created_at,
-                                    "updated_at": updated_memory.updated_at,
-                                    "value": updated_memory.value,
-                                },
-                            )
-                        break
-
-        if not did_update and FALLBACK_ENABLED and (not FALLBACK_CATEGORIES or category in FALLBACK_CATEGORIES):
-            checked = 0
-            for n in sorted_neigh:
-                if checked >= max(1, FALLBACK_TOPK):
-                    break
-                s = float(getattr(n, "score", 0.0) or 0.0)
-                if s < FALLBACK_LOW or s >= CHECK_LOW:
-                    continue
-                ts = _parse_iso(getattr(n, "updated_at", "")) or _parse_iso(getattr(n, "created_at", ""))
-                recent_ok = True
-                try:
-                    if ts is not None:
-                        age_days = (datetime.now(tz=timezone.utc) - ts).days
-                        recent_ok = age_days <= max(1, FALLBACK_RECENCY_DAYS)
-                except Exception:
-                    recent_ok = True
-                ex_sum = str((getattr(n, "value", {}) or {}).get("summary", ""))
-                lex_ok = _has_min_token_overlap(ex_sum, summary)
-                num_ok = _numeric_overlap_or_step(ex_sum, summary)
-                if not recent_ok or (not lex_ok and not num_ok):
-                    continue
-                same = _same_fact_classify(
-                    existing_summary=ex_sum,
-                    candidate_summary=summary,
-                    category=category,
+        target, match_mode = _find_merge_target(neighbors, summary, category)
+        if target is not None:
+            merged = _merge_into_neighbor(
+                store,
+                namespace,
+                target,
+                summary,
+                category,
+                candidate_value,
+                in_place=match_mode == "exact",
+            )
+            if merged is not None:
+                updated_key, updated_value = merged
+                did_update = True
+                logger.debug(
+                    "memory.cold_path.merge: mode=%s id=%s from=%s into=%s",
+                    match_mode,
+                    candidate_id,
+                    getattr(target, "key", ""),
+                    updated_key,
+                )
+                _profile_sync_from_memory_sync(user_id, thread_id, updated_value, event_loop)
+                _emit_sse_safe(
+                    event_loop,
+                    thread_id,
+                    "memory.updated",
+                    {
+                        "id": updated_key,
+                        "type": mem_type,
+                        "category": updated_value.get("category"),
+                        "summary": updated_value.get("display_summary") or updated_value.get("summary"),
+                        "importance": updated_value.get("importance"),
+                        "created_at": updated_value.get("created_at") or getattr(target, "created_at", None),
+                        "updated_at": updated_value.get("last_accessed"),
+                        "value": updated_value,
+                    },
                 )
-                checked += 1
-                if same:
-                    updated_key = None
-                    if MERGE_MODE == "recreate":
-                        new_id = _do_recreate(store, namespace, getattr(n, "key", ""), n, summary, category, candidate_value)
-                        logger.debug("memory.cold_path.recreate: mode=fallback id=%s", candidate_id)
-                        updated_key = new_id
-                    else:
-                        _do_update(store, namespace, getattr(n, "key", ""), summary, n, candidate_value)
-                        logger.debug("memory.cold_path.update: mode=fallback id=%s", candidate_id)
-                        updated_key = getattr(n, "key", "")
-
-                    did_update = True
-                    updated_memory = store.get(namespace, updated_key)
-                    if updated_memory:
-                        _profile_sync_from_memory_sync(user_id, thread_id, updated_memory.value, event_loop)
-                        _emit_sse_safe(
-                            event_loop,
-                            thread_id,
-                            "memory.updated",
-                            {
-                                "id": updated_memory.key,
-                                "type": mem_type,
-                                "category": (updated_memory.value or {}).get("category"),
-                                "summary": (updated_memory.value or {}).get("display_summary")
-                                or (updated_memory.value or {}).get("summary"),
-                                "importance": (updated_memory.value or {}).get("importance"),
-                                "created_at": updated_memory.created_at,
-                                "updated_at": updated_memory.updated_at,
-                                "value": updated_memory.value,
-                            },
-                        )
-                    break
 
         if not did_update:
             if int(candidate_value.get("importance") or 1) < SEMANTIC_MIN_IMPORTANCE:
@@ -956,9 +1017,15 @@ def _persist_session_ctrl_sync(
     ctrl: dict[str, Any],
     event_loop: asyncio.AbstractEventLoop,
 ) -> None:
-    """Persist session control synchronously from worker thread."""
+    """Persist session control synchronously from worker thread.
+
+    Only ``episodic_control`` is written, so turns stored since ``sess`` was
+    loaded are kept.
+    """
     sess["episodic_control"] = ctrl
-    future = asyncio.run_coroutine_threadsafe(session_store.set_session(thread_id, sess), event_loop)
+    future = asyncio.run_coroutine_threadsafe(
+        session_store.update_session_fields(thread_id, {"episodic_control": ctrl}), event_loop
+    )
     future.result(timeout=5.0)
 
 
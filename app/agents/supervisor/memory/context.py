@@ -144,9 +144,38 @@ def _resolve_user_tz_from_config(config: RunnableConfig) -> tzinfo:
         return timezone.utc
 
 
-async def _timed_search(store: Any, namespace: tuple[str, str], *, query: str, limit: int, label: str) -> list[Any]:
+def _supports_vector_search(store: Any) -> bool:
+    return callable(getattr(type(store), "asearch_by_vector", None)) and callable(getattr(type(store), "aembed_query", None))
+
+
+async def _embed_query_once(store: Any, query: str) -> list[float] | None:
+    """Embed the turn query a single time for stores that accept precomputed vectors."""
+    if not _supports_vector_search(store):
+        return None
+    t0 = time.perf_counter()
+    try:
+        vector = await store.aembed_query(query)
+    except Exception as e:
+        logger.warning("memory_context.embed_query.failed error=%s; falling back to per-search embedding", e)
+        return None
+    logger.info("memory_context.embed_query.done ms=%d", int((time.perf_counter() - t0) * 1000))
+    return vector
+
+
+async def _timed_search(
+    store: Any,
+    namespace: tuple[str, str],
+    *,
+    query: str,
+    limit: int,
+    label: str,
+    query_vector: list[float] | None = None,
+) -> list[Any]:
     t0 = time.perf_counter()
-    results = await asyncio.to_thread(store.search, namespace, query=query, filter=None, limit=limit)
+    if query_vector is not None:
+        results = await store.asearch_by_vector(namespace, query_vector, filter=None, limit=limit)
+    else:
+        results = await asyncio.to_thread(store.search, namespace, query=query, filter=None, limit=limit)
     t1 = time.perf_counter()
     logger.info("memory_context.%s.done ms=%d results=%d", label, int((t1 - t0) * 1000), len(results or []))
     return results
@@ -253,11 +282,22 @@ async def memory_context(state: MessagesState, config: RunnableConfig) -> dict:
         logger.info("memory_context.query: user_id=%s query=%s", user_id, (query_text[:200]))
 
         t0s = time.perf_counter()
+        query_vector = await _embed_query_once(store, query_text)
         sem_task = _timed_search(
-            store, (user_id, "semantic"), query=query_text, limit=int(CONTEXT_TOPK), label="semantic"
+            store,
+            (user_id, "semantic"),
+            query=query_text,
+            limit=int(CONTEXT_TOPK),
+            label="semantic",
+            query_vector=query_vector,
         )
         epi_task = _timed_search(
-            store, (user_id, "episodic"), query=query_text, limit=int(max(3, CONTEXT_TOPK // 2)), label="episodic"
+            store,
+            (user_id, "episodic"),
+            query=query_text,
+            limit=int(max(3, CONTEXT_TOPK // 2)),
+            label="episodic",
+            query_vector=query_vector,
         )
         proc_task = _timed_search(
             store,
@@ -265,6 +305,7 @@ async def memory_context(state: MessagesState, config: RunnableConfig) -> dict:
             query=query_text,
             limit=int(PROCEDURAL_TOPK),
             label="procedural",
+            query_vector=query_vector,
         )
         sem, epi, proc = await asyncio.gather(sem_task, epi_task, proc_task)
         t1s = time.perf_counter()
@@ -184,8 +184,7 @@ async def _merge_existing_if_applicable(
             with contextlib.suppress(Exception):
                 await _emit_memory_event(thread_id, existing.key, merged, is_created=False)
         ctrl = _reset_ctrl_after_capture(ctrl, now_utc)
-        sess["episodic_control"] = ctrl
-        await session_store.set_session(thread_id, sess)
+        await _persist_session_ctrl(session_store, thread_id, sess, ctrl)
         return True
     return False
 
@@ -245,9 +244,13 @@ def _reset_ctrl_after_capture(ctrl: dict[str, Any], now_utc: datetime) -> dict[s
 
 
 async def _persist_session_ctrl(session_store: Any, thread_id: str | None, sess: dict[str, Any], ctrl: dict[str, Any]) -> None:
-    """Persist episodic control state back into the session store."""
+    """Persist episodic control state back into the session store.
+
+    Only ``episodic_control`` is written: ``sess`` was read before the capture
+    ran, and writing it back whole would undo any turn stored in the meantime.
+    """
     sess["episodic_control"] = ctrl
-    await session_store.set_session(thread_id, sess)
+    await session_store.update_session_fields(thread_id, {"episodic_control": ctrl})
 
 
 async def episodic_capture(state: MessagesState, config: RunnableConfig) -> dict:
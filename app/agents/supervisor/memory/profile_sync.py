@@ -190,7 +190,7 @@ async def _profile_sync_from_memory(user_id: str, thread_id: Optional[str], valu
 
                 try:
                     cache = get_user_context_cache()
-                    cache.invalidate(state.user_context.user_id)
+                    await cache.ainvalidate(state.user_context.user_id)
                     logger.info("[PROFILE_SYNC] Invalidated user context cache for user %s", state.user_context.user_id)
                 except Exception as cache_err:
                     logger.warning(
@@ -0,0 +1,203 @@
+"""Local pre-classifier for the cold-path memory trigger.
+
+Most turns are questions or requests that carry no durable user fact. The gate
+scores a turn with lexical/structural features and a small logistic model loaded
+from JSON, and only turns that could plausibly hold a fact reach the trigger LLM.
+The gate only ever says "skip" or "ask the LLM"; it never creates memories itself.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from app.core.config import config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_PATH = Path(__file__).with_name("trigger_gate_model.json")
+STATS_LOG_EVERY: int = 200
+
+_TOKEN_RE = re.compile(r"[\w']+", re.UNICODE)
+_SENTENCE_RE = re.compile(r"[^.!?\n]+[.!?]?")
+
+_FIRST_PERSON = frozenset(
+    {"i", "i'm", "im", "i've", "i'd", "i'll", "me", "my", "mine", "myself", "we", "we're", "our", "ours", "us",
+     "yo", "mi", "mis", "nosotros", "nuestro", "nuestra"}
+)
+_SELF_DISCLOSURE_RE = re.compile(
+    r"\b(i\s*(am|'m|was|have|'ve|had|live|work|like|love|hate|prefer|enjoy|want|plan|need|usually|always|never|"
+    r"just|recently|got|moved|started|quit|earn|make|pay|own|rent|drive|retired)|"
+    r"my\s+(name|wife|husband|partner|girlfriend|boyfriend|kid|kids|son|daughter|children|family|mom|dad|mother|"
+    r"father|job|salary|income|birthday|goal|goals|dog|cat|pet|house|home|apartment|rent|mortgage|car|boss|"
+    r"company|team|favorite|favourite|budget|debt|loan|savings)|"
+    r"(soy|estoy|tengo|vivo|trabajo|prefiero|me\s+gusta|me\s+encanta|mi\s+\w+\s+se\s+llama))\b",
+    re.IGNORECASE,
+)
+_PREFERENCE = frozenset(
+    {"like", "love", "hate", "prefer", "enjoy", "dislike", "favorite", "favourite", "allergic", "vegan",
+     "vegetarian", "rather", "always", "never", "usually", "gusta", "encanta", "prefiero", "odio"}
+)
+_LIFE_FACT = frozenset(
+    {"wife", "husband", "partner", "married", "divorced", "kids", "kid", "son", "daughter", "baby", "pregnant",
+     "job", "salary", "paycheck", "promoted", "fired", "retire", "retired", "retirement", "rent", "mortgage",
+     "moved", "moving", "birthday", "dog", "cat", "college", "school", "graduated", "student", "loan", "debt",
+     "esposa", "esposo", "hijos", "hija", "hijo", "trabajo", "sueldo", "casado", "casada", "perro", "gato"}
+)
+_REQUEST_LEAD_RE = re.compile(
+    r"^\s*(what|what's|whats|how|why|when|where|which|who|can you|could you|would you|will you|please|show|tell me|"
+    r"explain|give me|help|list|find|check|calculate|compare|summarize|qu[eé]|c[oó]mo|cu[aá]nto|puedes|mu[eé]strame)\b",
+    re.IGNORECASE,
+)
+_ACK_ONLY_RE = re.compile(
+    r"^\s*(hi|hey|hello|hola|yo|thanks|thank you|thx|ty|gracias|ok|okay|k|sure|yes|yeah|yep|no|nope|cool|great|"
+    r"nice|awesome|perfect|got it|sounds good|good|bye|goodbye|adi[oó]s|lol|haha|hmm|wow)"
+    r"([\s,!.?]+(hi|hey|there|vera|thanks|thank you|so much|a lot|ok|okay|great|cool|gracias))*[\s!.?]*$",
+    re.IGNORECASE,
+)
+
+
+@dataclass(frozen=True)
+class GateDecision:
+    """Outcome of the local gate: ``skip`` settles the turn without calling the LLM."""
+
+    skip: bool
+    score: float
+    reason: str
+
+
+def extract_features(text: str) -> dict[str, float]:
+    lowered = (text or "").lower()
+    tokens = _TOKEN_RE.findall(lowered)
+    token_set = set(tokens)
+    sentences = [s.strip() for s in _SENTENCE_RE.findall(lowered) if s.strip()]
+    return {
+        "first_person": 1.0 if token_set & _FIRST_PERSON else 0.0,
+        "self_disclosure": 1.0 if _SELF_DISCLOSURE_RE.search(lowered) else 0.0,
+        "preference": 1.0 if token_set & _PREFERENCE else 0.0,
+        "life_fact": 1.0 if token_set & _LIFE_FACT else 0.0,
+        "question_only": 1.0 if sentences and all(s.endswith("?") for s in sentences) else 0.0,
+        "request_lead": 1.0 if all(_REQUEST_LEAD_RE.match(s) for s in sentences) and sentences else 0.0,
+        "short": 1.0 if len(tokens) <= 3 else 0.0,
+        "has_digits": 1.0 if any(ch.isdigit() for ch in lowered) else 0.0,
+        "log_tokens": math.log1p(len(tokens)),
+    }
+
+
+class TriggerGate:
+    """Deterministic gate in front of the cold-path trigger LLM call."""
+
+    def __init__(
+        self,
+        *,
+        bias: float,
+        weights: dict[str, float],
+        skip_below: float,
+        enabled: bool = True,
+    ) -> None:
+        self._bias = float(bias)
+        self._weights = {k: float(v) for k, v in weights.items()}
+        self._skip_below = float(skip_below)
+        self._enabled = enabled
+        self._lock = threading.Lock()
+        self._evaluated = 0
+        self._skipped = 0
+        self._skip_reasons: dict[str, int] = {}
+
+    @classmethod
+    def from_file(
+        cls,
+        path: Optional[str | Path] = None,
+        *,
+        skip_below: Optional[float] = None,
+        enabled: bool = True,
+    ) -> TriggerGate:
+        model_path = Path(path) if path else DEFAULT_MODEL_PATH
+        data: dict[str, Any] = json.loads(model_path.read_text(encoding="utf-8"))
+        return cls(
+            bias=data.get("bias", 0.0),
+            weights=data.get("weights") or {},
+            skip_below=skip_below if skip_below is not None else data.get("skip_below", 0.15),
+            enabled=enabled,
+        )
+
+    def score(self, text: str) -> float:
+        features = extract_features(text)
+        z = self._bias + sum(self._weights.get(name, 0.0) * value for name, value in features.items())
+        return 1.0 / (1.0 + math.exp(-z))
+
+    def decide(self, text: str) -> GateDecision:
+        if not self._enabled:
+            return GateDecision(skip=False, score=1.0, reason="disabled")
+        stripped = (text or "").strip()
+        if not stripped or not any(ch.isalpha() for ch in stripped):
+            decision = GateDecision(skip=True, score=0.0, reason="empty")
+        elif all(_ACK_ONLY_RE.match(line) for line in stripped.splitlines() if line.strip()):
+            decision = GateDecision(skip=True, score=0.0, reason="ack_only")
+        else:
+            score = self.score(stripped)
+            if score < self._skip_below:
+                decision = GateDecision(skip=True, score=score, reason="low_score")
+            else:
+                decision = GateDecision(skip=False, score=score, reason="ambiguous")
+        self._record(decision)
+        return decision
+
+    def _record(self, decision: GateDecision) -> None:
+        with self._lock:
+            self._evaluated += 1
+            if decision.skip:
+                self._skipped += 1
+                self._skip_reasons[decision.reason] = self._skip_reasons.get(decision.reason, 0) + 1
+            should_log = self._evaluated % STATS_LOG_EVERY == 0
+        if should_log:
+            stats = self.get_stats()
+            logger.info(
+                "memory.trigger_gate.stats evaluated=%d skipped=%d hit_rate=%.3f reasons=%s",
+                stats["evaluated"],
+                stats["skipped"],
+                stats["hit_rate"],
+                stats["skip_reasons"],
+            )
+
+    def get_stats(self) -> dict[str, Any]:
+        """Hit rate is the share of evaluated turns settled locally (LLM calls avoided)."""
+        with self._lock:
+            evaluated = self._evaluated
+            skipped = self._skipped
+            reasons = dict(self._skip_reasons)
+        return {
+            "enabled": self._enabled,
+            "evaluated": evaluated,
+            "skipped": skipped,
+            "passed_to_llm": evaluated - skipped,
+            "hit_rate": (skipped / evaluated) if evaluated else 0.0,
+            "skip_reasons": reasons,
+        }
+
+
+_trigger_gate: Optional[TriggerGate] = None
+_trigger_gate_lock = threading.Lock()
+
+
+def get_trigger_gate() -> TriggerGate:
+    global _trigger_gate
+    if _trigger_gate is None:
+        with _trigger_gate_lock:
+            if _trigger_gate is None:
+                try:
+                    _trigger_gate = TriggerGate.from_file(
+                        config.MEMORY_TRIGGER_GATE_MODEL_PATH,
+                        skip_below=config.MEMORY_TRIGGER_GATE_SKIP_BELOW,
+                        enabled=config.MEMORY_TRIGGER_GATE_ENABLED,
+                    )
+                except (OSError, ValueError) as e:
+                    logger.warning("memory.trigger_gate.model_unavailable error=%s; gate disabled", e)
+                    _trigger_gate = TriggerGate(bias=0.0, weights={}, skip_below=0.0, enabled=False)
+    return _trigger_gate
@@ -4,11 +4,14 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import threading
 from datetime import datetime, timezone
 from typing import Any
 
 from langgraph.store.base import BaseStore
 
+from app.core.config import config
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,7 +25,9 @@ async def _update_single_memory(
     key: str,
     timestamp: str,
     user_id: str,
+    usage_count: int = 1,
 ) -> bool:
+    """Rewrite one memory's usage fields with ``index=False``, so its embedding is left alone."""
     try:
         item = await store.aget(namespace, key)
 
@@ -40,8 +45,9 @@ async def _update_single_memory(
         updated_value = dict(current_value)
         updated_value.pop("last_used_at", None)
         updated_value["last_used_at"] = timestamp
+        updated_value["usage_count"] = int(updated_value.get("usage_count") or 0) + usage_count
 
-        await store.aput(namespace, key, updated_value, index=["summary"])
+        await store.aput(namespace, key, updated_value, index=False)
 
         logger.debug(
             "memory_usage_tracking.updated key=%s timestamp=%s",
@@ -60,42 +66,180 @@ async def _update_single_memory(
         return False
 
 
-async def _update_last_used_async(
-    store: BaseStore,
-    user_id: str,
-    memory_keys: list[str],
-) -> None:
-    """Update last_used_at timestamp for multiple memories."""
-    if not memory_keys:
-        return
+class MemoryUsageLedger:
+    """Write-behind buffer for memory usage events.
 
-    timestamp = _utc_now_iso()
-    namespace = (user_id, "semantic")
+    Usage is merged per memory key (latest ``last_used_at`` plus a ``usage_count``
+    delta) and flushed in the background after ``flush_interval_seconds`` or once
+    ``max_pending`` keys are buffered. Stores exposing ``apatch_values`` receive one
+    metadata-only write per namespace with no embedding call; other stores fall back
+    to a per-item read/rewrite that is not re-indexed either.
+    """
 
-    results = await asyncio.gather(
-        *[
-            _update_single_memory(store, namespace, key, timestamp, user_id)
-            for key in memory_keys
-        ],
-        return_exceptions=True
-    )
+    def __init__(self, flush_interval_seconds: float = 5.0, max_pending: int = 500) -> None:
+        self._flush_interval_seconds = max(0.0, float(flush_interval_seconds))
+        self._max_pending = max(1, int(max_pending))
+        self._pending: dict[tuple[int, tuple[str, ...]], dict[str, list[Any]]] = {}
+        self._stores: dict[int, BaseStore] = {}
+        self._lock = threading.Lock()
+        self._flush_task: asyncio.Task | None = None
+        # Set while the flush task is writing; it must not be cancelled then, because
+        # the entries it swapped out of ``_pending`` exist nowhere else.
+        self._flushing = False
+        self._flush_again = False
 
-    success_count = sum(1 for r in results if r is True)
-    error_count = sum(1 for r in results if isinstance(r, Exception))
+    def pending_count(self) -> int:
+        with self._lock:
+            return sum(len(entries) for entries in self._pending.values())
 
-    if error_count > 0:
-        logger.warning(
-            "memory_usage_tracking.batch_complete user_id=%s success=%d errors=%d",
-            user_id,
-            success_count,
-            error_count
+    def record(self, store: BaseStore, namespace: tuple[str, ...], keys: list[str], timestamp: str | None = None) -> None:
+        """Buffer usage for ``keys`` and make sure a flush is scheduled."""
+        if not keys:
+            return
+        timestamp = timestamp or _utc_now_iso()
+        with self._lock:
+            self._stores[id(store)] = store
+            bucket = self._pending.setdefault((id(store), tuple(namespace)), {})
+            for key in keys:
+                entry = bucket.get(key)
+                if entry is None:
+                    bucket[key] = [timestamp, 1]
+                else:
+                    entry[0] = max(entry[0], timestamp)
+                    entry[1] += 1
+            pending = sum(len(entries) for entries in self._pending.values())
+
+        self._schedule_flush(immediate=pending >= self._max_pending)
+
+    def _schedule_flush(self, *, immediate: bool) -> None:
+        loop = asyncio.get_running_loop()
+        task = self._flush_task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            if not immediate:
+                return
+            if self._flushing:
+                self._flush_again = True
+                return
+            task.cancel()
+        delay = 0.0 if immediate else self._flush_interval_seconds
+        self._flush_task = asyncio.create_task(self._flush_later(delay), name="memory_usage_ledger_flush")
+        self._flush_task.add_done_callback(_log_flush_exception)
+
+    async def _flush_later(self, delay: float) -> None:
+        if delay:
+            await asyncio.sleep(delay)
+        self._flushing = True
+        try:
+            await self.flush()
+            while self._flush_again:
+                self._flush_again = False
+                await self.flush()
+        finally:
+            self._flushing = False
+
+    async def flush(self) -> int:
+        """Write all buffered usage; returns the number of memories updated."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            stores, self._stores = self._stores, {}
+
+        updated = 0
+        remaining = list(pending)
+        for pending_key in pending:
+            store_id, namespace = pending_key
+            entries = pending[pending_key]
+            store = stores[store_id]
+            try:
+                updated += await self._flush_namespace(store, namespace, entries)
+            except asyncio.CancelledError:
+                # The interrupted write may or may not have landed; re-buffer it with the
+                # namespaces not reached yet rather than dropping them.
+                self._requeue({key: pending[key] for key in remaining}, stores)
+                raise
+            except Exception as e:
+                logger.warning(
+                    "memory_usage_tracking.flush_failed namespace=%s count=%d error=%s",
+                    "|".join(namespace),
+                    len(entries),
+                    str(e),
+                )
+            remaining.remove(pending_key)
+        if pending:
+            logger.debug("memory_usage_tracking.flushed namespaces=%d updated=%d", len(pending), updated)
+        return updated
+
+    def _requeue(
+        self,
+        pending: dict[tuple[int, tuple[str, ...]], dict[str, list[Any]]],
+        stores: dict[int, BaseStore],
+    ) -> None:
+        with self._lock:
+            for (store_id, namespace), entries in pending.items():
+                self._stores.setdefault(store_id, stores[store_id])
+                bucket = self._pending.setdefault((store_id, namespace), {})
+                for key, (timestamp, count) in entries.items():
+                    entry = bucket.get(key)
+                    if entry is None:
+                        bucket[key] = [timestamp, count]
+                    else:
+                        entry[0] = max(entry[0], timestamp)
+                        entry[1] += count
+
+    async def _flush_namespace(self, store: BaseStore, namespace: tuple[str, ...], entries: dict[str, list[Any]]) -> int:
+        patch = getattr(store, "apatch_values", None)
+        if patch is None:
+            user_id = namespace[0] if namespace else ""
+            results = await asyncio.gather(
+                *[
+                    _update_single_memory(store, namespace, key, ts, user_id, count)
+                    for key, (ts, count) in entries.items()
+                ],
+                return_exceptions=True,
+            )
+            return sum(1 for r in results if r is True)
+        return await patch(
+            namespace,
+            {key: {"last_used_at": ts} for key, (ts, _) in entries.items()},
+            {key: {"usage_count": count} for key, (_, count) in entries.items()},
         )
-    else:
-        logger.debug(
-            "memory_usage_tracking.batch_complete user_id=%s success=%d",
-            user_id,
-            success_count
+
+    async def aclose(self) -> None:
+        """Wait for an in-flight flush (or cancel a pending one) and write whatever is still buffered."""
+        task, self._flush_task = self._flush_task, None
+        if task is not None and not task.done():
+            if self._flushing and task.get_loop() is asyncio.get_running_loop():
+                await asyncio.wait({task})
+            else:
+                task.cancel()
+        await self.flush()
+
+
+def _log_flush_exception(task: asyncio.Task) -> None:
+    try:
+        task.result()
+    except asyncio.CancelledError:
+        pass
+    except Exception as e:
+        logger.error("memory_usage_tracking.task_failed error=%s", str(e), exc_info=e)
+
+
+_memory_usage_ledger: MemoryUsageLedger | None = None
+
+
+def get_memory_usage_ledger() -> MemoryUsageLedger:
+    global _memory_usage_ledger
+    if _memory_usage_ledger is None:
+        _memory_usage_ledger = MemoryUsageLedger(
+            flush_interval_seconds=config.MEMORY_USAGE_FLUSH_INTERVAL_SECONDS,
+            max_pending=config.MEMORY_USAGE_MAX_PENDING,
         )
+    return _memory_usage_ledger
+
+
+async def flush_memory_usage_ledger() -> None:
+    """Drain buffered usage on shutdown."""
+    if _memory_usage_ledger is not None:
+        await _memory_usage_ledger.aclose()
 
 
 def update_memory_usage_tracking(
@@ -103,7 +247,7 @@ def update_memory_usage_tracking(
     user_id: str,
     memory_items: list[Any],
 ) -> None:
-    """Track memory usage by updating last_used_at timestamps in background."""
+    """Record memory usage in the write-behind ledger; the store is updated in the background."""
     try:
         memory_keys = [
             getattr(item, "key", None)
@@ -114,28 +258,10 @@ def update_memory_usage_tracking(
         if not memory_keys:
             return
 
-        task = asyncio.create_task(
-            _update_last_used_async(store, user_id, memory_keys),
-            name=f"memory_usage_tracking_{user_id}"
-        )
-
-        def _log_task_exception(t: asyncio.Task) -> None:
-            try:
-                t.result()
-            except asyncio.CancelledError:
-                pass
-            except Exception as e:
-                logger.error(
-                    "memory_usage_tracking.task_failed user_id=%s error=%s",
-                    user_id,
-                    str(e),
-                    exc_info=e
-                )
-
-        task.add_done_callback(_log_task_exception)
+        get_memory_usage_ledger().record(store, (user_id, "semantic"), memory_keys)
 
         logger.debug(
-            "memory_usage_tracking.task_created user_id=%s count=%d",
+            "memory_usage_tracking.recorded user_id=%s count=%d",
             user_id,
             len(memory_keys)
         )
@@ -145,4 +271,3 @@ def update_memory_usage_tracking(
             user_id if user_id else "unknown",
             str(e)
         )
-
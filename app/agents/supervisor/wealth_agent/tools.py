@@ -5,6 +5,7 @@ import logging
 
 from langchain_core.tools import tool
 
+from app.core.config import config
 from app.knowledge.service import get_knowledge_service
 
 logger = logging.getLogger(__name__)
@@ -14,6 +15,15 @@ def _error(code: str, message: str, cause: str | None = None) -> dict:
     return {"code": code, "message": message, "cause": cause}
 
 
+def _parent_window(parent: str, start_index: int | None, chunk_length: int, max_chars: int) -> str:
+    """Slice of the parent page of at most ``max_chars`` centred on the matching chunk."""
+    if len(parent) <= max_chars:
+        return parent
+    center = (start_index or 0) + chunk_length // 2
+    begin = max(0, min(center - max_chars // 2, len(parent) - max_chars))
+    return parent[begin:begin + max_chars]
+
+
 @tool
 async def search_kb(query: str, content_source: str = "external") -> str:
     """Search the knowledge base for a query.
@@ -59,7 +69,8 @@ async def search_kb(query: str, content_source: str = "external") -> str:
             filter_param = {"content_source": "external"}
 
         logger.info(f"Searching KB with content_source={content_source}, query='{query}'")
-        results = await kb_service.search(query, filter=filter_param)
+        parent_chars = config.KB_PARENT_CONTEXT_MAX_CHARS
+        results = await kb_service.search(query, filter=filter_param, hydrate_parents=parent_chars > 0)
 
         formatted_results = []
         for result in results:
@@ -82,13 +93,17 @@ async def search_kb(query: str, content_source: str = "external") -> str:
                 if "subcategory" in result:
                     metadata["subcategory"] = result["subcategory"]
 
-                formatted_results.append(
-                    {
-                        "content": content,
-                        "source": source_reference or result.get("name", "Unknown source"),
-                        "metadata": metadata,
-                    }
-                )
+                formatted = {
+                    "content": content,
+                    "source": source_reference or result.get("name", "Unknown source"),
+                    "metadata": metadata,
+                }
+                parent_content = result.get("parent_content")
+                if parent_content:
+                    formatted["document_context"] = _parent_window(
+                        parent_content, result.get("start_index"), len(content), parent_chars
+                    )
+                formatted_results.append(formatted)
         return json.dumps(formatted_results, ensure_ascii=False)
     except Exception as e:
         return json.dumps(
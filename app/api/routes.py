@@ -10,6 +10,8 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 from app.core.app_state import (
+    attach_sse_queue,
+    detach_sse_queue,
     get_onboarding_status_for_user,
     get_sse_queue,
     get_thread_state,
@@ -114,9 +116,8 @@ async def onboarding_done(thread_id: str) -> dict:
 
 @router.get("/sse/{thread_id}")
 async def onboarding_sse(thread_id: str, request: Request) -> StreamingResponse:
-    queue = get_sse_queue(thread_id)
-
     async def event_generator() -> AsyncGenerator[str, None]:
+        queue = attach_sse_queue(thread_id)
         try:
             while True:
                 if await request.is_disconnected():
@@ -134,8 +135,7 @@ async def onboarding_sse(thread_id: str, request: Request) -> StreamingResponse:
                 else:
                     yield f"data: {json.dumps(item)}\n\n"
         finally:
-            # Clean up SSE queue when client disconnects
-            from app.core.app_state import drop_sse_queue
-            drop_sse_queue(thread_id)
+            # Clean up SSE queue when the last client disconnects
+            detach_sse_queue(thread_id)
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
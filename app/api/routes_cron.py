@@ -75,6 +75,8 @@ async def run_background_sync(job_id: str):
             f"Job {job_id} completed successfully in {duration:.2f}s: "
             f"Sources synced: {result['summary']['sources_synced']}, "
             f"Chunks created: {result['summary']['chunks_created']}, "
+            f"Chunks embedded: {result['summary']['chunks_embedded']} "
+            f"({result['summary']['embedding_calls']} embedding calls), "
             f"Errors: {result['summary']['errors']}, "
             f"Profile uploaded: {result['profile_uploaded']}"
         )
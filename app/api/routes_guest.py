@@ -8,7 +8,7 @@ from fastapi import APIRouter, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from app.core.app_state import get_sse_queue
+from app.core.app_state import attach_sse_queue, detach_sse_queue
 from app.services.guest.service import guest_service
 
 router = APIRouter(prefix="/guest", tags=["Guest"])
@@ -38,9 +38,8 @@ async def guest_message(payload: MessagePayload) -> dict:
 
 @router.get("/sse/{thread_id}")
 async def guest_sse(thread_id: str, request: Request) -> StreamingResponse:
-    queue = get_sse_queue(thread_id)
-
     async def event_generator() -> AsyncGenerator[str, None]:
+        queue = attach_sse_queue(thread_id)
         try:
             while True:
                 if await request.is_disconnected():
@@ -58,6 +57,6 @@ async def guest_sse(thread_id: str, request: Request) -> StreamingResponse:
                 else:
                     yield f"data: {json.dumps(item)}\n\n"
         finally:
-            pass
+            detach_sse_queue(thread_id, drop=False)
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
@@ -11,7 +11,8 @@ from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from app.agents.supervisor.memory.icebreaker_consumer import debug_icebreaker_flow
-from app.core.app_state import get_sse_queue
+from app.core.app_state import attach_sse_queue, detach_sse_queue
+from app.core.event_backplane import BackplaneSSEQueue
 from app.services.supervisor import supervisor_service
 
 router = APIRouter(prefix="/supervisor", tags=["Supervisor"])
@@ -19,7 +20,7 @@ router = APIRouter(prefix="/supervisor", tags=["Supervisor"])
 
 class SupervisorInitializeResponse(BaseModel):
     thread_id: str
-    welcome: str
+    welcome: str | None = None
     sse_url: str
     prior_conversation_summary: str | None = None
 
@@ -27,6 +28,8 @@ class SupervisorInitializeResponse(BaseModel):
 class SupervisorInitializePayload(BaseModel):
     user_id: UUID
     voice: bool = False  # Optional parameter
+    # Welcome is streamed over SSE; set to also block until it is generated and return it here
+    wait_for_welcome: bool = False
 
 
 @router.post("/initialize", response_model=SupervisorInitializeResponse)
@@ -34,6 +37,7 @@ async def initialize_supervisor(payload: SupervisorInitializePayload) -> Supervi
     result = await supervisor_service.initialize(
         user_id=payload.user_id,
         voice=payload.voice,
+        wait_for_welcome=payload.wait_for_welcome,
     )
     return SupervisorInitializeResponse(**result)
 
@@ -54,18 +58,25 @@ async def supervisor_message(payload: SupervisorMessagePayload) -> dict:
 
 @router.get("/sse/{thread_id}")
 async def supervisor_sse(thread_id: str, request: Request) -> StreamingResponse:
-    queue = get_sse_queue(thread_id)
-
     async def event_generator() -> AsyncGenerator[str, None]:
+        queue = attach_sse_queue(thread_id)
+        replayable = isinstance(queue, BackplaneSSEQueue)
+        if replayable:
+            queue.resume_after(request.headers.get("last-event-id"))
         try:
             while True:
                 if await request.is_disconnected():
                     break
                 try:
-                    item = await asyncio.wait_for(queue.get(), timeout=10.0)
+                    if replayable:
+                        event_id, item = await asyncio.wait_for(queue.get_with_id(), timeout=10.0)
+                    else:
+                        event_id, item = None, await asyncio.wait_for(queue.get(), timeout=10.0)
                 except asyncio.TimeoutError:
                     continue
 
+                if event_id is not None:
+                    yield f"id: {event_id}\n"
                 if isinstance(item, dict) and "event" in item:
                     event_name = item.get("event")
                     payload = item.get("data", {})
@@ -74,9 +85,7 @@ async def supervisor_sse(thread_id: str, request: Request) -> StreamingResponse:
                 else:
                     yield f"data: {json.dumps(item, default=str)}\n\n"
         finally:
-            from app.core.app_state import drop_sse_queue
-
-            drop_sse_queue(thread_id)
+            detach_sse_queue(thread_id)
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
@@ -253,7 +262,7 @@ async def test_icebreaker_flow(payload: SupervisorInitializePayload) -> dict:
     try:
         from app.services.supervisor import supervisor_service
 
-        result = await supervisor_service.initialize(user_id=payload.user_id)
+        result = await supervisor_service.initialize(user_id=payload.user_id, wait_for_welcome=True)
 
         return {
             "status": "success",
@@ -7,19 +7,35 @@ from uuid import UUID
 
 from langgraph.graph.state import CompiledStateGraph
 
+from app.core.config import config as app_config
+from app.core.runtime_registry import RuntimeRegistry, lock_is_idle, queue_is_idle
+
 if TYPE_CHECKING:
     from app.agents.onboarding import OnboardingAgent, OnboardingState
+    from app.core.event_backplane import BackplaneSSEQueue
 
 _onboarding_agent: "OnboardingAgent | None" = None
 _supervisor_graph = None
 _user_sessions: "dict[UUID, OnboardingState]" = {}
 
 _onboarding_threads: "dict[str, OnboardingState]" = {}
-_sse_queues: dict[str, asyncio.Queue] = {}
-_audio_queues: dict[str, asyncio.Queue] = {}
-_thread_locks: dict[str, asyncio.Lock] = {}
 
-_last_emitted_text: dict[str, str] = {}
+# Per-thread runtime objects live in bounded registries that evict idle threads.
+_REGISTRY_LIMITS = {
+    "max_entries": app_config.RUNTIME_REGISTRY_MAX_ENTRIES,
+    "idle_ttl_seconds": app_config.RUNTIME_REGISTRY_IDLE_TTL_SECONDS,
+}
+_sse_queues: "RuntimeRegistry[asyncio.Queue | BackplaneSSEQueue]" = RuntimeRegistry(
+    "sse_queues", is_evictable=queue_is_idle, **_REGISTRY_LIMITS
+)
+_audio_queues: RuntimeRegistry[asyncio.Queue] = RuntimeRegistry(
+    "audio_queues", is_evictable=queue_is_idle, **_REGISTRY_LIMITS
+)
+_thread_locks: RuntimeRegistry[asyncio.Lock] = RuntimeRegistry(
+    "thread_locks", is_evictable=lock_is_idle, **_REGISTRY_LIMITS
+)
+
+_last_emitted_text: RuntimeRegistry[str] = RuntimeRegistry("last_emitted_text", **_REGISTRY_LIMITS)
 
 # Finance samples cache (per-user) - stores compact JSON strings and timestamps
 FINANCE_SAMPLES_CACHE_TTL_SECONDS: int = 600
@@ -125,9 +141,13 @@ def set_thread_state(thread_id: str, state: OnboardingState) -> None:
     _onboarding_threads[thread_id] = state
 
 
-def get_sse_queue(thread_id: str) -> asyncio.Queue[str]:
+def get_sse_queue(thread_id: str) -> "asyncio.Queue[str] | BackplaneSSEQueue":
+    """Return the thread's SSE queue: process-local, or a view of the shared event log (``SSE_EVENT_BACKEND``)."""
     if thread_id not in _sse_queues:
-        _sse_queues[thread_id] = asyncio.Queue()
+        from app.core.event_backplane import BackplaneSSEQueue, get_event_backplane
+
+        backplane = get_event_backplane()
+        _sse_queues[thread_id] = BackplaneSSEQueue(backplane, thread_id) if backplane else asyncio.Queue()
     return _sse_queues[thread_id]
 
 
@@ -135,6 +155,22 @@ def drop_sse_queue(thread_id: str) -> None:
     _sse_queues.pop(thread_id, None)
 
 
+def attach_sse_queue(thread_id: str) -> "asyncio.Queue[str] | BackplaneSSEQueue":
+    """Return the thread's SSE queue, pinned against eviction until ``detach_sse_queue``.
+
+    A stream waiting between events leaves no getter on the queue, so without
+    the pin an idle or LRU sweep could swap it for a queue nobody reads.
+    """
+    _sse_queues.pin(thread_id)
+    return get_sse_queue(thread_id)
+
+
+def detach_sse_queue(thread_id: str, drop: bool = True) -> None:
+    """Release a stream's pin; with ``drop``, remove the queue once its last stream has gone."""
+    if _sse_queues.unpin(thread_id) == 0 and drop:
+        drop_sse_queue(thread_id)
+
+
 def get_thread_lock(thread_id: str) -> asyncio.Lock:
     lock = _thread_locks.get(thread_id)
     if lock is None:
@@ -143,6 +179,21 @@ def get_thread_lock(thread_id: str) -> asyncio.Lock:
     return lock
 
 
+def _runtime_registries() -> list[RuntimeRegistry]:
+    registries = (_sse_queues, _audio_queues, _thread_locks, _last_emitted_text)
+    return [r for r in registries if isinstance(r, RuntimeRegistry)]
+
+
+def get_runtime_registry_stats() -> list[dict[str, Any]]:
+    """Size, high-water mark and eviction counters for each per-thread registry."""
+    return [registry.stats() for registry in _runtime_registries()]
+
+
+def sweep_runtime_registries() -> int:
+    """Evict every idle per-thread entry now; writes already evict incrementally."""
+    return sum(registry.sweep() for registry in _runtime_registries())
+
+
 def get_last_emitted_text(thread_id: str) -> str:
     return _last_emitted_text.get(thread_id, "")
 
@@ -469,10 +520,22 @@ async def start_finance_agent_cleanup_task() -> None:
             try:
                 await asyncio.sleep(1800)  # Clean up every 30 minutes
                 removed_count = cleanup_expired_finance_agents()
+                import logging
+                logger = logging.getLogger(__name__)
                 if removed_count > 0:
-                    import logging
-                    logger = logging.getLogger(__name__)
                     logger.info(f"Cleaned up {removed_count} expired finance agents")
+                swept = sweep_runtime_registries()
+                for stats in get_runtime_registry_stats():
+                    logger.info(
+                        "runtime_registry.gauge name=%s size=%d high_water=%d evicted_idle=%d evicted_lru=%d",
+                        stats["name"],
+                        stats["size"],
+                        stats["high_water"],
+                        stats["evicted_idle"],
+                        stats["evicted_lru"],
+                    )
+                if swept > 0:
+                    logger.info(f"Evicted {swept} idle per-thread runtime entries")
             except Exception as e:
                 import logging
                 logger = logging.getLogger(__name__)
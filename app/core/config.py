@@ -74,6 +74,10 @@ class Config:
     EPISODIC_MERGE_WINDOW_HOURS: Optional[int] = get_optional_value("EPISODIC_MERGE_WINDOW_HOURS", int)
     EPISODIC_NOVELTY_MIN: Optional[float] = get_optional_value("EPISODIC_NOVELTY_MIN", float)
     MEMORY_TINY_LLM_MODEL_ID: str = os.getenv("MEMORY_TINY_LLM_MODEL_ID")
+    # Local gate that settles obvious no-op turns before the cold-path trigger LLM call
+    MEMORY_TRIGGER_GATE_ENABLED: bool = os.getenv("MEMORY_TRIGGER_GATE_ENABLED", "true").lower() in {"true", "1", "yes", "on"}
+    MEMORY_TRIGGER_GATE_MODEL_PATH: Optional[str] = os.getenv("MEMORY_TRIGGER_GATE_MODEL_PATH")
+    MEMORY_TRIGGER_GATE_SKIP_BELOW: Optional[float] = get_optional_value("MEMORY_TRIGGER_GATE_SKIP_BELOW", float)
 
     MEMORY_SEMANTIC_MAX_LIMIT: Optional[int] = get_optional_value("MEMORY_SEMANTIC_MAX_LIMIT", int)
     MEMORY_EPISODIC_MAX_LIMIT: Optional[int] = get_optional_value("MEMORY_EPISODIC_MAX_LIMIT", int)
@@ -90,13 +94,42 @@ class Config:
     MEMORY_COLD_PATH_THREAD_STATE_CLEANUP_INTERVAL_SECONDS: Optional[int] = get_optional_value(
         "MEMORY_COLD_PATH_THREAD_STATE_CLEANUP_INTERVAL_SECONDS", int
     )
+    # "local" keeps jobs in the API process; "redis" or "sqlite" use a durable queue drained by workers
+    MEMORY_COLD_PATH_QUEUE_BACKEND: str = os.getenv("MEMORY_COLD_PATH_QUEUE_BACKEND", "local").strip().lower()
+    MEMORY_COLD_PATH_QUEUE_PATH: str = os.getenv("MEMORY_COLD_PATH_QUEUE_PATH", "cold_path_queue.sqlite3")
+    MEMORY_COLD_PATH_VISIBILITY_TIMEOUT_SECONDS: int = int(os.getenv("MEMORY_COLD_PATH_VISIBILITY_TIMEOUT_SECONDS", "300"))
+    MEMORY_COLD_PATH_INPROCESS_WORKER: bool = os.getenv("MEMORY_COLD_PATH_INPROCESS_WORKER", "true").lower() in {
+        "true",
+        "1",
+        "yes",
+        "on",
+    }
 
     # Memory Context Configuration
     MEMORY_CONTEXT_TOPK: Optional[int] = get_optional_value("MEMORY_CONTEXT_TOPK", int)
     MEMORY_CONTEXT_TOPN: Optional[int] = get_optional_value("MEMORY_CONTEXT_TOPN", int)
     MEMORY_RERANK_WEIGHTS: str = os.getenv("MEMORY_RERANK_WEIGHTS")
 
+    # Memory Usage Tracking Configuration
+    MEMORY_USAGE_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("MEMORY_USAGE_FLUSH_INTERVAL_SECONDS", "5"))
+    MEMORY_USAGE_MAX_PENDING: int = int(os.getenv("MEMORY_USAGE_MAX_PENDING", "500"))
+
     USER_CONTEXT_CACHE_TTL_SECONDS: Optional[int] = get_optional_value("USER_CONTEXT_CACHE_TTL_SECONDS", int)
+    # Serve entries this long past the TTL while one background refresh runs
+    USER_CONTEXT_CACHE_STALE_SECONDS: int = int(os.getenv("USER_CONTEXT_CACHE_STALE_SECONDS", "120"))
+    # Remember failed fetches this long before retrying the source
+    USER_CONTEXT_CACHE_NEGATIVE_TTL_SECONDS: int = int(os.getenv("USER_CONTEXT_CACHE_NEGATIVE_TTL_SECONDS", "10"))
+    USER_CONTEXT_CACHE_MAX_ENTRIES: int = int(os.getenv("USER_CONTEXT_CACHE_MAX_ENTRIES", "5000"))
+    # "local" (per process) or "redis" (shared second tier across replicas)
+    USER_CONTEXT_CACHE_BACKEND: str = os.getenv("USER_CONTEXT_CACHE_BACKEND", "local").strip().lower()
+    # Summarize a conversation once it has been idle this long (0 disables; initialize then summarizes on demand)
+    CONVERSATION_SUMMARY_IDLE_SECONDS: float = float(os.getenv("CONVERSATION_SUMMARY_IDLE_SECONDS", "300"))
+    # Per-section deadline when loading external user context; late sections are left out of the context
+    USER_CONTEXT_SECTION_TIMEOUT_SECONDS: float = float(os.getenv("USER_CONTEXT_SECTION_TIMEOUT_SECONDS", "5"))
+
+    # Per-thread runtime registries (SSE/audio queues, thread locks, last emitted text, per-user locks)
+    RUNTIME_REGISTRY_MAX_ENTRIES: int = int(os.getenv("RUNTIME_REGISTRY_MAX_ENTRIES", "10000"))
+    RUNTIME_REGISTRY_IDLE_TTL_SECONDS: int = int(os.getenv("RUNTIME_REGISTRY_IDLE_TTL_SECONDS", "3600"))
 
     # Procedural Memory (Supervisor) Configuration
     MEMORY_PROCEDURAL_TOPK: Optional[int] = get_optional_value("MEMORY_PROCEDURAL_TOPK", int)
@@ -132,6 +165,12 @@ class Config:
     # AI Models Configuration
     BEDROCK_EMBED_MODEL_ID: str = os.getenv("BEDROCK_EMBED_MODEL_ID")
 
+    # Embedding Cache Configuration
+    EMBEDDING_CACHE_MAX_ENTRIES: Optional[int] = get_optional_value("EMBEDDING_CACHE_MAX_ENTRIES", int)
+    EMBEDDING_CACHE_PATH: Optional[str] = os.getenv("EMBEDDING_CACHE_PATH")
+    EMBEDDING_CACHE_DISK_MAX_ENTRIES: Optional[int] = get_optional_value("EMBEDDING_CACHE_DISK_MAX_ENTRIES", int)
+    EMBEDDING_MAX_CONCURRENCY: Optional[int] = get_optional_value("EMBEDDING_MAX_CONCURRENCY", int)
+
     # Bedrock Retry Configuration
     BEDROCK_RETRY_MAX_ATTEMPTS: int = int(os.getenv("BEDROCK_RETRY_MAX_ATTEMPTS", "3"))
 
@@ -199,9 +238,21 @@ class Config:
     S3V_BUCKET: Optional[str] = os.getenv("S3V_BUCKET")
     S3V_INDEX_KB: Optional[str] = os.getenv("S3V_INDEX_KB")
     S3V_KB_S3_FILES: Optional[str] = os.getenv("S3V_KB_S3_FILES")
+    # Source -> vector key manifests for the KB index (JSON objects; defaults to the KB files bucket)
+    KB_MANIFEST_ENABLED: bool = os.getenv("KB_MANIFEST_ENABLED", "true").lower() in {"true", "1", "yes", "on"}
+    KB_MANIFEST_BUCKET: Optional[str] = os.getenv("KB_MANIFEST_BUCKET") or S3V_KB_S3_FILES
+    KB_MANIFEST_PREFIX: str = os.getenv("KB_MANIFEST_PREFIX", "_kb_manifest/")
     S3V_DISTANCE: Optional[str] = os.getenv("S3V_DISTANCE")
     S3V_DIMS: Optional[int] = get_optional_value("S3V_DIMS", int)
     S3V_MAX_TOP_K: Optional[int] = get_optional_value("S3V_MAX_TOP_K", int)
+    S3V_IO_MAX_WORKERS: Optional[int] = get_optional_value("S3V_IO_MAX_WORKERS", int)
+    # Knowledge base index writes: request limits per batch, parallel batches and retries of failed slices
+    S3V_KB_PUT_BATCH_MAX_VECTORS: int = int(os.getenv("S3V_KB_PUT_BATCH_MAX_VECTORS", "500"))
+    S3V_KB_PUT_BATCH_MAX_BYTES: int = int(os.getenv("S3V_KB_PUT_BATCH_MAX_BYTES", str(15 * 1024 * 1024)))
+    S3V_KB_DELETE_BATCH_SIZE: int = int(os.getenv("S3V_KB_DELETE_BATCH_SIZE", "100"))
+    S3V_KB_WRITE_CONCURRENCY: int = int(os.getenv("S3V_KB_WRITE_CONCURRENCY", "4"))
+    S3V_KB_WRITE_MAX_ATTEMPTS: int = int(os.getenv("S3V_KB_WRITE_MAX_ATTEMPTS", "3"))
+    S3V_KB_WRITE_RETRY_BACKOFF_SECONDS: float = float(os.getenv("S3V_KB_WRITE_RETRY_BACKOFF_SECONDS", "0.5"))
 
     # Redis Configuration (populated exclusively via AWS Secrets -> aws_config)
     REDIS_HOST: Optional[str] = None
@@ -211,6 +262,16 @@ class Config:
     REDIS_TLS: Optional[str] = None
     REDIS_TTL_DEFAULT: Optional[str] = None
     REDIS_TTL_SESSION: Optional[str] = None
+    # LangGraph checkpoint payloads at or above this size are zlib-compressed in Redis (0 disables)
+    CHECKPOINT_COMPRESSION_MIN_BYTES: int = int(os.getenv("CHECKPOINT_COMPRESSION_MIN_BYTES", "1024"))
+    # Checkpoints kept per thread; older ones are trimmed as new ones arrive (0 keeps every checkpoint)
+    CHECKPOINT_MAX_HISTORY: int = int(os.getenv("CHECKPOINT_MAX_HISTORY", "50"))
+    # "local" keeps sessions in process; "redis" shares them so any replica can serve a thread
+    SESSION_STORE_BACKEND: str = os.getenv("SESSION_STORE_BACKEND", "local").strip().lower()
+    # "local" uses per-process asyncio queues; "memory" and "redis" keep a replayable per-thread event log
+    SSE_EVENT_BACKEND: str = os.getenv("SSE_EVENT_BACKEND", "local").strip().lower()
+    SSE_EVENT_RETENTION: int = int(os.getenv("SSE_EVENT_RETENTION", "500"))
+    SSE_EVENT_TTL_SECONDS: int = int(os.getenv("SSE_EVENT_TTL_SECONDS", "3600"))
 
     # Langfuse Configuration (Guest)
     LANGFUSE_PUBLIC_KEY: Optional[str] = os.getenv("LANGFUSE_PUBLIC_KEY")
@@ -244,6 +305,20 @@ class Config:
     # Crawling Configuration
     CRAWL_TYPE: str = os.getenv("CRAWL_TYPE")
     CRAWL_TIMEOUT: Optional[int] = get_optional_value("CRAWL_TIMEOUT", int)
+    # Budgets enforced while a recursive crawl runs (see app/knowledge/crawler/async_crawler.py)
+    CRAWL_MAX_BYTES: int = int(os.getenv("CRAWL_MAX_BYTES", str(20 * 1024 * 1024)))
+    CRAWL_MAX_PAGE_BYTES: int = int(os.getenv("CRAWL_MAX_PAGE_BYTES", str(2 * 1024 * 1024)))
+    CRAWL_TIME_BUDGET_SECONDS: float = float(os.getenv("CRAWL_TIME_BUDGET_SECONDS", "120"))
+    CRAWL_CONCURRENCY: int = int(os.getenv("CRAWL_CONCURRENCY", "4"))
+    CRAWL_PER_HOST_CONCURRENCY: int = int(os.getenv("CRAWL_PER_HOST_CONCURRENCY", "2"))
+    CRAWL_RESPECT_ROBOTS: bool = os.getenv("CRAWL_RESPECT_ROBOTS", "true").lower() in {"true", "1", "yes", "on"}
+    CRAWL_CACHE_MAX_ENTRIES: int = int(os.getenv("CRAWL_CACHE_MAX_ENTRIES", "1000"))
+    # Knowledge base sync pipeline: concurrent calls per stage and sources admitted at once
+    KB_SYNC_FETCH_CONCURRENCY: int = int(os.getenv("KB_SYNC_FETCH_CONCURRENCY", "4"))
+    KB_SYNC_SPLIT_CONCURRENCY: int = int(os.getenv("KB_SYNC_SPLIT_CONCURRENCY", "2"))
+    KB_SYNC_EMBED_CONCURRENCY: int = int(os.getenv("KB_SYNC_EMBED_CONCURRENCY", "2"))
+    KB_SYNC_WRITE_CONCURRENCY: int = int(os.getenv("KB_SYNC_WRITE_CONCURRENCY", "2"))
+    KB_SYNC_MAX_IN_FLIGHT: int = int(os.getenv("KB_SYNC_MAX_IN_FLIGHT", "8"))
 
     VERA_GUIDANCE_URL: Optional[str] = os.getenv("VERA_GUIDANCE_URL")
     VERA_GUIDANCE_RECURSION_DEPTH: Optional[int] = get_optional_value("VERA_GUIDANCE_RECURSION_DEPTH", int)
@@ -251,6 +326,14 @@ class Config:
     # Search Configuration
     CHUNK_SIZE: Optional[int] = get_optional_value("CHUNK_SIZE", int)
     CHUNK_OVERLAP: Optional[int] = get_optional_value("CHUNK_OVERLAP", int)
+    # Parent-page context attached to KB search results for the wealth agent (0 disables hydration)
+    KB_PARENT_CONTEXT_MAX_CHARS: int = int(os.getenv("KB_PARENT_CONTEXT_MAX_CHARS", "0"))
+    KB_PARENT_MAX_CHUNKS: int = int(os.getenv("KB_PARENT_MAX_CHUNKS", "30"))
+    KB_PARENT_CACHE_TTL_SECONDS: int = int(os.getenv("KB_PARENT_CACHE_TTL_SECONDS", "600"))
+    KB_PARENT_CACHE_MAX_ENTRIES: int = int(os.getenv("KB_PARENT_CACHE_MAX_ENTRIES", "256"))
+    KB_SEARCH_CACHE_TTL_SECONDS: int = int(os.getenv("KB_SEARCH_CACHE_TTL_SECONDS", "60"))
+    KB_SEARCH_CACHE_MAX_ENTRIES: int = int(os.getenv("KB_SEARCH_CACHE_MAX_ENTRIES", "512"))
+    KB_QUERY_EMBEDDING_CACHE_MAX_ENTRIES: int = int(os.getenv("KB_QUERY_EMBEDDING_CACHE_MAX_ENTRIES", "1024"))
 
     # Guest Agent Configuration
     GUEST_MAX_MESSAGES: Optional[int] = get_optional_value("GUEST_MAX_MESSAGES", int)
@@ -269,6 +352,16 @@ class Config:
     FOS_API_KEY: Optional[str] = os.getenv("FOS_API_KEY")
     FOS_SECRETS_ID: Optional[str] = os.getenv("FOS_SECRETS_ID")
     FOS_SECRETS_REGION: str = os.getenv("FOS_SECRETS_REGION")
+    # Shared FOS HTTP client: connection pool, concurrency cap, retries for idempotent calls and circuit breaker
+    FOS_HTTP_TIMEOUT_SECONDS: float = float(os.getenv("FOS_HTTP_TIMEOUT_SECONDS", "15"))
+    FOS_HTTP_MAX_CONNECTIONS: int = int(os.getenv("FOS_HTTP_MAX_CONNECTIONS", "100"))
+    FOS_HTTP_MAX_KEEPALIVE: int = int(os.getenv("FOS_HTTP_MAX_KEEPALIVE", "20"))
+    FOS_HTTP_MAX_CONCURRENCY: int = int(os.getenv("FOS_HTTP_MAX_CONCURRENCY", "32"))
+    FOS_HTTP2_ENABLED: bool = os.getenv("FOS_HTTP2_ENABLED", "true").strip().lower() == "true"
+    FOS_HTTP_MAX_RETRIES: int = int(os.getenv("FOS_HTTP_MAX_RETRIES", "2"))
+    FOS_HTTP_RETRY_BACKOFF_SECONDS: float = float(os.getenv("FOS_HTTP_RETRY_BACKOFF_SECONDS", "0.2"))
+    FOS_HTTP_CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("FOS_HTTP_CIRCUIT_FAILURE_THRESHOLD", "5"))
+    FOS_HTTP_CIRCUIT_RESET_SECONDS: float = float(os.getenv("FOS_HTTP_CIRCUIT_RESET_SECONDS", "30"))
 
     # Prompt Service Configuration
     SUPERVISOR_PROMPT_TEST_MODE: Optional[bool] = get_optional_value("SUPERVISOR_PROMPT_TEST_MODE", bool)
@@ -0,0 +1,247 @@
+"""Per-thread SSE event log shared by every replica.
+
+With ``SSE_EVENT_BACKEND=local`` each worker keeps its own ``asyncio.Queue`` per
+thread, so the POST that produces events and the SSE GET that drains them must
+land on the same process. The backplanes here keep an append-only, bounded event
+log per thread instead (a Redis stream, or an in-process stand-in with the same
+semantics) plus a delivery cursor, so any replica can publish or serve the
+stream and a reconnecting client can resume from ``Last-Event-ID``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+# Blocking reads must stay below the Redis client's socket timeout.
+READ_BLOCK_SECONDS: float = 2.0
+READ_BATCH_SIZE: int = 100
+
+EventRecord = tuple[str, Any]
+
+
+class EventBackplane(Protocol):
+    """Append-only per-thread event log with a shared delivery cursor."""
+
+    async def publish(self, thread_id: str, item: Any) -> str: ...
+
+    async def read(self, thread_id: str, after: Optional[str], block: float) -> list[EventRecord]: ...
+
+    async def get_cursor(self, thread_id: str) -> Optional[str]: ...
+
+    async def set_cursor(self, thread_id: str, event_id: str) -> None: ...
+
+
+@dataclass
+class _LocalStream:
+    events: deque[tuple[int, Any]]
+    next_seq: int = 1
+    cursor: Optional[str] = None
+    changed: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class InMemoryEventBackplane:
+    """Process-local stand-in for single-replica setups and tests.
+
+    Event ids are per-thread sequence numbers rendered as strings.
+    """
+
+    def __init__(self, retention: int = 500) -> None:
+        self._retention = max(1, int(retention))
+        self._streams: dict[str, _LocalStream] = {}
+
+    def _stream(self, thread_id: str) -> _LocalStream:
+        stream = self._streams.get(thread_id)
+        if stream is None:
+            stream = self._streams[thread_id] = _LocalStream(events=deque(maxlen=self._retention))
+        return stream
+
+    @staticmethod
+    def _seq(event_id: Optional[str]) -> int:
+        try:
+            return int(event_id) if event_id else 0
+        except ValueError:
+            return 0
+
+    async def publish(self, thread_id: str, item: Any) -> str:
+        stream = self._stream(thread_id)
+        seq = stream.next_seq
+        stream.next_seq += 1
+        stream.events.append((seq, item))
+        # Wake current readers and hand later ones a fresh event.
+        stream.changed.set()
+        stream.changed = asyncio.Event()
+        return str(seq)
+
+    def _after(self, stream: _LocalStream, after_seq: int) -> list[EventRecord]:
+        found = [(str(seq), item) for seq, item in stream.events if seq > after_seq]
+        return found[:READ_BATCH_SIZE]
+
+    async def read(self, thread_id: str, after: Optional[str], block: float) -> list[EventRecord]:
+        stream = self._stream(thread_id)
+        after_seq = self._seq(after)
+        found = self._after(stream, after_seq)
+        if found or block <= 0:
+            return found
+        changed = stream.changed
+        try:
+            await asyncio.wait_for(changed.wait(), timeout=block)
+        except asyncio.TimeoutError:
+            return []
+        return self._after(stream, after_seq)
+
+    async def get_cursor(self, thread_id: str) -> Optional[str]:
+        return self._stream(thread_id).cursor
+
+    async def set_cursor(self, thread_id: str, event_id: str) -> None:
+        self._stream(thread_id).cursor = event_id
+
+
+class RedisStreamEventBackplane:
+    """Backplane on one capped Redis stream per thread (``XADD MAXLEN`` / ``XREAD BLOCK``).
+
+    The stream and its cursor key expire ``ttl_seconds`` after the last write,
+    so abandoned threads clean themselves up.
+    """
+
+    def __init__(
+        self,
+        client: Any = None,
+        *,
+        prefix: str = "sse",
+        retention: int = 500,
+        ttl_seconds: int = 3600,
+    ) -> None:
+        self._client = client
+        self._prefix = prefix.rstrip(":")
+        self._retention = max(1, int(retention))
+        self._ttl_seconds = max(1, int(ttl_seconds))
+
+    async def _get_client(self) -> Any:
+        if self._client is None:
+            from app.services.memory.redis_client import get_redis_client_singleton
+
+            self._client = await get_redis_client_singleton()
+        return self._client
+
+    def _stream_key(self, thread_id: str) -> str:
+        return f"{self._prefix}:stream:{thread_id}"
+
+    def _cursor_key(self, thread_id: str) -> str:
+        return f"{self._prefix}:cursor:{thread_id}"
+
+    @staticmethod
+    def _decode(raw: Any) -> str:
+        return raw.decode("utf-8") if isinstance(raw, (bytes, bytearray)) else str(raw)
+
+    async def publish(self, thread_id: str, item: Any) -> str:
+        client = await self._get_client()
+        key = self._stream_key(thread_id)
+        pipe = client.pipeline(transaction=False)
+        pipe.xadd(key, {"data": json.dumps(item, default=str)}, maxlen=self._retention, approximate=True)
+        pipe.expire(key, self._ttl_seconds)
+        event_id, _ = await pipe.execute()
+        return self._decode(event_id)
+
+    async def read(self, thread_id: str, after: Optional[str], block: float) -> list[EventRecord]:
+        client = await self._get_client()
+        block_ms = int(block * 1000) if block > 0 else None
+        response = await client.xread(
+            {self._stream_key(thread_id): after or "0-0"}, count=READ_BATCH_SIZE, block=block_ms
+        )
+        records: list[EventRecord] = []
+        for _stream, entries in response or []:
+            for event_id, fields in entries:
+                raw = fields.get(b"data", fields.get("data"))
+                try:
+                    item = json.loads(raw)
+                except (TypeError, ValueError):
+                    logger.warning("sse.backplane.bad_entry thread_id=%s id=%s", thread_id, self._decode(event_id))
+                    continue
+                records.append((self._decode(event_id), item))
+        return records
+
+    async def get_cursor(self, thread_id: str) -> Optional[str]:
+        client = await self._get_client()
+        raw = await client.get(self._cursor_key(thread_id))
+        return self._decode(raw) if raw is not None else None
+
+    async def set_cursor(self, thread_id: str, event_id: str) -> None:
+        client = await self._get_client()
+        await client.set(self._cursor_key(thread_id), event_id, ex=self._ttl_seconds)
+
+
+class BackplaneSSEQueue:
+    """``asyncio.Queue``-shaped view of one thread's event log.
+
+    ``put`` publishes to the backplane. ``get`` returns the next event after the
+    shared cursor (or after the id passed to ``resume_after``) and advances the
+    cursor, so events published while no client was connected are delivered on
+    the next connection, on whichever replica it lands.
+    """
+
+    def __init__(self, backplane: EventBackplane, thread_id: str, block: float = READ_BLOCK_SECONDS) -> None:
+        self._backplane = backplane
+        self._thread_id = thread_id
+        self._block = block
+        self._buffer: deque[EventRecord] = deque()
+        self._last_id: Optional[str] = None
+        self._cursor_loaded = False
+
+    async def put(self, item: Any) -> None:
+        await self._backplane.publish(self._thread_id, item)
+
+    def resume_after(self, event_id: Optional[str]) -> None:
+        """Replay from just after ``event_id`` (an SSE ``Last-Event-ID``) instead of the shared cursor."""
+        if not event_id:
+            return
+        self._buffer.clear()
+        self._last_id = event_id
+        self._cursor_loaded = True
+
+    async def get_with_id(self) -> EventRecord:
+        while not self._buffer:
+            if not self._cursor_loaded:
+                self._last_id = await self._backplane.get_cursor(self._thread_id)
+                self._cursor_loaded = True
+            self._buffer.extend(await self._backplane.read(self._thread_id, self._last_id, self._block))
+        event_id, item = self._buffer[0]
+        # Commit the cursor before popping so a cancelled get never drops the event.
+        await self._backplane.set_cursor(self._thread_id, event_id)
+        self._buffer.popleft()
+        self._last_id = event_id
+        return event_id, item
+
+    async def get(self) -> Any:
+        _, item = await self.get_with_id()
+        return item
+
+
+_backplane: Optional[EventBackplane] = None
+
+
+def get_event_backplane() -> Optional[EventBackplane]:
+    """Return the configured backplane, or None for per-process queues (``SSE_EVENT_BACKEND=local``)."""
+    global _backplane
+    from app.core.config import config as app_config
+
+    backend = (app_config.SSE_EVENT_BACKEND or "local").lower()
+    if backend == "local":
+        return None
+    if _backplane is None:
+        if backend == "memory":
+            _backplane = InMemoryEventBackplane(retention=app_config.SSE_EVENT_RETENTION)
+        elif backend == "redis":
+            _backplane = RedisStreamEventBackplane(
+                retention=app_config.SSE_EVENT_RETENTION,
+                ttl_seconds=app_config.SSE_EVENT_TTL_SECONDS,
+            )
+        else:
+            raise ValueError(f"Unknown SSE_EVENT_BACKEND: {backend!r}")
+    return _backplane
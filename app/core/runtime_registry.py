@@ -0,0 +1,167 @@
+"""Bounded, self-evicting registries for per-thread and per-user runtime objects.
+
+``app_state`` used to keep SSE/audio queues, thread locks and last-emitted text
+in plain module-level dicts that only ever grew. ``RuntimeRegistry`` is a
+drop-in ``MutableMapping`` that keeps entries in LRU order, drops entries idle
+for longer than ``idle_ttl_seconds`` and caps the size at ``max_entries``.
+Entries that are still in use (a held lock, a queue with pending items or a
+waiting consumer) are never evicted; they are treated as freshly used instead.
+Callers that hold on to an entry without visibly using it (an SSE stream
+suspended between events) ``pin`` its key for as long as they need it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, MutableMapping
+from typing import Any, Generic, TypeVar
+
+V = TypeVar("V")
+
+# Idle entries examined per write; keeps eviction amortised O(1).
+EVICTION_SCAN_LIMIT: int = 32
+
+
+def queue_is_idle(queue: Any) -> bool:
+    """Return whether an ``asyncio.Queue`` is drained and nobody is waiting on it."""
+    if isinstance(queue, asyncio.Queue):
+        return queue.empty() and not getattr(queue, "_getters", None)
+    return True
+
+
+def lock_is_idle(lock: Any) -> bool:
+    """Return whether a lock is free to evict because nobody holds it."""
+    return not lock.locked()
+
+
+class RuntimeRegistry(MutableMapping[str, V], Generic[V]):
+    """Thread-safe LRU mapping with idle-timeout eviction, a size cap and gauges."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_entries: int,
+        idle_ttl_seconds: float,
+        is_evictable: Callable[[V], bool] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self._max_entries = max(1, int(max_entries))
+        self._idle_ttl = float(idle_ttl_seconds)
+        self._is_evictable = is_evictable or (lambda _value: True)
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[V, float]] = OrderedDict()
+        self._pins: dict[str, int] = {}
+        self._lock = threading.RLock()
+        self._evicted_idle = 0
+        self._evicted_lru = 0
+        self._high_water = 0
+
+    def __getitem__(self, key: str) -> V:
+        with self._lock:
+            value, _ = self._entries[key]
+            self._entries[key] = (value, self._clock())
+            self._entries.move_to_end(key)
+            return value
+
+    def __setitem__(self, key: str, value: V) -> None:
+        with self._lock:
+            now = self._clock()
+            self._entries[key] = (value, now)
+            self._entries.move_to_end(key)
+            self._evict(now, EVICTION_SCAN_LIMIT)
+            self._high_water = max(self._high_water, len(self._entries))
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            del self._entries[key]
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def copy(self) -> dict[str, V]:
+        with self._lock:
+            return {key: value for key, (value, _) in self._entries.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def pin(self, key: str) -> None:
+        """Keep ``key`` from being evicted until a matching ``unpin``; pins nest."""
+        with self._lock:
+            self._pins[key] = self._pins.get(key, 0) + 1
+
+    def unpin(self, key: str) -> int:
+        """Release one pin on ``key``; return how many remain."""
+        with self._lock:
+            remaining = self._pins.get(key, 0) - 1
+            if remaining > 0:
+                self._pins[key] = remaining
+                return remaining
+            self._pins.pop(key, None)
+            return 0
+
+    def _can_evict(self, key: str, value: V) -> bool:
+        return key not in self._pins and self._is_evictable(value)
+
+    def _evict(self, now: float, scan_limit: int | None) -> int:
+        """Evict idle entries from the LRU end, then enforce the size cap (lock held)."""
+        removed = 0
+        scanned = 0
+        while self._entries and (scan_limit is None or scanned < scan_limit):
+            key, (value, last_used) = next(iter(self._entries.items()))
+            if now - last_used <= self._idle_ttl:
+                break
+            scanned += 1
+            if self._can_evict(key, value):
+                del self._entries[key]
+                self._evicted_idle += 1
+                removed += 1
+            else:
+                # Still in use: count that as use so it stops blocking the scan.
+                self._entries[key] = (value, now)
+                self._entries.move_to_end(key)
+
+        pinned = 0
+        while len(self._entries) > self._max_entries and pinned < len(self._entries):
+            key, (value, _) = next(iter(self._entries.items()))
+            if self._can_evict(key, value):
+                del self._entries[key]
+                self._evicted_lru += 1
+                removed += 1
+            else:
+                self._entries.move_to_end(key)
+                pinned += 1
+        return removed
+
+    def sweep(self) -> int:
+        """Evict every idle entry now; returns how many were removed."""
+        with self._lock:
+            return self._evict(self._clock(), None)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "name": self.name,
+                "size": len(self._entries),
+                "max_entries": self._max_entries,
+                "idle_ttl_seconds": self._idle_ttl,
+                "high_water": self._high_water,
+                "pinned": len(self._pins),
+                "evicted_idle": self._evicted_idle,
+                "evicted_lru": self._evicted_lru,
+            }
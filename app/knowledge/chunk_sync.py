@@ -0,0 +1,232 @@
+"""Incremental, content-hash keyed writes of a source's chunks.
+
+``DocumentService.split_documents`` stamps every chunk with the SHA-256 of its
+text (``content_hash``). A sync compares those hashes with the ones already
+stored for the source: only chunks with a new hash are embedded, chunks whose
+text is unchanged but whose metadata moved (e.g. their offset in the parent
+page) are rewritten with their stored embedding, vectors whose hash vanished
+are deleted, and nothing is touched when both sides match.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+# Vector metadata that must match for a stored chunk to be reused as-is.
+# ``content``/``content_hash`` are covered by the hash; ``chunk_index`` and
+# ``last_sync`` change on every split and are not worth a rewrite.
+COMPARED_METADATA_FIELDS = (
+    "content_source",
+    "name",
+    "url",
+    "type",
+    "category",
+    "description",
+    "subcategory",
+    "parent_id",
+    "start_index",
+)
+
+
+@dataclass
+class ChunkDiff:
+    to_add: List[Document] = field(default_factory=list)
+    # Same text, different metadata: rewritten from the stored embedding (chunk, stored key).
+    to_refresh: List[Tuple[Document, str]] = field(default_factory=list)
+    to_delete: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    existing: int = 0
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.to_add or self.to_refresh or self.to_delete)
+
+
+@dataclass
+class ChunkSyncResult:
+    chunks_added: int = 0
+    chunks_refreshed: int = 0
+    chunks_deleted: int = 0
+    chunks_unchanged: int = 0
+    chunks_embedded: int = 0
+    embedding_calls: int = 0
+    delete_failures: int = 0
+    is_new_source: bool = True
+
+    @property
+    def changed(self) -> bool:
+        return self.chunks_added > 0 or self.chunks_refreshed > 0 or self.chunks_deleted > 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "documents_added": self.chunks_added,
+            "documents_refreshed": self.chunks_refreshed,
+            "documents_deleted": self.chunks_deleted,
+            "documents_unchanged": self.chunks_unchanged,
+            "chunks_embedded": self.chunks_embedded,
+            "embedding_calls": self.embedding_calls,
+            "is_new_source": self.is_new_source,
+        }
+
+
+def _normalize(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def _comparable(metadata: Dict[str, Any]) -> tuple:
+    return tuple(_normalize(metadata.get(name)) for name in COMPARED_METADATA_FIELDS)
+
+
+def _placement(chunk: Document) -> tuple:
+    return (str(chunk.metadata.get("parent_id") or ""), int(chunk.metadata.get("start_index") or 0))
+
+
+def _first_of_each_hash(chunks: List[Document]) -> List[Document]:
+    """One chunk per ``content_hash``, the lowest ``parent_id``/``start_index``, in first-seen order."""
+    chosen: Dict[str, Document] = {}
+    for chunk in chunks:
+        content_hash = chunk.metadata.get("content_hash", "")
+        current = chosen.get(content_hash)
+        if current is None or _placement(chunk) < _placement(current):
+            chosen[content_hash] = chunk
+    return list(chosen.values())
+
+
+def diff_source_chunks(existing_vectors: List[Dict[str, Any]], chunks: List[Document], build_metadata) -> ChunkDiff:
+    """Plan the writes that turn ``existing_vectors`` into ``chunks``.
+
+    Chunks are identified by ``content_hash``; repeated chunks within a source
+    (shared boilerplate) are indexed once, always under the same page whatever
+    order the pages were crawled in. ``build_metadata(doc, index)`` must
+    produce the metadata the vector store would write for ``doc``.
+    """
+    stored: Dict[str, Dict[str, Any]] = {}
+    diff = ChunkDiff(existing=len(existing_vectors))
+
+    for vector in existing_vectors:
+        key = vector.get("key")
+        content_hash = vector.get("metadata", {}).get("content_hash")
+        if not key:
+            continue
+        if not content_hash or content_hash in stored:
+            diff.to_delete.append(key)
+            continue
+        stored[content_hash] = vector
+
+    for chunk in _first_of_each_hash(chunks):
+        current = stored.pop(chunk.metadata.get("content_hash", ""), None)
+        if current is not None and _comparable(current.get("metadata", {})) == _comparable(build_metadata(chunk, 0)):
+            diff.unchanged += 1
+            continue
+        if current is not None:
+            diff.to_delete.append(current["key"])
+            diff.to_refresh.append((chunk, current["key"]))
+        else:
+            diff.to_add.append(chunk)
+
+    diff.to_delete.extend(vector["key"] for vector in stored.values())
+    return diff
+
+
+@dataclass
+class ChunkSyncPlan:
+    """A source's chunk diff, then the documents and embeddings ready to write."""
+
+    source_id: str
+    diff: ChunkDiff
+    is_new_source: bool
+    documents: List[Document] = field(default_factory=list)
+    embeddings: List[List[float]] = field(default_factory=list)
+    chunks_embedded: int = 0
+    embedding_calls: int = 0
+
+
+def plan_source_chunks(source_id: str, chunks: List[Document], *, vector_store) -> ChunkSyncPlan:
+    """List the stored vectors of ``source_id`` and diff them against ``chunks``."""
+    existing_vectors = vector_store.list_source_vectors(source_id)
+    diff = diff_source_chunks(existing_vectors, chunks, vector_store.build_vector_metadata)
+    return ChunkSyncPlan(source_id=source_id, diff=diff, is_new_source=not existing_vectors)
+
+
+def embed_planned_chunks(plan: ChunkSyncPlan, *, vector_store, document_service) -> ChunkSyncPlan:
+    """Embed the chunks the plan adds, reusing stored embeddings for refreshed ones."""
+    diff = plan.diff
+    if not diff.has_changes:
+        return plan
+
+    to_embed = list(diff.to_add)
+    reused: List[Tuple[Document, List[float]]] = []
+    if diff.to_refresh:
+        stored_embeddings = vector_store.get_vector_embeddings([key for _, key in diff.to_refresh])
+        for chunk, key in diff.to_refresh:
+            if key in stored_embeddings:
+                reused.append((chunk, stored_embeddings[key]))
+            else:
+                to_embed.append(chunk)
+
+    plan.documents = [chunk for chunk, _ in reused]
+    plan.embeddings = [embedding for _, embedding in reused]
+    if to_embed:
+        plan.embeddings.extend(document_service.generate_embeddings([doc.page_content for doc in to_embed]))
+        plan.documents.extend(to_embed)
+        plan.embedding_calls = 1
+        plan.chunks_embedded = len(to_embed)
+    return plan
+
+
+def write_planned_chunks(plan: ChunkSyncPlan, *, vector_store) -> ChunkSyncResult:
+    """Write the plan's vectors, then delete the stale ones."""
+    source_id = plan.source_id
+    diff = plan.diff
+    result = ChunkSyncResult(
+        chunks_unchanged=diff.unchanged,
+        chunks_embedded=plan.chunks_embedded,
+        embedding_calls=plan.embedding_calls,
+        is_new_source=plan.is_new_source,
+    )
+
+    if not diff.has_changes:
+        logger.info(f"No chunk changes for source_id={source_id} ({diff.unchanged} unchanged) - skipping embeddings and writes")
+        return result
+
+    written_keys: set[str] = set()
+    if plan.documents:
+        written_keys = set(vector_store.add_documents(plan.documents, plan.embeddings) or [])
+        result.chunks_added = len(diff.to_add)
+        result.chunks_refreshed = len(diff.to_refresh)
+
+    # A rewritten chunk can land on the key it used to have; never delete what was just written.
+    stale_keys = [key for key in diff.to_delete if key not in written_keys]
+    if stale_keys:
+        deletion = vector_store.delete_vectors_by_keys(stale_keys, label=f"source {source_id}", source_id=source_id)
+        result.chunks_deleted = deletion.get("vectors_deleted", 0)
+        result.delete_failures = deletion.get("vectors_failed", 0)
+        if result.delete_failures:
+            logger.warning(f"{result.delete_failures} stale vectors for source_id={source_id} could not be deleted - will retry next sync")
+
+    logger.info(
+        f"Chunk sync for source_id={source_id}: +{result.chunks_added} ~{result.chunks_refreshed} "
+        f"-{result.chunks_deleted} ={result.chunks_unchanged} (embedded {result.chunks_embedded})"
+    )
+    return result
+
+
+def sync_source_chunks(source_id: str, chunks: List[Document], *, vector_store, document_service) -> ChunkSyncResult:
+    """Bring the stored vectors of ``source_id`` in line with ``chunks``.
+
+    New vectors are written before vanished ones are deleted, so searches never
+    see a gap. Listing or write failures raise; delete failures are logged and
+    left for the next sync to retry. The sync pipeline runs the three steps as
+    separate stages.
+    """
+    plan = plan_source_chunks(source_id, chunks, vector_store=vector_store)
+    plan = embed_planned_chunks(plan, vector_store=vector_store, document_service=document_service)
+    return write_planned_chunks(plan, vector_store=vector_store)
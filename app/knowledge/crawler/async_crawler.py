@@ -0,0 +1,384 @@
+"""Bounded asynchronous site crawler.
+
+Pages are fetched breadth-first by a small worker pool over one pooled HTTP
+client, and every budget (pages, depth, bytes, wall time) is enforced while
+crawling rather than by truncating a finished crawl. Requests are limited per
+host, honour robots.txt, seed the frontier from the site's sitemaps, and are
+conditional (ETag / Last-Modified) against validators remembered from earlier
+crawls in this process, so an unchanged page costs a 304 instead of a download.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urldefrag, urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+
+import httpx
+from bs4 import BeautifulSoup
+
+from app.core.config import config
+from app.knowledge.crawler.content_utils import UrlFilter
+
+logger = logging.getLogger(__name__)
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+SITEMAP_LOC_PATTERN = re.compile(r"<loc>\s*([^<\s]+)\s*</loc>", re.IGNORECASE)
+MAX_SITEMAPS = 5
+
+
+@dataclass(frozen=True)
+class CrawlBudget:
+    max_pages: int = 50
+    # Same meaning as RecursiveUrlLoader's: pages are fetched while their depth is
+    # below max_depth, so 1 fetches only the root and 2 adds its direct links.
+    max_depth: int = 2
+    max_bytes: int = 20 * 1024 * 1024
+    max_page_bytes: int = 2 * 1024 * 1024
+    time_budget_seconds: float = 120.0
+
+    @classmethod
+    def from_config(cls, max_pages: Optional[int] = None, max_depth: Optional[int] = None) -> "CrawlBudget":
+        return cls(
+            max_pages=max_pages or cls.max_pages,
+            max_depth=max_depth if max_depth is not None else cls.max_depth,
+            max_bytes=config.CRAWL_MAX_BYTES,
+            max_page_bytes=config.CRAWL_MAX_PAGE_BYTES,
+            time_budget_seconds=config.CRAWL_TIME_BUDGET_SECONDS,
+        )
+
+
+@dataclass
+class CrawledPage:
+    url: str
+    content: str
+    depth: int
+    links: List[str] = field(default_factory=list)
+    not_modified: bool = False
+
+
+@dataclass
+class CrawlStats:
+    pages: int = 0
+    requests: int = 0
+    bytes_downloaded: int = 0
+    not_modified: int = 0
+    robots_blocked: int = 0
+    errors: int = 0
+    stop_reason: str = "exhausted"
+
+
+@dataclass
+class _CachedPage:
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content: str
+    links: List[str]
+
+
+class CrawlValidatorCache:
+    """Bounded LRU of page validators plus the extracted content they vouch for."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, _CachedPage] = OrderedDict()
+
+    def get(self, url: str) -> Optional[_CachedPage]:
+        entry = self._entries.get(url)
+        if entry is not None:
+            self._entries.move_to_end(url)
+        return entry
+
+    def put(self, url: str, entry: _CachedPage) -> None:
+        self._entries[url] = entry
+        self._entries.move_to_end(url)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_validator_cache: Optional[CrawlValidatorCache] = None
+
+
+def get_crawl_validator_cache() -> CrawlValidatorCache:
+    global _validator_cache
+    if _validator_cache is None:
+        _validator_cache = CrawlValidatorCache(config.CRAWL_CACHE_MAX_ENTRIES)
+    return _validator_cache
+
+
+class _PageTooLarge(Exception):
+    pass
+
+
+class AsyncCrawler:
+    """Crawl the pages under ``root_url`` within a ``CrawlBudget``.
+
+    ``extract`` turns a page's HTML into the stored content (the loaders pass
+    their cleaner). Links are followed only when they stay under ``root_url``.
+    """
+
+    def __init__(
+        self,
+        root_url: str,
+        budget: CrawlBudget,
+        *,
+        extract: Callable[[str], str],
+        headers: Optional[Dict[str, str]] = None,
+        request_timeout: float = 10.0,
+        concurrency: int = 4,
+        per_host_concurrency: int = 2,
+        respect_robots: bool = True,
+        use_sitemaps: bool = True,
+        exclude_patterns: Iterable[str] = (),
+        cache: Optional[CrawlValidatorCache] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.root_url = urldefrag(root_url)[0]
+        self.budget = budget
+        self.extract = extract
+        self.headers = headers or {}
+        self.request_timeout = request_timeout
+        self.concurrency = max(1, concurrency)
+        self.per_host_concurrency = max(1, per_host_concurrency)
+        self.respect_robots = respect_robots
+        self.use_sitemaps = use_sitemaps
+        self.exclude_patterns = [p for p in exclude_patterns if p]
+        self.cache = cache if cache is not None else get_crawl_validator_cache()
+        self.transport = transport
+        self.stats = CrawlStats()
+
+        root = urlparse(self.root_url)
+        self._scheme_host = (root.scheme, root.netloc)
+        # Like prevent_outside: stay under the root URL, or its directory when it names a file.
+        root_path = root.path or "/"
+        if "." in root_path.rsplit("/", 1)[-1]:
+            root_path = root_path.rsplit("/", 1)[0] + "/"
+        self._root_path = root_path
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._robots: Optional[RobotFileParser] = None
+        self._deadline = 0.0
+        self._frontier_cap = max(100, budget.max_pages * 10)
+
+    def in_scope(self, url: str) -> bool:
+        parsed = urlparse(url)
+        if (parsed.scheme, parsed.netloc) != self._scheme_host:
+            return False
+        if not (parsed.path or "/").startswith(self._root_path):
+            return False
+        if UrlFilter.should_exclude_url(url):
+            return False
+        return not any(pattern in parsed.path for pattern in self.exclude_patterns)
+
+    def _remaining(self) -> float:
+        return self._deadline - time.monotonic()
+
+    async def crawl(self) -> List[CrawledPage]:
+        self._deadline = time.monotonic() + self.budget.time_budget_seconds
+        pages: List[CrawledPage] = []
+        stop = asyncio.Event()
+
+        async with httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.request_timeout,
+            follow_redirects=True,
+            verify=False,
+            transport=self.transport,
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+        ) as client:
+            if self.respect_robots:
+                self._robots = await self._load_robots(client)
+
+            queue: asyncio.Queue[Tuple[str, int]] = asyncio.Queue()
+            seen = {self.root_url}
+            queue.put_nowait((self.root_url, 0))
+            if self.use_sitemaps and self.budget.max_depth > 1:
+                for url in await self._sitemap_urls(client):
+                    if len(seen) >= self._frontier_cap:
+                        break
+                    if url not in seen and self.in_scope(url):
+                        seen.add(url)
+                        queue.put_nowait((url, 1))
+
+            def enqueue_links(page: CrawledPage) -> None:
+                if page.depth + 1 >= self.budget.max_depth:
+                    return
+                for link in page.links:
+                    if len(seen) >= self._frontier_cap:
+                        return
+                    if link not in seen and self.in_scope(link):
+                        seen.add(link)
+                        queue.put_nowait((link, page.depth + 1))
+
+            async def worker() -> None:
+                while True:
+                    url, depth = await queue.get()
+                    try:
+                        if stop.is_set():
+                            continue
+                        page = await self._fetch_page(client, url, depth)
+                        if page is None or stop.is_set():
+                            continue
+                        pages.append(page)
+                        if len(pages) >= self.budget.max_pages:
+                            self.stats.stop_reason = "max_pages"
+                            stop.set()
+                        elif self.stats.bytes_downloaded >= self.budget.max_bytes:
+                            self.stats.stop_reason = "max_bytes"
+                            stop.set()
+                        else:
+                            enqueue_links(page)
+                    except Exception as e:
+                        self.stats.errors += 1
+                        logger.debug(f"Crawl of {url} failed: {e}")
+                    finally:
+                        queue.task_done()
+
+            workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+            drained = asyncio.create_task(queue.join())
+            stopped = asyncio.create_task(stop.wait())
+            try:
+                done, _ = await asyncio.wait(
+                    {drained, stopped},
+                    timeout=max(0.0, self._remaining()),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    self.stats.stop_reason = "time_budget"
+            finally:
+                for task in (*workers, drained, stopped):
+                    task.cancel()
+                await asyncio.gather(*workers, drained, stopped, return_exceptions=True)
+
+        self.stats.pages = len(pages)
+        logger.info(
+            f"Crawled {self.root_url}: {self.stats.pages} pages ({self.stats.not_modified} not modified), "
+            f"{self.stats.requests} requests, {self.stats.bytes_downloaded} bytes, "
+            f"{self.stats.robots_blocked} blocked by robots, stopped: {self.stats.stop_reason}"
+        )
+        # Workers finish in arbitrary order; keep the output stable across runs.
+        pages.sort(key=lambda p: (p.depth, p.url))
+        return pages
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return limit
+
+    async def _get(self, client: httpx.AsyncClient, url: str, headers: Optional[Dict[str, str]] = None) -> Tuple[httpx.Response, bytes]:
+        """GET ``url`` with the host limit held, reading at most ``max_page_bytes``."""
+        remaining = self._remaining()
+        if remaining <= 0:
+            raise asyncio.TimeoutError("crawl time budget exhausted")
+        async with self._host_limit(url):
+            self.stats.requests += 1
+            async with client.stream("GET", url, headers=headers, timeout=min(self.request_timeout, remaining)) as response:
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body.extend(chunk)
+                    if len(body) > self.budget.max_page_bytes:
+                        raise _PageTooLarge(url)
+                self.stats.bytes_downloaded += len(body)
+                return response, bytes(body)
+
+    async def _fetch_page(self, client: httpx.AsyncClient, url: str, depth: int) -> Optional[CrawledPage]:
+        if self._robots is not None and not self._robots.can_fetch(self.headers.get("User-Agent", "*"), url):
+            self.stats.robots_blocked += 1
+            return None
+
+        cached = self.cache.get(url)
+        headers: Dict[str, str] = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        try:
+            response, body = await self._get(client, url, headers)
+        except _PageTooLarge:
+            logger.info(f"Skipping {url}: larger than {self.budget.max_page_bytes} bytes")
+            return None
+
+        if response.status_code == 304 and cached is not None:
+            self.stats.not_modified += 1
+            return CrawledPage(url=url, content=cached.content, depth=depth, links=cached.links, not_modified=True)
+
+        if response.status_code != 200:
+            return None
+        content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+        if content_type and content_type not in HTML_CONTENT_TYPES:
+            return None
+
+        final_url = urldefrag(str(response.url))[0]
+        if final_url != url and not self.in_scope(final_url):
+            return None
+
+        html = body.decode(response.encoding or "utf-8", errors="ignore")
+        links = self._extract_links(final_url, html)
+        content = self.extract(html)
+
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if etag or last_modified:
+            self.cache.put(url, _CachedPage(etag=etag, last_modified=last_modified, content=content, links=links))
+
+        return CrawledPage(url=final_url, content=content, depth=depth, links=links)
+
+    @staticmethod
+    def _extract_links(base_url: str, html: str) -> List[str]:
+        soup = BeautifulSoup(html, "lxml")
+        links: List[str] = []
+        for anchor in soup.find_all("a", href=True):
+            href = anchor["href"].strip()
+            if not href or href.startswith(("mailto:", "tel:", "javascript:")):
+                continue
+            links.append(urldefrag(urljoin(base_url, href))[0])
+        return list(dict.fromkeys(links))
+
+    async def _load_robots(self, client: httpx.AsyncClient) -> Optional[RobotFileParser]:
+        scheme, host = self._scheme_host
+        robots_url = f"{scheme}://{host}/robots.txt"
+        try:
+            response, body = await self._get(client, robots_url)
+        except Exception as e:
+            logger.debug(f"robots.txt unavailable for {host}: {e}")
+            return None
+        if response.status_code != 200:
+            return None
+        parser = RobotFileParser(robots_url)
+        parser.parse(body.decode("utf-8", errors="ignore").splitlines())
+        return parser
+
+    async def _sitemap_urls(self, client: httpx.AsyncClient) -> List[str]:
+        scheme, host = self._scheme_host
+        pending = list((self._robots.site_maps() if self._robots is not None else None) or [f"{scheme}://{host}/sitemap.xml"])
+        urls: List[str] = []
+        fetched = 0
+        while pending and fetched < MAX_SITEMAPS and len(urls) < self._frontier_cap:
+            sitemap_url = pending.pop(0)
+            fetched += 1
+            try:
+                response, body = await self._get(client, sitemap_url)
+            except Exception as e:
+                logger.debug(f"Sitemap {sitemap_url} unavailable: {e}")
+                continue
+            if response.status_code != 200:
+                continue
+            text = body.decode("utf-8", errors="ignore")
+            locations = SITEMAP_LOC_PATTERN.findall(text)
+            if "<sitemapindex" in text:
+                pending.extend(locations)
+            else:
+                urls.extend(urldefrag(loc)[0] for loc in locations)
+        return urls
@@ -110,12 +110,6 @@ class UrlFilter:
         '/sitemap.xml', '/robots.txt'
     }
 
-    DEFAULT_EXCLUDE_DIRS = [
-        'css', 'js', 'static', 'assets', 'media', 'images', 'img',
-        'fonts', 'api', 'wp-json', 'wp-content', 'wp-includes',
-        'admin', 'wp-admin', 'feed', 'rss'
-    ]
-
     @classmethod
     def should_exclude_url(cls, url: str) -> bool:
         url_lower = url.lower()
@@ -125,17 +119,12 @@ class UrlFilter:
             return True
         return any(pattern in url_lower for pattern in cls.EXCLUDED_PATH_PATTERNS)
 
-    @classmethod
-    def build_exclude_dirs(cls, source) -> list[str]:
-        exclude_dirs = cls.DEFAULT_EXCLUDE_DIRS.copy()
-        if source.exclude_path_patterns:
-            custom_patterns = [
-                pattern.strip()
-                for pattern in source.exclude_path_patterns.split(',')
-                if pattern.strip()
-            ]
-            exclude_dirs.extend(custom_patterns)
-        return exclude_dirs
+    @staticmethod
+    def custom_exclude_patterns(source) -> list[str]:
+        """Return the source's own comma-separated path exclusions; the defaults above apply to every crawl."""
+        if not source.exclude_path_patterns:
+            return []
+        return [pattern.strip() for pattern in source.exclude_path_patterns.split(',') if pattern.strip()]
 
 
 class JavaScriptDetector:
@@ -1,10 +1,10 @@
 import logging
 from typing import List
 
-from langchain_community.document_loaders import RecursiveUrlLoader
 from langchain_core.documents import Document
 
 from app.core.config import config
+from app.knowledge.crawler.async_crawler import AsyncCrawler, CrawlBudget
 from app.knowledge.crawler.content_utils import UrlFilter
 
 from .base_loader import BaseLoader
@@ -16,36 +16,31 @@ class RecursiveLoader(BaseLoader):
 
     async def load_documents(self) -> List[Document]:
         try:
-            exclude_dirs = UrlFilter.build_exclude_dirs(self.source)
-
-            max_depth = self.kwargs.get('max_depth', self.source.recursion_depth)
-
-            loader = RecursiveUrlLoader(
-                url=self.source.url,
-                max_depth=max_depth,
-                prevent_outside=True,
-                timeout=config.CRAWL_TIMEOUT,
-                exclude_dirs=exclude_dirs,
-                extractor=self.clean_content,
-                check_response_status=False,
-                continue_on_failure=True,
-                headers=self.get_headers(),
-                ssl=False
+            budget = CrawlBudget.from_config(
+                max_pages=self.kwargs.get('max_pages', self.source.total_max_pages),
+                max_depth=self.kwargs.get('max_depth', self.source.recursion_depth),
             )
 
-            raw_documents = loader.load()
-
-            max_pages = self.kwargs.get('max_pages', self.source.total_max_pages)
-            if max_pages and len(raw_documents) > max_pages:
-                raw_documents = raw_documents[:max_pages]
+            crawler = AsyncCrawler(
+                self.source.url,
+                budget,
+                extract=self.clean_content,
+                headers=self.get_headers(),
+                request_timeout=config.CRAWL_TIMEOUT or 10,
+                concurrency=config.CRAWL_CONCURRENCY,
+                per_host_concurrency=config.CRAWL_PER_HOST_CONCURRENCY,
+                respect_robots=config.CRAWL_RESPECT_ROBOTS,
+                exclude_patterns=UrlFilter.custom_exclude_patterns(self.source),
+            )
+            pages = await crawler.crawl()
 
             return [
                 self.create_document(
-                    content=doc.page_content,
-                    url=doc.metadata.get("source", self.source.url),
+                    content=page.content,
+                    url=page.url,
                     loader_name="recursive"
                 )
-                for doc in raw_documents
+                for page in pages
             ]
         except Exception as e:
             logger.error(f"Recursive load error for {self.source.url}: {e}")
@@ -4,13 +4,13 @@ import time
 from datetime import datetime, timezone
 from typing import List
 
-from langchain_aws import BedrockEmbeddings
 from langchain_core.documents import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from app.core.config import config
 from app.knowledge.models import Source
 from app.knowledge.utils import get_subcategory_for_s3_key, get_subcategory_for_url
+from app.services.embeddings import get_embedding_service
 
 logger = logging.getLogger(__name__)
 
@@ -24,10 +24,7 @@ class DocumentService:
             add_start_index=True
         )
 
-        self.embeddings = BedrockEmbeddings(
-            model_id=config.BEDROCK_EMBED_MODEL_ID,
-            region_name=config.AWS_REGION
-        )
+        self.embeddings = get_embedding_service()
 
     def split_documents(self, documents: List[Document], source: Source, content_source: str = "external") -> List[Document]:
         """Split documents into chunks with source metadata."""
@@ -65,9 +62,10 @@ class DocumentService:
                     doc.metadata["subcategory"] = subcategory
                     logger.info(f"Assigned subcategory '{subcategory}' to internal document: {s3_key or section_url}")
 
+            parent_id = self.parent_document_id(source.id, doc)
             chunks = self.text_splitter.split_documents([doc])
             for i, chunk in enumerate(chunks):
-                chunk.metadata["content"] = doc.page_content
+                chunk.metadata["parent_id"] = parent_id
                 chunk.metadata["content_hash"] = hashlib.sha256(chunk.page_content.encode()).hexdigest()
                 chunk.metadata["chunk_index"] = i
                 chunk.metadata["last_sync"] = sync_timestamp
@@ -77,6 +75,37 @@ class DocumentService:
 
         return all_chunks
 
+    @staticmethod
+    def parent_document_id(source_id: str, doc: Document) -> str:
+        """Stable id of the page a chunk came from; chunks reference it instead of carrying the page."""
+        page = doc.metadata.get("page_number")
+        key = f"{source_id}:{doc.metadata.get('section_url', '')}"
+        if page is not None:
+            key = f"{key}#{page}"
+        return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+    @staticmethod
+    def assemble_parent_text(chunks: List[dict]) -> str:
+        """Rebuild a parent page from its stored chunks (``content`` + ``start_index``), dropping overlaps."""
+        ordered = sorted(chunks, key=lambda c: c.get("start_index") if c.get("start_index") is not None else float("inf"))
+        text = ""
+        end = 0
+        for chunk in ordered:
+            content = chunk.get("content") or ""
+            start = chunk.get("start_index")
+            if start is None:
+                text = f"{text}\n\n{content}" if text else content
+                continue
+            start = int(start)
+            if not text:
+                text = content
+            elif start <= end:
+                text += content[end - start:]
+            else:
+                text += "\n" + content
+            end = max(end, start + len(content))
+        return text
+
     def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for a list of texts."""
         start_time = time.time()
@@ -8,7 +8,9 @@ import boto3
 from langchain_core.documents import Document
 
 from app.core.config import config
+from app.knowledge.chunk_sync import ChunkSyncPlan, embed_planned_chunks, plan_source_chunks, write_planned_chunks
 from app.knowledge.models import Source
+from app.knowledge.sync_pipeline import SyncPipeline
 from app.knowledge.vector_store.service import S3VectorStoreService
 
 logger = logging.getLogger(__name__)
@@ -108,6 +110,8 @@ class S3SyncService:
 
                 for obj in page['Contents']:
                     s3_key = obj['Key']
+                    if self._is_manifest_key(s3_key):
+                        continue
                     size = obj['Size']
                     files.append({
                         "s3_key": s3_key,
@@ -234,18 +238,20 @@ class S3SyncService:
             logger.error(f"Unexpected error checking S3 file {s3_key}: {e}")
             raise
 
-    async def sync_file(self, s3_key: str) -> Dict[str, Any]:
+    async def sync_file(self, s3_key: str, pipeline: SyncPipeline | None = None) -> Dict[str, Any]:
         """Sync a single S3 file to the vector store.
 
         Args:
             s3_key: S3 key of file to sync
+            pipeline: Stage limits shared with other files being synced
 
         Returns:
             Dict with success status, s3_key, source_id, chunk_count, file_type
 
         """
+        pipeline = pipeline or SyncPipeline()
         try:
-            content = self._read_file(s3_key)
+            content = await pipeline.run_blocking("fetch", self._read_file, s3_key)
 
             if not content or not content.strip():
                 raise ValueError(f"File {s3_key} is empty")
@@ -275,24 +281,24 @@ class S3SyncService:
                 }
             )
 
-            chunks = self.document_service.split_documents([document], temp_source, content_source="internal")
+            chunks = await pipeline.run_blocking(
+                "split", self.document_service.split_documents, [document], temp_source, content_source="internal"
+            )
             logger.info(f"Split {s3_key} into {len(chunks)} chunks")
 
-            logger.info(f"Deleting old vectors for source_id {source_id}")
-            self.vector_service.delete_documents_by_source_id(source_id)
-
-            chunk_texts = [chunk.page_content for chunk in chunks]
-            embeddings = self.document_service.generate_embeddings(chunk_texts)
-            logger.info(f"Generated embeddings for {len(chunks)} chunks")
-
-            self.vector_service.add_documents(chunks, embeddings)
-            logger.info(f"Successfully synced {s3_key} to vector store")
+            plan = await pipeline.run_blocking("embed", self._plan_and_embed, source_id, chunks)
+            sync_result = await pipeline.run_blocking("write", write_planned_chunks, plan, vector_store=self.vector_service)
+            logger.info(f"Successfully synced {s3_key} to vector store (embedded {sync_result.chunks_embedded} chunks)")
 
             return {
                 "success": True,
                 "s3_key": s3_key,
                 "source_id": source_id,
                 "chunk_count": len(chunks),
+                "chunks_added": sync_result.chunks_added,
+                "chunks_deleted": sync_result.chunks_deleted,
+                "chunks_embedded": sync_result.chunks_embedded,
+                "embedding_calls": sync_result.embedding_calls,
                 "file_type": file_type,
                 "filename": filename
             }
@@ -312,16 +318,25 @@ class S3SyncService:
                 "s3_key": s3_key
             }
 
-    async def sync_all(self, prefix: str = "") -> Dict[str, Any]:
+    def _plan_and_embed(self, source_id: str, chunks: List[Document]) -> ChunkSyncPlan:
+        plan = plan_source_chunks(source_id, chunks, vector_store=self.vector_service)
+        return embed_planned_chunks(plan, vector_store=self.vector_service, document_service=self.document_service)
+
+    async def sync_all(self, prefix: str = "", pipeline: SyncPipeline | None = None) -> Dict[str, Any]:
         """Sync all files in S3 bucket to vector store.
 
+        Files are synced concurrently within the pipeline's stage limits.
+
         Args:
             prefix: Optional prefix to filter files
+            pipeline: Stage limits to share; a run-local pipeline from config by default
 
         Returns:
             Dict with total, succeeded, failed counts and details list
 
         """
+        owns_pipeline = pipeline is None
+        pipeline = pipeline or SyncPipeline.from_config()
         try:
             files = self.list_files(prefix)
 
@@ -339,9 +354,11 @@ class S3SyncService:
             failed = 0
             details = []
 
-            for file_info in files:
-                s3_key = file_info["s3_key"]
-                result = await self.sync_file(s3_key)
+            outcomes = await pipeline.map(files, lambda file_info: self.sync_file(file_info["s3_key"], pipeline=pipeline))
+
+            for file_info, result in zip(files, outcomes, strict=True):
+                if isinstance(result, Exception):
+                    result = {"success": False, "error": str(result), "s3_key": file_info["s3_key"]}
 
                 if result["success"]:
                     succeeded += 1
@@ -352,13 +369,17 @@ class S3SyncService:
 
             logger.info(f"Sync complete: {succeeded} succeeded, {failed} failed out of {len(files)} total")
 
-            return {
+            result = {
                 "success": True,
                 "total": len(files),
                 "succeeded": succeeded,
                 "failed": failed,
                 "details": details
             }
+            if owns_pipeline:
+                result["pipeline"] = pipeline.report()
+                pipeline.log_report("S3 sync")
+            return result
 
         except Exception as e:
             logger.error(f"Error during bulk sync: {str(e)}")
@@ -388,6 +409,10 @@ class S3SyncService:
         content = response['Body'].read().decode('utf-8')
         return content
 
+    def _is_manifest_key(self, s3_key: str) -> bool:
+        """Vector manifests may share this bucket; they are not knowledge files."""
+        return bool(config.KB_MANIFEST_BUCKET) and self.bucket_name == config.KB_MANIFEST_BUCKET and s3_key.startswith(config.KB_MANIFEST_PREFIX)
+
     @staticmethod
     def _generate_source_id(s3_key: str) -> str:
         """Generate deterministic 16-character source ID from S3 key.
@@ -1,16 +1,32 @@
+import asyncio
 import logging
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
+from langchain_core.documents import Document
+
+from app.core.config import config
 from app.knowledge.models import Source
-from app.knowledge.vector_store.service import S3VectorStoreService
+from app.knowledge.vector_store.service import S3VectorStoreService, bump_index_generation, index_generation
 
+from .chunk_sync import ChunkSyncPlan, embed_planned_chunks, plan_source_chunks, write_planned_chunks
 from .crawler.service import CrawlerService
 from .document_service import DocumentService
+from .sync_pipeline import SyncPipeline
 
 logger = logging.getLogger(__name__)
 
 
+SearchCacheKey = Tuple[str, Tuple[Tuple[str, str], ...], bool]
+
+
+def _normalize_query(query: str) -> str:
+    return " ".join(query.split()).casefold()
+
+
 class KnowledgeService:
 
     TOP_K_SEARCH = 10
@@ -19,10 +35,29 @@ class KnowledgeService:
         self.vector_store_service = S3VectorStoreService()
         self.document_service = DocumentService()
         self.crawler_service = CrawlerService()
+        # parent_id -> (fetched_at, index generation, page text) for pages rebuilt from all their
+        # chunks; (parent_id, normalized query) for pages limited to the chunks nearest a query.
+        # Pages are hydrated only for returned search results.
+        self._parent_cache: OrderedDict[str | tuple[str, str], tuple[float, int, str]] = OrderedDict()
+        # normalized query -> embedding; embeddings only change with the model, so no TTL
+        self._query_embedding_cache: OrderedDict[str, List[float]] = OrderedDict()
+        # (normalized query, filter, hydrate_parents) -> (fetched_at, index generation, results);
+        # every vector store write or delete in this process moves the generation on
+        self._search_cache: OrderedDict[SearchCacheKey, tuple[float, int, List[Dict[str, Any]]]] = OrderedDict()
+        # Searches run in worker threads; the caches are shared between them.
+        self._cache_lock = threading.Lock()
+
+    def invalidate_search_caches(self) -> None:
+        """Drop cached search results and parent pages after the index changed."""
+        bump_index_generation()
+        with self._cache_lock:
+            self._search_cache.clear()
+            self._parent_cache.clear()
 
     def delete_all_vectors(self) -> Dict[str, Any]:
         """Delete ALL vectors from the knowledge base."""
         deletion_result = self.vector_store_service.delete_all_vectors()
+        self.invalidate_search_caches()
 
         if deletion_result["success"]:
             logger.info("Successfully deleted all vectors from knowledge base")
@@ -43,6 +78,7 @@ class KnowledgeService:
     def delete_source_vectors_by_id(self, source_id: str) -> Dict[str, Any]:
         """Delete all vectors for a source by source_id."""
         deletion_result = self.vector_store_service.delete_documents_by_source_id(source_id)
+        self.invalidate_search_caches()
 
         if deletion_result["success"]:
             logger.info(f"Successfully deleted {deletion_result['vectors_deleted']} vectors for source {source_id}")
@@ -74,6 +110,7 @@ class KnowledgeService:
 
         source_id = source_data['source_id']
         deletion_result = self.vector_store_service.delete_documents_by_source_id(source_id)
+        self.invalidate_search_caches()
         if deletion_result["success"]:
             logger.info(f"Successfully deleted source {source_url}")
             return {"success": True}
@@ -85,11 +122,22 @@ class KnowledgeService:
             logger.error(f"Failed to delete vectors for source {source_id}: {deletion_result['message']}")
             return {"success": False, "error": error_info}
 
-    async def upsert_source(self, source: Source, content_source: str = "external") -> Dict[str, Any]:
-        import time
+    async def upsert_source(
+        self,
+        source: Source,
+        content_source: str = "external",
+        pipeline: SyncPipeline | None = None,
+    ) -> Dict[str, Any]:
+        """Crawl, split, embed and write one source.
+
+        Each step runs under ``pipeline``'s limit for its stage, so bulk syncs
+        can run many upserts concurrently; blocking steps run in worker threads.
+        """
         start_time = time.time()
+        pipeline = pipeline or SyncPipeline()
 
-        crawl_result = await self.crawler_service.crawl_source(source)
+        async with pipeline.stage("fetch"):
+            crawl_result = await self.crawler_service.crawl_source(source)
         documents = crawl_result.get("documents", [])
         crawl_error = crawl_result.get("error")
 
@@ -108,35 +156,9 @@ class KnowledgeService:
 
         logger.info(f"Processing {len(documents)} documents from {source.url}")
 
-        chunks = self.document_service.split_documents(documents, source, content_source)
+        chunks = await pipeline.run_blocking("split", self.document_service.split_documents, documents, source, content_source)
         logger.info(f"Split into {len(chunks)} chunks for {source.url}")
 
-        vector_sources = self.get_vector_sources()
-        existing_source_data = next(
-            (s for s in vector_sources['sources'] if s['source_id'] == source.id),
-            None
-        )
-        is_update = existing_source_data is not None
-
-        if is_update:
-            logger.info(f"Source exists with source_id={source.id}, url={source.url} - deleting all old documents for clean replacement")
-            delete_result = self.delete_source_vectors_by_id(source.id)
-            if not delete_result["success"]:
-                logger.error(f"Failed to delete existing source during replacement: {delete_result.get('error')}")
-                return {
-                    "source_url": source.url,
-                    "success": False,
-                    "message": f"Failed to delete existing documents: {delete_result.get('error', 'Unknown error')}",
-                    "is_new_source": False,
-                    "documents_added": 0,
-                    "documents_processed": len(documents)
-                }
-            logger.info(f"✅ Deleted {delete_result['vectors_deleted']} old chunks (found {delete_result['vectors_found']}) for source_id={source.id}, url={source.url}")
-
-        logger.info(f"Generating embeddings for {len(chunks)} chunks from {source.url}")
-        chunk_texts = [doc.page_content for doc in chunks]
-        chunk_embeddings = self.document_service.generate_embeddings(chunk_texts)
-
         section_urls = set()
         for chunk in chunks:
             section_url = chunk.metadata.get("section_url")
@@ -146,60 +168,210 @@ class KnowledgeService:
         source.section_urls = list(section_urls) if section_urls else []
         logger.info(f"Collected {len(source.section_urls)} unique section URLs for {source.url}")
 
-        self.vector_store_service.add_documents(chunks, chunk_embeddings)
+        try:
+            plan = await pipeline.run_blocking("embed", self._plan_and_embed, source.id, chunks)
+            sync_result = await pipeline.run_blocking("write", write_planned_chunks, plan, vector_store=self.vector_store_service)
+        except Exception as e:
+            logger.error(f"Failed to sync chunks for source_id={source.id}, url={source.url}: {e}")
+            return {
+                "source_url": source.url,
+                "success": False,
+                "message": f"Failed to sync chunks: {e}",
+                "is_new_source": False,
+                "documents_added": 0,
+                "documents_processed": len(documents)
+            }
 
-        source.total_chunks = len(chunks)
+        source.total_chunks = sync_result.chunks_added + sync_result.chunks_refreshed + sync_result.chunks_unchanged
+        if sync_result.changed:
+            self.invalidate_search_caches()
 
         end_time = time.time()
         processing_time = end_time - start_time
 
         result = {
             "success": True,
-            "documents_added": len(chunks),
+            **sync_result.as_dict(),
             "documents_processed": len(documents),
             "source_url": source.url,
-            "is_new_source": not is_update,
             "processing_time_seconds": round(processing_time, 2)
         }
 
-        logger.debug(f"Successfully upserted {source.url}: {len(chunks)} chunks in {processing_time:.2f}s")
+        logger.debug(
+            f"Successfully upserted {source.url}: +{sync_result.chunks_added} -{sync_result.chunks_deleted} "
+            f"={sync_result.chunks_unchanged} chunks in {processing_time:.2f}s"
+        )
 
         return result
 
-    async def search(self, query: str, filter: Dict[str, str] | None = None) -> List[Dict[str, Any]]:
-        """Search the knowledge base with optional metadata filtering."""
+    def _plan_and_embed(self, source_id: str, chunks: List[Document]) -> ChunkSyncPlan:
+        plan = plan_source_chunks(source_id, chunks, vector_store=self.vector_store_service)
+        return embed_planned_chunks(plan, vector_store=self.vector_store_service, document_service=self.document_service)
+
+    async def search(
+        self,
+        query: str,
+        filter: Dict[str, str] | None = None,
+        hydrate_parents: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Search the knowledge base with optional metadata filtering.
+
+        With ``hydrate_parents`` each result that references a parent page gets
+        its text as ``parent_content``; chunks never carry the page themselves.
+        The embedding and vector calls run in a worker thread so the event loop
+        stays free. Query embeddings are cached, and results are cached for
+        ``KB_SEARCH_CACHE_TTL_SECONDS`` per normalized query and filter until
+        the index changes.
+        """
         try:
-            query_embedding = self.document_service.generate_query_embedding(query)
-            results = self.vector_store_service.similarity_search(
-                query_embedding,
-                k=self.TOP_K_SEARCH,
-                metadata_filter=filter
-            )
-            out = []
-            for r in results:
-                meta = r.get('metadata', {})
-                result = {
-                    'content': r.get('content', ''),
-                    'section_url': meta.get('section_url', ''),
-                    'source_url': meta.get('source_url', ''),
-                    'source_id': meta.get('source_id', ''),
-                    'name': meta.get('name', ''),
-                    'type': meta.get('type', ''),
-                    'category': meta.get('category', ''),
-                    'description': meta.get('description', ''),
-                    'content_source': meta.get('content_source', ''),
-                    'score': r.get('score', 0.0),
-                }
-
-                if 'subcategory' in meta:
-                    result['subcategory'] = meta['subcategory']
-
-                out.append(result)
-            return out
+            key = self._search_cache_key(query, filter, hydrate_parents)
+            cached = self._get_cached_search(key)
+            if cached is not None:
+                return cached
+
+            generation = index_generation()
+            out = await asyncio.to_thread(self._search_blocking, query, filter, hydrate_parents)
+            self._store_cached_search(key, generation, out)
+            return [dict(result) for result in out]
         except Exception as e:
             logger.error(f"Search failed: {str(e)}", exc_info=True)
             return []
 
+    def _search_blocking(
+        self,
+        query: str,
+        filter: Dict[str, str] | None,
+        hydrate_parents: bool,
+    ) -> List[Dict[str, Any]]:
+        query_embedding = self._get_query_embedding(query)
+        results = self.vector_store_service.similarity_search(
+            query_embedding,
+            k=self.TOP_K_SEARCH,
+            metadata_filter=filter
+        )
+        out = []
+        for r in results:
+            meta = r.get('metadata', {})
+            result = {
+                'content': r.get('content', ''),
+                'section_url': meta.get('section_url', ''),
+                'source_url': meta.get('source_url', ''),
+                'source_id': meta.get('source_id', ''),
+                'name': meta.get('name', ''),
+                'type': meta.get('type', ''),
+                'category': meta.get('category', ''),
+                'description': meta.get('description', ''),
+                'content_source': meta.get('content_source', ''),
+                'score': r.get('score', 0.0),
+            }
+
+            if 'subcategory' in meta:
+                result['subcategory'] = meta['subcategory']
+
+            if meta.get('parent_id'):
+                result['parent_id'] = meta['parent_id']
+                result['start_index'] = meta.get('start_index')
+
+            out.append(result)
+
+        if hydrate_parents:
+            for result in out:
+                parent_id = result.get('parent_id')
+                if not parent_id:
+                    continue
+                try:
+                    result['parent_content'] = self._get_parent_content(
+                        parent_id, result.get('source_id', ''), query, query_embedding
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to hydrate parent {parent_id}: {e}")
+        return out
+
+    @staticmethod
+    def _search_cache_key(query: str, filter: Dict[str, str] | None, hydrate_parents: bool) -> SearchCacheKey:
+        filter_key = tuple(sorted((str(k), str(v)) for k, v in (filter or {}).items()))
+        return (_normalize_query(query), filter_key, hydrate_parents)
+
+    def _get_cached_search(self, key: SearchCacheKey) -> List[Dict[str, Any]] | None:
+        if config.KB_SEARCH_CACHE_TTL_SECONDS <= 0:
+            return None
+        with self._cache_lock:
+            cached = self._search_cache.get(key)
+            if cached is None:
+                return None
+            fetched_at, generation, results = cached
+            if (
+                generation != index_generation()
+                or time.monotonic() - fetched_at >= config.KB_SEARCH_CACHE_TTL_SECONDS
+            ):
+                del self._search_cache[key]
+                return None
+            self._search_cache.move_to_end(key)
+            return [dict(result) for result in results]
+
+    def _store_cached_search(self, key: SearchCacheKey, generation: int, results: List[Dict[str, Any]]) -> None:
+        # A sync that finished while this search ran may have changed the index under it.
+        if config.KB_SEARCH_CACHE_TTL_SECONDS <= 0 or generation != index_generation():
+            return
+        with self._cache_lock:
+            self._search_cache[key] = (time.monotonic(), generation, [dict(result) for result in results])
+            self._search_cache.move_to_end(key)
+            while len(self._search_cache) > config.KB_SEARCH_CACHE_MAX_ENTRIES:
+                self._search_cache.popitem(last=False)
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        """Embedding of the normalized query, cached with an LRU bound.
+
+        The normalized text is what gets embedded, so every spelling that shares
+        a cache entry also shares the exact vector.
+        """
+        key = _normalize_query(query)
+        with self._cache_lock:
+            embedding = self._query_embedding_cache.get(key)
+            if embedding is not None:
+                self._query_embedding_cache.move_to_end(key)
+                return embedding
+
+        embedding = self.document_service.generate_query_embedding(key)
+        with self._cache_lock:
+            self._query_embedding_cache[key] = embedding
+            self._query_embedding_cache.move_to_end(key)
+            while len(self._query_embedding_cache) > config.KB_QUERY_EMBEDDING_CACHE_MAX_ENTRIES:
+                self._query_embedding_cache.popitem(last=False)
+        return embedding
+
+    def _get_parent_content(self, parent_id: str, source_id: str, query: str, query_embedding: List[float]) -> str:
+        """Parent page text rebuilt from its chunks, cached with a TTL and LRU bound.
+
+        The whole page comes from the source's manifest. Without one, only the
+        ``KB_PARENT_MAX_CHUNKS`` chunks nearest the query are available, so that
+        partial page is cached for this query alone.
+        """
+        now = time.monotonic()
+        generation = index_generation()
+        query_key = (parent_id, _normalize_query(query))
+        with self._cache_lock:
+            for cache_key in (parent_id, query_key):
+                cached = self._parent_cache.get(cache_key)
+                if cached is not None and now - cached[0] < config.KB_PARENT_CACHE_TTL_SECONDS and cached[1] == generation:
+                    self._parent_cache.move_to_end(cache_key)
+                    return cached[2]
+
+        cache_key: str | tuple[str, str] = parent_id
+        chunks = self.vector_store_service.get_parent_chunks(parent_id, source_id)
+        if chunks is None:
+            cache_key = query_key
+            chunks = self.vector_store_service.query_parent_chunks(parent_id, query_embedding, config.KB_PARENT_MAX_CHUNKS)
+        content = self.document_service.assemble_parent_text(chunks)
+        if generation != index_generation():
+            return content
+        with self._cache_lock:
+            self._parent_cache[cache_key] = (now, generation, content)
+            self._parent_cache.move_to_end(cache_key)
+            while len(self._parent_cache) > config.KB_PARENT_CACHE_MAX_ENTRIES:
+                self._parent_cache.popitem(last=False)
+        return content
+
     def get_sources(self) -> List[Source]:
         """Get all knowledge base sources from vector store."""
         vector_sources_data = self.get_vector_sources()
@@ -240,11 +412,13 @@ class KnowledgeService:
             source_id: The source ID to get details for
 
         """
-        vector_sources = self.get_vector_sources()
-        source_data = next(
-            (s for s in vector_sources['sources'] if s['source_id'] == source_id),
-            None
-        )
+        source_data = self.vector_store_service.get_source_summary(source_id)
+        if source_data is None and not self.vector_store_service.manifest_covers_index():
+            vector_sources = self.get_vector_sources()
+            source_data = next(
+                (s for s in vector_sources['sources'] if s['source_id'] == source_id),
+                None
+            )
         if not source_data:
             return {"error": f"Source with id {source_id} not found"}
 
@@ -299,8 +473,17 @@ class KnowledgeService:
         return result
 
     def get_vector_sources(self) -> dict[str, Any]:
-        """Get all unique sources from the vector store."""
+        """Get all unique sources, from the per-source manifests when enabled."""
         try:
+            manifests = self.vector_store_service.list_source_manifests()
+            if manifests is not None:
+                sources = [summary for summary in (m.summary() for m in manifests) if summary]
+                sources.sort(key=lambda x: x.get('total_chunks', 0), reverse=True)
+                logger.info(f"Loaded {len(sources)} sources from manifests")
+                return {
+                    'sources': sources,
+                    'total_sources': len(sources)
+                }
 
             vectors_metadata = self.vector_store_service.get_all_vectors_metadata()
 
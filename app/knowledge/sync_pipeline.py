@@ -0,0 +1,134 @@
+"""Bounded, staged execution of knowledge base syncs.
+
+A sync of one source runs through four stages: fetch (crawl or read the
+file), split, embed and write. Many sources are synced concurrently, but every
+stage has its own concurrency limit, so crawls overlap with embedding and
+writes without letting any one backend (the crawled sites, Bedrock, S3
+Vectors) see more than its share. Admission is bounded too: a source is only
+started while fewer than ``max_in_flight`` are between stages, which caps the
+crawled documents held in memory. A failing source is reported on its own and
+never stops the others.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar
+
+from app.core.config import config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+STAGES = ("fetch", "split", "embed", "write")
+
+
+@dataclass
+class StageStats:
+    concurrency: int
+    calls: int = 0
+    failures: int = 0
+    busy_seconds: float = 0.0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "calls": self.calls,
+            "failures": self.failures,
+            "busy_seconds": round(self.busy_seconds, 2),
+            "avg_seconds": round(self.busy_seconds / self.calls, 3) if self.calls else 0.0,
+            "peak_in_flight": self.peak_in_flight,
+        }
+
+
+class SyncPipeline:
+    """Per-stage concurrency limits and throughput accounting for a sync run."""
+
+    def __init__(self, concurrency: Optional[Dict[str, int]] = None, max_in_flight: Optional[int] = None):
+        concurrency = concurrency or {}
+        self._stats = {name: StageStats(concurrency=max(1, concurrency.get(name, 1))) for name in STAGES}
+        self._limits = {name: asyncio.Semaphore(stats.concurrency) for name, stats in self._stats.items()}
+        self.max_in_flight = max(1, max_in_flight or sum(s.concurrency for s in self._stats.values()))
+        self._admission = asyncio.Semaphore(self.max_in_flight)
+        self._started = time.monotonic()
+        self.items = 0
+        self.items_failed = 0
+
+    @classmethod
+    def from_config(cls) -> "SyncPipeline":
+        return cls(
+            concurrency={
+                "fetch": config.KB_SYNC_FETCH_CONCURRENCY,
+                "split": config.KB_SYNC_SPLIT_CONCURRENCY,
+                "embed": config.KB_SYNC_EMBED_CONCURRENCY,
+                "write": config.KB_SYNC_WRITE_CONCURRENCY,
+            },
+            max_in_flight=config.KB_SYNC_MAX_IN_FLIGHT,
+        )
+
+    @asynccontextmanager
+    async def stage(self, name: str):
+        stats = self._stats[name]
+        async with self._limits[name]:
+            stats.in_flight += 1
+            stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+            started = time.monotonic()
+            try:
+                yield
+            except BaseException:
+                stats.failures += 1
+                raise
+            finally:
+                stats.in_flight -= 1
+                stats.calls += 1
+                stats.busy_seconds += time.monotonic() - started
+
+    async def run_blocking(self, name: str, fn: Callable[..., R], *args, **kwargs) -> R:
+        """Run a blocking stage step in a worker thread under the stage's limit."""
+        async with self.stage(name):
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
+    async def map(self, items: Sequence[T], handler: Callable[[T], Awaitable[R]]) -> List[Any]:
+        """Run ``handler`` over ``items`` with bounded admission.
+
+        Results come back in input order; a failed item yields its exception
+        instead of a result.
+        """
+        async def admit(item: T) -> Any:
+            async with self._admission:
+                self.items += 1
+                try:
+                    return await handler(item)
+                except Exception as e:
+                    self.items_failed += 1
+                    return e
+
+        return await asyncio.gather(*(admit(item) for item in items))
+
+    def report(self) -> Dict[str, Any]:
+        wall_seconds = time.monotonic() - self._started
+        return {
+            "items": self.items,
+            "items_failed": self.items_failed,
+            "wall_seconds": round(wall_seconds, 2),
+            "items_per_second": round(self.items / wall_seconds, 3) if wall_seconds > 0 else 0.0,
+            "max_in_flight": self.max_in_flight,
+            "stages": {name: stats.as_dict() for name, stats in self._stats.items()},
+        }
+
+    def log_report(self, label: str) -> None:
+        report = self.report()
+        stages = ", ".join(
+            f"{name} {s['calls']}x avg {s['avg_seconds']}s (peak {s['peak_in_flight']}/{s['concurrency']})"
+            for name, s in report["stages"].items()
+        )
+        logger.info(
+            f"{label} pipeline: {report['items']} items ({report['items_failed']} failed) in "
+            f"{report['wall_seconds']}s, {report['items_per_second']} items/s - {stages}"
+        )
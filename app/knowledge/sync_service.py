@@ -8,6 +8,7 @@ from app.services.external_context.sources.repository import ExternalSourcesRepo
 
 from .crawl_logger import CrawlLogger
 from .service import KnowledgeService
+from .sync_pipeline import SyncPipeline
 
 logger = logging.getLogger(__name__)
 
@@ -20,8 +21,11 @@ class KnowledgeBaseSyncService:
         self.default_max_pages = 20
         self.default_recursion_depth = 2
 
-    async def sync_all(self, limit: int = None) -> Dict[str, Any]:
+    async def sync_all(self, limit: int = None, pipeline: SyncPipeline | None = None) -> Dict[str, Any]:
+        """Sync every enabled external source, concurrently within ``pipeline``'s stage limits."""
         start_time = time.time()
+        owns_pipeline = pipeline is None
+        pipeline = pipeline or SyncPipeline.from_config()
 
         external_sources_available = True
         try:
@@ -43,6 +47,8 @@ class KnowledgeBaseSyncService:
         sources_errors = 0
         sync_failures = []
         total_chunks_created = 0
+        total_chunks_embedded = 0
+        embedding_calls = 0
 
         enabled_sources = [s for s in external_sources if s.enabled]
 
@@ -60,29 +66,13 @@ class KnowledgeBaseSyncService:
             logger.info(f"Processing {len(enabled_sources)} source{'s' if len(enabled_sources) != 1 else ''}")
             self.crawl_logger.log_sync_start(len(external_sources), len(enabled_sources))
 
-        for external_source in enabled_sources:
-            logger.info(f"Processing: {external_source.url}")
+        outcomes = await pipeline.map(enabled_sources, lambda source: self._upsert_external_source(source, pipeline))
 
+        for external_source, outcome in zip(enabled_sources, outcomes, strict=True):
             try:
-                source_id = hashlib.sha256(external_source.url.encode()).hexdigest()[:16]
-
-                max_pages = external_source.total_max_pages or self.default_max_pages
-                max_depth = external_source.recursion_depth or self.default_recursion_depth
-
-                internal_source = Source(
-                    id=source_id,
-                    name=external_source.name,
-                    url=external_source.url,
-                    type=external_source.type,
-                    category=external_source.category,
-                    description=external_source.description,
-                    include_path_patterns=external_source.include_path_patterns,
-                    exclude_path_patterns=external_source.exclude_path_patterns,
-                    total_max_pages=max_pages,
-                    recursion_depth=max_depth
-                )
-
-                result = await self.kb_service.upsert_source(internal_source)
+                if isinstance(outcome, Exception):
+                    raise outcome
+                result = outcome
 
                 if not result["success"]:
                     sources_errors += 1
@@ -95,7 +85,10 @@ class KnowledgeBaseSyncService:
                     continue
 
                 chunks_added = result.get("documents_added", 0)
+                chunks_deleted = result.get("documents_deleted", 0)
                 documents_processed = result.get("documents_processed", 0)
+                total_chunks_embedded += result.get("chunks_embedded", 0)
+                embedding_calls += result.get("embedding_calls", 0)
                 result_message = result.get("message", "")
                 crawl_error = result.get("crawl_error")
 
@@ -104,10 +97,10 @@ class KnowledgeBaseSyncService:
                     total_chunks_created += chunks_added
                     logger.info(f"Created: {external_source.url} (+{chunks_added} chunks)")
                     self.crawl_logger.log_success(external_source.url, documents_processed, chunks_added, True)
-                elif chunks_added > 0:
+                elif chunks_added > 0 or chunks_deleted > 0:
                     sources_updated += 1
                     total_chunks_created += chunks_added
-                    logger.info(f"Updated: {external_source.url} (+{chunks_added} chunks)")
+                    logger.info(f"Updated: {external_source.url} (+{chunks_added} -{chunks_deleted} chunks)")
                     self.crawl_logger.log_success(external_source.url, documents_processed, chunks_added, False)
                 elif crawl_error or "No documents found during crawl" in result_message:
                     # This is actually a crawling error, not "no changes"
@@ -186,12 +179,17 @@ class KnowledgeBaseSyncService:
             "sources_no_changes": sources_no_changes,
             "sources_errors": sources_errors,
             "total_chunks_created": total_chunks_created,
+            "total_chunks_embedded": total_chunks_embedded,
+            "embedding_calls": embedding_calls,
             "sync_failures": sync_failures,
             "total_sync_time_seconds": round(total_time, 2),
             "average_time_per_source": round(total_time / max(len(enabled_sources), 1), 2),
             "external_sources_available": external_sources_available,
             "deletions_skipped": not external_sources_available
         }
+        if owns_pipeline:
+            result["pipeline"] = pipeline.report()
+            pipeline.log_report("External sync")
 
         deletion_info = " (deletions skipped)" if not external_sources_available else ""
 
@@ -199,7 +197,8 @@ class KnowledgeBaseSyncService:
             f"Sync completed in {total_time:.2f}s: "
             f"Created {sources_created}, Updated {sources_updated}, "
             f"Unchanged {sources_no_changes}, Deleted {sources_deleted}, "
-            f"Errors {sources_errors}, Chunks {total_chunks_created}{deletion_info}"
+            f"Errors {sources_errors}, Chunks {total_chunks_created}, "
+            f"Embedded {total_chunks_embedded} in {embedding_calls} calls{deletion_info}"
         )
 
         # Log sync completion to crawl log
@@ -215,3 +214,25 @@ class KnowledgeBaseSyncService:
 
         return result
 
+    async def _upsert_external_source(self, external_source: Source, pipeline: SyncPipeline) -> Dict[str, Any]:
+        logger.info(f"Processing: {external_source.url}")
+
+        source_id = hashlib.sha256(external_source.url.encode()).hexdigest()[:16]
+
+        max_pages = external_source.total_max_pages or self.default_max_pages
+        max_depth = external_source.recursion_depth or self.default_recursion_depth
+
+        internal_source = Source(
+            id=source_id,
+            name=external_source.name,
+            url=external_source.url,
+            type=external_source.type,
+            category=external_source.category,
+            description=external_source.description,
+            include_path_patterns=external_source.include_path_patterns,
+            exclude_path_patterns=external_source.exclude_path_patterns,
+            total_max_pages=max_pages,
+            recursion_depth=max_depth
+        )
+
+        return await self.kb_service.upsert_source(internal_source, pipeline=pipeline)
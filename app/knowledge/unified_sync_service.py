@@ -1,5 +1,6 @@
 """Unified synchronization service for all knowledge base sources."""
 
+import asyncio
 import logging
 import time
 from typing import Any, Dict
@@ -15,6 +16,7 @@ from app.knowledge.constants import (
 from app.knowledge.models import Source
 from app.knowledge.s3_sync_service import S3SyncService
 from app.knowledge.service import KnowledgeService
+from app.knowledge.sync_pipeline import SyncPipeline
 from app.knowledge.sync_service import KnowledgeBaseSyncService
 from app.knowledge.utils import generate_source_id
 
@@ -30,34 +32,42 @@ class UnifiedSyncService:
         self.kb_service = KnowledgeService()
 
     async def sync_all_sources(self) -> Dict[str, Any]:
-        """Synchronize all knowledge base sources."""
+        """Synchronize all knowledge base sources.
+
+        The S3, guidance and external syncs run concurrently and share one
+        pipeline, so their stage limits apply to the run as a whole.
+        """
         start_time = time.time()
-        operations = []
+        pipeline = SyncPipeline.from_config()
 
         logger.info("Starting unified sync")
 
-        for sync_fn, op_type in [
-            (self._sync_s3, "s3"),
-            (self._sync_guidance, "guidance"),
-            (self._sync_external, "external")
-        ]:
+        async def run(sync_fn, op_type: str) -> Dict[str, Any]:
             try:
-                result = await sync_fn()
-                operations.append(result)
+                return await sync_fn(pipeline)
             except Exception as e:
                 logger.error(f"{op_type} sync failed: {e}", exc_info=True)
-                operations.append({
+                return {
                     "success": False,
                     "operation_type": op_type,
                     "error": str(e)
-                })
+                }
+
+        operations = list(await asyncio.gather(
+            run(self._sync_s3, "s3"),
+            run(self._sync_guidance, "guidance"),
+            run(self._sync_external, "external"),
+        ))
 
         summary = self._calculate_summary(operations)
+        summary["pipeline"] = pipeline.report()
+        pipeline.log_report("Unified sync")
         success = all(op.get("success", False) for op in operations)
 
         logger.info(
             f"Unified sync completed in {time.time() - start_time:.2f}s: "
-            f"{summary['sources_synced']} sources, {summary['chunks_created']} chunks"
+            f"{summary['sources_synced']} sources, {summary['chunks_created']} chunks, "
+            f"{summary['chunks_embedded']} embedded in {summary['embedding_calls']} calls"
         )
 
         return {
@@ -67,37 +77,38 @@ class UnifiedSyncService:
             "summary": summary
         }
 
-    async def _sync_external(self) -> Dict[str, Any]:
+    async def _sync_external(self, pipeline: SyncPipeline) -> Dict[str, Any]:
         """Sync external sources from FOS API."""
-        result = await self.external_sync.sync_all(limit=None)
+        result = await self.external_sync.sync_all(limit=None, pipeline=pipeline)
 
         return {
             "success": result.get("success", True),
             "operation_type": "external",
             "sources_synced": result.get("sources_created", 0) + result.get("sources_updated", 0),
             "chunks_created": result.get("total_chunks_created", 0),
+            "chunks_embedded": result.get("total_chunks_embedded", 0),
+            "embedding_calls": result.get("embedding_calls", 0),
             "errors": result.get("sources_errors", 0)
         }
 
-    async def _sync_s3(self) -> Dict[str, Any]:
+    async def _sync_s3(self, pipeline: SyncPipeline) -> Dict[str, Any]:
         """Sync S3 files to vector store."""
-        result = await self.s3_sync.sync_all(prefix="")
+        result = await self.s3_sync.sync_all(prefix="", pipeline=pipeline)
 
-        chunks = sum(
-            d.get("chunk_count", 0)
-            for d in result.get("details", [])
-            if d.get("success", False)
-        )
+        succeeded = [d for d in result.get("details", []) if d.get("success", False)]
+        chunks = sum(d.get("chunk_count", 0) for d in succeeded)
 
         return {
             "success": result.get("success", True),
             "operation_type": "s3",
             "sources_synced": result.get("succeeded", 0),
             "chunks_created": chunks,
+            "chunks_embedded": sum(d.get("chunks_embedded", 0) for d in succeeded),
+            "embedding_calls": sum(d.get("embedding_calls", 0) for d in succeeded),
             "errors": result.get("failed", 0)
         }
 
-    async def _sync_guidance(self) -> Dict[str, Any]:
+    async def _sync_guidance(self, pipeline: SyncPipeline) -> Dict[str, Any]:
         """Sync Vera guidance documentation."""
         if not config.VERA_GUIDANCE_URL:
             logger.warning("VERA_GUIDANCE_URL not configured")
@@ -120,13 +131,15 @@ class UnifiedSyncService:
             recursion_depth=config.VERA_GUIDANCE_RECURSION_DEPTH
         )
 
-        result = await self.kb_service.upsert_source(source, content_source=VERA_GUIDANCE_CONTENT_SOURCE)
+        result = await self.kb_service.upsert_source(source, content_source=VERA_GUIDANCE_CONTENT_SOURCE, pipeline=pipeline)
 
         return {
             "success": result.get("success", True),
             "operation_type": "guidance",
             "sources_synced": 1,
             "chunks_created": result.get("documents_added", 0),
+            "chunks_embedded": result.get("chunks_embedded", 0),
+            "embedding_calls": result.get("embedding_calls", 0),
             "errors": 0 if result.get("success") else 1
         }
 
@@ -135,5 +148,7 @@ class UnifiedSyncService:
         return {
             "sources_synced": sum(op.get("sources_synced", 0) for op in operations),
             "chunks_created": sum(op.get("chunks_created", 0) for op in operations),
+            "chunks_embedded": sum(op.get("chunks_embedded", 0) for op in operations),
+            "embedding_calls": sum(op.get("embedding_calls", 0) for op in operations),
             "errors": sum(op.get("errors", 0) for op in operations)
         }
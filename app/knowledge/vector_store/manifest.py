@@ -0,0 +1,329 @@
+"""Persisted source → vector key manifest for the knowledge base index.
+
+S3 Vectors can only be listed as a whole, so finding one source's vectors
+used to mean paging through the entire index. Each source now has a small
+JSON manifest in S3 holding its vector keys with their metadata (everything
+but the chunk text), kept in step with every write and delete. A marker
+object records whether the manifests cover the whole index; it is set after
+a full listing rebuilds them and cleared whenever a manifest write fails, so
+a lost update costs one rescan instead of a wrong answer.
+
+A rebuild can race writes from this or another replica, so every manifest
+change first stamps a fresh token in a last-write marker. A rebuild stops
+writing once the token moves past the one it saw before listing the index,
+never overwrites a manifest written after the listing started, and only
+marks the set complete while the token is unchanged.
+
+Writers update a source's manifest with conditional PUTs on its ETag, so two
+writers on one source cannot drop each other's keys. Before touching the
+index a writer also records itself as pending in the manifest and removes
+itself when it records its keys; a manifest with pending writers is not
+trusted, so a writer that dies between the two costs a rescan of that source
+instead of keys the manifest never learns about.
+"""
+
+import json
+import logging
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import boto3
+
+from app.core.config import config
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+COMPLETE_MARKER = "_complete.json"
+LAST_WRITE_MARKER = "_last_write.json"
+# Conditional writes that lose to another writer re-read and retry this many times.
+UPDATE_ATTEMPTS = 5
+# A pending write older than this is taken to have died; a rescan of the source clears it.
+PENDING_WRITE_TIMEOUT_SECONDS = 900
+
+
+@dataclass
+class SourceManifest:
+    source_id: str
+    # vector key -> stored metadata without the chunk text
+    vectors: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    updated_at: str = ""
+    # write id -> start time of writes that have not recorded their keys yet
+    pending: Dict[str, str] = field(default_factory=dict)
+    # ETag of the stored object this was read from; not persisted
+    etag: Optional[str] = field(default=None, compare=False)
+
+    @staticmethod
+    def _slim(metadata: Dict[str, Any]) -> Dict[str, Any]:
+        return {name: value for name, value in metadata.items() if name != "content"}
+
+    @classmethod
+    def from_vectors(cls, source_id: str, vectors: Iterable[Dict[str, Any]]) -> "SourceManifest":
+        manifest = cls(source_id=source_id)
+        for vector in vectors:
+            if vector.get("key"):
+                manifest.vectors[vector["key"]] = cls._slim(vector.get("metadata", {}))
+        return manifest
+
+    def apply(self, upserts: Dict[str, Dict[str, Any]] | None = None, deletes: Iterable[str] = ()) -> None:
+        for key in deletes:
+            self.vectors.pop(key, None)
+        for key, metadata in (upserts or {}).items():
+            self.vectors[key] = self._slim(metadata)
+
+    def live_pending(self, now: Optional[datetime] = None) -> Dict[str, str]:
+        """Pending writes young enough to still be running."""
+        now = now or datetime.now(timezone.utc)
+        return {
+            write_id: started_at
+            for write_id, started_at in self.pending.items()
+            if (now - datetime.fromisoformat(started_at)).total_seconds() < PENDING_WRITE_TIMEOUT_SECONDS
+        }
+
+    @property
+    def keys(self) -> List[str]:
+        return list(self.vectors)
+
+    def as_vectors(self) -> List[Dict[str, Any]]:
+        """Vectors in the shape ``list_vectors`` returns (key and metadata)."""
+        return [{"key": key, "metadata": dict(metadata)} for key, metadata in self.vectors.items()]
+
+    def summary(self) -> Optional[Dict[str, Any]]:
+        """Per-source aggregate used by the sources API; ``None`` when empty."""
+        if not self.vectors:
+            return None
+        first = next(iter(self.vectors.values()))
+        last_sync = max((m.get("last_sync") or "" for m in self.vectors.values()), default="") or None
+        return {
+            "source_id": self.source_id,
+            "name": first.get("name", ""),
+            "url": first.get("url", ""),
+            "type": first.get("type", ""),
+            "category": first.get("category", ""),
+            "description": first.get("description", ""),
+            "content_source": first.get("content_source", ""),
+            "last_sync": last_sync,
+            "total_chunks": len(self.vectors),
+            "section_urls": sorted({m["url"] for m in self.vectors.values() if m.get("url")}),
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": MANIFEST_VERSION,
+            "source_id": self.source_id,
+            "updated_at": self.updated_at,
+            "vectors": self.vectors,
+            "pending": self.pending,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], etag: Optional[str] = None) -> "SourceManifest":
+        return cls(
+            source_id=data["source_id"],
+            vectors=data.get("vectors", {}),
+            updated_at=data.get("updated_at", ""),
+            pending=data.get("pending", {}),
+            etag=etag,
+        )
+
+
+class VectorManifestStore:
+    """One JSON object per source under ``prefix`` in an S3 bucket."""
+
+    def __init__(self, bucket: str, prefix: str, client=None):
+        self.bucket = bucket
+        self.prefix = prefix if prefix.endswith("/") else f"{prefix}/"
+        self.client = client or boto3.client("s3", region_name=config.AWS_REGION)
+
+    @classmethod
+    def from_config(cls) -> Optional["VectorManifestStore"]:
+        if not config.KB_MANIFEST_ENABLED or not config.KB_MANIFEST_BUCKET:
+            return None
+        return cls(config.KB_MANIFEST_BUCKET, config.KB_MANIFEST_PREFIX)
+
+    def _key(self, source_id: str) -> str:
+        return f"{self.prefix}{source_id}.json"
+
+    @staticmethod
+    def _error_code(error: Exception) -> str:
+        return (getattr(error, "response", None) or {}).get("Error", {}).get("Code", "")
+
+    @classmethod
+    def _is_missing(cls, error: Exception) -> bool:
+        return cls._error_code(error) in {"NoSuchKey", "404", "NotFound"}
+
+    @classmethod
+    def is_conflict(cls, error: Exception) -> bool:
+        """Whether a conditional write lost to a concurrent change of the same object."""
+        return cls._error_code(error) in {"PreconditionFailed", "412", "ConditionalRequestConflict", "409"}
+
+    def _read_with_etag(self, key: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=key)
+        except Exception as e:
+            if self._is_missing(e):
+                return None, None
+            raise
+        return json.loads(response["Body"].read()), response.get("ETag")
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._read_with_etag(key)[0]
+
+    def _write(self, key: str, data: Dict[str, Any], **conditions: str) -> Optional[str]:
+        response = self.client.put_object(
+            Bucket=self.bucket,
+            Key=key,
+            Body=json.dumps(data, separators=(",", ":")).encode("utf-8"),
+            ContentType="application/json",
+            **conditions,
+        )
+        return (response or {}).get("ETag")
+
+    def get(self, source_id: str) -> Optional[SourceManifest]:
+        data, etag = self._read_with_etag(self._key(source_id))
+        return SourceManifest.from_dict(data, etag=etag) if data else None
+
+    def put(self, manifest: SourceManifest, conditional: bool = False) -> None:
+        """Store a manifest; with ``conditional`` only over the object it was read from.
+
+        A conditional put of a manifest with no ETag only succeeds if the source
+        has no manifest yet. A lost race raises the client error (see ``is_conflict``).
+        """
+        manifest.updated_at = datetime.now(timezone.utc).isoformat()
+        conditions = {}
+        if conditional:
+            conditions = {"IfMatch": manifest.etag} if manifest.etag else {"IfNoneMatch": "*"}
+        manifest.etag = self._write(self._key(manifest.source_id), manifest.to_dict(), **conditions)
+
+    def delete(self, source_id: str, etag: Optional[str] = None) -> None:
+        conditions = {"IfMatch": etag} if etag else {}
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(source_id), **conditions)
+
+    def update(
+        self,
+        source_id: str,
+        change: Callable[[SourceManifest], None],
+        create: bool = False,
+    ) -> Optional[SourceManifest]:
+        """Read-modify-write a source's manifest with conditional writes, retrying lost races.
+
+        ``change`` edits the manifest in place. A source without a manifest is
+        left alone unless ``create``, in which case ``change`` starts from an
+        empty one. A manifest left with neither vectors nor pending writes is deleted.
+        """
+        for attempt in range(UPDATE_ATTEMPTS):
+            current = self.get(source_id)
+            if current is None and not create:
+                return None
+            manifest = current or SourceManifest(source_id=source_id)
+            change(manifest)
+            try:
+                if manifest.vectors or manifest.pending:
+                    self.put(manifest, conditional=True)
+                elif current is not None:
+                    self.delete(source_id, etag=current.etag)
+                return manifest
+            except Exception as e:
+                if not self.is_conflict(e) or attempt == UPDATE_ATTEMPTS - 1:
+                    raise
+                logger.info(f"Manifest for source_id={source_id} changed underneath, retrying")
+        return None
+
+    def _manifest_keys(self) -> List[str]:
+        markers = {f"{self.prefix}{COMPLETE_MARKER}", f"{self.prefix}{LAST_WRITE_MARKER}"}
+        keys = []
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for obj in page.get("Contents", []):
+                if obj["Key"].endswith(".json") and obj["Key"] not in markers:
+                    keys.append(obj["Key"])
+        return keys
+
+    def _updated_since(self, key: str, since: datetime) -> bool:
+        data = self._read(key)
+        return bool(data and data.get("updated_at")) and datetime.fromisoformat(data["updated_at"]) >= since
+
+    def list_all(self) -> List[SourceManifest]:
+        manifests = []
+        for key in self._manifest_keys():
+            data = self._read(key)
+            if data:
+                manifests.append(SourceManifest.from_dict(data))
+        return manifests
+
+    def replace_all(
+        self,
+        manifests: Iterable[SourceManifest],
+        scan_started_at: datetime,
+        write_token: Optional[str],
+    ) -> bool:
+        """Rewrite every manifest from a full listing and mark the set complete.
+
+        ``scan_started_at`` and ``write_token`` (from ``last_write_token``) are
+        taken before the listing. Returns ``False`` without marking the set
+        complete when a manifest write raced the rebuild.
+        """
+        self.mark_complete(False)
+        seen = set()
+        last_put = None
+        for manifest in manifests:
+            key = self._key(manifest.source_id)
+            seen.add(key)
+            if self._updated_since(key, scan_started_at):
+                continue
+            if self.last_write_token() != write_token:
+                return self._abandon_rebuild(last_put)
+            self.put(manifest)
+            last_put = manifest
+        for key in self._manifest_keys():
+            if key in seen or self._updated_since(key, scan_started_at):
+                continue
+            if self.last_write_token() != write_token:
+                return self._abandon_rebuild(last_put)
+            self.client.delete_object(Bucket=self.bucket, Key=key)
+        if self.last_write_token() != write_token:
+            return self._abandon_rebuild(last_put)
+        self.mark_complete(True)
+        # A writer that read the marker just before it was set skipped its
+        # manifest, but its token was stamped first: look once more.
+        if self.last_write_token() != write_token:
+            self.mark_complete(False)
+            return False
+        return True
+
+    def _abandon_rebuild(self, last_put: Optional[SourceManifest]) -> bool:
+        # The write that moved the token may have landed between the last check
+        # and the last put, so that manifest could be the stale one; unless a
+        # writer has replaced it since, drop it and let it be backfilled.
+        if last_put is not None:
+            current = self.get(last_put.source_id)
+            if current is not None and current.updated_at == last_put.updated_at:
+                self.delete(last_put.source_id)
+        return False
+
+    def is_complete(self) -> bool:
+        data = self._read(f"{self.prefix}{COMPLETE_MARKER}")
+        return bool(data and data.get("complete"))
+
+    def note_write(self) -> None:
+        """Stamp a new last-write token ahead of a manifest change."""
+        self._write(
+            f"{self.prefix}{LAST_WRITE_MARKER}",
+            {"token": uuid.uuid4().hex, "updated_at": datetime.now(timezone.utc).isoformat()},
+        )
+
+    def last_write_token(self) -> Optional[str]:
+        data = self._read(f"{self.prefix}{LAST_WRITE_MARKER}")
+        return data.get("token") if data else None
+
+    def mark_complete(self, complete: bool) -> None:
+        key = f"{self.prefix}{COMPLETE_MARKER}"
+        if complete:
+            self._write(key, {"complete": True, "updated_at": datetime.now(timezone.utc).isoformat()})
+        else:
+            self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def owns_key(self, s3_key: str) -> bool:
+        return s3_key.startswith(self.prefix)
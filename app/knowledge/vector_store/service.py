@@ -1,45 +1,233 @@
+import json
 import logging
-from typing import Any, Dict, List
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Sequence, Tuple, TypeVar
 
 import boto3
 from langchain_core.documents import Document
 
 from app.core.config import config
 
+from .manifest import SourceManifest, VectorManifestStore
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Transient failures worth resending unchanged.
+RETRYABLE_ERROR_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "InternalServerException",
+    "RequestTimeout",
+    "RequestTimeoutException",
+    "SlowDown",
+}
+# The request body was too big; smaller slices will go through.
+SIZE_ERROR_CODES = {
+    "RequestEntityTooLargeException",
+    "PayloadTooLargeException",
+}
+# The request was rejected, possibly because of one bad vector in it.
+VALIDATION_ERROR_CODES = {"ValidationException"}
+
+
+# Bumped after every write or delete this process sends to the index, so
+# in-process caches of search results can tell they are stale.
+_index_generation = 0
+_index_generation_lock = threading.Lock()
+
+
+def index_generation() -> int:
+    return _index_generation
+
+
+def bump_index_generation() -> int:
+    global _index_generation
+    with _index_generation_lock:
+        _index_generation += 1
+        return _index_generation
+
+
+class VectorWriteError(Exception):
+    """Some vectors could not be written after retries; ``written_keys`` did land."""
+
+    def __init__(self, message: str, failed_keys: List[str], written_keys: List[str]):
+        super().__init__(message)
+        self.failed_keys = failed_keys
+        self.written_keys = written_keys
+
+
+def _error_code(error: Exception) -> Tuple[str, int]:
+    response = getattr(error, "response", None) or {}
+    code = response.get("Error", {}).get("Code", "")
+    status = response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+    return code, status
+
+
+def is_retryable_error(error: Exception) -> bool:
+    code, status = _error_code(error)
+    if code in RETRYABLE_ERROR_CODES or status == 429 or status >= 500:
+        return True
+    return type(error).__name__ in {"EndpointConnectionError", "ConnectionClosedError", "ReadTimeoutError", "ConnectTimeoutError"}
+
+
+def is_size_error(error: Exception) -> bool:
+    code, status = _error_code(error)
+    return code in SIZE_ERROR_CODES or status == 413
+
+
+def is_validation_error(error: Exception) -> bool:
+    return _error_code(error)[0] in VALIDATION_ERROR_CODES
+
+
+def estimate_vector_bytes(vector: Dict[str, Any]) -> int:
+    """Approximate size of a vector in a put_vectors request body."""
+    return len(json.dumps(vector, separators=(",", ":"), default=str))
+
+
+def split_into_batches(
+    items: Sequence[T],
+    max_count: int,
+    max_bytes: int | None = None,
+    size_of: Callable[[T], int] | None = None,
+) -> List[List[T]]:
+    """Split ``items`` into consecutive batches bounded by count and, optionally, bytes.
+
+    An item larger than ``max_bytes`` on its own still gets a batch, so the
+    service (not this helper) decides whether it is acceptable.
+    """
+    max_count = max(1, max_count)
+    batches: List[List[T]] = []
+    current: List[T] = []
+    current_bytes = 0
+    for item in items:
+        item_bytes = size_of(item) if max_bytes and size_of else 0
+        if current and (len(current) >= max_count or (max_bytes and current_bytes + item_bytes > max_bytes)):
+            batches.append(current)
+            current, current_bytes = [], 0
+        current.append(item)
+        current_bytes += item_bytes
+    if current:
+        batches.append(current)
+    return batches
+
 
 class S3VectorStoreService:
     def __init__(self):
         self.bucket_name = config.S3V_BUCKET
         self.index_name = config.S3V_INDEX_KB
         self.client = boto3.client('s3vectors', region_name=config.AWS_REGION)
+        self.put_batch_max_vectors = config.S3V_KB_PUT_BATCH_MAX_VECTORS
+        self.put_batch_max_bytes = config.S3V_KB_PUT_BATCH_MAX_BYTES
+        self.delete_batch_size = config.S3V_KB_DELETE_BATCH_SIZE
+        self.write_concurrency = max(1, config.S3V_KB_WRITE_CONCURRENCY)
+        self.write_max_attempts = max(1, config.S3V_KB_WRITE_MAX_ATTEMPTS)
+        self.write_retry_backoff = config.S3V_KB_WRITE_RETRY_BACKOFF_SECONDS
+        self.manifest = VectorManifestStore.from_config()
+
+    def _send_with_retry(
+        self, batch: List[T], send: Callable[[List[T]], Any], split_invalid: bool = True
+    ) -> Tuple[List[T], List[Tuple[List[T], Exception]]]:
+        """Send one batch; retry transient errors and halve rejected batches.
+
+        Oversized batches are halved until they fit. A validation error is
+        narrowed down to the half that keeps failing; when both halves fail it is
+        systematic (e.g. a wrong dimension) and splitting stops there instead of
+        costing a call per vector. Returns the items written and the slices that
+        still failed.
+        """
+        attempt = 1
+        while True:
+            try:
+                send(batch)
+                return list(batch), []
+            except Exception as e:
+                if len(batch) > 1 and is_size_error(e):
+                    middle = len(batch) // 2
+                    done_left, failed_left = self._send_with_retry(batch[:middle], send, split_invalid)
+                    done_right, failed_right = self._send_with_retry(batch[middle:], send, split_invalid)
+                    return done_left + done_right, failed_left + failed_right
+                if len(batch) > 1 and split_invalid and is_validation_error(e):
+                    return self._isolate_invalid(batch, send)
+                if not is_retryable_error(e) or attempt >= self.write_max_attempts:
+                    return [], [(batch, e)]
+                time.sleep(self.write_retry_backoff * (2 ** (attempt - 1)))
+                attempt += 1
+
+    def _isolate_invalid(
+        self, batch: List[T], send: Callable[[List[T]], Any]
+    ) -> Tuple[List[T], List[Tuple[List[T], Exception]]]:
+        middle = len(batch) // 2
+        done, failed = [], []
+        halves = [self._send_with_retry(half, send, split_invalid=False) for half in (batch[:middle], batch[middle:])]
+        invalid = [i for i, (_, half_failed) in enumerate(halves) if any(is_validation_error(e) for _, e in half_failed)]
+        for half_done, half_failed in halves:
+            done.extend(half_done)
+            for failed_slice, error in half_failed:
+                if len(invalid) == 1 and len(failed_slice) > 1 and is_validation_error(error):
+                    slice_done, slice_failed = self._isolate_invalid(failed_slice, send)
+                    done.extend(slice_done)
+                    failed.extend(slice_failed)
+                else:
+                    failed.append((failed_slice, error))
+        return done, failed
+
+    def _run_batches(
+        self, batches: List[List[T]], send: Callable[[List[T]], Any]
+    ) -> Tuple[List[T], List[Tuple[List[T], Exception]]]:
+        """Send batches with bounded parallelism; only failed slices are retried."""
+        done: List[T] = []
+        failed: List[Tuple[List[T], Exception]] = []
+        if len(batches) <= 1 or self.write_concurrency == 1:
+            outcomes = [self._send_with_retry(batch, send) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.write_concurrency, len(batches)), thread_name_prefix="s3v-kb-write") as pool:
+                outcomes = list(pool.map(lambda batch: self._send_with_retry(batch, send), batches))
+        for batch_done, batch_failed in outcomes:
+            done.extend(batch_done)
+            failed.extend(batch_failed)
+        return done, failed
+
+    @staticmethod
+    def build_vector_metadata(doc: Document, chunk_index: int) -> Dict[str, Any]:
+        """Metadata stored alongside a chunk's vector."""
+        metadata = {
+            'source_id': doc.metadata.get('source_id', ''),
+            'content_hash': doc.metadata.get('content_hash', ''),
+            'chunk_index': chunk_index,
+            'content': doc.page_content,
+            'content_source': doc.metadata.get('content_source', 'unknown'),
+            'name': doc.metadata.get('name') or doc.metadata.get('filename') or '',
+            'url': doc.metadata.get('section_url') or doc.metadata.get('source_url') or '',
+            'type': doc.metadata.get('type') or doc.metadata.get('file_type') or '',
+            'category': doc.metadata.get('category') or '',
+            'description': doc.metadata.get('description') or '',
+            'last_sync': doc.metadata.get('last_sync') or '',
+        }
+
+        if 'subcategory' in doc.metadata and doc.metadata['subcategory']:
+            metadata['subcategory'] = doc.metadata['subcategory']
 
-    def add_documents(self, documents: List[Document], embeddings: List[List[float]]):
-        """Add documents to vector store."""
+        if doc.metadata.get('parent_id'):
+            metadata['parent_id'] = doc.metadata['parent_id']
+            if doc.metadata.get('start_index') is not None:
+                metadata['start_index'] = int(doc.metadata['start_index'])
+
+        return metadata
+
+    def add_documents(self, documents: List[Document], embeddings: List[List[float]]) -> List[str]:
+        """Add documents to vector store and return the keys written."""
         vectors = []
         for i, (doc, embedding) in enumerate(zip(documents, embeddings, strict=False)):
-            content_hash = doc.metadata.get('content_hash', '')
-            source_id = doc.metadata.get('source_id', '')
-
-            key = f"doc_{source_id[:16]}_{content_hash[:16]}_{i}"
-
-            metadata = {
-                'source_id': source_id,
-                'content_hash': content_hash,
-                'chunk_index': i,
-                'content': doc.page_content,
-                'content_source': doc.metadata.get('content_source', 'unknown'),
-                'name': doc.metadata.get('name') or doc.metadata.get('filename') or '',
-                'url': doc.metadata.get('section_url') or doc.metadata.get('source_url') or '',
-                'type': doc.metadata.get('type') or doc.metadata.get('file_type') or '',
-                'category': doc.metadata.get('category') or '',
-                'description': doc.metadata.get('description') or '',
-                'last_sync': doc.metadata.get('last_sync') or '',
-            }
-
-            if 'subcategory' in doc.metadata and doc.metadata['subcategory']:
-                metadata['subcategory'] = doc.metadata['subcategory']
+            metadata = self.build_vector_metadata(doc, i)
+            key = f"doc_{metadata['source_id'][:16]}_{metadata['content_hash'][:16]}_{i}"
 
             vectors.append({
                 'key': key,
@@ -47,18 +235,40 @@ class S3VectorStoreService:
                 'metadata': metadata
             })
 
-        try:
-            self.client.put_vectors(
+        source_ids = list(dict.fromkeys(v['metadata']['source_id'] for v in vectors))
+        write_id = self._begin_manifest_write(source_ids)
+        batches = split_into_batches(vectors, self.put_batch_max_vectors, self.put_batch_max_bytes, estimate_vector_bytes)
+        written, failed = self._run_batches(
+            batches,
+            lambda batch: self.client.put_vectors(
                 vectorBucketName=self.bucket_name,
                 indexName=self.index_name,
-                vectors=vectors
-            )
-        except Exception as e:
-            logger.error(f"Failed to store vectors: {str(e)}")
-            raise
+                vectors=batch
+            ),
+        )
+        if vectors:
+            bump_index_generation()
+
+        upserts_by_source: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+        for vector in written:
+            upserts_by_source[vector['metadata']['source_id']][vector['key']] = vector['metadata']
+        for source_id in source_ids:
+            self._record_in_manifest(source_id, upserts=upserts_by_source.get(source_id), write_id=write_id)
+
+        if failed:
+            failed_keys = [v['key'] for batch, _ in failed for v in batch]
+            message = f"Failed to store {len(failed_keys)}/{len(vectors)} vectors: {failed[0][1]}"
+            logger.error(message)
+            raise VectorWriteError(message, failed_keys, [v['key'] for v in written])
+
+        if len(batches) > 1:
+            logger.info(f"Stored {len(vectors)} vectors in {len(batches)} batches")
+        return [v['key'] for v in vectors]
 
     def delete_all_vectors(self) -> dict[str, any]:
         """Delete ALL vectors from the index."""
+        started_at = datetime.now(timezone.utc)
+        write_token = self._manifest_write_token()
         try:
             vector_keys = self._get_all_vector_keys()
 
@@ -71,46 +281,8 @@ class S3VectorStoreService:
                     "message": "No vectors found to delete"
                 }
 
-            batch_size = 100
-            deleted_count = 0
-            failed_keys = []
-
-            for i in range(0, len(vector_keys), batch_size):
-                batch_keys = vector_keys[i:i + batch_size]
-                try:
-                    self.client.delete_vectors(
-                        vectorBucketName=self.bucket_name,
-                        indexName=self.index_name,
-                        keys=batch_keys
-                    )
-                    deleted_count += len(batch_keys)
-                    logger.info(f"Deleted batch {i//batch_size + 1}: {len(batch_keys)} vectors")
-                except Exception as batch_error:
-                    logger.error(f"Failed to delete batch {i//batch_size + 1}: {str(batch_error)}")
-                    failed_keys.extend(batch_keys)
-
-            total_found = len(vector_keys)
-            success = deleted_count > 0 and len(failed_keys) == 0
-
-            result = {
-                "success": success,
-                "vectors_found": total_found,
-                "vectors_deleted": deleted_count,
-                "vectors_failed": len(failed_keys)
-            }
-
-            if success:
-                result["message"] = f"Successfully deleted all {deleted_count} vectors from index"
-                logger.info(f"Successfully deleted all {deleted_count} vectors from index")
-            elif deleted_count > 0:
-                result["message"] = f"Partially successful: deleted {deleted_count}/{total_found} vectors"
-                result["failed_keys"] = failed_keys
-                logger.warning(f"Partially deleted vectors from index: {deleted_count}/{total_found}")
-            else:
-                result["message"] = "Failed to delete any vectors"
-                result["failed_keys"] = failed_keys
-                logger.error("Failed to delete any vectors from index")
-
+            result = self.delete_vectors_by_keys(vector_keys, label="index")
+            self._reset_manifests(index_empty=result["success"], started_at=started_at, write_token=write_token)
             return result
         except Exception as e:
             logger.error(f"Failed to delete all vectors from index: {str(e)}")
@@ -163,46 +335,7 @@ class S3VectorStoreService:
                     "message": "No vectors found to delete"
                 }
 
-            batch_size = 100
-            deleted_count = 0
-            failed_keys = []
-
-            for i in range(0, len(vector_keys), batch_size):
-                batch_keys = vector_keys[i:i + batch_size]
-                try:
-                    self.client.delete_vectors(
-                        vectorBucketName=self.bucket_name,
-                        indexName=self.index_name,
-                        keys=batch_keys
-                    )
-                    deleted_count += len(batch_keys)
-                except Exception as batch_error:
-                    logger.error(f"Failed to delete batch {i//batch_size + 1}: {str(batch_error)}")
-                    failed_keys.extend(batch_keys)
-
-            total_found = len(vector_keys)
-            success = deleted_count > 0 and len(failed_keys) == 0
-
-            result = {
-                "success": success,
-                "vectors_found": total_found,
-                "vectors_deleted": deleted_count,
-                "vectors_failed": len(failed_keys)
-            }
-
-            if success:
-                result["message"] = f"Successfully deleted all {deleted_count} vectors"
-                logger.info(f"Successfully deleted all {deleted_count} vectors for source {source_id}")
-            elif deleted_count > 0:
-                result["message"] = f"Partially successful: deleted {deleted_count}/{total_found} vectors"
-                result["failed_keys"] = failed_keys
-                logger.warning(f"Partially deleted vectors for source {source_id}: {deleted_count}/{total_found}")
-            else:
-                result["message"] = "Failed to delete any vectors"
-                result["failed_keys"] = failed_keys
-                logger.error(f"Failed to delete any vectors for source {source_id}")
-
-            return result
+            return self.delete_vectors_by_keys(vector_keys, label=f"source {source_id}", source_id=source_id)
         except Exception as e:
             logger.error(f"Failed to delete documents for source {source_id}: {str(e)}")
             return {
@@ -213,30 +346,277 @@ class S3VectorStoreService:
                 "message": f"Deletion process failed: {str(e)}"
             }
 
-    def _iterate_vectors_by_source_id(self, source_id: str):
-        """Yield vectors for a specific source_id."""
-        try:
-            paginator = self.client.get_paginator('list_vectors')
-            page_iterator = paginator.paginate(
+    def delete_vectors_by_keys(self, vector_keys: List[str], label: str = "keys", source_id: str | None = None) -> dict[str, any]:
+        """Delete the given vector keys in parallel batches, retrying only failed slices.
+
+        Pass ``source_id`` when the keys belong to one source so its manifest
+        drops them too.
+        """
+        if not vector_keys:
+            return {
+                "success": True,
+                "vectors_found": 0,
+                "vectors_deleted": 0,
+                "message": "No vectors found to delete"
+            }
+
+        write_id = self._begin_manifest_write([source_id]) if source_id else None
+        deleted, failed = self._run_batches(
+            split_into_batches(vector_keys, self.delete_batch_size),
+            lambda batch: self.client.delete_vectors(
                 vectorBucketName=self.bucket_name,
                 indexName=self.index_name,
-                returnMetadata=True,
-                returnData=False,
-                PaginationConfig={'PageSize': 1000}
-            )
+                keys=batch
+            ),
+        )
+        bump_index_generation()
+        deleted_count = len(deleted)
+        failed_keys = [key for batch, _ in failed for key in batch]
+        for batch, error in failed:
+            logger.error(f"Failed to delete {len(batch)} vectors for {label}: {str(error)}")
+        if source_id:
+            self._record_in_manifest(source_id, deletes=deleted, write_id=write_id)
+
+        total_found = len(vector_keys)
+        success = deleted_count > 0 and len(failed_keys) == 0
+
+        result = {
+            "success": success,
+            "vectors_found": total_found,
+            "vectors_deleted": deleted_count,
+            "vectors_failed": len(failed_keys)
+        }
 
-            for page in page_iterator:
-                for vector in page.get('vectors', []):
-                    if vector.get('metadata', {}).get('source_id') == source_id:
-                        yield vector
+        if success:
+            result["message"] = f"Successfully deleted all {deleted_count} vectors"
+            logger.info(f"Successfully deleted all {deleted_count} vectors for {label}")
+        elif deleted_count > 0:
+            result["message"] = f"Partially successful: deleted {deleted_count}/{total_found} vectors"
+            result["failed_keys"] = failed_keys
+            logger.warning(f"Partially deleted vectors for {label}: {deleted_count}/{total_found}")
+        else:
+            result["message"] = "Failed to delete any vectors"
+            result["failed_keys"] = failed_keys
+            logger.error(f"Failed to delete any vectors for {label}")
+
+        return result
+
+    def _scan_vectors_by_source_id(self, source_id: str):
+        """Yield vectors (key and metadata) for a specific source_id; listing errors propagate."""
+        for vector in self._scan_all_vectors():
+            if vector.get('metadata', {}).get('source_id') == source_id:
+                yield vector
+
+    def _iterate_vectors_by_source_id(self, source_id: str):
+        """Yield vectors (with full metadata) for a specific source_id."""
+        try:
+            manifest = self._load_manifest(source_id, include_pending=True)
+            if manifest is not None and not manifest.pending:
+                yield from self._get_vectors_with_metadata(manifest.keys)
+            elif manifest is not None or not self.manifest_covers_index():
+                yield from self._scan_vectors_by_source_id(source_id)
         except Exception as e:
             logger.error(f"Failed to iterate vectors for source_id {source_id}: {str(e)}")
 
+    def list_source_vectors(self, source_id: str) -> List[Dict[str, Any]]:
+        """List every stored vector of a source (key and metadata, without chunk text from the manifest).
+
+        Reads the source's manifest when there is one and no write is pending on
+        it; otherwise lists the index and backfills the manifest. Unlike
+        ``_iterate_vectors_by_source_id`` this raises when listing fails, so
+        callers never mistake an unreadable index for an empty source.
+        """
+        manifest = self._load_manifest(source_id, include_pending=True)
+        if manifest is not None and not manifest.pending:
+            return manifest.as_vectors()
+        if manifest is None and self.manifest_covers_index():
+            return []
+
+        vectors = list(self._scan_vectors_by_source_id(source_id))
+        if self.manifest is not None:
+            backfill = SourceManifest.from_vectors(source_id, vectors)
+            if manifest is not None:
+                # Writes that died are covered by the listing; live ones record their own keys.
+                backfill.pending = manifest.live_pending()
+                backfill.etag = manifest.etag
+            try:
+                self.manifest.put(backfill, conditional=True)
+            except Exception as e:
+                if self.manifest.is_conflict(e):
+                    logger.info(f"Skipped manifest backfill for source_id={source_id}: a write raced the listing")
+                else:
+                    logger.warning(f"Failed to backfill manifest for source_id={source_id}: {e}")
+        return vectors
 
     def _get_vector_keys_by_source_id(self, source_id: str) -> list[str]:
         """Get all vector keys for a specific source_id."""
+        manifest = self._load_manifest(source_id)
+        if manifest is not None:
+            return manifest.keys
         return [v.get('key') for v in self._iterate_vectors_by_source_id(source_id) if v.get('key')]
 
+    def _get_vectors_with_metadata(self, vector_keys: List[str]):
+        """Yield ``{key, metadata}`` for the given keys, fetched in batches."""
+        batch_size = 100
+        for i in range(0, len(vector_keys), batch_size):
+            response = self.client.get_vectors(
+                vectorBucketName=self.bucket_name,
+                indexName=self.index_name,
+                keys=vector_keys[i:i + batch_size],
+                returnData=False,
+                returnMetadata=True
+            )
+            for vector in response.get('vectors', []):
+                yield {'key': vector.get('key'), 'metadata': vector.get('metadata', {})}
+
+    def _load_manifest(self, source_id: str, include_pending: bool = False) -> SourceManifest | None:
+        """Return the source's manifest; one with pending writes only when ``include_pending``."""
+        if self.manifest is None:
+            return None
+        try:
+            manifest = self.manifest.get(source_id)
+            if manifest is not None and manifest.pending and not include_pending:
+                return None
+            return manifest
+        except Exception as e:
+            logger.warning(f"Failed to read manifest for source_id={source_id}: {e}")
+            return None
+
+    def manifest_covers_index(self) -> bool:
+        """Whether every source in the index has an up-to-date manifest."""
+        if self.manifest is None:
+            return False
+        try:
+            return self.manifest.is_complete()
+        except Exception as e:
+            logger.warning(f"Failed to read manifest marker: {e}")
+            return False
+
+    def _begin_manifest_write(self, source_ids: Sequence[str]) -> str | None:
+        """Mark the sources' manifests as mid-write before the index is touched; return the write id."""
+        if self.manifest is None or not source_ids:
+            return None
+        write_id = uuid.uuid4().hex
+        started_at = datetime.now(timezone.utc).isoformat()
+        try:
+            self.manifest.note_write()
+            # Without the complete marker a source with no manifest has unknown
+            # history, and the next listing of it backfills one.
+            complete = self.manifest.is_complete()
+        except Exception as e:
+            logger.error(f"Failed to start manifest write, invalidating manifests: {e}")
+            self._invalidate_manifests(source_ids)
+            return write_id
+
+        def mark_pending(manifest: SourceManifest) -> None:
+            manifest.pending[write_id] = started_at
+
+        for source_id in source_ids:
+            try:
+                self.manifest.update(source_id, mark_pending, create=complete)
+            except Exception as e:
+                logger.error(f"Failed to mark manifest pending for source_id={source_id}, invalidating it: {e}")
+                self._invalidate_manifests([source_id])
+        return write_id
+
+    def _record_in_manifest(
+        self,
+        source_id: str,
+        upserts: Dict[str, Dict[str, Any]] | None = None,
+        deletes: Sequence[str] = (),
+        write_id: str | None = None,
+    ) -> None:
+        """Apply written/deleted keys to a source's manifest and clear the write's pending mark; drop it if that fails."""
+        if self.manifest is None:
+            return
+
+        def apply(manifest: SourceManifest) -> None:
+            manifest.pending.pop(write_id, None)
+            manifest.apply(upserts, deletes)
+
+        try:
+            self.manifest.note_write()
+            self.manifest.update(source_id, apply, create=self.manifest.is_complete())
+        except Exception as e:
+            logger.error(f"Failed to update manifest for source_id={source_id}, invalidating it: {e}")
+            self._invalidate_manifests([source_id])
+
+    def _invalidate_manifests(self, source_ids: Sequence[str]) -> None:
+        try:
+            self.manifest.mark_complete(False)
+            for source_id in source_ids:
+                self.manifest.delete(source_id)
+        except Exception as cleanup_error:
+            logger.error(f"Failed to invalidate manifests for {list(source_ids)}: {cleanup_error}")
+
+    def _reset_manifests(self, index_empty: bool, started_at: datetime, write_token: str | None) -> None:
+        if self.manifest is None:
+            return
+        try:
+            if index_empty:
+                self.manifest.replace_all([], scan_started_at=started_at, write_token=write_token)
+            else:
+                self.manifest.mark_complete(False)
+        except Exception as e:
+            logger.error(f"Failed to reset manifests: {e}")
+
+    def _manifest_write_token(self) -> str | None:
+        if self.manifest is None:
+            return None
+        try:
+            return self.manifest.last_write_token()
+        except Exception as e:
+            logger.warning(f"Failed to read manifest write marker: {e}")
+            return None
+
+    def get_source_summary(self, source_id: str) -> Dict[str, Any] | None:
+        """Aggregate of one source from its manifest, or ``None`` if it has none."""
+        manifest = self._load_manifest(source_id)
+        return manifest.summary() if manifest is not None else None
+
+    def list_source_manifests(self) -> List[SourceManifest] | None:
+        """Every source's manifest, rebuilt from one index listing when incomplete.
+
+        Returns ``None`` when manifests are disabled.
+        """
+        if self.manifest is None:
+            return None
+        if self.manifest_covers_index():
+            try:
+                return self.manifest.list_all()
+            except Exception as e:
+                logger.warning(f"Failed to read manifests, rebuilding from the index: {e}")
+
+        scan_started_at = datetime.now(timezone.utc)
+        write_token = self._manifest_write_token()
+        vectors_by_source: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for vector in self._scan_all_vectors():
+            source_id = vector.get('metadata', {}).get('source_id')
+            if source_id:
+                vectors_by_source[source_id].append(vector)
+        manifests = [SourceManifest.from_vectors(source_id, vectors) for source_id, vectors in vectors_by_source.items()]
+        try:
+            if self.manifest.replace_all(manifests, scan_started_at=scan_started_at, write_token=write_token):
+                logger.info(f"Rebuilt manifests for {len(manifests)} sources")
+            else:
+                logger.info(f"Rebuilt manifests for {len(manifests)} sources; writes raced the listing, leaving them incomplete")
+        except Exception as e:
+            logger.error(f"Failed to rebuild manifests: {e}")
+        return manifests
+
+    def _scan_all_vectors(self):
+        """Yield every vector (key and metadata) in the index."""
+        paginator = self.client.get_paginator('list_vectors')
+        page_iterator = paginator.paginate(
+            vectorBucketName=self.bucket_name,
+            indexName=self.index_name,
+            returnMetadata=True,
+            returnData=False,
+            PaginationConfig={'PageSize': 1000}
+        )
+        for page in page_iterator:
+            yield from page.get('vectors', [])
+
 
     def similarity_search(
         self,
@@ -305,6 +685,10 @@ class S3VectorStoreService:
             if 'subcategory' in metadata:
                 result_metadata['subcategory'] = metadata['subcategory']
 
+            if 'parent_id' in metadata:
+                result_metadata['parent_id'] = metadata['parent_id']
+                result_metadata['start_index'] = metadata.get('start_index')
+
             results.append({
                 'content': metadata.get('content', ''),
                 'metadata': result_metadata,
@@ -313,6 +697,61 @@ class S3VectorStoreService:
             })
         return results
 
+    def get_vector_embeddings(self, vector_keys: List[str]) -> Dict[str, List[float]]:
+        """Fetch stored embeddings by key, so unchanged text can be rewritten without re-embedding."""
+        embeddings: Dict[str, List[float]] = {}
+        batch_size = 100
+        for i in range(0, len(vector_keys), batch_size):
+            response = self.client.get_vectors(
+                vectorBucketName=self.bucket_name,
+                indexName=self.index_name,
+                keys=vector_keys[i:i + batch_size],
+                returnData=True,
+                returnMetadata=False
+            )
+            for vector in response.get('vectors', []):
+                data = vector.get('data', {}).get('float32')
+                if vector.get('key') and data:
+                    embeddings[vector['key']] = data
+        return embeddings
+
+    def get_parent_chunks(self, parent_id: str, source_id: str) -> List[Dict[str, Any]] | None:
+        """Return every stored chunk of one parent document as ``{content, start_index}``.
+
+        The chunk keys come from the source's manifest, so the page is complete
+        whatever query led to it. Returns ``None`` when the source has no manifest.
+        """
+        manifest = self._load_manifest(source_id) if source_id else None
+        if manifest is None:
+            return None
+        keys = [key for key, metadata in manifest.vectors.items() if metadata.get('parent_id') == parent_id]
+        return [
+            {
+                'content': v['metadata'].get('content', ''),
+                'start_index': v['metadata'].get('start_index'),
+            }
+            for v in self._get_vectors_with_metadata(keys)
+        ]
+
+    def query_parent_chunks(self, parent_id: str, query_embedding: List[float], k: int) -> List[Dict[str, Any]]:
+        """Return up to ``k`` chunks of one parent document nearest to the query as ``{content, start_index}``."""
+        response = self.client.query_vectors(
+            vectorBucketName=self.bucket_name,
+            indexName=self.index_name,
+            topK=k,
+            queryVector={'float32': [float(x) for x in query_embedding]},
+            filter={'parent_id': parent_id},
+            returnMetadata=True,
+            returnDistance=False
+        )
+        return [
+            {
+                'content': v.get('metadata', {}).get('content', ''),
+                'start_index': v.get('metadata', {}).get('start_index'),
+            }
+            for v in response.get('vectors', [])
+        ]
+
     def get_all_vectors_metadata(self) -> list[dict[str, Any]]:
         """Get metadata from all vectors in the store.
 
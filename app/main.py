@@ -150,6 +150,14 @@ async def lifespan(app: FastAPI):
     finally:
         logger.info("Application shutdown - cleaning up resources")
 
+        try:
+            from app.agents.supervisor.memory.usage_tracking import flush_memory_usage_ledger
+
+            await flush_memory_usage_ledger()
+            logger.info("Memory usage ledger flushed successfully")
+        except Exception as e:
+            logger.error(f"Error flushing memory usage ledger: {e}")
+
         # Stop background cold-path memory jobs first, while DB/AWS clients still exist.
         try:
             from app.services.memory.cold_path_manager import get_memory_cold_path_manager
@@ -191,6 +199,22 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Error shutting down SQS executor: {e}")
 
+        try:
+            from app.services.conversation_summaries import stop_idle_summary_scheduler
+
+            await stop_idle_summary_scheduler()
+            logger.info("Idle conversation summaries stopped successfully")
+        except Exception as e:
+            logger.error(f"Error stopping idle conversation summaries: {e}")
+
+        try:
+            from app.services.external_context.http_client import close_fos_http_pool
+
+            await close_fos_http_pool()
+            logger.info("FOS HTTP pool closed successfully")
+        except Exception as e:
+            logger.error(f"Error closing FOS HTTP pool: {e}")
+
         try:
             from app.services.user_context_cache import stop_user_context_cache
 
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional, Protocol, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+Namespace = Tuple[str, ...]
+
+
+def namespace_sort_score(value: dict[str, Any], fallback_iso: str) -> float:
+    """Order memories the way MemoryService picks the oldest: last_accessed, then created_at."""
+    raw = value.get("last_accessed") or value.get("created_at") or fallback_iso
+    try:
+        dt = datetime.fromisoformat(str(raw))
+    except (TypeError, ValueError):
+        dt = datetime.fromisoformat(fallback_iso)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+class NamespaceIndex(Protocol):
+    """Per-namespace key manifest kept in step with store writes.
+
+    Keys are ordered by ``namespace_sort_score`` so count, oldest and newest
+    are answered without listing the vector index. A namespace is only trusted
+    once it has been marked ready by a full ``rebuild``. Every recorded write
+    bumps the namespace's write epoch; a rebuild given the epoch read before its
+    scan is dropped if a write landed in between, so it never overwrites it.
+    """
+
+    def is_ready(self, namespace: Namespace) -> bool: ...
+
+    def write_epoch(self, namespace: Namespace) -> int: ...
+
+    def rebuild(
+        self, namespace: Namespace, entries: Iterable[tuple[str, float]], epoch: Optional[int] = None
+    ) -> bool: ...
+
+    def invalidate(self, namespace: Namespace) -> None: ...
+
+    def record_put(self, namespace: Namespace, key: str, score: float) -> None: ...
+
+    def record_delete(self, namespace: Namespace, keys: Sequence[str]) -> None: ...
+
+    def keys(self, namespace: Namespace, limit: Optional[int] = None) -> list[str]: ...
+
+    def count(self, namespace: Namespace) -> int: ...
+
+    def oldest(self, namespace: Namespace) -> Optional[str]: ...
+
+    def newest(self, namespace: Namespace) -> Optional[str]: ...
+
+
+def _join(namespace: Namespace) -> str:
+    return "|".join(namespace)
+
+
+class InMemoryNamespaceIndex:
+    """Process-local index for single-replica and development setups."""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, dict[str, float]] = {}
+        self._ready: set[str] = set()
+        self._epochs: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def is_ready(self, namespace: Namespace) -> bool:
+        return _join(namespace) in self._ready
+
+    def write_epoch(self, namespace: Namespace) -> int:
+        with self._lock:
+            return self._epochs.get(_join(namespace), 0)
+
+    def rebuild(
+        self, namespace: Namespace, entries: Iterable[tuple[str, float]], epoch: Optional[int] = None
+    ) -> bool:
+        ns = _join(namespace)
+        mapping = dict(entries)
+        with self._lock:
+            if epoch is not None and self._epochs.get(ns, 0) != epoch:
+                return False
+            self._entries[ns] = mapping
+            self._ready.add(ns)
+        return True
+
+    def invalidate(self, namespace: Namespace) -> None:
+        ns = _join(namespace)
+        with self._lock:
+            self._ready.discard(ns)
+            self._epochs[ns] = self._epochs.get(ns, 0) + 1
+
+    def record_put(self, namespace: Namespace, key: str, score: float) -> None:
+        ns = _join(namespace)
+        with self._lock:
+            self._entries.setdefault(ns, {})[key] = score
+            self._epochs[ns] = self._epochs.get(ns, 0) + 1
+
+    def record_delete(self, namespace: Namespace, keys: Sequence[str]) -> None:
+        ns = _join(namespace)
+        with self._lock:
+            self._epochs[ns] = self._epochs.get(ns, 0) + 1
+            bucket = self._entries.get(ns)
+            if bucket is None:
+                return
+            for key in keys:
+                bucket.pop(key, None)
+
+    def _sorted(self, namespace: Namespace) -> list[str]:
+        with self._lock:
+            bucket = dict(self._entries.get(_join(namespace)) or {})
+        return [k for k, _ in sorted(bucket.items(), key=lambda kv: (kv[1], kv[0]))]
+
+    def keys(self, namespace: Namespace, limit: Optional[int] = None) -> list[str]:
+        ordered = self._sorted(namespace)
+        return ordered[:limit] if limit else ordered
+
+    def count(self, namespace: Namespace) -> int:
+        with self._lock:
+            return len(self._entries.get(_join(namespace)) or {})
+
+    def oldest(self, namespace: Namespace) -> Optional[str]:
+        ordered = self._sorted(namespace)
+        return ordered[0] if ordered else None
+
+    def newest(self, namespace: Namespace) -> Optional[str]:
+        ordered = self._sorted(namespace)
+        return ordered[-1] if ordered else None
+
+
+class RedisNamespaceIndex:
+    """Shared index backed by one Redis sorted set per namespace."""
+
+    def __init__(self, client: Any, prefix: str = "s3v:nsidx") -> None:
+        self._client = client
+        self._prefix = prefix.rstrip(":")
+
+    def _zset_key(self, namespace: Namespace) -> str:
+        return f"{self._prefix}:keys:{_join(namespace)}"
+
+    def _ready_key(self, namespace: Namespace) -> str:
+        return f"{self._prefix}:ready:{_join(namespace)}"
+
+    def _epoch_key(self, namespace: Namespace) -> str:
+        return f"{self._prefix}:epoch:{_join(namespace)}"
+
+    @staticmethod
+    def _decode(raw: Any) -> str:
+        return raw.decode("utf-8") if isinstance(raw, (bytes, bytearray)) else str(raw)
+
+    def is_ready(self, namespace: Namespace) -> bool:
+        return bool(self._client.exists(self._ready_key(namespace)))
+
+    def write_epoch(self, namespace: Namespace) -> int:
+        return int(self._client.get(self._epoch_key(namespace)) or 0)
+
+    def rebuild(
+        self, namespace: Namespace, entries: Iterable[tuple[str, float]], epoch: Optional[int] = None
+    ) -> bool:
+        from redis.exceptions import WatchError
+
+        mapping = dict(entries)
+        pipe = self._client.pipeline(transaction=True)
+        try:
+            if epoch is not None:
+                pipe.watch(self._epoch_key(namespace))
+                if int(pipe.get(self._epoch_key(namespace)) or 0) != epoch:
+                    return False
+                pipe.multi()
+            pipe.delete(self._zset_key(namespace))
+            if mapping:
+                pipe.zadd(self._zset_key(namespace), mapping)
+            pipe.set(self._ready_key(namespace), "1")
+            pipe.execute()
+        except WatchError:
+            return False
+        finally:
+            pipe.reset()
+        return True
+
+    def invalidate(self, namespace: Namespace) -> None:
+        pipe = self._client.pipeline(transaction=True)
+        pipe.delete(self._ready_key(namespace))
+        pipe.incr(self._epoch_key(namespace))
+        pipe.execute()
+
+    def record_put(self, namespace: Namespace, key: str, score: float) -> None:
+        pipe = self._client.pipeline(transaction=True)
+        pipe.zadd(self._zset_key(namespace), {key: score})
+        pipe.incr(self._epoch_key(namespace))
+        pipe.execute()
+
+    def record_delete(self, namespace: Namespace, keys: Sequence[str]) -> None:
+        if keys:
+            pipe = self._client.pipeline(transaction=True)
+            pipe.zrem(self._zset_key(namespace), *keys)
+            pipe.incr(self._epoch_key(namespace))
+            pipe.execute()
+
+    def keys(self, namespace: Namespace, limit: Optional[int] = None) -> list[str]:
+        end = (limit - 1) if limit else -1
+        return [self._decode(k) for k in self._client.zrange(self._zset_key(namespace), 0, end)]
+
+    def count(self, namespace: Namespace) -> int:
+        return int(self._client.zcard(self._zset_key(namespace)) or 0)
+
+    def oldest(self, namespace: Namespace) -> Optional[str]:
+        found = self._client.zrange(self._zset_key(namespace), 0, 0)
+        return self._decode(found[0]) if found else None
+
+    def newest(self, namespace: Namespace) -> Optional[str]:
+        found = self._client.zrange(self._zset_key(namespace), -1, -1)
+        return self._decode(found[0]) if found else None
+
+
+_local_indexes: dict[str, InMemoryNamespaceIndex] = {}
+_local_indexes_lock = threading.Lock()
+
+
+def create_namespace_index(scope: str) -> NamespaceIndex:
+    """Return the namespace index for one vector index, identified by ``scope``.
+
+    Uses the shared Redis index when Redis is configured; otherwise every store
+    for the same scope in this process shares one in-memory index so writes made
+    through any of them stay visible to the others.
+    """
+    from app.core.config import config as app_config
+    from app.services.memory.redis_client import get_sync_redis_client_singleton, is_dev_env
+
+    if not is_dev_env() and app_config.REDIS_HOST:
+        try:
+            return RedisNamespaceIndex(get_sync_redis_client_singleton(), prefix=f"s3v:nsidx:{scope}")
+        except Exception as exc:
+            logger.warning("namespace_index.redis_unavailable err=%s; using in-memory index", exc)
+    with _local_indexes_lock:
+        index = _local_indexes.get(scope)
+        if index is None:
+            index = _local_indexes[scope] = InMemoryNamespaceIndex()
+        return index
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Iterable, Literal, Optional, Sequence, Tuple, TypeAlias, cast
+from functools import partial
+from typing import Any, Callable, Iterable, Literal, Optional, Sequence, Tuple, TypeAlias, TypeVar, cast
 from uuid import NAMESPACE_URL, UUID, uuid5
 
 try:
@@ -50,9 +53,15 @@ from botocore.client import BaseClient
 from botocore.exceptions import ClientError
 
 from app.core.config import config
+from app.repositories.namespace_index import NamespaceIndex, namespace_sort_score
+from app.services.embeddings import EmbeddingService
 
 Namespace = Tuple[str, ...]
+R = TypeVar("R")
 
+DEFAULT_IO_MAX_WORKERS = 16
+GET_VECTORS_MAX_KEYS = 100
+PUT_VECTORS_MAX_VECTORS = 500
 
 logger = logging.getLogger(__name__)
 
@@ -147,6 +156,9 @@ class S3VectorsStore(BaseStore):
         model_id: str,
         distance: Literal["COSINE", "EUCLIDEAN"] = "COSINE",
         default_index_fields: Optional[list[str]] = None,
+        io_max_workers: Optional[int] = None,
+        embedding_service: Optional[EmbeddingService] = None,
+        namespace_index: Optional[NamespaceIndex] = None,
     ) -> None:
         self._s3v = s3v_client
         self._bedrock = bedrock_client
@@ -156,6 +168,22 @@ class S3VectorsStore(BaseStore):
         self._model_id = model_id
         self._distance = distance
         self._default_index_fields = default_index_fields or ["summary"]
+        self._embeddings = embedding_service or EmbeddingService(bedrock_client=bedrock_client, model_id=model_id)
+        self._ns_index = namespace_index
+        # boto3 clients are blocking; async entry points hand them to this pool so the event loop never waits on I/O.
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=max(1, int(io_max_workers or DEFAULT_IO_MAX_WORKERS)),
+            thread_name_prefix="s3v-io",
+        )
+
+    async def _run_blocking(self, fn: Callable[..., R], /, *args: Any, **kwargs: Any) -> R:
+        """Run a blocking store call on the I/O pool and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_executor, partial(fn, *args, **kwargs))
+
+    def close(self) -> None:
+        """Release the I/O pool used by the async API."""
+        self._io_executor.shutdown(wait=False, cancel_futures=True)
 
     def batch(self, ops: Iterable[Op]) -> list[Any]:
         results: list[Any] = []
@@ -180,7 +208,7 @@ class S3VectorsStore(BaseStore):
         return results
 
     async def abatch(self, ops: Iterable[Op]) -> list[Any]:
-        return self.batch(ops)
+        return await self._run_blocking(self.batch, list(ops))
 
     def get(
         self,
@@ -261,8 +289,29 @@ class S3VectorsStore(BaseStore):
         if not query:
             return []
 
-        query_vec = self._embed_texts([query])[0]
+        return self.search_by_vector(
+            namespace_prefix,
+            self.embed_query(query),
+            filter=filter,
+            limit=limit,
+            offset=offset,
+        )
+
+    def embed_query(self, query: str) -> list[float]:
+        """Embed a query once so it can be reused across several namespace searches."""
+        return self._embed_texts([query])[0]
 
+    def search_by_vector(
+        self,
+        namespace_prefix: Namespace,
+        query_vec: list[float],
+        /,
+        *,
+        filter: dict[str, Any] | None = None,
+        limit: int = 10,
+        offset: int = 0,
+    ) -> list[SearchItem]:
+        """Search a namespace with a precomputed query vector (see ``embed_query``)."""
         flt = self._build_filter(namespace_prefix, filter)
         eff_limit = limit + offset if offset else limit
         aws_query_limit = 100
@@ -369,6 +418,65 @@ class S3VectorsStore(BaseStore):
                 }
             ],
         )
+        self._index_put(namespace, {key: namespace_sort_score(value, created_at)})
+
+    def patch_values(
+        self,
+        namespace: Namespace,
+        updates: dict[str, dict[str, Any]],
+        increments: Optional[dict[str, dict[str, int]]] = None,
+    ) -> int:
+        """Update stored values in place without re-embedding.
+
+        Existing vectors are fetched with their data and written back with the same
+        embedding, so only ``value_json`` changes. ``updates`` sets fields per key and
+        ``increments`` adds to numeric fields per key. Keys that no longer exist are
+        skipped. Returns the number of items rewritten.
+        """
+        increments = increments or {}
+        keys = list(dict.fromkeys([*updates, *increments]))
+        if not keys:
+            return 0
+
+        by_point_id = {str(_compose_point_uuid(namespace, key)): key for key in keys}
+        point_ids = list(by_point_id)
+        rewritten: list[dict[str, Any]] = []
+        scores: dict[str, float] = {}
+        for i in range(0, len(point_ids), GET_VECTORS_MAX_KEYS):
+            res = self._s3v.get_vectors(
+                vectorBucketName=self._bucket,
+                indexName=self._index,
+                keys=point_ids[i : i + GET_VECTORS_MAX_KEYS],
+                returnData=True,
+                returnMetadata=True,
+            )
+            for vector in cast(list[dict[str, Any]], res.get("vectors") or []):
+                point_id = cast(str, vector.get("key") or "")
+                key = by_point_id.get(point_id)
+                data = vector.get("data")
+                if key is None or not data:
+                    continue
+                metadata = dict(vector.get("metadata") or {})
+                try:
+                    value = json.loads(metadata.get("value_json") or "{}")
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping patch for {key}: invalid value_json")
+                    continue
+                value.update(updates.get(key, {}))
+                for field, amount in increments.get(key, {}).items():
+                    value[field] = int(value.get(field) or 0) + amount
+                metadata["value_json"] = json.dumps(value, ensure_ascii=False)
+                rewritten.append({"key": point_id, "data": data, "metadata": metadata})
+                scores[key] = namespace_sort_score(value, metadata.get("created_at") or _utc_now_iso())
+
+        for i in range(0, len(rewritten), PUT_VECTORS_MAX_VECTORS):
+            self._s3v.put_vectors(
+                vectorBucketName=self._bucket,
+                indexName=self._index,
+                vectors=rewritten[i : i + PUT_VECTORS_MAX_VECTORS],
+            )
+        self._index_put(namespace, scores)
+        return len(rewritten)
 
     def delete(self, namespace: Namespace, key: str) -> None:
         """Delete a single item by its key."""
@@ -378,6 +486,7 @@ class S3VectorsStore(BaseStore):
             indexName=self._index,
             keys=[point_id],
         )
+        self._index_delete(namespace, [key])
 
     def batch_delete_by_keys(
         self,
@@ -407,6 +516,7 @@ class S3VectorsStore(BaseStore):
                     keys=point_ids,
                 )
                 deleted_count += len(batch_keys)
+                self._index_delete(namespace, batch_keys)
                 logger.debug(f"Batch {i // batch_size + 1}: Deleted {len(batch_keys)} items")
             except Exception as e:
                 logger.error(f"Failed to delete batch {i // batch_size + 1}: {str(e)}")
@@ -436,7 +546,29 @@ class S3VectorsStore(BaseStore):
         *,
         refresh_ttl: bool | None = None,
     ) -> Item | None:
-        return self.get(namespace, key, refresh_ttl=refresh_ttl)
+        return await self._run_blocking(self.get, namespace, key, refresh_ttl=refresh_ttl)
+
+    async def aembed_query(self, query: str) -> list[float]:
+        return await self._run_blocking(self.embed_query, query)
+
+    async def asearch_by_vector(
+        self,
+        namespace_prefix: Namespace,
+        query_vec: list[float],
+        /,
+        *,
+        filter: dict[str, Any] | None = None,
+        limit: int = 10,
+        offset: int = 0,
+    ) -> list[SearchItem]:
+        return await self._run_blocking(
+            self.search_by_vector,
+            namespace_prefix,
+            query_vec,
+            filter=filter,
+            limit=limit,
+            offset=offset,
+        )
 
     async def asearch(
         self,
@@ -449,7 +581,8 @@ class S3VectorsStore(BaseStore):
         offset: int = 0,
         refresh_ttl: bool | None = None,
     ) -> list[SearchItem]:
-        return self.search(
+        return await self._run_blocking(
+            self.search,
             namespace_prefix,
             query=query,
             filter=filter,
@@ -467,10 +600,18 @@ class S3VectorsStore(BaseStore):
         *,
         ttl: float | None | NotProvided = NOT_PROVIDED,
     ) -> None:
-        self.put(namespace, key, value, index, ttl=ttl)
+        await self._run_blocking(self.put, namespace, key, value, index, ttl=ttl)
 
     async def adelete(self, namespace: Namespace, key: str) -> None:
-        self.delete(namespace, key)
+        await self._run_blocking(self.delete, namespace, key)
+
+    async def apatch_values(
+        self,
+        namespace: Namespace,
+        updates: dict[str, dict[str, Any]],
+        increments: Optional[dict[str, dict[str, int]]] = None,
+    ) -> int:
+        return await self._run_blocking(self.patch_values, namespace, updates, increments)
 
     async def alist_namespaces(
         self,
@@ -609,7 +750,8 @@ class S3VectorsStore(BaseStore):
         fallback_to_med: bool = True,
         limit: int = None,
     ) -> dict[str, Any] | None:
-        return self.get_random_recent_high_importance(
+        return await self._run_blocking(
+            self.get_random_recent_high_importance,
             user_id,
             include_current_week=include_current_week,
             fallback_to_med=fallback_to_med,
@@ -624,7 +766,13 @@ class S3VectorsStore(BaseStore):
         max_results: int = 500,
         limit: int | None = None,
     ) -> list[SearchItem]:
-        """List vectors in a namespace with filtering during pagination.
+        """List vectors in a namespace.
+
+        Fully specified namespaces are served from the namespace index when one is
+        configured, fetching only that namespace's keys. Wildcard namespaces, and the
+        first listing of a namespace the index has not seen yet, fall back to paging
+        through the vector index with client-side filtering; a complete scan then
+        seeds the index.
 
         Args:
             namespace: Tuple of namespace values to filter by. None values act as
@@ -637,15 +785,147 @@ class S3VectorsStore(BaseStore):
             List of SearchItems matching the namespace filter
 
         """
-        filtered_items = self._fetch_and_filter_paginated(
+        if self._namespace_index_ready(namespace):
+            return self._list_from_index(namespace, return_metadata=return_metadata, limit=limit)
+
+        seed_index = (
+            self._ns_index is not None and self._is_concrete_namespace(namespace) and return_metadata and not limit
+        )
+        epoch = self._namespace_index_epoch(namespace) if seed_index else None
+        filtered_items, complete = self._fetch_and_filter_paginated_with_status(
             namespace=namespace,
             return_metadata=return_metadata,
             max_results=max_results,
             limit=limit,
         )
+        if epoch is not None and complete:
+            self._rebuild_namespace_index(namespace, filtered_items, epoch)
 
         return filtered_items
 
+    def count_by_namespace(self, namespace: Namespace) -> int:
+        """Count items in a namespace, using the namespace index when available."""
+        if not self._namespace_index_ready(namespace):
+            items = self.list_by_namespace(namespace, return_metadata=True)
+            if not self._namespace_index_ready(namespace):
+                return len(items)
+        return self._ns_index.count(namespace)
+
+    def get_oldest_in_namespace(self, namespace: Namespace) -> SearchItem | None:
+        """Return the item with the oldest last_accessed/created_at in a namespace."""
+        if not self._namespace_index_ready(namespace):
+            items = self.list_by_namespace(namespace, return_metadata=True)
+            if not self._namespace_index_ready(namespace):
+                if not items:
+                    return None
+                return min(items, key=lambda item: item.value.get("last_accessed") or item.value.get("created_at", ""))
+        while True:
+            oldest_key = self._ns_index.oldest(namespace)
+            if oldest_key is None:
+                return None
+            found = self._fetch_items_by_keys(namespace, [oldest_key], return_metadata=True)
+            if found:
+                return found[0]
+
+    def _is_concrete_namespace(self, namespace: Namespace) -> bool:
+        return bool(namespace) and all(isinstance(part, str) and part for part in namespace)
+
+    def _namespace_index_ready(self, namespace: Namespace) -> bool:
+        if self._ns_index is None or not self._is_concrete_namespace(namespace):
+            return False
+        try:
+            return self._ns_index.is_ready(namespace)
+        except Exception as e:
+            logger.warning(f"Namespace index unavailable, falling back to scan: {e}")
+            return False
+
+    def _namespace_index_epoch(self, namespace: Namespace) -> int | None:
+        try:
+            return self._ns_index.write_epoch(namespace)
+        except Exception as e:
+            logger.warning(f"Namespace index unavailable, not seeding it: {e}")
+            return None
+
+    def _rebuild_namespace_index(self, namespace: Namespace, items: list[SearchItem], epoch: int) -> None:
+        """Seed the index from a complete scan, unless a write was recorded since ``epoch``."""
+        fallback = _utc_now_iso()
+        entries = [(item.key, namespace_sort_score(item.value, item.created_at or fallback)) for item in items]
+        try:
+            if self._ns_index.rebuild(namespace, entries, epoch=epoch):
+                logger.info(f"s3v.namespace_index.rebuilt: namespace={_join_namespace(namespace)} count={len(entries)}")
+            else:
+                logger.info(f"s3v.namespace_index.rebuild_skipped: namespace={_join_namespace(namespace)} writes raced the scan")
+        except Exception as e:
+            logger.warning(f"Failed to rebuild namespace index for {_join_namespace(namespace)}: {e}")
+
+    def _index_put(self, namespace: Namespace, scores: dict[str, float]) -> None:
+        if self._ns_index is None or not self._is_concrete_namespace(namespace):
+            return
+        try:
+            for key, score in scores.items():
+                self._ns_index.record_put(namespace, key, score)
+        except Exception as e:
+            self._invalidate_namespace_index(namespace, e)
+
+    def _index_delete(self, namespace: Namespace, keys: list[str]) -> None:
+        if self._ns_index is None or not self._is_concrete_namespace(namespace):
+            return
+        try:
+            self._ns_index.record_delete(namespace, keys)
+        except Exception as e:
+            self._invalidate_namespace_index(namespace, e)
+
+    def _invalidate_namespace_index(self, namespace: Namespace, error: Exception) -> None:
+        # The vector write already happened; drop the namespace back to scanning
+        # rather than failing the caller or trusting an index that missed it.
+        logger.error(f"Failed to update namespace index for {_join_namespace(namespace)}, invalidating it: {error}")
+        try:
+            self._ns_index.invalidate(namespace)
+        except Exception as cleanup_error:
+            logger.error(f"Failed to invalidate namespace index for {_join_namespace(namespace)}: {cleanup_error}")
+
+    def _list_from_index(
+        self,
+        namespace: Namespace,
+        *,
+        return_metadata: bool,
+        limit: int | None,
+    ) -> list[SearchItem]:
+        keys = self._ns_index.keys(namespace, limit=limit)
+        return self._fetch_items_by_keys(namespace, keys, return_metadata=return_metadata)
+
+    def _fetch_items_by_keys(
+        self,
+        namespace: Namespace,
+        keys: list[str],
+        *,
+        return_metadata: bool,
+    ) -> list[SearchItem]:
+        """Fetch items by doc key in index order, pruning keys whose vectors no longer exist."""
+        by_point_id = {str(_compose_point_uuid(namespace, key)): key for key in keys}
+        found: dict[str, SearchItem] = {}
+        point_ids = list(by_point_id)
+        for i in range(0, len(point_ids), GET_VECTORS_MAX_KEYS):
+            res = self._s3v.get_vectors(
+                vectorBucketName=self._bucket,
+                indexName=self._index,
+                keys=point_ids[i : i + GET_VECTORS_MAX_KEYS],
+                returnMetadata=True,
+            )
+            for vector in cast(list[dict[str, Any]], res.get("vectors") or []):
+                doc_key = by_point_id.get(cast(str, vector.get("key") or ""))
+                if doc_key is None:
+                    continue
+                item = self._parse_vector_to_search_item(vector, namespace, return_metadata)
+                if item:
+                    found[doc_key] = item
+
+        missing = [key for key in keys if key not in found]
+        if missing:
+            logger.info(f"s3v.namespace_index.prune: namespace={_join_namespace(namespace)} stale={len(missing)}")
+            self._index_delete(namespace, missing)
+        return [found[key] for key in keys if key in found]
+
     def _fetch_and_filter_paginated(
         self,
         namespace: Namespace,
@@ -654,6 +934,17 @@ class S3VectorsStore(BaseStore):
         limit: int | None = None,
     ) -> list[SearchItem]:
         """Fetch vectors with pagination, filtering by namespace on each page."""
+        filtered_items, _ = self._fetch_and_filter_paginated_with_status(namespace, return_metadata, max_results, limit)
+        return filtered_items
+
+    def _fetch_and_filter_paginated_with_status(
+        self,
+        namespace: Namespace,
+        return_metadata: bool,
+        max_results: int,
+        limit: int | None = None,
+    ) -> tuple[list[SearchItem], bool]:
+        """Scan the index for a namespace and report whether the scan reached the last page."""
         filtered_items: list[SearchItem] = []
         next_token: str | None = None
         page_count = 0
@@ -672,19 +963,17 @@ class S3VectorsStore(BaseStore):
                 if item:
                     filtered_items.append(item)
                     if limit and len(filtered_items) >= limit:
-                        return filtered_items
+                        return filtered_items, False
 
             next_token = response.get("nextToken")
             if not next_token:
-                break
-
-        if page_count >= self.MAX_PAGINATION_PAGES:
-            logger.warning(
-                f"Reached max page limit ({self.MAX_PAGINATION_PAGES}). "
-                f"Retrieved {len(filtered_items)} matching vectors. Results may be incomplete."
-            )
+                return filtered_items, True
 
-        return filtered_items
+        logger.warning(
+            f"Reached max page limit ({self.MAX_PAGINATION_PAGES}). "
+            f"Retrieved {len(filtered_items)} matching vectors. Results may be incomplete."
+        )
+        return filtered_items, False
 
     def _fetch_single_page(
         self,
@@ -796,7 +1085,8 @@ class S3VectorsStore(BaseStore):
         limit: int | None = None,
     ) -> list[SearchItem]:
         """Async version of list_by_namespace."""
-        return self.list_by_namespace(
+        return await self._run_blocking(
+            self.list_by_namespace,
             namespace,
             return_metadata=return_metadata,
             max_results=max_results,
@@ -866,12 +1156,7 @@ class S3VectorsStore(BaseStore):
 
     def _embed_texts(self, texts: list[str]) -> list[list[float]]:
         joined: list[list[float]] = []
-        for text in texts:
-            payload = {"inputText": text}
-            res = self._bedrock.invoke_model(modelId=self._model_id, body=json.dumps(payload))
-            body = res.get("body")
-            data = json.loads(body.read()) if hasattr(body, "read") else json.loads(body)
-            embedding = cast(list[float], data.get("embedding") or [])
+        for embedding in self._embeddings.embed_documents(texts):
             if len(embedding) != self._dims:
                 if len(embedding) > self._dims:
                     embedding = embedding[: self._dims]
@@ -1,20 +1,122 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
+import json
+import logging
+import threading
+from collections.abc import Iterator, Mapping
 from contextlib import suppress
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, Optional, Protocol
 
+logger = logging.getLogger(__name__)
 
-class InMemorySessionStore:
-    def __init__(self, ttl_hours: int = 24*30, cleanup_interval_minutes: int = 60) -> None:  # 30 days for dev
+DEFAULT_SHARDS: int = 16
+# Heap entries examined per shard before the periodic cleanup yields to the event loop.
+CLEANUP_BATCH_SIZE: int = 500
+# Most-recently written threads remembered per user, newest first.
+RECENT_THREADS_PER_USER: int = 5
+
+
+class SessionStore(Protocol):
+    """Per-thread conversation context shared by the API handlers and memory jobs."""
+
+    async def get_user_threads(self, user_id: str) -> list[str]: ...
+
+    async def get_recent_user_threads(self, user_id: str) -> list[str]: ...
+
+    async def get_session(self, session_id: str) -> dict[str, Any] | None: ...
+
+    async def peek_session(self, session_id: str) -> dict[str, Any] | None: ...
+
+    async def set_session(self, session_id: str, context: dict[str, Any]) -> None: ...
+
+    async def update_session_fields(self, session_id: str, fields: dict[str, Any]) -> bool: ...
+
+    async def update_session_access(self, session_id: str) -> None: ...
+
+    async def get_memory_counter(self, session_id: str | None, memory_type: str) -> int | None: ...
+
+    async def set_memory_counter(self, session_id: str | None, memory_type: str, count: int) -> None: ...
+
+    async def increment_memory_counter(
+        self, session_id: str | None, memory_type: str, delta: int = 1
+    ) -> int | None: ...
+
+    async def invalidate_memory_counter(self, session_id: str | None, memory_type: str | None = None) -> None: ...
+
+
+class _Shard:
+    """One slice of the store; every field is guarded by ``mutex``."""
+
+    __slots__ = ("mutex", "sessions", "locks", "owners", "user_threads", "recent", "expiry", "scheduled")
+
+    def __init__(self) -> None:
+        self.mutex = threading.Lock()
         self.sessions: dict[str, dict[str, Any]] = {}
         self.locks: dict[str, asyncio.Lock] = {}
+        self.owners: dict[str, str] = {}  # session_id -> user_id
         self.user_threads: dict[str, set[str]] = {}  # user_id -> set of thread_ids
+        self.recent: dict[str, list[str]] = {}  # user_id -> thread_ids, most recently written first
+        self.expiry: list[tuple[float, str]] = []  # min-heap of (deadline, session_id)
+        self.scheduled: set[str] = set()
+
+
+class _ShardedView(Mapping):
+    """Read-only mapping over one per-shard dict, keyed the same way as the shards."""
+
+    def __init__(self, store: InMemorySessionStore, field: str) -> None:
+        self._store = store
+        self._field = field
+
+    def _part(self, key: str) -> dict[str, Any]:
+        return getattr(self._store._shard(key), self._field)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._part(key)[key]
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and key in self._part(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for shard in self._store._shards:
+            yield from list(getattr(shard, self._field))
+
+    def __len__(self) -> int:
+        return sum(len(getattr(shard, self._field)) for shard in self._store._shards)
+
+
+class InMemorySessionStore:
+    """Process-local session store split into independently locked shards.
+
+    Sessions and user -> thread mappings are hashed onto ``shards`` slices, each
+    guarded by a short ``threading.Lock`` that is never held across an await, so
+    unrelated threads never contend. Each session has at most one entry in its
+    shard's expiry heap; access only rewrites ``last_accessed`` and the heap
+    entry is revalidated when it comes due, so cleanup touches only sessions
+    that may have expired instead of scanning the whole store.
+    """
+
+    def __init__(
+        self, ttl_hours: int = 24*30, cleanup_interval_minutes: int = 60, shards: int = DEFAULT_SHARDS
+    ) -> None:  # 30 days for dev
+        self._shards = [_Shard() for _ in range(max(1, int(shards)))]
+        self.sessions: Mapping[str, dict[str, Any]] = _ShardedView(self, "sessions")
+        self.locks: Mapping[str, asyncio.Lock] = _ShardedView(self, "locks")
+        self.user_threads: Mapping[str, set[str]] = _ShardedView(self, "user_threads")
         self.ttl = timedelta(hours=ttl_hours)
         self.cleanup_interval = timedelta(minutes=cleanup_interval_minutes)
         self.cleanup_task: asyncio.Task | None = None
-        self._store_lock = asyncio.Lock()
+
+    def _shard(self, key: str) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def _is_expired(self, ctx: dict[str, Any], now: datetime) -> bool:
+        return now - ctx.get("last_accessed", now) > self.ttl
+
+    def _deadline(self, last_accessed: datetime) -> float:
+        return (last_accessed + self.ttl).timestamp()
 
     async def start(self) -> None:
         if self.cleanup_task is None:
@@ -31,116 +133,432 @@ class InMemorySessionStore:
         while True:
             try:
                 await asyncio.sleep(self.cleanup_interval.total_seconds())
-                await self.cleanup_expired()
+                await self.cleanup_expired(batch_size=CLEANUP_BATCH_SIZE)
             except asyncio.CancelledError:
                 break
             except Exception:
                 # Best-effort cleanup; ignore errors
                 pass
 
-    async def cleanup_expired(self) -> None:
+    def _evict_locked(self, shard: _Shard, session_id: str) -> str | None:
+        """Drop a session from its shard (mutex held) and return its owner for unlinking."""
+        shard.sessions.pop(session_id, None)
+        shard.locks.pop(session_id, None)
+        return shard.owners.pop(session_id, None)
+
+    def _unlink_user(self, user_id: str | None, session_id: str) -> None:
+        if not user_id:
+            return
+        shard = self._shard(user_id)
+        with shard.mutex:
+            threads = shard.user_threads.get(user_id)
+            if threads is not None:
+                threads.discard(session_id)
+                if not threads:
+                    del shard.user_threads[user_id]
+            recent = shard.recent.get(user_id)
+            if recent is not None and session_id in recent:
+                recent.remove(session_id)
+                if not recent:
+                    del shard.recent[user_id]
+
+    def _expire_due(self, shard: _Shard, now: datetime, limit: int | None) -> tuple[list[tuple[str, str | None]], bool]:
+        """Pop due heap entries; returns evicted (session_id, owner) pairs and whether more are due."""
+        now_ts = now.timestamp()
+        evicted: list[tuple[str, str | None]] = []
+        processed = 0
+        with shard.mutex:
+            while shard.expiry and shard.expiry[0][0] < now_ts:
+                if limit is not None and processed >= limit:
+                    return evicted, True
+                processed += 1
+                _, session_id = heapq.heappop(shard.expiry)
+                shard.scheduled.discard(session_id)
+                ctx = shard.sessions.get(session_id)
+                if ctx is None:
+                    continue
+                if self._is_expired(ctx, now):
+                    evicted.append((session_id, self._evict_locked(shard, session_id)))
+                else:
+                    # Touched since it was scheduled: move it to its current deadline.
+                    heapq.heappush(shard.expiry, (self._deadline(ctx.get("last_accessed", now)), session_id))
+                    shard.scheduled.add(session_id)
+        return evicted, False
+
+    async def cleanup_expired(self, batch_size: int | None = None) -> int:
+        """Evict expired sessions; with ``batch_size`` the loop yields after each batch."""
         now = datetime.now()
-        expired = [
-            sid
-            for sid, ctx in self.sessions.items()
-            if now - ctx.get("last_accessed", now) > self.ttl
-        ]
-        async with self._store_lock:
-            for sid in expired:
-                self.sessions.pop(sid, None)
-                self.locks.pop(sid, None)
-                self._cleanup_user_thread_mapping(sid)
+        removed = 0
+        for shard in self._shards:
+            more = True
+            while more:
+                evicted, more = self._expire_due(shard, now, batch_size)
+                for session_id, owner in evicted:
+                    self._unlink_user(owner, session_id)
+                removed += len(evicted)
+                if batch_size is not None:
+                    await asyncio.sleep(0)
+        return removed
 
     def _cleanup_user_thread_mapping(self, session_id: str) -> None:
-        """Remove session from user_threads mapping when session expires."""
-        for user_threads in self.user_threads.values():
-            user_threads.discard(session_id)
-        # Clean up empty user entries
-        self.user_threads = {k: v for k, v in self.user_threads.items() if v}
+        """Remove session from its owner's user_threads entry (dropping the entry once empty)."""
+        shard = self._shard(session_id)
+        with shard.mutex:
+            owner = shard.owners.get(session_id)
+        self._unlink_user(owner, session_id)
 
     async def get_user_threads(self, user_id: str) -> list[str]:
         """Get all thread IDs for a user (O(1) lookup)."""
-        return list(self.user_threads.get(user_id, set()))
+        shard = self._shard(user_id)
+        with shard.mutex:
+            return list(shard.user_threads.get(user_id, ()))
+
+    async def get_recent_user_threads(self, user_id: str) -> list[str]:
+        """Threads the user most recently wrote to, newest first (O(1) lookup)."""
+        shard = self._shard(user_id)
+        with shard.mutex:
+            return list(shard.recent.get(user_id, ()))
 
     async def get_session(self, session_id: str) -> dict[str, Any] | None:
-        ctx = self.sessions.get(session_id)
-        if ctx:
-            if datetime.now() - ctx.get("last_accessed", datetime.now()) > self.ttl:
-                async with self._store_lock:
-                    self.sessions.pop(session_id, None)
-                    self.locks.pop(session_id, None)
-                    self._cleanup_user_thread_mapping(session_id)
+        now = datetime.now()
+        shard = self._shard(session_id)
+        with shard.mutex:
+            ctx = shard.sessions.get(session_id)
+            if not ctx:
                 return None
-            ctx["last_accessed"] = datetime.now()
-            return ctx
+            if not self._is_expired(ctx, now):
+                ctx["last_accessed"] = now
+                return ctx
+            owner = self._evict_locked(shard, session_id)
+        self._unlink_user(owner, session_id)
         return None
 
-    async def set_session(self, session_id: str, context: dict[str, Any]) -> None:
-        context["last_accessed"] = datetime.now()
-        async with self._store_lock:
-            self.sessions[session_id] = context
-            if session_id not in self.locks:
-                self.locks[session_id] = asyncio.Lock()
+    async def peek_session(self, session_id: str) -> dict[str, Any] | None:
+        """Read a session without refreshing its access time."""
+        shard = self._shard(session_id)
+        with shard.mutex:
+            ctx = shard.sessions.get(session_id)
+            if ctx and not self._is_expired(ctx, datetime.now()):
+                return ctx
+        return None
 
-            # Maintain user_id -> thread_id mapping
-            user_id = context.get("user_id")
+    async def set_session(self, session_id: str, context: dict[str, Any]) -> None:
+        now = datetime.now()
+        context["last_accessed"] = now
+        user_id = context.get("user_id")
+        shard = self._shard(session_id)
+        with shard.mutex:
+            shard.sessions[session_id] = context
+            if session_id not in shard.locks:
+                shard.locks[session_id] = asyncio.Lock()
+            if session_id not in shard.scheduled:
+                heapq.heappush(shard.expiry, (self._deadline(now), session_id))
+                shard.scheduled.add(session_id)
+            previous_owner = shard.owners.get(session_id)
             if user_id:
-                if user_id not in self.user_threads:
-                    self.user_threads[user_id] = set()
-                self.user_threads[user_id].add(session_id)
+                shard.owners[session_id] = user_id
+
+        # Maintain user_id -> thread_id mapping and the user's recent-thread list
+        if user_id and user_id != previous_owner:
+            self._unlink_user(previous_owner, session_id)
+        if user_id:
+            user_shard = self._shard(user_id)
+            with user_shard.mutex:
+                user_shard.user_threads.setdefault(user_id, set()).add(session_id)
+                recent = user_shard.recent.setdefault(user_id, [])
+                if session_id in recent:
+                    recent.remove(session_id)
+                recent.insert(0, session_id)
+                del recent[RECENT_THREADS_PER_USER:]
+
+    async def update_session_fields(self, session_id: str, fields: dict[str, Any]) -> bool:
+        """Merge ``fields`` into a live session without touching its access time or recency."""
+        shard = self._shard(session_id)
+        with shard.mutex:
+            ctx = shard.sessions.get(session_id)
+            if ctx is None or self._is_expired(ctx, datetime.now()):
+                return False
+            ctx.update(fields)
+            return True
 
     async def update_session_access(self, session_id: str) -> None:
-        if session_id in self.sessions:
-            self.sessions[session_id]["last_accessed"] = datetime.now()
+        shard = self._shard(session_id)
+        with shard.mutex:
+            ctx = shard.sessions.get(session_id)
+            if ctx is not None:
+                ctx["last_accessed"] = datetime.now()
+
+    def _live_counters_locked(self, shard: _Shard, session_id: str, now: datetime) -> dict[str, Any] | None:
+        ctx = shard.sessions.get(session_id)
+        if ctx is None or self._is_expired(ctx, now):
+            return None
+        ctx["last_accessed"] = now
+        counters = ctx.get("memory_counters")
+        if not isinstance(counters, dict):
+            counters = ctx["memory_counters"] = {}
+        return counters
 
     async def get_memory_counter(self, session_id: str | None, memory_type: str) -> int | None:
         if not session_id:
             return None
-        ctx = await self.get_session(session_id) or {}
-        counters = ctx.get("memory_counters") or {}
-        mt = counters.get(memory_type) or {}
-        count = mt.get("count")
+        shard = self._shard(session_id)
+        with shard.mutex:
+            counters = self._live_counters_locked(shard, session_id, datetime.now()) or {}
+            count = (counters.get(memory_type) or {}).get("count")
         return count if isinstance(count, int) else None
 
     async def set_memory_counter(self, session_id: str | None, memory_type: str, count: int) -> None:
         if not session_id:
             return
-        ctx = await self.get_session(session_id) or {}
-        counters = dict(ctx.get("memory_counters") or {})
-        mt = dict(counters.get(memory_type) or {})
-        mt["count"] = int(count)
-        mt["last_synced_at"] = datetime.now().isoformat()
-        counters[memory_type] = mt
-        ctx["memory_counters"] = counters
-        await self.set_session(session_id, ctx)
+        now = datetime.now()
+        entry = {"count": int(count), "last_synced_at": now.isoformat()}
+        shard = self._shard(session_id)
+        with shard.mutex:
+            counters = self._live_counters_locked(shard, session_id, now)
+            if counters is not None:
+                counters[memory_type] = entry
+                return
+        await self.set_session(session_id, {"memory_counters": {memory_type: entry}})
 
     async def increment_memory_counter(self, session_id: str | None, memory_type: str, delta: int = 1) -> int | None:
         if not session_id:
             return None
-        current = await self.get_memory_counter(session_id, memory_type)
-        if current is None:
+        now = datetime.now()
+        shard = self._shard(session_id)
+        with shard.mutex:
+            counters = self._live_counters_locked(shard, session_id, now) or {}
+            current = (counters.get(memory_type) or {}).get("count")
+            if not isinstance(current, int):
+                return None
+            new_val = max(0, current + int(delta))
+            counters[memory_type] = {"count": new_val, "last_synced_at": now.isoformat()}
+        return new_val
+
+    async def invalidate_memory_counter(self, session_id: str | None, memory_type: str | None = None) -> None:
+        if not session_id:
+            return
+        shard = self._shard(session_id)
+        with shard.mutex:
+            counters = self._live_counters_locked(shard, session_id, datetime.now())
+            if counters is None:
+                return
+            if memory_type:
+                counters.pop(memory_type, None)
+            else:
+                counters.clear()
+
+
+class RedisSessionStore:
+    """Session store shared by every replica.
+
+    Each session is one JSON document with a sliding TTL, so the replica that
+    accepted a message and the one serving its SSE stream see the same context.
+    User -> thread membership is a set per user, pruned lazily as sessions
+    expire, and memory counters live in a hash per session so increments are
+    atomic across replicas.
+    """
+
+    def __init__(self, client: Any = None, *, prefix: str = "session", ttl_hours: int = 24 * 30) -> None:
+        self._client = client
+        self._prefix = prefix.rstrip(":")
+        self.ttl = timedelta(hours=ttl_hours)
+        self._ttl_seconds = int(self.ttl.total_seconds())
+
+    async def _get_client(self) -> Any:
+        if self._client is None:
+            from app.services.memory.redis_client import get_redis_client_singleton
+
+            self._client = await get_redis_client_singleton()
+        return self._client
+
+    async def start(self) -> None:
+        """Redis expires sessions itself; kept for parity with ``InMemorySessionStore``."""
+
+    async def stop(self) -> None:
+        """Redis expires sessions itself; kept for parity with ``InMemorySessionStore``."""
+
+    def _ctx_key(self, session_id: str) -> str:
+        return f"{self._prefix}:ctx:{session_id}"
+
+    def _user_threads_key(self, user_id: str) -> str:
+        return f"{self._prefix}:user_threads:{user_id}"
+
+    def _counters_key(self, session_id: str) -> str:
+        return f"{self._prefix}:counters:{session_id}"
+
+    def _recent_threads_key(self, user_id: str) -> str:
+        return f"{self._prefix}:user_recent:{user_id}"
+
+    @staticmethod
+    def _decode(raw: Any) -> str:
+        return raw.decode("utf-8") if isinstance(raw, (bytes, bytearray)) else str(raw)
+
+    @staticmethod
+    def _dumps(context: dict[str, Any]) -> str:
+        return json.dumps(context, default=lambda v: v.isoformat() if isinstance(v, datetime) else str(v))
+
+    def _loads(self, raw: Any) -> dict[str, Any] | None:
+        if raw is None:
+            return None
+        try:
+            ctx = json.loads(raw)
+        except (TypeError, ValueError):
+            logger.warning("session_store.redis.bad_payload")
             return None
-        new_val = max(0, int(current) + int(delta))
-        await self.set_memory_counter(session_id, memory_type, new_val)
+        accessed = ctx.get("last_accessed")
+        if isinstance(accessed, str):
+            with suppress(ValueError):
+                ctx["last_accessed"] = datetime.fromisoformat(accessed)
+        return ctx
+
+    async def get_user_threads(self, user_id: str) -> list[str]:
+        client = await self._get_client()
+        thread_ids = sorted(self._decode(m) for m in await client.smembers(self._user_threads_key(user_id)))
+        if not thread_ids:
+            return []
+        pipe = client.pipeline(transaction=False)
+        for thread_id in thread_ids:
+            pipe.exists(self._ctx_key(thread_id))
+        alive = await pipe.execute()
+        expired = [t for t, present in zip(thread_ids, alive, strict=True) if not present]
+        if expired:
+            await client.srem(self._user_threads_key(user_id), *expired)
+        return [t for t, present in zip(thread_ids, alive, strict=True) if present]
+
+    async def get_recent_user_threads(self, user_id: str) -> list[str]:
+        """Threads the user most recently wrote to, newest first; expired ones are skipped."""
+        client = await self._get_client()
+        key = self._recent_threads_key(user_id)
+        thread_ids = [self._decode(m) for m in await client.zrevrange(key, 0, RECENT_THREADS_PER_USER - 1)]
+        if not thread_ids:
+            return []
+        pipe = client.pipeline(transaction=False)
+        for thread_id in thread_ids:
+            pipe.exists(self._ctx_key(thread_id))
+        alive = await pipe.execute()
+        expired = [t for t, present in zip(thread_ids, alive, strict=True) if not present]
+        if expired:
+            await client.zrem(key, *expired)
+        return [t for t, present in zip(thread_ids, alive, strict=True) if present]
+
+    async def get_session(self, session_id: str) -> dict[str, Any] | None:
+        client = await self._get_client()
+        pipe = client.pipeline(transaction=False)
+        pipe.get(self._ctx_key(session_id))
+        pipe.expire(self._ctx_key(session_id), self._ttl_seconds)
+        raw, _ = await pipe.execute()
+        ctx = self._loads(raw)
+        if ctx is not None:
+            ctx["last_accessed"] = datetime.now()
+        return ctx
+
+    async def peek_session(self, session_id: str) -> dict[str, Any] | None:
+        """Read a session without refreshing its TTL."""
+        client = await self._get_client()
+        return self._loads(await client.get(self._ctx_key(session_id)))
+
+    async def set_session(self, session_id: str, context: dict[str, Any]) -> None:
+        context["last_accessed"] = datetime.now()
+        client = await self._get_client()
+        pipe = client.pipeline(transaction=False)
+        pipe.set(self._ctx_key(session_id), self._dumps(context), ex=self._ttl_seconds)
+        user_id = context.get("user_id")
+        if user_id:
+            pipe.sadd(self._user_threads_key(str(user_id)), session_id)
+            pipe.expire(self._user_threads_key(str(user_id)), self._ttl_seconds)
+            recent_key = self._recent_threads_key(str(user_id))
+            pipe.zadd(recent_key, {session_id: context["last_accessed"].timestamp()})
+            pipe.zremrangebyrank(recent_key, 0, -(RECENT_THREADS_PER_USER + 1))
+            pipe.expire(recent_key, self._ttl_seconds)
+        await pipe.execute()
+
+    async def update_session_fields(self, session_id: str, fields: dict[str, Any]) -> bool:
+        """Merge ``fields`` into a live session, keeping its TTL and the user's recent-thread order.
+
+        The read and write run under WATCH, so a ``set_session`` from another
+        task or replica in between makes this retry on the new context instead
+        of overwriting it.
+        """
+        from redis.exceptions import WatchError
+
+        client = await self._get_client()
+        key = self._ctx_key(session_id)
+        async with client.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(key)
+                    ctx = self._loads(await pipe.get(key))
+                    if ctx is None:
+                        return False
+                    ctx.update(fields)
+                    pipe.multi()
+                    # xx: never resurrect a session that expired between the read and the write.
+                    pipe.set(key, self._dumps(ctx), keepttl=True, xx=True)
+                    (stored,) = await pipe.execute()
+                    return bool(stored)
+                except WatchError:
+                    continue
+
+    async def update_session_access(self, session_id: str) -> None:
+        client = await self._get_client()
+        await client.expire(self._ctx_key(session_id), self._ttl_seconds)
+
+    async def get_memory_counter(self, session_id: str | None, memory_type: str) -> int | None:
+        if not session_id:
+            return None
+        client = await self._get_client()
+        raw = await client.hget(self._counters_key(session_id), memory_type)
+        return int(raw) if raw is not None else None
+
+    async def set_memory_counter(self, session_id: str | None, memory_type: str, count: int) -> None:
+        if not session_id:
+            return
+        client = await self._get_client()
+        pipe = client.pipeline(transaction=False)
+        pipe.hset(self._counters_key(session_id), mapping={memory_type: int(count)})
+        pipe.expire(self._counters_key(session_id), self._ttl_seconds)
+        await pipe.execute()
+
+    async def increment_memory_counter(self, session_id: str | None, memory_type: str, delta: int = 1) -> int | None:
+        if not session_id:
+            return None
+        client = await self._get_client()
+        key = self._counters_key(session_id)
+        # Only adjust counters that were seeded from the store; an unknown count stays unknown.
+        if not await client.hexists(key, memory_type):
+            return None
+        new_val = int(await client.hincrby(key, memory_type, int(delta)))
+        if new_val < 0:
+            await client.hset(key, mapping={memory_type: 0})
+            new_val = 0
         return new_val
 
     async def invalidate_memory_counter(self, session_id: str | None, memory_type: str | None = None) -> None:
         if not session_id:
             return
-        ctx = await self.get_session(session_id) or {}
-        counters = dict(ctx.get("memory_counters") or {})
+        client = await self._get_client()
         if memory_type:
-            counters.pop(memory_type, None)
+            await client.hdel(self._counters_key(session_id), memory_type)
         else:
-            counters = {}
-        ctx["memory_counters"] = counters
-        await self.set_session(session_id, ctx)
+            await client.delete(self._counters_key(session_id))
+
 
+_session_store: Optional[SessionStore] = None
 
-_session_store = InMemorySessionStore()
 
+def get_session_store() -> SessionStore:
+    """Return the process-wide session store for ``SESSION_STORE_BACKEND`` ("local" or "redis")."""
+    global _session_store
+    if _session_store is None:
+        from app.core.config import config as app_config
 
-def get_session_store() -> InMemorySessionStore:
+        backend = (app_config.SESSION_STORE_BACKEND or "local").lower()
+        if backend == "local":
+            _session_store = InMemorySessionStore()
+        elif backend == "redis":
+            _session_store = RedisSessionStore()
+        else:
+            raise ValueError(f"Unknown SESSION_STORE_BACKEND: {backend!r}")
     return _session_store
 
 
@@ -0,0 +1,113 @@
+"""Microbenchmark for ``FOSHttpClient`` against a local ASGI stand-in for FOS.
+
+Run with::
+
+    poetry run python -m app.scripts.fos_http_client_benchmark --concurrency 1 16 64
+
+The stand-in answers every GET after ``--latency-ms`` and counts the requests
+it served. ``per-request`` builds a fresh ``httpx.AsyncClient`` for every call,
+which is how the client used to work; ``pooled`` goes through one
+``FOSConnectionPool``. ``--distinct-keys`` sets how many different URLs the
+callers spread over, so a small value shows the effect of GET coalescing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import httpx
+
+from app.services.external_context.http_client import FOSCircuitBreaker, FOSConnectionPool, FOSHttpClient
+
+BASE_URL: str = "http://fos.local"
+
+
+class FOSStandIn:
+    """Minimal ASGI app that returns a small JSON body after a fixed delay."""
+
+    def __init__(self, latency_seconds: float):
+        self.latency_seconds = latency_seconds
+        self.served = 0
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            return
+        self.served += 1
+        await asyncio.sleep(self.latency_seconds)
+        body = json.dumps({"path": scope["path"], "items": list(range(10))}).encode()
+        await send(
+            {"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]}
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+async def _per_request_get(app: FOSStandIn, endpoint: str) -> dict:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), timeout=15.0) as client:
+        resp = await client.get(f"{BASE_URL}{endpoint}")
+        resp.raise_for_status()
+        return resp.json()
+
+
+async def _run(mode: str, app: FOSStandIn, concurrency: int, requests: int, distinct_keys: int, seed: int) -> float:
+    rng = random.Random(seed)
+    endpoints = [f"/api/users/{rng.randrange(distinct_keys)}/profile" for _ in range(requests)]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    pool = None
+    client = None
+    if mode == "pooled":
+        pool = FOSConnectionPool(
+            transport=httpx.ASGITransport(app=app),
+            breaker=FOSCircuitBreaker(failure_threshold=1_000_000, reset_seconds=0),
+        )
+        client = FOSHttpClient(pool=pool)
+        client.base_url = BASE_URL
+
+    async def one(endpoint: str) -> None:
+        async with semaphore:
+            if client is None:
+                await _per_request_get(app, endpoint)
+            else:
+                await client.get(endpoint)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(endpoint) for endpoint in endpoints))
+    elapsed = time.perf_counter() - started
+    if pool is not None:
+        await pool.aclose()
+    return elapsed
+
+
+def run_case(
+    mode: str, concurrency: int, requests: int, distinct_keys: int, latency_ms: float, seed: int = 7
+) -> dict[str, float]:
+    """Run one benchmark cell and return throughput and upstream request counts."""
+    app = FOSStandIn(latency_ms / 1000)
+    elapsed = asyncio.run(_run(mode, app, concurrency, requests, distinct_keys, seed))
+    return {
+        "req_per_sec": requests / elapsed if elapsed else 0.0,
+        "upstream": float(app.served),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--distinct-keys", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'mode':>12} {'conc':>5} {'req/sec':>10} {'upstream':>9}")
+    for mode in ("per-request", "pooled"):
+        for concurrency in args.concurrency:
+            result = run_case(mode, concurrency, args.requests, args.distinct_keys, args.latency_ms)
+            print(f"{mode:>12} {concurrency:>5} {result['req_per_sec']:>10,.0f} {int(result['upstream']):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Microbenchmark for ``InMemorySessionStore`` throughput versus concurrency.
+
+Run with::
+
+    poetry run python -m app.scripts.session_store_benchmark --threads 1 4 16 --shards 1 16
+
+Each worker thread drives its own event loop through a mixed workload (reads,
+writes, counter increments and user-thread lookups) against one shared store,
+which is how the API loop and the cold-path worker threads reach it. Comparing
+``--shards 1`` with the default shows the effect of lock striping; the final
+column times one expiry sweep over that many freshly expired sessions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import threading
+import time
+
+from app.repositories.session_store import DEFAULT_SHARDS, InMemorySessionStore
+
+SWEEP_TTL_SECONDS: float = 0.05
+
+
+async def _worker(store: InMemorySessionStore, worker_id: int, ops: int, sessions: int, seed: int) -> None:
+    rng = random.Random(seed + worker_id)
+    for _ in range(ops):
+        session_id = f"s{rng.randrange(sessions)}"
+        roll = rng.random()
+        if roll < 0.6:
+            await store.get_session(session_id)
+        elif roll < 0.8:
+            await store.set_session(session_id, {"user_id": f"u{rng.randrange(sessions // 4 or 1)}"})
+        elif roll < 0.95:
+            await store.increment_memory_counter(session_id, "semantic")
+        else:
+            await store.get_user_threads(f"u{rng.randrange(sessions // 4 or 1)}")
+
+
+def _run_thread(store: InMemorySessionStore, worker_id: int, ops: int, sessions: int, seed: int) -> None:
+    asyncio.run(_worker(store, worker_id, ops, sessions, seed))
+
+
+async def _seed(store: InMemorySessionStore, sessions: int) -> None:
+    for i in range(sessions):
+        await store.set_session(f"s{i}", {"user_id": f"u{i // 4}"})
+        await store.set_memory_counter(f"s{i}", "semantic", 0)
+
+
+def run_case(threads: int, shards: int, ops_per_thread: int, sessions: int, seed: int = 7) -> dict[str, float]:
+    """Run one benchmark cell and return throughput and sweep timings."""
+    store = InMemorySessionStore(ttl_hours=1, shards=shards)
+    asyncio.run(_seed(store, sessions))
+
+    workers = [
+        threading.Thread(target=_run_thread, args=(store, i, ops_per_thread, sessions, seed)) for i in range(threads)
+    ]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    # Time one expiry sweep over a store whose sessions have all just expired.
+    expiring = InMemorySessionStore(ttl_hours=SWEEP_TTL_SECONDS / 3600, shards=shards)
+    asyncio.run(_seed(expiring, sessions))
+    time.sleep(SWEEP_TTL_SECONDS * 2)
+    sweep_started = time.perf_counter()
+    removed = asyncio.run(expiring.cleanup_expired())
+    sweep = time.perf_counter() - sweep_started
+
+    return {
+        "ops_per_sec": (threads * ops_per_thread) / elapsed if elapsed else 0.0,
+        "sweep_ms": sweep * 1000,
+        "removed": float(removed),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, DEFAULT_SHARDS])
+    parser.add_argument("--ops", type=int, default=20000, help="operations per thread")
+    parser.add_argument("--sessions", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'shards':>6} {'threads':>7} {'ops/sec':>12} {'sweep ms':>9} {'removed':>8}")
+    for shards in args.shards:
+        for threads in args.threads:
+            result = run_case(threads, shards, args.ops, args.sessions)
+            print(
+                f"{shards:>6} {threads:>7} {result['ops_per_sec']:>12,.0f} "
+                f"{result['sweep_ms']:>9.1f} {int(result['removed']):>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
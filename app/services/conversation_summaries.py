@@ -0,0 +1,97 @@
+"""Precomputed prior-conversation summaries.
+
+A thread's summary is computed once the conversation has gone idle and is
+stored on the thread's session next to a fingerprint of the chat it was built
+from. ``SupervisorService.initialize`` then reuses it as long as the
+conversation has not changed, instead of calling the LLM on every new thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any, Optional
+
+from app.core.config import config
+from app.core.runtime_registry import RuntimeRegistry
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_KEY: str = "conversation_summary"
+SUMMARY_FINGERPRINT_KEY: str = "conversation_summary_fingerprint"
+
+
+def conversation_fingerprint(pairs: list[tuple[str, str]]) -> str:
+    """Stable content hash of (role, content) chat pairs."""
+    payload = json.dumps(pairs, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _task_is_done(task: asyncio.Task) -> bool:
+    return task.done()
+
+
+class IdleSummaryScheduler:
+    """Debounced per-thread jobs: each ``touch`` restarts the thread's idle timer.
+
+    The job runs once no message has arrived for ``idle_seconds``. Timers live in
+    a bounded ``RuntimeRegistry``; a pending timer is never evicted.
+    """
+
+    def __init__(self, idle_seconds: float):
+        self.idle_seconds = idle_seconds
+        self._timers: RuntimeRegistry[asyncio.Task] = RuntimeRegistry(
+            "summary_timers",
+            max_entries=config.RUNTIME_REGISTRY_MAX_ENTRIES,
+            idle_ttl_seconds=config.RUNTIME_REGISTRY_IDLE_TTL_SECONDS,
+            is_evictable=_task_is_done,
+        )
+
+    def touch(self, thread_id: str, job: Callable[[], Awaitable[Any]]) -> None:
+        previous = self._timers.pop(thread_id, None)
+        if previous is not None and not previous.done():
+            previous.cancel()
+        if self.idle_seconds <= 0:
+            return
+        self._timers[thread_id] = asyncio.create_task(self._run_when_idle(thread_id, job))
+
+    async def _run_when_idle(self, thread_id: str, job: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await asyncio.sleep(self.idle_seconds)
+            await job()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"[SUMMARY] Idle summary failed for thread {thread_id}: {e}")
+        finally:
+            current = self._timers.get(thread_id)
+            if current is asyncio.current_task():
+                self._timers.pop(thread_id, None)
+
+    def pending(self) -> int:
+        return sum(1 for task in list(self._timers.values()) if not task.done())
+
+    async def stop(self) -> None:
+        tasks = [task for task in list(self._timers.values()) if not task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._timers.clear()
+
+
+_scheduler: Optional[IdleSummaryScheduler] = None
+
+
+def get_idle_summary_scheduler() -> IdleSummaryScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = IdleSummaryScheduler(config.CONVERSATION_SUMMARY_IDLE_SECONDS)
+    return _scheduler
+
+
+async def stop_idle_summary_scheduler() -> None:
+    if _scheduler is not None:
+        await _scheduler.stop()
@@ -0,0 +1,10 @@
+"""Shared text embedding service.
+
+Every Titan embedding in the app (memory store, knowledge base) goes through
+one cached, de-duplicating client keyed by model id and text hash.
+"""
+
+from .cache import EmbeddingCache, make_cache_key
+from .service import EmbeddingService, get_embedding_service
+
+__all__ = ["EmbeddingCache", "EmbeddingService", "get_embedding_service", "make_cache_key"]
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_MAX_ENTRIES: int = 10_000
+DEFAULT_DISK_MAX_ENTRIES: int = 200_000
+DISK_PRUNE_EVERY_WRITES: int = 256
+
+
+def make_cache_key(model_id: str, text: str) -> str:
+    """Content-address an embedding by model id and text."""
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{model_id}:{digest}"
+
+
+class EmbeddingCache:
+    """Bounded two-tier embedding cache: in-process LRU backed by an optional SQLite file.
+
+    Vectors are persisted as packed float32, which matches what S3 Vectors stores.
+    All operations are thread-safe so the cache can be shared by the store I/O pool
+    and the knowledge sync workers.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int | None = None,
+        disk_path: str | None = None,
+        disk_max_entries: int | None = None,
+    ) -> None:
+        self._max_entries = max(1, int(max_entries or DEFAULT_MEMORY_MAX_ENTRIES))
+        self._disk_max_entries = max(1, int(disk_max_entries or DEFAULT_DISK_MAX_ENTRIES))
+        self._memory: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk: sqlite3.Connection | None = None
+        self._disk_writes = 0
+        self._hits_memory = 0
+        self._hits_disk = 0
+        self._misses = 0
+        if disk_path:
+            self._disk = self._open_disk(disk_path)
+
+    @staticmethod
+    def _open_disk(disk_path: str) -> sqlite3.Connection | None:
+        try:
+            Path(disk_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(disk_path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL, created_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS embeddings_created_at ON embeddings (created_at)")
+            logger.info("embedding_cache.disk.opened path=%s", disk_path)
+            return conn
+        except Exception as e:
+            logger.warning("embedding_cache.disk.unavailable path=%s err=%s", disk_path, e)
+            return None
+
+    def get(self, key: str) -> list[float] | None:
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self._hits_memory += 1
+                return vector
+            if self._disk is not None:
+                row = self._disk_get(key)
+                if row is not None:
+                    self._remember(key, row)
+                    self._hits_disk += 1
+                    return row
+            self._misses += 1
+            return None
+
+    def put(self, key: str, vector: list[float]) -> None:
+        with self._lock:
+            self._remember(key, vector)
+            if self._disk is not None:
+                self._disk_put(key, vector)
+
+    def _remember(self, key: str, vector: list[float]) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str) -> list[float] | None:
+        try:
+            row = self._disk.execute("SELECT vector FROM embeddings WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("embedding_cache.disk.read_error err=%s", e)
+            return None
+        if row is None:
+            return None
+        packed = array("f")
+        packed.frombytes(row[0])
+        return packed.tolist()
+
+    def _disk_put(self, key: str, vector: list[float]) -> None:
+        try:
+            self._disk.execute(
+                "INSERT OR REPLACE INTO embeddings (key, vector, created_at) VALUES (?, ?, ?)",
+                (key, array("f", vector).tobytes(), time.time()),
+            )
+            self._disk_writes += 1
+            if self._disk_writes % DISK_PRUNE_EVERY_WRITES == 0:
+                self._disk_prune()
+        except sqlite3.Error as e:
+            logger.warning("embedding_cache.disk.write_error err=%s", e)
+
+    def _disk_prune(self) -> None:
+        count = self._disk.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        overflow = count - self._disk_max_entries
+        if overflow > 0:
+            self._disk.execute(
+                "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY created_at LIMIT ?)",
+                (overflow,),
+            )
+            logger.info("embedding_cache.disk.pruned count=%d", overflow)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._disk is not None:
+                self._disk.execute("DELETE FROM embeddings")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._disk is not None:
+                self._disk.close()
+                self._disk = None
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "memory_entries": len(self._memory),
+                "memory_max_entries": self._max_entries,
+                "disk_enabled": self._disk is not None,
+                "hits_memory": self._hits_memory,
+                "hits_disk": self._hits_disk,
+                "misses": self._misses,
+            }
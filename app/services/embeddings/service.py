@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, cast
+
+from app.core.config import config
+
+from .cache import EmbeddingCache, make_cache_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY: int = 8
+
+
+class EmbeddingService:
+    """Shared Titan embedding client with caching, in-flight dedupe and parallel fan-out.
+
+    Titan text models accept a single ``inputText`` per ``invoke_model`` call, so a
+    batch is served by checking the cache first and fanning the remaining unique
+    texts out over a bounded pool. Concurrent callers asking for the same text
+    share one in-flight request instead of issuing their own.
+
+    Exposes the LangChain ``Embeddings`` method names so it can stand in for
+    ``BedrockEmbeddings`` in the knowledge pipeline.
+    """
+
+    def __init__(
+        self,
+        *,
+        bedrock_client: Any,
+        model_id: str,
+        cache: EmbeddingCache | None = None,
+        max_concurrency: int | None = None,
+    ) -> None:
+        self._bedrock = bedrock_client
+        self._model_id = model_id
+        self._cache = cache or EmbeddingCache()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, int(max_concurrency or DEFAULT_MAX_CONCURRENCY)),
+            thread_name_prefix="embed",
+        )
+        self._inflight: dict[str, Future[list[float]]] = {}
+        self._lock = threading.Lock()
+        self._requested = 0
+        self._cache_hits = 0
+        self._inflight_joins = 0
+        self._model_calls = 0
+
+    @property
+    def model_id(self) -> str:
+        return self._model_id
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [future.result() for future in self._submit(texts)]
+
+    def embed_query(self, text: str) -> list[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        futures = self._submit(texts)
+        return list(await asyncio.gather(*(asyncio.wrap_future(f) for f in futures)))
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return (await self.aembed_documents([text]))[0]
+
+    def _submit(self, texts: list[str]) -> list[Future[list[float]]]:
+        futures: list[Future[list[float]]] = []
+        local: dict[str, Future[list[float]]] = {}
+        for text in texts:
+            key = make_cache_key(self._model_id, text)
+            if key in local:
+                futures.append(local[key])
+                continue
+            future = self._future_for(key, text)
+            local[key] = future
+            futures.append(future)
+        return futures
+
+    def _future_for(self, key: str, text: str) -> Future[list[float]]:
+        with self._lock:
+            self._requested += 1
+            inflight = self._inflight.get(key)
+            if inflight is not None:
+                self._inflight_joins += 1
+                return inflight
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            with self._lock:
+                self._cache_hits += 1
+            done: Future[list[float]] = Future()
+            done.set_result(cached)
+            return done
+
+        with self._lock:
+            inflight = self._inflight.get(key)
+            if inflight is not None:
+                self._inflight_joins += 1
+                return inflight
+            future = self._pool.submit(self._invoke, text)
+            self._inflight[key] = future
+            self._model_calls += 1
+        future.add_done_callback(lambda f, k=key: self._on_done(k, f))
+        return future
+
+    def _on_done(self, key: str, future: Future[list[float]]) -> None:
+        # Populate the cache before leaving the in-flight table so late callers always find one of them.
+        if not future.cancelled() and future.exception() is None:
+            self._cache.put(key, future.result())
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def _invoke(self, text: str) -> list[float]:
+        res = self._bedrock.invoke_model(modelId=self._model_id, body=json.dumps({"inputText": text}))
+        body = res.get("body")
+        data = json.loads(body.read()) if hasattr(body, "read") else json.loads(body)
+        return cast(list[float], data.get("embedding") or [])
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            stats: dict[str, Any] = {
+                "model_id": self._model_id,
+                "requested": self._requested,
+                "cache_hits": self._cache_hits,
+                "inflight_joins": self._inflight_joins,
+                "model_calls": self._model_calls,
+                "inflight": len(self._inflight),
+            }
+        stats["cache"] = self._cache.get_stats()
+        return stats
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._cache.close()
+
+
+_embedding_service: EmbeddingService | None = None
+_embedding_service_lock = threading.Lock()
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Return the process-wide embedding service for ``BEDROCK_EMBED_MODEL_ID``."""
+    global _embedding_service
+    if _embedding_service is None:
+        with _embedding_service_lock:
+            if _embedding_service is None:
+                from app.core.app_state import get_bedrock_runtime_client
+
+                cache = EmbeddingCache(
+                    max_entries=config.EMBEDDING_CACHE_MAX_ENTRIES,
+                    disk_path=config.EMBEDDING_CACHE_PATH,
+                    disk_max_entries=config.EMBEDDING_CACHE_DISK_MAX_ENTRIES,
+                )
+                _embedding_service = EmbeddingService(
+                    bedrock_client=get_bedrock_runtime_client(),
+                    model_id=config.BEDROCK_EMBED_MODEL_ID,
+                    cache=cache,
+                    max_concurrency=config.EMBEDDING_MAX_CONCURRENCY,
+                )
+    return _embedding_service
@@ -1,7 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import copy
+import json
 import logging
-from typing import Any, Dict
+import random
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional
 
 import httpx
 
@@ -9,13 +16,250 @@ from app.core.config import config
 
 logger = logging.getLogger(__name__)
 
+# Statuses worth retrying for idempotent methods; everything else is final.
+RETRYABLE_STATUS_CODES: frozenset[int] = frozenset({429, 502, 503, 504})
+IDEMPOTENT_METHODS: frozenset[str] = frozenset({"GET", "PUT", "DELETE"})
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class FOSCircuitOpenError(Exception):
+    """Raised internally when the FOS circuit breaker is rejecting calls."""
+
+
+class FOSCircuitBreaker:
+    """Consecutive-failure circuit breaker shared by every FOS pool in the process.
+
+    After ``failure_threshold`` consecutive transport errors or 5xx responses the
+    circuit opens and calls fail fast for ``reset_seconds``. The first call after
+    that is let through as a probe; its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+    def before_call(self) -> bool:
+        """Raise while the circuit rejects calls; return True when this call is the probe."""
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            if time.monotonic() - self._opened_at < self.reset_seconds or self._probe_in_flight:
+                raise FOSCircuitOpenError("FOS circuit open")
+            self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probe_in_flight or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._probe_in_flight:
+                    logger.warning(f"FOS circuit opened after {self._failures} consecutive failures")
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def abandon_probe(self) -> None:
+        """Release a probe that ended without an outcome (e.g. it was cancelled); the circuit stays open."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def reset(self) -> None:
+        self.record_success()
+
+
+class FOSConnectionPool:
+    """Long-lived ``httpx.AsyncClient`` plus concurrency cap and GET coalescing.
+
+    An ``AsyncClient`` is bound to the event loop it first runs on, so one pool is
+    kept per loop (see ``get_fos_pool``); the API loop and each cold-path worker
+    loop get their own keep-alive connections.
+    """
+
+    def __init__(
+        self,
+        *,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        breaker: Optional[FOSCircuitBreaker] = None,
+    ):
+        http2 = config.FOS_HTTP2_ENABLED and transport is None and _http2_available()
+        if config.FOS_HTTP2_ENABLED and transport is None and not http2:
+            logger.info("FOS HTTP/2 requested but 'h2' is not installed - using HTTP/1.1")
+        client_kwargs: Dict[str, Any] = {
+            "timeout": config.FOS_HTTP_TIMEOUT_SECONDS,
+            "limits": httpx.Limits(
+                max_connections=config.FOS_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=config.FOS_HTTP_MAX_KEEPALIVE,
+            ),
+            "http2": http2,
+        }
+        if transport is not None:
+            client_kwargs["transport"] = transport
+        self.client = httpx.AsyncClient(**client_kwargs)
+        self.breaker = breaker or _circuit_breaker
+        self.max_retries = max(0, config.FOS_HTTP_MAX_RETRIES)
+        self.retry_backoff_seconds = config.FOS_HTTP_RETRY_BACKOFF_SECONDS
+        self._semaphore = asyncio.Semaphore(max(1, config.FOS_HTTP_MAX_CONCURRENCY))
+        self._inflight_gets: Dict[str, asyncio.Future] = {}
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send one request, retrying idempotent methods on transient failures."""
+        attempts = 1 + (self.max_retries if method in IDEMPOTENT_METHODS else 0)
+        attempt = 0
+        while True:
+            attempt += 1
+            probe = self.breaker.before_call()
+            try:
+                async with self._semaphore:
+                    resp = await getattr(self.client, method.lower())(url, **kwargs)
+            except httpx.TransportError:
+                self.breaker.record_failure()
+                if attempt >= attempts:
+                    raise
+            except Exception:
+                self.breaker.record_failure()
+                raise
+            except BaseException:
+                # Cancellation says nothing about FOS health, but the probe slot must be freed.
+                if probe:
+                    self.breaker.abandon_probe()
+                raise
+            else:
+                if resp.status_code >= 500:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                if resp.status_code not in RETRYABLE_STATUS_CODES or attempt >= attempts:
+                    return resp
+            # Full jitter keeps retries from several callers from landing together.
+            await asyncio.sleep(random.uniform(0, self.retry_backoff_seconds * (2 ** (attempt - 1))))
+
+    async def coalesced_get(self, key: str, fetch) -> Any:
+        """Run ``fetch`` once for concurrent callers sharing ``key``.
+
+        The first caller gets the decoded body itself; callers that joined while
+        it was in flight get deep copies so none of them can mutate another's data.
+        """
+        pending = self._inflight_gets.get(key)
+        if pending is not None:
+            try:
+                return copy.deepcopy(await asyncio.shield(pending))
+            except asyncio.CancelledError:
+                # Only our own cancellation propagates; a cancelled leader means fetch ourselves.
+                if not pending.cancelled():
+                    raise
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self._inflight_gets[key] = future
+        try:
+            result = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Followers see the exception; mark it retrieved for the no-follower case.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight_gets.pop(key, None)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+_circuit_breaker = FOSCircuitBreaker(
+    failure_threshold=config.FOS_HTTP_CIRCUIT_FAILURE_THRESHOLD,
+    reset_seconds=config.FOS_HTTP_CIRCUIT_RESET_SECONDS,
+)
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, FOSConnectionPool]" = weakref.WeakKeyDictionary()
+_pools_lock = threading.Lock()
+
+
+def get_fos_pool() -> FOSConnectionPool:
+    """Return the shared FOS pool for the running event loop, creating it once."""
+    loop = asyncio.get_running_loop()
+    with _pools_lock:
+        pool = _pools.get(loop)
+        if pool is None:
+            pool = FOSConnectionPool()
+            _pools[loop] = pool
+        return pool
+
+
+POOL_CLOSE_TIMEOUT_SECONDS: float = 5.0
+
+
+async def close_fos_http_pool() -> None:
+    """Close every FOS pool, each on the event loop that owns its client.
+
+    Pools of loops that are no longer running cannot be closed from here; they
+    stay registered and are dropped with their loop.
+    """
+    loop = asyncio.get_running_loop()
+    with _pools_lock:
+        pool = _pools.pop(loop, None)
+        others = [(owner, other) for owner, other in _pools.items() if owner.is_running() and not owner.is_closed()]
+        for owner, _ in others:
+            del _pools[owner]
+    closing = [asyncio.wrap_future(asyncio.run_coroutine_threadsafe(other.aclose(), owner)) for owner, other in others]
+    if pool is not None:
+        await pool.aclose()
+    if closing:
+        try:
+            results = await asyncio.wait_for(asyncio.gather(*closing, return_exceptions=True), POOL_CLOSE_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            logger.warning(f"Timed out closing {len(closing)} FOS pools owned by other event loops")
+            return
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to close FOS pool on another event loop: {result}")
+
+
+def reset_fos_http_state() -> None:
+    """Drop cached pools and close the circuit; used by tests."""
+    with _pools_lock:
+        _pools.clear()
+    _circuit_breaker.reset()
+
 
 class FOSHttpClient:
-    """HTTP client for FOS service."""
+    """HTTP client for FOS service.
+
+    Instances are cheap: requests go through the per-loop ``FOSConnectionPool``
+    so connections are reused across repositories and calls.
+    """
 
-    def __init__(self):
+    def __init__(self, pool: Optional[FOSConnectionPool] = None):
         self.base_url = (config.FOS_SERVICE_URL).rstrip('/') if config.FOS_SERVICE_URL else None
         self.api_key = config.FOS_API_KEY
+        self._pool = pool
+
+    def _get_pool(self) -> FOSConnectionPool:
+        return self._pool or get_fos_pool()
 
     def _build_headers(self) -> Dict[str, str]:
         """Build request headers with API key."""
@@ -25,23 +269,30 @@ class FOSHttpClient:
         return headers
 
     async def get(self, endpoint: str, params: Dict[str, Any] = None) -> Dict[str, Any] | None:
-        """GET request to FOS service."""
+        """GET request to FOS service; identical concurrent GETs share one call."""
         if not self.base_url:
             logger.warning("FOS_SERVICE_URL not configured - skipping external API call")
             return None
 
         url = f"{self.base_url}{endpoint}"
         headers = self._build_headers()
+        pool = self._get_pool()
+        key = json.dumps([url, params, headers.get("x-api-key")], sort_keys=True, default=str)
+
+        async def fetch() -> Dict[str, Any] | None:
+            logger.debug(f"Calling FOS API: {url}" + (f" with params: {params}" if params else ""))
+            resp = await pool.request("GET", url, headers=headers, params=params)
+            if resp.status_code == 404:
+                logger.warning(f"FOS API endpoint not found: {endpoint}")
+                return None
+            resp.raise_for_status()
+            return resp.json()
 
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                logger.debug(f"Calling FOS API: {url}" + (f" with params: {params}" if params else ""))
-                resp = await client.get(url, headers=headers, params=params)
-                if resp.status_code == 404:
-                    logger.warning(f"FOS API endpoint not found: {endpoint}")
-                    return None
-                resp.raise_for_status()
-                return resp.json()
+            return await pool.coalesced_get(key, fetch)
+        except FOSCircuitOpenError:
+            logger.warning(f"FOS circuit open - skipping GET {endpoint}")
+            return None
         except httpx.HTTPStatusError as e:
             logger.error(f"FOS API HTTP error for {endpoint}: {e.response.status_code} - {e.response.text}")
             return None
@@ -58,12 +309,11 @@ class FOSHttpClient:
         headers = self._build_headers()
 
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.put(url, headers=headers, json=data)
-                if resp.status_code == 404:
-                    return None
-                resp.raise_for_status()
-                return resp.json()
+            resp = await self._get_pool().request("PUT", url, headers=headers, json=data)
+            if resp.status_code == 404:
+                return None
+            resp.raise_for_status()
+            return resp.json()
         except Exception as e:
             logger.warning(f"FOS API PUT failed for {endpoint}: {e}")
             return None
@@ -77,12 +327,11 @@ class FOSHttpClient:
         headers = self._build_headers()
 
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.patch(url, headers=headers, json=data)
-                if resp.status_code == 404:
-                    return None
-                resp.raise_for_status()
-                return resp.json()
+            resp = await self._get_pool().request("PATCH", url, headers=headers, json=data)
+            if resp.status_code == 404:
+                return None
+            resp.raise_for_status()
+            return resp.json()
         except Exception as e:
             logger.warning(f"FOS API PATCH failed for {endpoint}: {e}")
             return None
@@ -96,10 +345,9 @@ class FOSHttpClient:
         headers = self._build_headers()
 
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.post(url, headers=headers, json=data)
-                resp.raise_for_status()
-                return resp.json()
+            resp = await self._get_pool().request("POST", url, headers=headers, json=data)
+            resp.raise_for_status()
+            return resp.json()
         except httpx.HTTPStatusError as e:
             logger.warning(f"FOS API POST failed for {endpoint}: Client error '{e.response.status_code} {e.response.reason_phrase}' for url '{e.request.url}'")
             return None
@@ -116,10 +364,9 @@ class FOSHttpClient:
         headers = self._build_headers()
 
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.delete(url, headers=headers)
-                resp.raise_for_status()
-                return resp.json()
+            resp = await self._get_pool().request("DELETE", url, headers=headers)
+            resp.raise_for_status()
+            return resp.json()
         except Exception as e:
             logger.warning(f"FOS API DELETE failed for {endpoint}: {e}")
             return None
@@ -0,0 +1,66 @@
+"""Concurrent assembly of independent external user-context sections.
+
+Each section (AI context, personal info, profile details, payment reminders) is
+a separate FOS round trip that does not depend on the others. They are fetched
+together, each under its own deadline, so a cold load costs the slowest section
+rather than the sum. A section that fails or misses its deadline resolves to
+``None`` and is listed in ``missing`` so the caller can build a partial context
+from the rest without mistaking it for a complete one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SECTION_TIMEOUT_SECONDS: float = 5.0
+
+
+@dataclass(frozen=True)
+class ContextSection:
+    name: str
+    fetch: Callable[[], Awaitable[Any]]
+    timeout_seconds: Optional[float] = None
+
+
+class ContextSections(dict):
+    """Section results by name; ``missing`` names the sections that failed or timed out."""
+
+    def __init__(self, results: dict[str, Any], missing: Tuple[str, ...] = ()) -> None:
+        super().__init__(results)
+        self.missing = missing
+
+
+async def _fetch_section(section: ContextSection, default_timeout: float, label: str) -> Tuple[bool, Any]:
+    timeout = section.timeout_seconds if section.timeout_seconds is not None else default_timeout
+    started = time.perf_counter()
+    try:
+        return True, await asyncio.wait_for(section.fetch(), timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"[USER_CONTEXT] Section '{section.name}' exceeded {timeout:.1f}s for {label} - using partial context")
+    except Exception as e:
+        logger.warning(f"[USER_CONTEXT] Section '{section.name}' failed for {label}: {type(e).__name__}: {e}")
+    finally:
+        logger.debug(f"[USER_CONTEXT] Section '{section.name}' for {label} took {(time.perf_counter() - started) * 1000:.0f}ms")
+    return False, None
+
+
+async def gather_context_sections(
+    sections: list[ContextSection],
+    *,
+    default_timeout_seconds: float = DEFAULT_SECTION_TIMEOUT_SECONDS,
+    label: str = "",
+) -> ContextSections:
+    """Fetch all sections concurrently; failed or late sections map to ``None`` and are listed in ``missing``."""
+    results = await asyncio.gather(
+        *(_fetch_section(section, default_timeout_seconds, label) for section in sections)
+    )
+    return ContextSections(
+        {section.name: value for section, (_, value) in zip(sections, results, strict=True)},
+        missing=tuple(section.name for section, (ok, _) in zip(sections, results, strict=True) if not ok),
+    )
@@ -123,6 +123,35 @@ Category: {category}
 Existing: {existing_summary}
 Candidate: {candidate_summary}"""
 
+# Memory Same-Fact Batch Classifier
+MEMORY_SAME_FACT_BATCH_CLASSIFIER_LOCAL = """Same-Fact Batch Classifier (language-agnostic)
+Your job: Compare ONE candidate summary against a numbered list of existing summaries and return which existing
+summaries express the SAME underlying fact about the user as the candidate.
+Decide by meaning, not wording. Ignore casing, punctuation, and minor phrasing differences.
+
+Core rules
+1) Same attribute: If an existing summary describes the same attribute of the same subject (e.g., age, name, city,
+   favorite X, count of Y), it is the SAME FACT even if phrased differently or the value changed.
+2) Same subject: Treat the exact same name or clear role synonyms (pet/cat/dog; spouse/partner/wife/husband;
+   kid/child/son/daughter) as the same subject.
+3) Different entities or attributes are NOT the same fact.
+4) Contradictory preferences (opposite choices for the same attribute, e.g., "prefers email" vs "prefers phone")
+   are NOT the same fact.
+5) Multilingual: Treat cross-language synonyms as equivalent (e.g., 'español' == 'Spanish').
+
+Examples
+- Candidate 'Luna is 4 years old.' vs existing 'Luna is 3 years old.' -> same fact (value changed)
+- Candidate 'Has 2 kids.' vs existing 'Has two children.' -> same fact (synonyms)
+- Candidate 'User prefers phone calls.' vs existing 'User prefers email.' -> not the same (contradictory preferences)
+- Candidate 'User has a dog named Bruno.' vs existing 'User has a cat named Luna.' -> not the same (different entities)
+
+Output: Return Strict JSON only: {{"same_fact": [numbers of matching existing summaries]}}. Use [] when none match.
+No extra text.
+Category: {category}
+Candidate: {candidate_summary}
+Existing:
+{existing_summaries}"""
+
 # Memory Compose Summaries
 MEMORY_COMPOSE_SUMMARIES_LOCAL = """Task: Combine two short summaries about the SAME user fact into one concise statement.
 - Keep it neutral, third person, and include both details without redundancy.
@@ -109,6 +109,7 @@ class PromptLoader:
             "onboarding_location_extraction": self._get_onboarding_location_extraction_local,
             "memory_hotpath_trigger_classifier": self._get_memory_hotpath_trigger_classifier_local,
             "memory_same_fact_classifier": self._get_memory_same_fact_classifier_local,
+            "memory_same_fact_batch_classifier": self._get_memory_same_fact_batch_classifier_local,
             "memory_compose_summaries": self._get_memory_compose_summaries_local,
             "episodic_memory_summarizer": self._get_episodic_memory_summarizer_local,
             "profile_sync_extractor": self._get_profile_sync_extractor_local,
@@ -195,6 +196,12 @@ class PromptLoader:
             from . import memory_prompts
         return memory_prompts.MEMORY_SAME_FACT_CLASSIFIER_LOCAL.format(**kwargs).strip()
 
+    def _get_memory_same_fact_batch_classifier_local(self, **kwargs) -> str:
+        memory_prompts = sys.modules.get('app.services.llm.memory_prompts')
+        if memory_prompts is None:
+            from . import memory_prompts
+        return memory_prompts.MEMORY_SAME_FACT_BATCH_CLASSIFIER_LOCAL.format(**kwargs).strip()
+
     def _get_memory_compose_summaries_local(self, **kwargs) -> str:
         memory_prompts = sys.modules.get('app.services.llm.memory_prompts')
         if memory_prompts is None:
@@ -1,6 +1,10 @@
 import asyncio
 import logging
 import time
+import weakref
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timezone
 from typing import Any, AsyncIterator, Dict, Optional, Sequence, cast
 
 from langchain_core.runnables import RunnableConfig
@@ -23,6 +27,14 @@ from app.services.memory.redis_client import (
 
 logger = logging.getLogger(__name__)
 
+COMPRESSED_TYPE_PREFIX = "zlib:"
+COMPRESSION_LEVEL: int = 6
+KNOWN_BLOBS_MAX: int = 10000
+HISTORY_TRIM_BATCH: int = 10
+HISTORY_PAGE_SIZE: int = 50
+_EMPTY_BLOB_TYPE = "empty"
+_TYPED_SEPARATOR = b"\x00"
+
 
 class NoopCheckpointer(BaseCheckpointSaver[str]):
     """No-op checkpointer for development that skips Redis entirely."""
@@ -95,14 +107,79 @@ class NoopCheckpointer(BaseCheckpointSaver[str]):
 
 
 class KVRedisCheckpointer(BaseCheckpointSaver[str]):
-    """Redis-backed checkpointer that uses typed LangGraph serialization."""
+    """Redis-backed checkpointer that uses typed LangGraph serialization.
+
+    Channel values are stored once per (channel, version) and shared by every
+    checkpoint that references them, so a graph step only writes the channels
+    it changed. Payloads of at least ``compression_min_bytes`` are stored
+    zlib-compressed. Pending writes are appended to a per-checkpoint list, and
+    ``aput`` only serializes against other writers of the same thread.
+
+    Each thread keeps a sorted set of its checkpoint ids ordered by timestamp,
+    which ``alist`` pages through, and a sorted set of the blobs its
+    checkpoints reference. Beyond ``max_history`` checkpoints the oldest are
+    trimmed, together with blobs no retained checkpoint references.
+    """
 
-    def __init__(self, client, namespace: str, default_ttl: Optional[int]) -> None:
+    def __init__(
+        self,
+        client,
+        namespace: str,
+        default_ttl: Optional[int],
+        compression_min_bytes: Optional[int] = None,
+        max_history: Optional[int] = None,
+    ) -> None:
         super().__init__()
         self._client = client
         self._namespace = namespace.rstrip(":")
         self._default_ttl = int(default_ttl) if default_ttl else None
-        self._lock = asyncio.Lock()
+        self._compression_min_bytes = int(
+            compression_min_bytes
+            if compression_min_bytes is not None
+            else (app_config.CHECKPOINT_COMPRESSION_MIN_BYTES or 0)
+        )
+        self._max_history = max(
+            0, int(max_history if max_history is not None else (app_config.CHECKPOINT_MAX_HISTORY or 0))
+        )
+        self._thread_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = weakref.WeakValueDictionary()
+        # Blob keys this process has written or re-armed; unknown references are rewritten once.
+        self._known_blobs: OrderedDict[str, None] = OrderedDict()
+
+    def _thread_lock(self, thread_id: str, checkpoint_ns: str) -> asyncio.Lock:
+        lock_key = f"{thread_id}:{checkpoint_ns}"
+        lock = self._thread_locks.get(lock_key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._thread_locks[lock_key] = lock
+        return lock
+
+    def _remember_blob(self, blob_key: str) -> None:
+        self._known_blobs[blob_key] = None
+        self._known_blobs.move_to_end(blob_key)
+        while len(self._known_blobs) > KNOWN_BLOBS_MAX:
+            self._known_blobs.popitem(last=False)
+
+    def _dumps(self, obj: Any) -> tuple[str, bytes]:
+        type_value, data = self.serde.dumps_typed(obj)
+        if self._compression_min_bytes > 0 and len(data) >= self._compression_min_bytes:
+            compressed = zlib.compress(data, COMPRESSION_LEVEL)
+            if len(compressed) < len(data):
+                return f"{COMPRESSED_TYPE_PREFIX}{type_value}", compressed
+        return type_value, data
+
+    def _loads(self, type_value: str, data: bytes) -> Any:
+        if type_value.startswith(COMPRESSED_TYPE_PREFIX):
+            return self.serde.loads_typed((type_value[len(COMPRESSED_TYPE_PREFIX) :], zlib.decompress(data)))
+        return self.serde.loads_typed((type_value, data))
+
+    @staticmethod
+    def _pack(type_value: str, data: bytes) -> bytes:
+        return type_value.encode() + _TYPED_SEPARATOR + data
+
+    @staticmethod
+    def _unpack(raw: bytes) -> tuple[str, bytes]:
+        type_bytes, _, data = raw.partition(_TYPED_SEPARATOR)
+        return type_bytes.decode(), data
 
     def _checkpoint_key(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> str:
         return f"{self._namespace}:cp:{thread_id}:{checkpoint_ns}:{checkpoint_id}"
@@ -124,6 +201,31 @@ class KVRedisCheckpointer(BaseCheckpointSaver[str]):
     def _writes_index_key(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> str:
         return f"{self._namespace}:wrindex:{thread_id}:{checkpoint_ns}:{checkpoint_id}"
 
+    def _writes_log_key(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> str:
+        return f"{self._namespace}:wrlog:{thread_id}:{checkpoint_ns}:{checkpoint_id}"
+
+    def _blob_key(self, thread_id: str, checkpoint_ns: str, channel: str, version: Any) -> str:
+        return f"{self._namespace}:blob:{thread_id}:{checkpoint_ns}:{channel}:{version}"
+
+    def _history_key(self, thread_id: str, checkpoint_ns: str) -> str:
+        return f"{self._namespace}:hist:{thread_id}:{checkpoint_ns}"
+
+    def _blob_refs_key(self, thread_id: str, checkpoint_ns: str) -> str:
+        return f"{self._namespace}:blobrefs:{thread_id}:{checkpoint_ns}"
+
+    def _history_indexed_key(self, thread_id: str, checkpoint_ns: str) -> str:
+        return f"{self._namespace}:histidx:{thread_id}:{checkpoint_ns}"
+
+    @staticmethod
+    def _checkpoint_score(checkpoint: Checkpoint) -> float:
+        try:
+            ts = datetime.fromisoformat(str(checkpoint.get("ts")))
+        except (TypeError, ValueError):
+            return time.time()
+        if ts.tzinfo is None:
+            ts = ts.replace(tzinfo=timezone.utc)
+        return ts.timestamp()
+
     @staticmethod
     def _order_pending_writes(entries: Sequence[PendingWrite]) -> list[PendingWrite]:
         enumerated = list(enumerate(entries))
@@ -146,13 +248,17 @@ class KVRedisCheckpointer(BaseCheckpointSaver[str]):
 
         type_value = type_blob.decode() if isinstance(type_blob, bytes) else str(type_blob)
         try:
-            raw_list = self.serde.loads_typed((type_value, data_blob))
+            raw_list = self._loads(type_value, data_blob)
         except Exception as exc:
             logger.warning("kv_checkpointer.pending_blob.deserialize_failed err=%s", exc)
             return False, []
 
+        return True, self._order_pending_writes(self._normalize_pending_entries(raw_list))
+
+    @staticmethod
+    def _normalize_pending_entries(raw_list: Any) -> list[PendingWrite]:
         if not isinstance(raw_list, Sequence):
-            return True, []
+            return []
 
         normalized: list[PendingWrite] = []
         for entry in raw_list:
@@ -162,12 +268,20 @@ class KVRedisCheckpointer(BaseCheckpointSaver[str]):
             task_id = str(task_id_raw)
             channel = str(channel_raw)
             normalized.append((task_id, channel, value))
+        return normalized
 
-        return True, self._order_pending_writes(normalized)
+    def _deserialize_pending_log(self, raw_entries: Sequence[bytes] | None) -> list[PendingWrite]:
+        entries: list[PendingWrite] = []
+        for raw in raw_entries or []:
+            try:
+                entries.extend(self._normalize_pending_entries(self._loads(*self._unpack(raw))))
+            except Exception as exc:
+                logger.warning("kv_checkpointer.pending_log.deserialize_failed err=%s", exc)
+        return entries
 
     def _serialize_pending_writes(self, pending: Sequence[PendingWrite]) -> tuple[str, bytes]:
         ordered = self._order_pending_writes(list(pending))
-        return self.serde.dumps_typed(ordered)
+        return self._dumps(ordered)
 
     async def _load_pending_blob_direct(
         self,
@@ -317,7 +431,10 @@ class KVRedisCheckpointer(BaseCheckpointSaver[str]):
         checkpoint_id: str,
     ) -> CheckpointTuple | None:
         key = self._checkpoint_key(thread_id, checkpoint_ns, checkpoint_id)
-        data = await client.hgetall(key)
+        pipe = client.pipeline(transaction=False)
+        pipe.hgetall(key)
+        pipe.lrange(self._writes_log_key(thread_id, checkpoint_ns, checkpoint_id), 0, -1)
+        data, log_entries = await pipe.execute()
         if not data:
             return None
 
@@ -331,12 +448,20 @@ class KVRedisCheckpointer(BaseCheckpointSaver[str]):
             return None
 
         try:
-            checkpoint = self.serde.loads_typed((checkpoint_type, checkpoint_bytes))
-            metadata = self.serde.loads_typed((metadata_type, metadata_bytes))
+            checkpoint = self._loads(checkpoint_type, checkpoint_bytes)
+            metadata = self._loads(metadata_type, metadata_bytes)
         except Exception as exc:
             logger.warning("kv_checkpointer.load_checkpoint.deserialize_failed key=%s err=%s", key, exc)
             return None
 
+        if data.get(b"channel_blobs"):
+            checkpoint["channel_values"] = await self._load_channel_values(
+                client,
+                thread_id,
+                checkpoint_ns,
+                checkpoint.get("channel_versions") or {},
+            )
+
         parent_checkpoint_id_bytes = data.get(b"parent_checkpoint_id")
         parent_checkpoint_id = parent_checkpoint_id_bytes.decode() if parent_checkpoint_id_bytes else None
 
@@ -344,13 +469,17 @@ class KVRedisCheckpointer(BaseCheckpointSaver[str]):
             data.get(b"pending_writes_type"),
             data.get(b"pending_writes"),
         )
-        if not pending_found:
+        if not pending_found and (b"pending_writes_type" in data or b"pending_writes" in data):
             pending_writes = await self._load_pending_writes(
                 client,
                 thread_id,
                 checkpoint_ns,
                 checkpoint_id,
             )
+        if log_entries:
+            pending_writes = self._order_pending_writes(
+                [*pending_writes, *self._deserialize_pending_log(log_entries)]
+            )
 
         resume_config: RunnableConfig = {
             "configurable": {
@@ -377,6 +506,43 @@ class KVRedisCheckpointer(BaseCheckpointSaver[str]):
             pending_writes=pending_writes or None,
         )
 
+    async def _load_channel_values(
+        self,
+        client,
+        thread_id: str,
+        checkpoint_ns: str,
+        channel_versions: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        if not channel_versions:
+            return {}
+        channels = list(channel_versions)
+        raw_blobs = await client.mget(
+            [self._blob_key(thread_id, checkpoint_ns, channel, channel_versions[channel]) for channel in channels]
+        )
+        values: Dict[str, Any] = {}
+        for channel, raw in zip(channels, raw_blobs, strict=False):
+            if raw is None:
+                logger.warning(
+                    "kv_checkpointer.load_checkpoint.missing_blob thread_id=%s channel=%s version=%s",
+                    thread_id,
+                    channel,
+                    channel_versions[channel],
+                )
+                continue
+            type_value, blob = self._unpack(raw)
+            if type_value == _EMPTY_BLOB_TYPE:
+                continue
+            try:
+                values[channel] = self._loads(type_value, blob)
+            except Exception as exc:
+                logger.warning(
+                    "kv_checkpointer.load_checkpoint.blob_deserialize_failed thread_id=%s channel=%s err=%s",
+                    thread_id,
+                    channel,
+                    exc,
+                )
+        return values
+
     async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
         time.perf_counter()
         thread_id = self._get_thread_id(config)
@@ -417,8 +583,10 @@ class KVRedisCheckpointer(BaseCheckpointSaver[str]):
         checkpoint_id = checkpoint["id"]
         parent_checkpoint_id = get_checkpoint_id(config)
 
-        checkpoint_type, checkpoint_bytes = self.serde.dumps_typed(checkpoint)
-        metadata_type, metadata_bytes = self.serde.dumps_typed(metadata)
+        channel_values = dict(checkpoint.get("channel_values") or {})
+        stored_checkpoint = cast(Checkpoint, {**checkpoint, "channel_values": {}})
+        checkpoint_type, checkpoint_bytes = self._dumps(stored_checkpoint)
+        metadata_type, metadata_bytes = self._dumps(metadata)
 
         key = self._checkpoint_key(thread_id, checkpoint_ns, checkpoint_id)
         hash_data: Dict[str, Any] = {
@@ -426,20 +594,65 @@ class KVRedisCheckpointer(BaseCheckpointSaver[str]):
             "checkpoint": checkpoint_bytes,
             "metadata_type": metadata_type,
             "metadata": metadata_bytes,
+            "channel_blobs": "1",
         }
         if parent_checkpoint_id:
             hash_data["parent_checkpoint_id"] = parent_checkpoint_id
 
+        # Only changed channels are serialized; unchanged ones already have a blob at their version.
+        blobs: Dict[str, bytes] = {}
+        rearm: list[str] = []
+        for channel, version in {**(checkpoint.get("channel_versions") or {}), **new_versions}.items():
+            blob_key = self._blob_key(thread_id, checkpoint_ns, channel, version)
+            if channel not in new_versions and blob_key in self._known_blobs:
+                rearm.append(blob_key)
+            elif channel in channel_values:
+                blobs[blob_key] = self._pack(*self._dumps(channel_values[channel]))
+            else:
+                blobs[blob_key] = self._pack(_EMPTY_BLOB_TYPE, b"")
+
         client = await self._ensure_client()
         pointer_key = self._latest_pointer_key(thread_id, checkpoint_ns)
-        async with self._lock:
+        history_key = self._history_key(thread_id, checkpoint_ns)
+        blob_refs_key = self._blob_refs_key(thread_id, checkpoint_ns)
+        indexed_key = self._history_indexed_key(thread_id, checkpoint_ns)
+        score = self._checkpoint_score(checkpoint)
+        referenced = [*blobs, *rearm]
+        async with self._thread_lock(thread_id, checkpoint_ns):
             pipe = client.pipeline(transaction=False)
+            # Read before the pointer is set below: a thread without one has no older checkpoints.
+            pipe.exists(indexed_key)
+            pipe.exists(pointer_key)
+            for blob_key, blob in blobs.items():
+                pipe.set(blob_key, blob, ex=self._default_ttl)
             pipe.hset(key, mapping=hash_data)
+            pipe.zadd(history_key, {checkpoint_id: score})
+            if referenced:
+                pipe.zadd(blob_refs_key, {blob_key: score for blob_key in referenced})
             if self._default_ttl:
                 pipe.expire(key, self._default_ttl)
+                pipe.expire(history_key, self._default_ttl)
+                pipe.expire(blob_refs_key, self._default_ttl)
+                # Channel blobs are shared across checkpoints; keep referenced ones alive as long as this one
+                for blob_key in rearm:
+                    pipe.expire(blob_key, self._default_ttl)
             pipe.set(pointer_key, checkpoint_id)
             # Do NOT expire the latest pointer to avoid slow fallback paths
-            await pipe.execute()
+            pipe.zcard(history_key)
+            results = await pipe.execute()
+            for blob_key in referenced:
+                self._remember_blob(blob_key)
+
+            history_size = int(results[-1] or 0)
+            indexed, had_checkpoints = results[0], results[1]
+            if not indexed:
+                if had_checkpoints:
+                    await self._backfill_history(client, thread_id, checkpoint_ns)
+                    history_size = int(await client.zcard(history_key) or 0)
+                else:
+                    await client.set(indexed_key, "1", ex=self._default_ttl)
+            if self._max_history and history_size > self._max_history + HISTORY_TRIM_BATCH:
+                await self._trim_history(client, thread_id, checkpoint_ns, history_size)
 
         logger.debug(
             "kv_checkpointer.put checkpoint thread_id=%s checkpoint_ns=%s checkpoint_id=%s ttl=%s",
@@ -457,6 +670,47 @@ class KVRedisCheckpointer(BaseCheckpointSaver[str]):
             }
         }
 
+    async def _trim_history(self, client, thread_id: str, checkpoint_ns: str, history_size: int) -> None:
+        """Drop the oldest checkpoints beyond ``max_history`` and blobs only they referenced."""
+        history_key = self._history_key(thread_id, checkpoint_ns)
+        blob_refs_key = self._blob_refs_key(thread_id, checkpoint_ns)
+        excess = history_size - self._max_history
+        pipe = client.pipeline(transaction=False)
+        pipe.zrange(history_key, 0, excess - 1)
+        pipe.zrange(history_key, excess, excess, withscores=True)
+        stale_raw, oldest_kept = await pipe.execute()
+        if not stale_raw or not oldest_kept:
+            return
+
+        stale_ids = [raw.decode() if isinstance(raw, bytes) else str(raw) for raw in stale_raw]
+        # A blob last referenced before the oldest retained checkpoint is unreachable from the kept history.
+        retained_floor = float(oldest_kept[0][1])
+        stale_blobs = [
+            raw.decode() if isinstance(raw, bytes) else str(raw)
+            for raw in await client.zrangebyscore(blob_refs_key, "-inf", f"({retained_floor}")
+        ]
+
+        pipe = client.pipeline(transaction=False)
+        pipe.delete(
+            *(self._checkpoint_key(thread_id, checkpoint_ns, cid) for cid in stale_ids),
+            *(self._writes_log_key(thread_id, checkpoint_ns, cid) for cid in stale_ids),
+            *stale_blobs,
+        )
+        pipe.zrem(history_key, *stale_ids)
+        if stale_blobs:
+            pipe.zrem(blob_refs_key, *stale_blobs)
+        await pipe.execute()
+        for blob_key in stale_blobs:
+            self._known_blobs.pop(blob_key, None)
+
+        logger.debug(
+            "kv_checkpointer.history.trimmed thread_id=%s checkpoint_ns=%s checkpoints=%d blobs=%d",
+            thread_id,
+            checkpoint_ns,
+            len(stale_ids),
+            len(stale_blobs),
+        )
+
     async def aput_writes(
         self,
         config: RunnableConfig,
@@ -474,30 +728,15 @@ class KVRedisCheckpointer(BaseCheckpointSaver[str]):
         if not checkpoint_id:
             raise ValueError("aput_writes requires checkpoint_id in config.configurable")
 
+        # Append-only: each call adds one entry to the checkpoint's write log, no read-modify-write needed
+        log_key = self._writes_log_key(thread_id, checkpoint_ns, checkpoint_id)
+        entry = self._pack(*self._dumps([(task_id, channel, value) for channel, value in writes]))
         client = await self._ensure_client()
-        async with self._lock:
-            checkpoint_key = self._checkpoint_key(thread_id, checkpoint_ns, checkpoint_id)
-            existing_writes = await self._load_pending_writes(
-                client,
-                thread_id,
-                checkpoint_ns,
-                checkpoint_id,
-            )
-            combined_writes = list(existing_writes)
-            combined_writes.extend((task_id, channel, value) for channel, value in writes)
-            pending_type, pending_bytes = self._serialize_pending_writes(combined_writes)
-            pipe = client.pipeline(transaction=False)
-            pipe.hset(
-                checkpoint_key,
-                mapping={
-                    "pending_writes_type": pending_type,
-                    "pending_writes": pending_bytes,
-                },
-            )
-            if self._default_ttl:
-                pipe.expire(checkpoint_key, self._default_ttl)
-                # Do NOT expire the latest pointer to avoid slow fallback paths
-            await pipe.execute()
+        pipe = client.pipeline(transaction=False)
+        pipe.rpush(log_key, entry)
+        if self._default_ttl:
+            pipe.expire(log_key, self._default_ttl)
+        await pipe.execute()
 
         logger.debug(
             "kv_checkpointer.put_writes.commit thread_id=%s checkpoint_ns=%s checkpoint_id=%s task_id=%s count=%d",
@@ -523,20 +762,59 @@ class KVRedisCheckpointer(BaseCheckpointSaver[str]):
         checkpoint_ns = self._get_checkpoint_ns(config)
 
         client = await self._ensure_client()
-        tuples: list[CheckpointTuple] = []
+        history_key = self._history_key(thread_id, checkpoint_ns)
+        if not await client.exists(self._history_indexed_key(thread_id, checkpoint_ns)):
+            await self._backfill_history(client, thread_id, checkpoint_ns)
+
+        start = 0
+        before_id = get_checkpoint_id(before) if before else None
+        if before_id:
+            before_rank = await client.zrevrank(history_key, before_id)
+            if before_rank is None:
+                return
+            start = int(before_rank) + 1
+
+        page_size = limit if limit and not filter else HISTORY_PAGE_SIZE
+        yielded = 0
+        while True:
+            page = await client.zrevrange(history_key, start, start + page_size - 1)
+            if not page:
+                return
+            start += len(page)
+            for raw_id in page:
+                checkpoint_id = raw_id.decode() if isinstance(raw_id, bytes) else str(raw_id)
+                checkpoint_tuple = await self._load_checkpoint_tuple(client, thread_id, checkpoint_ns, checkpoint_id)
+                if checkpoint_tuple is None:
+                    continue
+                if filter and not all(checkpoint_tuple.metadata.get(k) == v for k, v in filter.items()):
+                    continue
+                yield checkpoint_tuple
+                yielded += 1
+                if limit is not None and yielded >= limit:
+                    return
+
+    async def _backfill_history(self, client, thread_id: str, checkpoint_ns: str) -> None:
+        """Index checkpoints written before the history set existed (one keyspace scan per thread).
+
+        Merges into whatever the set already holds, then sets the thread's
+        indexed marker: a thread with pre-existing checkpoints gets its set
+        created by its first new ``aput``, so an empty set can't be the signal.
+        """
+        scores: Dict[str, float] = {}
         async for key in client.scan_iter(match=self._checkpoint_pattern(thread_id, checkpoint_ns), count=100):
             key_str = key.decode() if isinstance(key, bytes) else str(key)
             checkpoint_id = key_str.split(":")[-1]
             checkpoint_tuple = await self._load_checkpoint_tuple(client, thread_id, checkpoint_ns, checkpoint_id)
             if checkpoint_tuple:
-                tuples.append(checkpoint_tuple)
-
-        tuples.sort(key=lambda item: item.checkpoint["ts"], reverse=True)
-
-        for idx, item in enumerate(tuples):
-            if limit is not None and idx >= limit:
-                break
-            yield item
+                scores[checkpoint_id] = self._checkpoint_score(checkpoint_tuple.checkpoint)
+        history_key = self._history_key(thread_id, checkpoint_ns)
+        pipe = client.pipeline(transaction=False)
+        if scores:
+            pipe.zadd(history_key, scores)
+            if self._default_ttl:
+                pipe.expire(history_key, self._default_ttl)
+        pipe.set(self._history_indexed_key(thread_id, checkpoint_ns), "1", ex=self._default_ttl)
+        await pipe.execute()
 
 
 def get_supervisor_checkpointer():
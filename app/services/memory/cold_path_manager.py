@@ -8,6 +8,7 @@ from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any, Optional, TypedDict
 
 from app.core.config import config
+from app.services.memory.cold_path_queue import ColdPathJob, ColdPathQueue, create_cold_path_queue
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +28,37 @@ class _TurnPayload(TypedDict):
     store: Any
 
 
+def run_cold_path_turn(
+    *,
+    thread_id: str,
+    user_id: str,
+    user_context: dict[str, Any],
+    conversation_window: list[dict[str, Any]],
+    event_loop: asyncio.AbstractEventLoop,
+    store: Any,
+) -> None:
+    """Run the semantic then episodic memory jobs for one turn (single attempt)."""
+    from app.agents.supervisor.memory.cold_path import run_episodic_memory_job, run_semantic_memory_job
+
+    run_semantic_memory_job(
+        user_id=user_id,
+        thread_id=thread_id,
+        user_context=user_context,
+        conversation_window=conversation_window,
+        event_loop=event_loop,
+        store=store,
+    )
+
+    run_episodic_memory_job(
+        user_id=user_id,
+        thread_id=thread_id,
+        user_context=user_context,
+        conversation_window=conversation_window,
+        event_loop=event_loop,
+        store=store,
+    )
+
+
 class MemoryColdPathManager:
     """Manages cold-path memory creation jobs using a bounded threadpool.
 
@@ -34,15 +66,30 @@ class MemoryColdPathManager:
     Coalesces jobs per thread_id (keeps only latest payload).
     Emits SSE events safely from worker threads.
     Retries failures with bounded backoff.
+
+    When a durable ``queue`` is configured, turns are enqueued there instead and
+    processed by ``ColdPathWorker`` instances (in this process when
+    ``inprocess_worker`` is set, or by the standalone worker entry point).
     """
 
-    def __init__(self, max_workers: int = MAX_COLD_PATH_WORKERS) -> None:
+    def __init__(
+        self,
+        max_workers: int = MAX_COLD_PATH_WORKERS,
+        queue: Optional[ColdPathQueue] = None,
+        inprocess_worker: bool = True,
+    ) -> None:
         """Initialize the cold-path manager with a bounded threadpool.
 
         Args:
             max_workers: Maximum number of worker threads (default from config).
+            queue: Optional durable queue; when set, jobs survive restarts and can be drained by other processes.
+            inprocess_worker: Whether to also drain the durable queue from this process.
 
         """
+        self._queue = queue
+        self._inprocess_worker = inprocess_worker
+        self._worker: Any = None
+        self._max_workers = max_workers
         self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
             max_workers=max_workers,
             thread_name_prefix="memory-cold-path",
@@ -117,6 +164,10 @@ class MemoryColdPathManager:
             logger.warning("memory.cold_path.submit.skip: store missing thread_id=%s user_id=%s", thread_id, user_id)
             return
 
+        if self._queue is not None:
+            self._enqueue_durable(thread_id, user_id, user_context, conversation_window, store, event_loop)
+            return
+
         now = time.time()
         payload: _TurnPayload = {
             "thread_id": thread_id,
@@ -144,6 +195,41 @@ class MemoryColdPathManager:
 
         logger.debug("memory.cold_path.submitted: thread_id=%s user_id=%s", thread_id, user_id)
 
+    def _enqueue_durable(
+        self,
+        thread_id: str,
+        user_id: str,
+        user_context: dict[str, Any],
+        conversation_window: list[dict[str, Any]],
+        store: Any,
+        event_loop: asyncio.AbstractEventLoop,
+    ) -> None:
+        self._queue.enqueue(
+            ColdPathJob(
+                thread_id=thread_id,
+                user_id=user_id,
+                user_context=user_context,
+                conversation_window=conversation_window,
+            )
+        )
+        if self._inprocess_worker:
+            self._ensure_worker(store, event_loop)
+        logger.debug("memory.cold_path.enqueued: thread_id=%s user_id=%s", thread_id, user_id)
+
+    def _ensure_worker(self, store: Any, event_loop: asyncio.AbstractEventLoop) -> None:
+        with self._lock:
+            if self._worker is not None:
+                return
+            from app.services.memory.cold_path_worker import ColdPathWorker
+
+            self._worker = ColdPathWorker(
+                self._queue,
+                store=store,
+                event_loop=event_loop,
+                concurrency=self._max_workers,
+            )
+            self._worker.start()
+
     def _run_thread_runner(self, thread_id: str) -> None:
         """Run the latest queued cold-path payload for a thread until no payload remains."""
         thread_lock = self._get_thread_lock(thread_id)
@@ -176,20 +262,9 @@ class MemoryColdPathManager:
         store = payload["store"]
 
         try:
-            from app.agents.supervisor.memory.cold_path import run_episodic_memory_job, run_semantic_memory_job
-
             for attempt in range(COLD_PATH_MAX_RETRIES):
                 try:
-                    run_semantic_memory_job(
-                        user_id=user_id,
-                        thread_id=thread_id,
-                        user_context=user_context,
-                        conversation_window=conversation_window,
-                        event_loop=event_loop,
-                        store=store,
-                    )
-
-                    run_episodic_memory_job(
+                    run_cold_path_turn(
                         user_id=user_id,
                         thread_id=thread_id,
                         user_context=user_context,
@@ -243,6 +318,8 @@ class MemoryColdPathManager:
             wait: If True, wait for running jobs to complete.
 
         """
+        if self._worker is not None:
+            self._worker.stop(wait=wait)
         self._executor.shutdown(wait=wait)
         logger.debug("memory.cold_path.shutdown: wait=%s", wait)
 
@@ -256,6 +333,9 @@ def get_memory_cold_path_manager() -> MemoryColdPathManager:
     global _memory_cold_path_manager
     with _manager_lock:
         if _memory_cold_path_manager is None:
-            _memory_cold_path_manager = MemoryColdPathManager()
+            _memory_cold_path_manager = MemoryColdPathManager(
+                queue=create_cold_path_queue(),
+                inprocess_worker=config.MEMORY_COLD_PATH_INPROCESS_WORKER,
+            )
         return _memory_cold_path_manager
 
@@ -0,0 +1,387 @@
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ColdPathJob:
+    """Serializable cold-path request for one completed turn."""
+
+    thread_id: str
+    user_id: str
+    user_context: dict[str, Any]
+    conversation_window: list[dict[str, Any]]
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    enqueued_at: float = field(default_factory=time.time)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), default=str)
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> ColdPathJob:
+        return cls(**json.loads(raw))
+
+
+@dataclass
+class ClaimedJob:
+    """A job leased to one worker until ``ack``, ``retry`` or ``dead_letter``."""
+
+    job: ColdPathJob
+    attempts: int
+    receipt: str
+
+
+class ColdPathQueue(Protocol):
+    """Durable cold-path queue.
+
+    Jobs are coalesced per ``thread_id`` (a newer turn supersedes a pending one) and
+    at most one job per thread is leased at a time. A lease that is not settled
+    within ``visibility_timeout`` seconds becomes claimable again, so jobs survive
+    worker crashes and deploys.
+    """
+
+    def enqueue(self, job: ColdPathJob) -> None: ...
+
+    def claim(self, consumer: str, visibility_timeout: float) -> Optional[ClaimedJob]: ...
+
+    def ack(self, claimed: ClaimedJob) -> None: ...
+
+    def retry(self, claimed: ClaimedJob, delay_seconds: float) -> None: ...
+
+    def dead_letter(self, claimed: ClaimedJob, error: str) -> None: ...
+
+    def pending_count(self) -> int: ...
+
+
+class SQLiteColdPathQueue:
+    """SQLite-backed queue for single-host deployments and tests.
+
+    Writers take ``BEGIN IMMEDIATE`` so several worker processes can share one
+    database file; ``":memory:"`` gives a process-local queue.
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cold_path_jobs ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, thread_id TEXT NOT NULL, payload TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, available_at REAL NOT NULL, "
+            "claim_token TEXT, claimed_until REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cold_path_jobs_thread ON cold_path_jobs (thread_id)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cold_path_dead_letters ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, thread_id TEXT NOT NULL, payload TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL, error TEXT, failed_at REAL NOT NULL)"
+        )
+
+    def _transaction(self):
+        return _SQLiteTransaction(self._conn, self._lock)
+
+    def enqueue(self, job: ColdPathJob) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM cold_path_jobs WHERE thread_id = ? AND claim_token IS NULL", (job.thread_id,))
+            conn.execute(
+                "INSERT INTO cold_path_jobs (thread_id, payload, available_at) VALUES (?, ?, ?)",
+                (job.thread_id, job.to_json(), time.time()),
+            )
+
+    def claim(self, consumer: str, visibility_timeout: float) -> Optional[ClaimedJob]:
+        with self._transaction() as conn:
+            while True:
+                now = time.time()
+                row = conn.execute(
+                    "SELECT id, thread_id, payload, attempts, claim_token FROM cold_path_jobs j "
+                    "WHERE available_at <= ? AND (claim_token IS NULL OR claimed_until <= ?) "
+                    "AND NOT EXISTS (SELECT 1 FROM cold_path_jobs c WHERE c.thread_id = j.thread_id "
+                    "AND c.id != j.id AND c.claim_token IS NOT NULL AND c.claimed_until > ?) "
+                    "ORDER BY available_at, id LIMIT 1",
+                    (now, now, now),
+                ).fetchone()
+                if row is None:
+                    return None
+                row_id, thread_id, payload, attempts, previous_token = row
+                if previous_token is not None and self._has_newer(conn, thread_id, row_id):
+                    conn.execute("DELETE FROM cold_path_jobs WHERE id = ?", (row_id,))
+                    continue
+                token = f"{consumer}:{uuid.uuid4().hex}"
+                conn.execute(
+                    "UPDATE cold_path_jobs SET claim_token = ?, claimed_until = ?, attempts = attempts + 1 WHERE id = ?",
+                    (token, now + visibility_timeout, row_id),
+                )
+                return ClaimedJob(job=ColdPathJob.from_json(payload), attempts=attempts + 1, receipt=f"{row_id}|{token}")
+
+    @staticmethod
+    def _has_newer(conn: sqlite3.Connection, thread_id: str, row_id: int) -> bool:
+        found = conn.execute(
+            "SELECT 1 FROM cold_path_jobs WHERE thread_id = ? AND id > ? LIMIT 1", (thread_id, row_id)
+        ).fetchone()
+        return found is not None
+
+    @staticmethod
+    def _split_receipt(claimed: ClaimedJob) -> tuple[int, str]:
+        row_id, token = claimed.receipt.split("|", 1)
+        return int(row_id), token
+
+    def ack(self, claimed: ClaimedJob) -> None:
+        row_id, token = self._split_receipt(claimed)
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM cold_path_jobs WHERE id = ? AND claim_token = ?", (row_id, token))
+
+    def retry(self, claimed: ClaimedJob, delay_seconds: float) -> None:
+        row_id, token = self._split_receipt(claimed)
+        with self._transaction() as conn:
+            if self._has_newer(conn, claimed.job.thread_id, row_id):
+                conn.execute("DELETE FROM cold_path_jobs WHERE id = ? AND claim_token = ?", (row_id, token))
+                return
+            conn.execute(
+                "UPDATE cold_path_jobs SET claim_token = NULL, claimed_until = NULL, available_at = ? "
+                "WHERE id = ? AND claim_token = ?",
+                (time.time() + delay_seconds, row_id, token),
+            )
+
+    def dead_letter(self, claimed: ClaimedJob, error: str) -> None:
+        row_id, token = self._split_receipt(claimed)
+        with self._transaction() as conn:
+            deleted = conn.execute(
+                "DELETE FROM cold_path_jobs WHERE id = ? AND claim_token = ?", (row_id, token)
+            ).rowcount
+            if deleted:
+                conn.execute(
+                    "INSERT INTO cold_path_dead_letters (thread_id, payload, attempts, error, failed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (claimed.job.thread_id, claimed.job.to_json(), claimed.attempts, error, time.time()),
+                )
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM cold_path_jobs").fetchone()[0])
+
+    def dead_letter_count(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM cold_path_dead_letters").fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class _SQLiteTransaction:
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock) -> None:
+        self._conn = conn
+        self._lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._lock.acquire()
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except Exception:
+            self._lock.release()
+            raise
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._lock.release()
+
+
+_RELEASE_IF_OWNER = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end return 0"
+)
+
+_HDEL_IF_EQUAL = (
+    "if redis.call('hget', KEYS[1], ARGV[1]) == ARGV[2] then return redis.call('hdel', KEYS[1], ARGV[1]) end return 0"
+)
+
+
+class RedisStreamsColdPathQueue:
+    """Redis Streams queue shared by every API replica and worker.
+
+    Layout under ``prefix``: a stream with one consumer group for delivery, a
+    ``latest`` hash for per-thread coalescing, a ``delayed`` sorted set for retry
+    scheduling, per-thread lease keys, job payload keys and a ``dead`` stream.
+    Leases expire after the visibility timeout and stale stream entries are
+    reclaimed with ``XAUTOCLAIM``.
+    """
+
+    JOB_TTL_SECONDS = 7 * 24 * 3600
+    BUSY_THREAD_RETRY_SECONDS = 1.0
+
+    def __init__(self, client: Any, prefix: str = "coldpath", block_ms: int = 1000) -> None:
+        self._client = client
+        self._prefix = prefix.rstrip(":")
+        self._stream = f"{self._prefix}:stream"
+        self._group = f"{self._prefix}:workers"
+        self._latest = f"{self._prefix}:latest"
+        self._delayed = f"{self._prefix}:delayed"
+        self._dead = f"{self._prefix}:dead"
+        self._block_ms = block_ms
+        self._ensure_group()
+
+    def _ensure_group(self) -> None:
+        try:
+            self._client.xgroup_create(self._stream, self._group, id="0", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self._prefix}:job:{job_id}"
+
+    def _lease_key(self, thread_id: str) -> str:
+        return f"{self._prefix}:lease:{thread_id}"
+
+    @staticmethod
+    def _decode(raw: Any) -> str:
+        return raw.decode("utf-8") if isinstance(raw, (bytes, bytearray)) else str(raw)
+
+    def _store_job(self, job: ColdPathJob, attempts: int) -> None:
+        record = json.dumps({"job": json.loads(job.to_json()), "attempts": attempts})
+        self._client.set(self._job_key(job.job_id), record, ex=self.JOB_TTL_SECONDS)
+
+    def _load_job(self, job_id: str) -> Optional[tuple[ColdPathJob, int]]:
+        raw = self._client.get(self._job_key(job_id))
+        if raw is None:
+            return None
+        record = json.loads(raw)
+        return ColdPathJob(**record["job"]), int(record.get("attempts", 0))
+
+    def enqueue(self, job: ColdPathJob) -> None:
+        record = json.dumps({"job": json.loads(job.to_json()), "attempts": 0})
+        pipe = self._client.pipeline(transaction=True)
+        pipe.set(self._job_key(job.job_id), record, ex=self.JOB_TTL_SECONDS)
+        pipe.hset(self._latest, job.thread_id, job.job_id)
+        pipe.xadd(self._stream, {"job_id": job.job_id, "thread_id": job.thread_id})
+        pipe.execute()
+
+    def _promote_due(self) -> None:
+        due = self._client.zrangebyscore(self._delayed, "-inf", time.time(), start=0, num=100)
+        for raw in due:
+            job_id = self._decode(raw)
+            if not self._client.zrem(self._delayed, job_id):
+                continue
+            loaded = self._load_job(job_id)
+            if loaded is not None:
+                self._client.xadd(self._stream, {"job_id": job_id, "thread_id": loaded[0].thread_id})
+
+    def _next_entry(self, consumer: str, visibility_timeout: float) -> Optional[tuple[str, dict[str, str]]]:
+        reclaimed = self._client.xautoclaim(
+            self._stream, self._group, consumer, min_idle_time=int(visibility_timeout * 1000), start_id="0-0", count=1
+        )
+        entries = reclaimed[1] if reclaimed else []
+        if not entries:
+            response = self._client.xreadgroup(
+                self._group, consumer, {self._stream: ">"}, count=1, block=self._block_ms
+            )
+            entries = response[0][1] if response else []
+        if not entries:
+            return None
+        entry_id, fields = entries[0]
+        return self._decode(entry_id), {self._decode(k): self._decode(v) for k, v in (fields or {}).items()}
+
+    def _drop_entry(self, entry_id: str) -> None:
+        self._client.xack(self._stream, self._group, entry_id)
+        self._client.xdel(self._stream, entry_id)
+
+    def claim(self, consumer: str, visibility_timeout: float) -> Optional[ClaimedJob]:
+        self._promote_due()
+        next_entry = self._next_entry(consumer, visibility_timeout)
+        if next_entry is None:
+            return None
+        entry_id, fields = next_entry
+        job_id, thread_id = fields.get("job_id", ""), fields.get("thread_id", "")
+
+        latest = self._client.hget(self._latest, thread_id)
+        if latest is None or self._decode(latest) != job_id:
+            self._drop_entry(entry_id)
+            self._client.delete(self._job_key(job_id))
+            return None
+
+        lease_ms = int(visibility_timeout * 1000)
+        if not self._client.set(self._lease_key(thread_id), job_id, nx=True, px=lease_ms):
+            if self._decode(self._client.get(self._lease_key(thread_id)) or b"") != job_id:
+                # Another worker holds this thread; park the entry briefly instead of blocking on it.
+                self._drop_entry(entry_id)
+                self._client.zadd(self._delayed, {job_id: time.time() + self.BUSY_THREAD_RETRY_SECONDS})
+                return None
+            self._client.pexpire(self._lease_key(thread_id), lease_ms)
+
+        loaded = self._load_job(job_id)
+        if loaded is None:
+            self._drop_entry(entry_id)
+            self._client.eval(_RELEASE_IF_OWNER, 1, self._lease_key(thread_id), job_id)
+            return None
+        job, attempts = loaded
+        attempts += 1
+        self._store_job(job, attempts)
+        return ClaimedJob(job=job, attempts=attempts, receipt=entry_id)
+
+    def _settle(self, claimed: ClaimedJob, *, forget_job: bool) -> None:
+        job = claimed.job
+        self._drop_entry(claimed.receipt)
+        if forget_job:
+            self._client.eval(_HDEL_IF_EQUAL, 1, self._latest, job.thread_id, job.job_id)
+            self._client.delete(self._job_key(job.job_id))
+        self._client.eval(_RELEASE_IF_OWNER, 1, self._lease_key(job.thread_id), job.job_id)
+
+    def ack(self, claimed: ClaimedJob) -> None:
+        self._settle(claimed, forget_job=True)
+
+    def retry(self, claimed: ClaimedJob, delay_seconds: float) -> None:
+        latest = self._client.hget(self._latest, claimed.job.thread_id)
+        if latest is None or self._decode(latest) != claimed.job.job_id:
+            self._settle(claimed, forget_job=True)
+            return
+        self._client.zadd(self._delayed, {claimed.job.job_id: time.time() + delay_seconds})
+        self._settle(claimed, forget_job=False)
+
+    def dead_letter(self, claimed: ClaimedJob, error: str) -> None:
+        self._client.xadd(
+            self._dead,
+            {
+                "job_id": claimed.job.job_id,
+                "thread_id": claimed.job.thread_id,
+                "attempts": str(claimed.attempts),
+                "error": error[:1000],
+                "payload": claimed.job.to_json(),
+            },
+            maxlen=10_000,
+            approximate=True,
+        )
+        self._settle(claimed, forget_job=True)
+
+    def pending_count(self) -> int:
+        return int(self._client.hlen(self._latest) or 0)
+
+
+def create_cold_path_queue(backend: Optional[str] = None) -> Optional[ColdPathQueue]:
+    """Build the configured durable queue, or None for the in-process ("local") backend."""
+    from app.core.config import config as app_config
+
+    backend = (backend or app_config.MEMORY_COLD_PATH_QUEUE_BACKEND or "local").lower()
+    if backend == "local":
+        return None
+    if backend == "sqlite":
+        return SQLiteColdPathQueue(app_config.MEMORY_COLD_PATH_QUEUE_PATH)
+    if backend == "redis":
+        from app.services.memory.redis_client import get_sync_redis_client_singleton
+
+        return RedisStreamsColdPathQueue(get_sync_redis_client_singleton())
+    raise ValueError(f"Unknown MEMORY_COLD_PATH_QUEUE_BACKEND: {backend!r}")
@@ -0,0 +1,195 @@
+"""Cold-path memory worker draining the durable queue.
+
+Run standalone with::
+
+    poetry run python -m app.services.memory.cold_path_worker
+
+so memory extraction scales independently of the API pods. The API process can
+also host a worker (``MEMORY_COLD_PATH_INPROCESS_WORKER``). A standalone worker
+has no SSE listeners of its own, so memory events it emits only reach clients
+when ``SSE_EVENT_BACKEND=redis`` shares the event log across processes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import signal
+import socket
+import threading
+from typing import Any, Optional
+
+from app.core.config import config
+from app.services.memory.cold_path_queue import ClaimedJob, ColdPathQueue, create_cold_path_queue
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL_SECONDS: float = 1.0
+
+
+class ColdPathWorker:
+    """Claims cold-path jobs from a ``ColdPathQueue`` and runs them on worker threads.
+
+    Failed jobs are rescheduled on the queue with exponential backoff instead of
+    sleeping on a worker thread, and moved to the dead-letter set once
+    ``max_retries`` attempts are used up.
+    """
+
+    def __init__(
+        self,
+        queue: ColdPathQueue,
+        *,
+        store: Any = None,
+        event_loop: Optional[asyncio.AbstractEventLoop] = None,
+        concurrency: Optional[int] = None,
+        visibility_timeout: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        retry_backoff_seconds: Optional[float] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL_SECONDS,
+        consumer_name: Optional[str] = None,
+    ) -> None:
+        self._queue = queue
+        self._store = store
+        self._event_loop = event_loop
+        self._owned_loop_thread: Optional[threading.Thread] = None
+        self._concurrency = max(1, int(concurrency or config.MEMORY_COLD_PATH_MAX_WORKERS or 4))
+        self._visibility_timeout = float(visibility_timeout or config.MEMORY_COLD_PATH_VISIBILITY_TIMEOUT_SECONDS)
+        self._max_retries = max(1, int(max_retries or config.MEMORY_COLD_PATH_MAX_RETRIES or 3))
+        self._retry_backoff_seconds = float(
+            retry_backoff_seconds
+            if retry_backoff_seconds is not None
+            else (config.MEMORY_COLD_PATH_RETRY_BACKOFF_SECONDS or 1)
+        )
+        self._poll_interval = poll_interval
+        self._consumer_name = consumer_name or f"{socket.gethostname()}-{os.getpid()}"
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._init_lock = threading.Lock()
+
+    def _get_store(self) -> Any:
+        with self._init_lock:
+            if self._store is None:
+                from app.services.memory.store_factory import create_s3_vectors_store_from_env
+
+                self._store = create_s3_vectors_store_from_env()
+            return self._store
+
+    def _get_event_loop(self) -> asyncio.AbstractEventLoop:
+        with self._init_lock:
+            if self._event_loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="memory-cold-path-loop", daemon=True)
+                thread.start()
+                self._event_loop = loop
+                self._owned_loop_thread = thread
+            return self._event_loop
+
+    def start(self) -> None:
+        """Start ``concurrency`` polling threads."""
+        self._stop.clear()
+        for i in range(self._concurrency):
+            thread = threading.Thread(
+                target=self._run_loop,
+                args=(f"{self._consumer_name}-{i}",),
+                name=f"memory-cold-path-worker-{i}",
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.info("memory.cold_path.worker.started: consumer=%s threads=%d", self._consumer_name, self._concurrency)
+
+    def stop(self, wait: bool = True) -> None:
+        """Stop polling; leased jobs not yet settled are redelivered after the visibility timeout."""
+        self._stop.set()
+        if wait:
+            for thread in self._threads:
+                thread.join(timeout=self._visibility_timeout)
+        self._threads.clear()
+        if self._owned_loop_thread is not None and self._event_loop is not None:
+            self._event_loop.call_soon_threadsafe(self._event_loop.stop)
+            self._owned_loop_thread = None
+        logger.info("memory.cold_path.worker.stopped: consumer=%s", self._consumer_name)
+
+    def _run_loop(self, consumer: str) -> None:
+        while not self._stop.is_set():
+            try:
+                processed = self.run_once(consumer)
+            except Exception as e:
+                logger.error("memory.cold_path.worker.poll_error: consumer=%s error=%s", consumer, str(e), exc_info=True)
+                processed = False
+            if not processed:
+                self._stop.wait(self._poll_interval)
+
+    def run_once(self, consumer: Optional[str] = None) -> bool:
+        """Claim and process at most one job. Returns True if a job was handled."""
+        claimed = self._queue.claim(consumer or self._consumer_name, self._visibility_timeout)
+        if claimed is None:
+            return False
+        self._process(claimed)
+        return True
+
+    def _process(self, claimed: ClaimedJob) -> None:
+        from app.services.memory.cold_path_manager import run_cold_path_turn
+
+        job = claimed.job
+        try:
+            run_cold_path_turn(
+                thread_id=job.thread_id,
+                user_id=job.user_id,
+                user_context=job.user_context,
+                conversation_window=job.conversation_window,
+                event_loop=self._get_event_loop(),
+                store=self._get_store(),
+            )
+        except Exception as e:
+            if claimed.attempts < self._max_retries:
+                backoff = self._retry_backoff_seconds * (2 ** (claimed.attempts - 1))
+                logger.warning(
+                    "memory.cold_path.retry: thread_id=%s user_id=%s attempt=%d error=%s backoff=%.1fs",
+                    job.thread_id,
+                    job.user_id,
+                    claimed.attempts,
+                    str(e),
+                    backoff,
+                )
+                self._queue.retry(claimed, backoff)
+            else:
+                logger.error(
+                    "memory.cold_path.failed: thread_id=%s user_id=%s attempts=%d error=%s",
+                    job.thread_id,
+                    job.user_id,
+                    claimed.attempts,
+                    str(e),
+                    exc_info=True,
+                )
+                self._queue.dead_letter(claimed, str(e))
+            return
+
+        self._queue.ack(claimed)
+        logger.debug(
+            "memory.cold_path.completed: thread_id=%s user_id=%s attempt=%d",
+            job.thread_id,
+            job.user_id,
+            claimed.attempts,
+        )
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    queue = create_cold_path_queue()
+    if queue is None:
+        raise SystemExit("MEMORY_COLD_PATH_QUEUE_BACKEND must be 'redis' or 'sqlite' to run a standalone worker")
+
+    worker = ColdPathWorker(queue)
+    stopped = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stopped.set())
+
+    worker.start()
+    stopped.wait()
+    worker.stop(wait=True)
+
+
+if __name__ == "__main__":
+    main()
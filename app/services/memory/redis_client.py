@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import threading
 from typing import Optional
 
 from app.core.config import config as app_config
@@ -8,6 +9,8 @@ logger = logging.getLogger(__name__)
 
 _redis_client_singleton = None
 _redis_client_lock = asyncio.Lock()
+_sync_redis_client_singleton = None
+_sync_redis_client_lock = threading.Lock()
 
 
 def _str_to_bool(value: Optional[str]) -> bool:
@@ -21,8 +24,7 @@ def is_dev_env() -> bool:
     return env in {"develop", "dev", "local", "test"}
 
 
-def _build_async_redis_client():
-    import redis.asyncio as aioredis
+def _redis_connection_kwargs() -> dict:
     from redis.backoff import ExponentialBackoff
     from redis.retry import Retry
 
@@ -39,21 +41,46 @@ def _build_async_redis_client():
     if not host:
         raise RuntimeError("REDIS_HOST not configured")
 
-    return aioredis.Redis(
-        host=host,
-        port=port,
-        password=password,
-        username=username,
-        ssl=use_tls or False,
-        decode_responses=False,
-        retry=Retry(ExponentialBackoff(), 3),
-        retry_on_timeout=True,
-        socket_connect_timeout=3,
-        socket_timeout=5,
-        health_check_interval=30,
-        socket_keepalive=True,
-        max_connections=64,
-    )
+    return {
+        "host": host,
+        "port": port,
+        "password": password,
+        "username": username,
+        "ssl": use_tls or False,
+        "decode_responses": False,
+        "retry": Retry(ExponentialBackoff(), 3),
+        "retry_on_timeout": True,
+        "socket_connect_timeout": 3,
+        "socket_timeout": 5,
+        "health_check_interval": 30,
+        "socket_keepalive": True,
+        "max_connections": 64,
+    }
+
+
+def _build_async_redis_client():
+    import redis.asyncio as aioredis
+
+    return aioredis.Redis(**_redis_connection_kwargs())
+
+
+def _build_sync_redis_client():
+    import redis
+
+    return redis.Redis(**_redis_connection_kwargs())
+
+
+def get_sync_redis_client_singleton():
+    """Blocking Redis client for code that already runs off the event loop (store I/O threads)."""
+    global _sync_redis_client_singleton
+    if is_dev_env():
+        raise RuntimeError("Redis client disabled in dev environment")
+    if _sync_redis_client_singleton is None:
+        with _sync_redis_client_lock:
+            if _sync_redis_client_singleton is None:
+                _sync_redis_client_singleton = _build_sync_redis_client()
+                logger.debug("Redis sync singleton client created")
+    return _sync_redis_client_singleton
 
 
 async def get_redis_client_singleton():
@@ -3,7 +3,9 @@ from typing import Optional
 from boto3.session import Session
 
 from app.core.config import config
+from app.repositories.namespace_index import create_namespace_index
 from app.repositories.s3_vectors_store import S3VectorsStore
+from app.services.embeddings import EmbeddingService, get_embedding_service
 
 
 def create_s3_vectors_store_from_env(
@@ -24,6 +26,7 @@ def create_s3_vectors_store_from_env(
       - S3V_DISTANCE (default: cosine)
       - S3V_DIMS (default: 1024)
       - BEDROCK_EMBED_MODEL_ID
+      - S3V_IO_MAX_WORKERS (default: 16, size of the pool backing the async API)
 
     Args:
         region_name: Optional AWS region override
@@ -45,6 +48,11 @@ def create_s3_vectors_store_from_env(
     boto_session = session or Session()
     s3v = boto_session.client("s3vectors", region_name=region)
     bedrock = boto_session.client("bedrock-runtime", region_name=region)
+    # Default-credential stores share the process-wide embedding cache; custom sessions/regions get their own client.
+    if session is None and region_name is None:
+        embedding_service = get_embedding_service()
+    else:
+        embedding_service = EmbeddingService(bedrock_client=bedrock, model_id=model_id)
 
     return S3VectorsStore(
         s3v_client=s3v,
@@ -55,6 +63,9 @@ def create_s3_vectors_store_from_env(
         model_id=model_id,
         distance=distance,  # type: ignore[arg-type]
         default_index_fields=["summary"],
+        io_max_workers=config.S3V_IO_MAX_WORKERS,
+        embedding_service=embedding_service,
+        namespace_index=create_namespace_index(f"{bucket}/{index}"),
     )
 
 
@@ -371,11 +371,7 @@ class MemoryService:
         namespace = self._get_namespace(user_id, memory_type)
 
         try:
-            items = self._store.list_by_namespace(
-                namespace,
-                return_metadata=True,
-            )
-            return len(items)
+            return self._store.count_by_namespace(namespace)
         except Exception as e:
             logger.exception(
                 "memory_service.count.error: user_id=%s type=%s error=%s",
@@ -393,21 +389,15 @@ class MemoryService:
         namespace = self._get_namespace(user_id, memory_type)
 
         try:
-            items = self._store.list_by_namespace(
-                namespace,
-                return_metadata=True,
-            )
+            oldest = self._store.get_oldest_in_namespace(namespace)
 
-            if not items:
+            if oldest is None:
                 logger.warning(
                     "memory_service.no_memories: user_id=%s type=%s",
                     user_id, memory_type
                 )
                 return None
 
-            items.sort(key=lambda item: item.value.get("last_accessed") or item.value.get("created_at", ""))
-            oldest = items[0]
-
             logger.info(
                 "memory_service.found_oldest: user_id=%s type=%s key=%s last_accessed=%s",
                 user_id, memory_type, oldest.key, oldest.value.get("last_accessed")
@@ -433,19 +423,15 @@ class MemoryService:
         limit = self._get_limit(memory_type)
 
         try:
-            items = self._store.list_by_namespace(
-                namespace,
-                return_metadata=True,
-            )
-
-            count = len(items)
+            count = self._store.count_by_namespace(namespace)
             is_at_limit = count >= limit
 
-            if not is_at_limit or not items:
+            if not is_at_limit:
                 return (is_at_limit, None)
 
-            items.sort(key=lambda item: item.value.get("last_accessed") or item.value.get("created_at", ""))
-            oldest = items[0]
+            oldest = self._store.get_oldest_in_namespace(namespace)
+            if oldest is None:
+                return (is_at_limit, None)
 
             logger.info(
                 "memory_service.check_limit: user_id=%s type=%s count=%d limit=%d oldest_key=%s",
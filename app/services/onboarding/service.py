@@ -100,7 +100,7 @@ class OnboardingService:
 
             try:
                 cache = get_user_context_cache()
-                cache.invalidate(state.user_id)
+                await cache.ainvalidate(state.user_id)
                 logger.info("[USER CONTEXT EXPORT] Invalidated user context cache for user %s", state.user_id)
             except Exception as cache_err:
                 logger.warning(
@@ -34,8 +34,15 @@ from app.core.app_state import (
 from app.core.config import config
 from app.models.user import UserContext
 from app.repositories.database_service import get_database_service
-from app.repositories.session_store import InMemorySessionStore, get_session_store
+from app.repositories.session_store import SessionStore, get_session_store
 from app.services.audio_service import get_audio_service, start_audio_service_for_thread
+from app.services.conversation_summaries import (
+    SUMMARY_FINGERPRINT_KEY,
+    SUMMARY_KEY,
+    conversation_fingerprint,
+    get_idle_summary_scheduler,
+)
+from app.services.external_context.user.context_sections import ContextSection, gather_context_sections
 from app.services.external_context.user.mapping import (
     map_ai_context_to_user_context,
     map_user_context_to_ai_context,
@@ -49,7 +56,7 @@ from app.services.llm.extended_description import (
     schedule_extended_description_update,
 )
 from app.services.location.normalizer import location_normalizer
-from app.services.user_context_cache import get_user_context_cache
+from app.services.user_context_cache import DegradedUserContextError, get_user_context_cache
 from app.utils.mapping import get_source_name
 from app.utils.tools import check_repeated_sources
 from app.utils.welcome import call_llm, generate_personalized_welcome
@@ -110,6 +117,21 @@ if not config.is_langfuse_supervisor_enabled():
     logger.warning("Langfuse env vars missing or incomplete; callback tracing will be disabled")
 
 
+# Deferred initialize work (welcome generation, TTS, finance prefetch); held so tasks are not GC'd mid-flight.
+_initialize_tasks: set[asyncio.Task] = set()
+
+
+def _track_initialize_task(task: asyncio.Task) -> None:
+    _initialize_tasks.add(task)
+    task.add_done_callback(_on_initialize_task_done)
+
+
+def _on_initialize_task_done(task: asyncio.Task) -> None:
+    _initialize_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"[SUPERVISOR] Deferred initialize work failed: {task.exception()}")
+
+
 class SupervisorService:
     def _has_guardrail_intervention(self, text: str) -> bool:
         if not isinstance(text, str):
@@ -157,38 +179,67 @@ class SupervisorService:
             return max_prompt_tokens, max_total_tokens
 
     async def _load_user_context_from_external(self, user_id: UUID) -> UserContext:
-        """Load UserContext from external FOS service with fallback."""
+        """Load UserContext from external FOS service.
+
+        The sections are independent FOS calls, so they are fetched concurrently;
+        a section that fails or misses its deadline is left out of the context.
+        Any missing section raises ``DegradedUserContextError`` carrying the partial
+        (or, when FOS fails outright, empty) context so the cache does not store it
+        and callers can tell it from a complete one.
+        """
         try:
             repo = ExternalUserRepository()
             personal_info_service = PersonalInformationService()
             payment_reminders_service = PaymentRemindersService()
-            external_ctx = await repo.get_by_id(user_id)
+            sections = await gather_context_sections(
+                [
+                    ContextSection("external_ctx", lambda: repo.get_by_id(user_id)),
+                    ContextSection("personal_info", lambda: personal_info_service.get_all_personal_info(str(user_id))),
+                    ContextSection("profile_details", lambda: personal_info_service.get_profile_details(str(user_id))),
+                    ContextSection(
+                        "payment_reminders", lambda: payment_reminders_service.get_payment_reminders(str(user_id))
+                    ),
+                ],
+                default_timeout_seconds=config.USER_CONTEXT_SECTION_TIMEOUT_SECONDS,
+                label=f"user {user_id}",
+            )
 
             ctx = UserContext(user_id=user_id)
-            personal_info = await personal_info_service.get_all_personal_info(str(user_id))
+            personal_info = sections["personal_info"]
             if personal_info:
                 ctx.personal_information = personal_info
 
-            profile_details = await personal_info_service.get_profile_details(str(user_id))
+            profile_details = sections["profile_details"]
             if profile_details:
                 self._merge_profile_details(ctx, profile_details)
 
-            payment_reminders = await payment_reminders_service.get_payment_reminders(str(user_id))
+            payment_reminders = sections["payment_reminders"]
             if payment_reminders and isinstance(payment_reminders, dict):
                 ctx.payment_reminders = payment_reminders.get("payment_reminders", [])
 
+            external_ctx = sections["external_ctx"]
             if external_ctx:
                 ctx = map_ai_context_to_user_context(external_ctx, ctx)
                 logger.info(f"[SUPERVISOR] External AI Context loaded for user: {user_id}")
             else:
                 logger.info(f"[SUPERVISOR] No external AI Context found for user: {user_id}")
 
+            if sections.missing:
+                raise DegradedUserContextError(ctx, sections.missing)
             return ctx
 
+        except DegradedUserContextError:
+            raise
         except Exception as e:
             logger.warning(f"[SUPERVISOR] Failed to load external user context: {e}")
-            # Fallback to empty UserContext if external service fails
-            return UserContext(user_id=user_id)
+            raise DegradedUserContextError(UserContext(user_id=user_id)) from e
+
+    async def _load_initial_user_context(self, user_id: UUID) -> Tuple[UserContext, bool]:
+        """Load the context for a new conversation; return it with a degraded flag instead of raising."""
+        try:
+            return await self._load_user_context_from_external(user_id), False
+        except DegradedUserContextError as e:
+            return e.context, True
 
     async def _export_user_context_to_external(self, user_context: UserContext) -> bool:
         """Export UserContext to external FOS service."""
@@ -497,9 +548,20 @@ class SupervisorService:
             logger.warning("[SUPERVISOR] Failed to invalidate finance agent for user %s: %s", user_id, e)
 
     async def _find_latest_prior_thread(
-        self, session_store: InMemorySessionStore, user_id: str, exclude_thread_id: str
+        self, session_store: SessionStore, user_id: str, exclude_thread_id: str
     ) -> Optional[str]:
-        """Find the most recent previous thread for this user (excluding current thread)."""
+        """Find the most recent previous thread for this user (excluding current thread).
+
+        Served from the store's per-user recent-thread list; the full scan over the
+        user's threads only runs for users with no recent-thread entry yet.
+        """
+        recent = list(await session_store.get_recent_user_threads(user_id))
+        for thread_id in recent:
+            if thread_id != exclude_thread_id:
+                return thread_id
+        if recent:
+            return None
+
         user_threads = await session_store.get_user_threads(user_id)
 
         latest_thread = None
@@ -509,7 +571,7 @@ class SupervisorService:
             if thread_id == exclude_thread_id:
                 continue
 
-            session_data = session_store.sessions.get(thread_id, {})
+            session_data = await session_store.peek_session(thread_id) or {}
             timestamp = session_data.get("last_accessed")
             if timestamp and (latest_timestamp is None or timestamp > latest_timestamp):
                 latest_thread = thread_id
@@ -517,9 +579,11 @@ class SupervisorService:
 
         return latest_thread
 
-    def _load_conversation_messages(self, session_store: InMemorySessionStore, thread_id: str) -> List[Dict[str, str]]:
+    async def _load_conversation_messages(
+        self, session_store: SessionStore, thread_id: str
+    ) -> List[Dict[str, str]]:
         """Load conversation messages from a thread's session data."""
-        session_data = session_store.sessions.get(thread_id, {})
+        session_data = await session_store.peek_session(thread_id) or {}
         return session_data.get("conversation_messages", [])
 
     def _extract_chat_pairs(self, messages: List[Dict[str, str]]) -> List[Tuple[str, str]]:
@@ -572,8 +636,32 @@ class SupervisorService:
 
         return None
 
+    async def _ensure_thread_summary(self, session_store: SessionStore, thread_id: str) -> Optional[str]:
+        """Return the thread's stored summary, regenerating it only if the chat changed since."""
+        session_data = await session_store.peek_session(thread_id) or {}
+        messages = session_data.get("conversation_messages", [])
+        if not messages:
+            logger.info(f"No messages found in thread {thread_id} to summarize")
+            return None
+
+        chat_pairs = self._extract_chat_pairs(messages)
+        if not chat_pairs:
+            logger.info(f"No valid chat pairs found in thread {thread_id} to summarize")
+            return None
+
+        fingerprint = conversation_fingerprint(chat_pairs)
+        if session_data.get(SUMMARY_FINGERPRINT_KEY) == fingerprint:
+            return session_data.get(SUMMARY_KEY)
+
+        summary = await self._summarize_conversation(chat_pairs)
+        if summary:
+            await session_store.update_session_fields(
+                thread_id, {SUMMARY_KEY: summary, SUMMARY_FINGERPRINT_KEY: fingerprint}
+            )
+        return summary
+
     async def _get_prior_conversation_summary(
-        self, session_store: InMemorySessionStore, user_id: str, current_thread_id: str
+        self, session_store: SessionStore, user_id: str, current_thread_id: str
     ) -> Optional[str]:
         """Get summary of the most recent prior conversation for this user."""
         try:
@@ -583,38 +671,17 @@ class SupervisorService:
                 logger.info(f"No prior conversation found for user {user_id}")
                 return None
 
-            messages = self._load_conversation_messages(session_store, prior_thread_id)
-
-            if not messages:
-                logger.info(f"No messages found in prior thread {prior_thread_id} for user {user_id}")
-                return None
-
-            chat_pairs = self._extract_chat_pairs(messages)
-
-            if not chat_pairs:
-                logger.info(f"No valid chat pairs found in prior thread {prior_thread_id} for user {user_id}")
-                return None
+            summary = await self._ensure_thread_summary(session_store, prior_thread_id)
 
-            summary = await self._summarize_conversation(chat_pairs)
-
-            logger.info(f"Generated prior summary for user {user_id}: {len(summary or '')} chars")
+            logger.info(f"Prior summary for user {user_id}: {len(summary or '')} chars")
             return summary
 
         except Exception as e:
             logger.exception(f"Error getting prior conversation summary for user {user_id}: {e}")
             return None
 
-    async def initialize(self, *, user_id: UUID, voice: bool = False) -> dict[str, Any]:
-        """Initialize the supervisor service."""
-        thread_id = str(uuid4())
-        queue = get_sse_queue(thread_id)
-
-        await queue.put({"event": "conversation.started", "data": {"thread_id": thread_id}})
-
-        session_store = get_session_store()
-        uid: UUID = user_id
-        ctx = await self._load_user_context_from_external(uid)
-
+    async def _check_financial_flags(self, uid: UUID) -> tuple[bool, bool]:
+        """Return (has_plaid_accounts, has_financial_data) for a new conversation."""
         has_plaid_accounts = False
         has_financial_data = False
         try:
@@ -629,29 +696,10 @@ class SupervisorService:
         except Exception as e:
             logger.warning(f"[SUPERVISOR] Failed to check financial accounts for user {uid}: {e}")
             has_financial_data = has_plaid_accounts
+        return has_plaid_accounts, has_financial_data
 
-        logger.info(
-            f"[SUPERVISOR] User {uid} financial flags -> plaid_accounts={has_plaid_accounts}, "
-            f"financial_data={has_financial_data}"
-        )
-        await session_store.set_session(
-            thread_id,
-            {
-                "user_id": str(uid),
-                "user_context": ctx.model_dump(mode="json"),
-                "conversation_messages": [],
-                "has_financial_accounts": has_plaid_accounts,
-                "has_plaid_accounts": has_plaid_accounts,
-                "has_financial_data": has_financial_data,
-            },
-        )
-
-        prior_summary = await self._get_prior_conversation_summary(session_store, str(uid), thread_id)
-
-        logger.info(f"[SUPERVISOR] Generating welcome message with icebreaker support for user {uid}")
-
-        icebreaker_used: bool = False
-        icebreaker_hint: str | None = None
+    async def _poll_icebreaker(self, uid: UUID) -> Optional[str]:
+        """Fetch an icebreaker hint from FOS for the welcome message, if any."""
         try:
             from app.services.nudges.icebreaker_processor import get_icebreaker_processor
 
@@ -660,21 +708,34 @@ class SupervisorService:
             raw_icebreaker = await processor.process_icebreaker_for_user(uid)
             logger.info(f"Finished getting icebreaker via FOS API for user {uid}")
             if raw_icebreaker and raw_icebreaker.strip():
-                icebreaker_hint = raw_icebreaker.strip()
-                icebreaker_used = True
                 logger.info(f"[SUPERVISOR] Icebreaker hint captured for user {uid}")
+                return raw_icebreaker.strip()
         except Exception as e:
             logger.warning(f"[SUPERVISOR] Icebreaker polling failed for user {uid}: {e}")
+        return None
+
+    async def _deliver_welcome(
+        self,
+        *,
+        uid: UUID,
+        thread_id: str,
+        user_context: dict[str, Any],
+        prior_summary_task: asyncio.Task,
+        icebreaker_task: asyncio.Task,
+        voice: bool,
+    ) -> tuple[str, Optional[str]]:
+        """Generate the welcome once its inputs are ready and stream it (and its audio) over SSE."""
+        prior_summary, icebreaker_hint = await asyncio.gather(prior_summary_task, icebreaker_task)
 
-        user_ctx_for_welcome = (await session_store.get_session(thread_id) or {}).get("user_context", {})
-        welcome = await generate_personalized_welcome(user_ctx_for_welcome, prior_summary, icebreaker_hint)
+        logger.info(f"[SUPERVISOR] Generating welcome message with icebreaker support for user {uid}")
+        welcome = await generate_personalized_welcome(user_context, prior_summary, icebreaker_hint)
 
         logger.info(
-            f"Initialize complete for user {uid}: thread={thread_id}, has_prior_summary={bool(prior_summary)}, icebreaker_used={icebreaker_used}"
+            f"Initialize complete for user {uid}: thread={thread_id}, has_prior_summary={bool(prior_summary)}, icebreaker_used={icebreaker_hint is not None}"
         )
 
         welcome_cleaned = _strip_emojis(welcome)
-        await queue.put({"event": "message.completed", "data": {"text": welcome_cleaned}})
+        await get_sse_queue(thread_id).put({"event": "message.completed", "data": {"text": welcome_cleaned}})
 
         if voice:
             try:
@@ -693,15 +754,84 @@ class SupervisorService:
             except Exception as e:
                 logger.error(f"[SUPERVISOR] Failed to generate welcome audio for thread_id {thread_id}: {e}")
 
+        return welcome, prior_summary
+
+    async def initialize(self, *, user_id: UUID, voice: bool = False, wait_for_welcome: bool = False) -> dict[str, Any]:
+        """Start a conversation and return its thread id as soon as the session exists.
+
+        Stages run as a small dependency graph: the prior-conversation summary and
+        the icebreaker poll start right away, alongside the user-context load and
+        the financial-flag check. The session is written once context and flags are
+        in, and the call returns. The welcome (and its audio when ``voice``) follows
+        on the thread's SSE stream once summary and icebreaker are done. With
+        ``wait_for_welcome`` the call also waits for the welcome and returns it.
+        """
+        thread_id = str(uuid4())
+        queue = get_sse_queue(thread_id)
+
+        await queue.put({"event": "conversation.started", "data": {"thread_id": thread_id}})
+
+        session_store = get_session_store()
+        uid: UUID = user_id
+
+        prior_summary_task = asyncio.create_task(
+            self._get_prior_conversation_summary(session_store, str(uid), thread_id)
+        )
+        icebreaker_task = asyncio.create_task(self._poll_icebreaker(uid))
+        try:
+            (ctx, ctx_degraded), (has_plaid_accounts, has_financial_data) = await asyncio.gather(
+                self._load_initial_user_context(uid),
+                self._check_financial_flags(uid),
+            )
+        except BaseException:
+            prior_summary_task.cancel()
+            icebreaker_task.cancel()
+            raise
+
+        logger.info(
+            f"[SUPERVISOR] User {uid} financial flags -> plaid_accounts={has_plaid_accounts}, "
+            f"financial_data={has_financial_data}"
+        )
+        user_context = ctx.model_dump(mode="json")
+        session_data = {
+            "user_id": str(uid),
+            "user_context": user_context,
+            "conversation_messages": [],
+            "has_financial_accounts": has_plaid_accounts,
+            "has_plaid_accounts": has_plaid_accounts,
+            "has_financial_data": has_financial_data,
+        }
+        if ctx_degraded:
+            # Never exported back to FOS; the next turn retries the load.
+            session_data["user_context_degraded"] = True
+        await session_store.set_session(thread_id, session_data)
+
         if has_financial_data:
             try:
                 from app.core.app_state import get_finance_agent
 
                 fa = get_finance_agent()
-                asyncio.create_task(fa._fetch_shallow_samples(uid))
+                _track_initialize_task(asyncio.create_task(fa._fetch_shallow_samples(uid)))
             except Exception:
                 pass
 
+        welcome_task = asyncio.create_task(
+            self._deliver_welcome(
+                uid=uid,
+                thread_id=thread_id,
+                user_context=user_context,
+                prior_summary_task=prior_summary_task,
+                icebreaker_task=icebreaker_task,
+                voice=voice,
+            )
+        )
+        welcome: Optional[str] = None
+        prior_summary: Optional[str] = None
+        if wait_for_welcome:
+            welcome, prior_summary = await welcome_task
+        else:
+            _track_initialize_task(welcome_task)
+
         return {
             "thread_id": thread_id,
             "welcome": welcome,
@@ -726,7 +856,7 @@ class SupervisorService:
         await q.put(step_update_event)
 
         graph: CompiledStateGraph = get_supervisor_graph()
-        session_store: InMemorySessionStore = get_session_store()
+        session_store: SessionStore = get_session_store()
         session_ctx = await session_store.get_session(thread_id) or {}
         sources = []
 
@@ -739,16 +869,24 @@ class SupervisorService:
         if user_id:
             uid = UUID(user_id)
             cache = get_user_context_cache()
-            ctx, ctx_dict, ctx_hash, _cache_changed = await cache.get_or_fetch(
-                uid,
-                self._load_user_context_from_external,
-            )
+            try:
+                ctx, ctx_dict, ctx_hash, _cache_changed = await cache.get_or_fetch(
+                    uid,
+                    self._load_user_context_from_external,
+                )
+            except DegradedUserContextError as e:
+                logger.warning("[SUPERVISOR] User context degraded for thread %s: %s", thread_id, e)
+                ctx_hash = None
+                if not session_ctx.get("user_context"):
+                    session_ctx["user_context"] = e.context.model_dump(mode="json")
+                    session_ctx["user_context_degraded"] = True
+                    user_context_changed = True
             old_hash = session_ctx.get("user_context_hash")
-            user_context_changed = old_hash is None or old_hash != ctx_hash
-
-            if user_context_changed:
+            if ctx_hash is not None and (old_hash is None or old_hash != ctx_hash):
+                user_context_changed = True
                 session_ctx["user_context"] = ctx_dict
                 session_ctx["user_context_hash"] = ctx_hash
+                session_ctx.pop("user_context_degraded", None)
                 logger.info(
                     "[SUPERVISOR] User context updated for thread %s: old_hash=%s new_hash=%s",
                     thread_id,
@@ -1301,16 +1439,19 @@ class SupervisorService:
             session_ctx["conversation_messages"] = conversation_messages
             await session_store.set_session(thread_id, session_ctx)
             logger.info(f"Stored conversation for thread {thread_id}: {len(conversation_messages)} messages")
+            get_idle_summary_scheduler().touch(
+                thread_id, lambda: self._ensure_thread_summary(session_store, thread_id)
+            )
 
             user_id = session_ctx.get("user_id")
-            if user_id:
+            if user_id and not session_ctx.get("user_context_degraded"):
                 user_ctx_dict = session_ctx.get("user_context", {})
                 if user_ctx_dict:
                     ctx = UserContext.model_validate(user_ctx_dict)
                     export_success = await self._export_user_context_to_external(ctx)
                     if export_success:
                         cache = get_user_context_cache()
-                        cache.invalidate(ctx.user_id)
+                        await cache.ainvalidate(ctx.user_id)
 
         except Exception as e:
             logger.exception(f"Failed to store conversation for thread {thread_id}: {e}")
@@ -1335,7 +1476,7 @@ class SupervisorService:
         await q.put({"event": "confirm.response", "data": {"decision": decision}})
 
         graph: CompiledStateGraph = get_supervisor_graph()
-        session_store: InMemorySessionStore = get_session_store()
+        session_store: SessionStore = get_session_store()
         session_ctx = await session_store.get_session(thread_id) or {}
 
         user_id = session_ctx.get("user_id")
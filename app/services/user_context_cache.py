@@ -6,20 +6,39 @@ import hashlib
 import json
 import logging
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Sequence
 from uuid import UUID
 
 from app.core.config import config as app_config
+from app.core.runtime_registry import RuntimeRegistry, lock_is_idle
 from app.models.user import UserContext
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_CACHE_TTL_SECONDS: int = 60
+# Past the TTL, entries are still served for this long while one refresh runs in the background.
+DEFAULT_STALE_SECONDS: int = 120
+# Failed fetches are remembered this long so an FOS outage does not turn into a retry storm.
+DEFAULT_NEGATIVE_TTL_SECONDS: int = 10
+DEFAULT_MAX_ENTRIES: int = 5000
 
 CLEANUP_INTERVAL_SECONDS: int = 300
 
 
+class DegradedUserContextError(Exception):
+    """Raised by a fetch that could only build a partial context; it is never cached or shared.
+
+    ``context`` holds whatever was loaded so callers can still use it for the current turn.
+    """
+
+    def __init__(self, context: UserContext, missing: Sequence[str] = ()) -> None:
+        self.context = context
+        self.missing = tuple(missing)
+        super().__init__(f"user context degraded, missing: {', '.join(self.missing) or 'all'}")
+
+
 @dataclass
 class CachedUserContextEntry:
     context: UserContext
@@ -28,28 +47,128 @@ class CachedUserContextEntry:
     fetched_at: float
 
 
+class RedisUserContextTier:
+    """Shared second tier: one JSON document per user, written by whichever replica fetched it."""
+
+    def __init__(self, client: Any = None, *, prefix: str = "user_ctx") -> None:
+        self._client = client
+        self._prefix = prefix.rstrip(":")
+
+    async def _get_client(self) -> Any:
+        if self._client is None:
+            from app.services.memory.redis_client import get_redis_client_singleton
+
+            self._client = await get_redis_client_singleton()
+        return self._client
+
+    def _key(self, user_id: str) -> str:
+        return f"{self._prefix}:{user_id}"
+
+    async def get(self, user_id: str) -> CachedUserContextEntry | None:
+        try:
+            client = await self._get_client()
+            raw = await client.get(self._key(user_id))
+            if raw is None:
+                return None
+            payload = json.loads(raw)
+            return CachedUserContextEntry(
+                context=UserContext.model_validate(payload["context"]),
+                context_dict=payload["context"],
+                content_hash=payload["hash"],
+                fetched_at=float(payload["fetched_at"]),
+            )
+        except Exception as e:
+            logger.warning("user_context_cache.shared.get.error user_id=%s err=%s", user_id, e)
+            return None
+
+    async def set(self, user_id: str, entry: CachedUserContextEntry, ttl_seconds: int) -> None:
+        payload = {"context": entry.context_dict, "hash": entry.content_hash, "fetched_at": entry.fetched_at}
+        try:
+            client = await self._get_client()
+            await client.set(self._key(user_id), json.dumps(payload, default=str), ex=max(1, int(ttl_seconds)))
+        except Exception as e:
+            logger.warning("user_context_cache.shared.set.error user_id=%s err=%s", user_id, e)
+
+    async def delete(self, user_id: str) -> None:
+        try:
+            client = await self._get_client()
+            await client.delete(self._key(user_id))
+        except Exception as e:
+            logger.warning("user_context_cache.shared.delete.error user_id=%s err=%s", user_id, e)
+
+
+def _default_shared_tier() -> RedisUserContextTier | None:
+    backend = (getattr(app_config, "USER_CONTEXT_CACHE_BACKEND", None) or "local").lower()
+    if backend == "local":
+        return None
+    if backend == "redis":
+        return RedisUserContextTier()
+    raise ValueError(f"Unknown USER_CONTEXT_CACHE_BACKEND: {backend!r}")
+
+
 class UserContextCache:
-    """In-memory cache for user context with TTL and hash-based change detection.
+    """Two-tier user context cache with TTL and hash-based change detection.
 
     Features:
-    - Per-user caching with configurable TTL
-    - Content hash for detecting actual changes
-    - Thread-safe async operations with per-user locks
+    - Local LRU tier bounded to ``max_entries``, optionally backed by a shared Redis tier
+      (``USER_CONTEXT_CACHE_BACKEND=redis``) so replicas reuse each other's fetches
+    - Stale-while-revalidate: entries up to ``stale_seconds`` past the TTL are served
+      while a single background refresh per user runs
+    - Negative caching of failed fetches for ``negative_ttl_seconds``; a fetch raising
+      ``DegradedUserContextError`` counts as failed, so partial contexts never reach either tier
+    - Content hash for detecting actual changes, recomputed only when the fetched context differs
+    - Thread-safe async operations with per-user locks (bounded, idle locks are evicted)
     - Automatic cleanup of expired entries
     """
 
-    def __init__(self, ttl_seconds: int | None = None) -> None:
-        self._cache: dict[str, CachedUserContextEntry] = {}
-        self._locks: dict[str, asyncio.Lock] = {}
+    def __init__(
+        self,
+        ttl_seconds: int | None = None,
+        *,
+        stale_seconds: int | None = None,
+        negative_ttl_seconds: int | None = None,
+        max_entries: int | None = None,
+        shared: RedisUserContextTier | None = None,
+    ) -> None:
+        self._cache: OrderedDict[str, CachedUserContextEntry] = OrderedDict()
+        self._negative: dict[str, tuple[float, Exception]] = {}
+        self._refreshing: dict[str, asyncio.Task] = {}
+        # Fetches in flight per user, and the ones an invalidation overtook; the latter
+        # return their result to the caller but must not write it back to either tier.
+        self._fetching: dict[str, int] = {}
+        self._overtaken: set[str] = set()
+        self._locks: RuntimeRegistry[asyncio.Lock] = RuntimeRegistry(
+            "user_context_locks",
+            max_entries=app_config.RUNTIME_REGISTRY_MAX_ENTRIES,
+            idle_ttl_seconds=app_config.RUNTIME_REGISTRY_IDLE_TTL_SECONDS,
+            is_evictable=lock_is_idle,
+        )
         self._global_lock = asyncio.Lock()
         self._cleanup_task: asyncio.Task | None = None
+        self._shared = shared if shared is not None else _default_shared_tier()
 
         config_ttl = getattr(app_config, "USER_CONTEXT_CACHE_TTL_SECONDS", None)
         self._ttl_seconds = ttl_seconds or config_ttl or DEFAULT_CACHE_TTL_SECONDS
+        self._stale_seconds = _first_not_none(
+            stale_seconds, getattr(app_config, "USER_CONTEXT_CACHE_STALE_SECONDS", None), DEFAULT_STALE_SECONDS
+        )
+        self._negative_ttl_seconds = _first_not_none(
+            negative_ttl_seconds,
+            getattr(app_config, "USER_CONTEXT_CACHE_NEGATIVE_TTL_SECONDS", None),
+            DEFAULT_NEGATIVE_TTL_SECONDS,
+        )
+        self._max_entries = max(
+            1,
+            _first_not_none(max_entries, getattr(app_config, "USER_CONTEXT_CACHE_MAX_ENTRIES", None), DEFAULT_MAX_ENTRIES),
+        )
 
         logger.info(
-            "user_context_cache.init ttl_seconds=%d",
+            "user_context_cache.init ttl_seconds=%d stale_seconds=%d negative_ttl_seconds=%d max_entries=%d shared=%s",
             self._ttl_seconds,
+            self._stale_seconds,
+            self._negative_ttl_seconds,
+            self._max_entries,
+            self._shared is not None,
         )
 
     async def start(self) -> None:
@@ -64,6 +183,10 @@ class UserContextCache:
                 await self._cleanup_task
             self._cleanup_task = None
             logger.info("user_context_cache.cleanup_task.stopped")
+        refreshing = list(self._refreshing.values())
+        for task in refreshing:
+            task.cancel()
+        await asyncio.gather(*refreshing, return_exceptions=True)
 
     async def _periodic_cleanup(self) -> None:
         while True:
@@ -83,19 +206,24 @@ class UserContextCache:
 
         async with self._global_lock:
             for key, entry in self._cache.items():
-                if (now - entry.fetched_at) > self._ttl_seconds:
+                if self._age(entry, now) > self._ttl_seconds + self._stale_seconds:
                     expired_keys.append(key)
 
             for key in expired_keys:
                 self._cache.pop(key, None)
+            for key in [k for k, (until, _) in self._negative.items() if until <= now]:
+                self._negative.pop(key, None)
+        self._locks.sweep()
         return len(expired_keys)
 
     async def _get_lock(self, user_id: str) -> asyncio.Lock:
-        if user_id not in self._locks:
+        lock = self._locks.get(user_id)
+        if lock is None:
             async with self._global_lock:
-                if user_id not in self._locks:
-                    self._locks[user_id] = asyncio.Lock()
-        return self._locks[user_id]
+                lock = self._locks.get(user_id)
+                if lock is None:
+                    lock = self._locks[user_id] = asyncio.Lock()
+        return lock
 
     HASH_EXCLUDE_FIELDS: frozenset[str] = frozenset(
         {
@@ -127,8 +255,21 @@ class UserContextCache:
         serialized = json.dumps(stable_dict, sort_keys=True, default=str)
         return hashlib.md5(serialized.encode(), usedforsecurity=False).hexdigest()
 
+    @staticmethod
+    def _age(entry: CachedUserContextEntry, now: float | None = None) -> float:
+        return (now if now is not None else time.time()) - entry.fetched_at
+
     def _is_expired(self, entry: CachedUserContextEntry) -> bool:
-        return (time.time() - entry.fetched_at) > self._ttl_seconds
+        return self._age(entry) > self._ttl_seconds
+
+    def _is_servable_stale(self, entry: CachedUserContextEntry) -> bool:
+        return self._age(entry) <= self._ttl_seconds + self._stale_seconds
+
+    def _store_local(self, cache_key: str, entry: CachedUserContextEntry) -> None:
+        self._cache[cache_key] = entry
+        self._cache.move_to_end(cache_key)
+        while len(self._cache) > self._max_entries:
+            self._cache.popitem(last=False)
 
     def get_cached(self, user_id: UUID | str) -> CachedUserContextEntry | None:
         cache_key = str(user_id)
@@ -138,11 +279,131 @@ class UserContextCache:
             return None
 
         if self._is_expired(entry):
-            self._cache.pop(cache_key, None)
+            if not self._is_servable_stale(entry):
+                self._cache.pop(cache_key, None)
             return None
 
+        self._cache.move_to_end(cache_key)
         return entry
 
+    async def _lookup(self, cache_key: str) -> CachedUserContextEntry | None:
+        """Local tier first, then the shared tier (promoting its entry locally)."""
+        entry = self._cache.get(cache_key)
+        if entry is None and self._shared is not None:
+            entry = await self._shared.get(cache_key)
+            if entry is not None:
+                self._store_local(cache_key, entry)
+        if entry is not None and not self._is_servable_stale(entry):
+            self._cache.pop(cache_key, None)
+            return None
+        return entry
+
+    def _raise_if_negative(self, cache_key: str) -> None:
+        negative = self._negative.get(cache_key)
+        if negative is None:
+            return
+        until, error = negative
+        if time.time() < until:
+            logger.info("user_context_cache.negative_hit user_id=%s", cache_key)
+            raise error
+        self._negative.pop(cache_key, None)
+
+    def _schedule_refresh(self, user_id: UUID, fetch_fn) -> None:
+        cache_key = str(user_id)
+        task = self._refreshing.get(cache_key)
+        if task is not None and not task.done():
+            return
+        task = asyncio.create_task(self._background_refresh(user_id, fetch_fn))
+        self._refreshing[cache_key] = task
+        task.add_done_callback(lambda t, k=cache_key: self._refreshing.pop(k, None) if self._refreshing.get(k) is t else None)
+
+    async def _background_refresh(self, user_id: UUID, fetch_fn) -> None:
+        cache_key = str(user_id)
+        lock = await self._get_lock(cache_key)
+        async with lock:
+            entry = self._cache.get(cache_key)
+            if entry is not None and not self._is_expired(entry):
+                return
+            with contextlib.suppress(Exception):
+                await self._fetch_and_store(user_id, fetch_fn, reason="revalidate")
+
+    def _finish_fetch(self, cache_key: str) -> bool:
+        """Count a fetch as done; return True when an invalidation overtook it."""
+        overtaken = cache_key in self._overtaken
+        remaining = self._fetching.get(cache_key, 1) - 1
+        if remaining > 0:
+            self._fetching[cache_key] = remaining
+        else:
+            self._fetching.pop(cache_key, None)
+            self._overtaken.discard(cache_key)
+        return overtaken
+
+    async def _fetch_and_store(
+        self, user_id: UUID, fetch_fn, *, reason: str
+    ) -> tuple[UserContext, dict[str, Any], str, bool]:
+        """Fetch from the source (lock held) and update both tiers; failures become negative entries."""
+        cache_key = str(user_id)
+        t0 = time.perf_counter()
+        self._fetching[cache_key] = self._fetching.get(cache_key, 0) + 1
+        try:
+            context = await fetch_fn(user_id)
+        except Exception as e:
+            logger.error(
+                "user_context_cache.fetch.error user_id=%s err=%s",
+                user_id,
+                e,
+            )
+            stale_entry = self._cache.get(cache_key)
+            if stale_entry is not None:
+                logger.warning(
+                    "user_context_cache.fetch.fallback_to_stale user_id=%s",
+                    user_id,
+                )
+                return stale_entry.context, stale_entry.context_dict, stale_entry.content_hash, False
+            if self._negative_ttl_seconds > 0:
+                self._negative[cache_key] = (time.time() + self._negative_ttl_seconds, e)
+            raise
+        finally:
+            overtaken = self._finish_fetch(cache_key)
+
+        t1 = time.perf_counter()
+        fetch_ms = int((t1 - t0) * 1000)
+        self._negative.pop(cache_key, None)
+
+        context_dict = context.model_dump(mode="json")
+        old_entry = self._cache.get(cache_key)
+        if old_entry is not None and old_entry.context_dict == context_dict:
+            # Identical payload: keep the hash instead of re-canonicalizing and hashing it.
+            new_hash = old_entry.content_hash
+        else:
+            new_hash = self.compute_hash(context_dict)
+        content_changed = old_entry is None or old_entry.content_hash != new_hash
+
+        if overtaken:
+            logger.info("user_context_cache.fetch.discarded user_id=%s reason=invalidated", user_id)
+            return context, context_dict, new_hash, content_changed
+
+        new_entry = CachedUserContextEntry(
+            context=context,
+            context_dict=context_dict,
+            content_hash=new_hash,
+            fetched_at=time.time(),
+        )
+        self._store_local(cache_key, new_entry)
+        if self._shared is not None:
+            await self._shared.set(cache_key, new_entry, self._ttl_seconds + self._stale_seconds)
+
+        log_level = "miss" if old_entry is None else reason
+        logger.info(
+            "user_context_cache.%s user_id=%s fetch_ms=%d content_changed=%s",
+            log_level,
+            user_id,
+            fetch_ms,
+            content_changed,
+        )
+
+        return context, context_dict, new_hash, content_changed
+
     async def get_or_fetch(
         self,
         user_id: UUID,
@@ -150,68 +411,57 @@ class UserContextCache:
         force_refresh: bool = False,
     ) -> tuple[UserContext, dict[str, Any], str, bool]:
         cache_key = str(user_id)
+
+        if not force_refresh:
+            entry = self.get_cached(user_id)
+            if entry is not None:
+                logger.info(
+                    "user_context_cache.hit user_id=%s age_seconds=%.1f",
+                    user_id,
+                    self._age(entry),
+                )
+                return entry.context, entry.context_dict, entry.content_hash, False
+
         lock = await self._get_lock(cache_key)
 
         async with lock:
             if not force_refresh:
-                entry = self.get_cached(user_id)
+                entry = await self._lookup(cache_key)
                 if entry is not None:
-                    logger.info(
-                        "user_context_cache.hit user_id=%s age_seconds=%.1f",
-                        user_id,
-                        time.time() - entry.fetched_at,
-                    )
+                    if self._is_expired(entry):
+                        logger.info(
+                            "user_context_cache.stale user_id=%s age_seconds=%.1f",
+                            user_id,
+                            self._age(entry),
+                        )
+                        self._schedule_refresh(user_id, fetch_fn)
+                    else:
+                        logger.info(
+                            "user_context_cache.hit user_id=%s age_seconds=%.1f",
+                            user_id,
+                            self._age(entry),
+                        )
                     return entry.context, entry.context_dict, entry.content_hash, False
+                self._raise_if_negative(cache_key)
 
-            t0 = time.perf_counter()
-            try:
-                context = await fetch_fn(user_id)
-            except Exception as e:
-                logger.error(
-                    "user_context_cache.fetch.error user_id=%s err=%s",
-                    user_id,
-                    e,
-                )
-                stale_entry = self._cache.get(cache_key)
-                if stale_entry is not None:
-                    logger.warning(
-                        "user_context_cache.fetch.fallback_to_stale user_id=%s",
-                        user_id,
-                    )
-                    return stale_entry.context, stale_entry.context_dict, stale_entry.content_hash, False
-                raise
-
-            t1 = time.perf_counter()
-            fetch_ms = int((t1 - t0) * 1000)
-
-            context_dict = context.model_dump(mode="json")
-            new_hash = self.compute_hash(context_dict)
+            return await self._fetch_and_store(user_id, fetch_fn, reason="refresh" if force_refresh else "expired")
 
-            old_entry = self._cache.get(cache_key)
-            content_changed = old_entry is None or old_entry.content_hash != new_hash
+    async def ainvalidate(self, user_id: UUID | str) -> bool:
+        """Drop the user's entry from both tiers.
 
-            new_entry = CachedUserContextEntry(
-                context=context,
-                context_dict=context_dict,
-                content_hash=new_hash,
-                fetched_at=time.time(),
-            )
-            self._cache[cache_key] = new_entry
-
-            log_level = "miss" if old_entry is None else ("refresh" if force_refresh else "expired")
-            logger.info(
-                "user_context_cache.%s user_id=%s fetch_ms=%d content_changed=%s",
-                log_level,
-                user_id,
-                fetch_ms,
-                content_changed,
-            )
-
-            return context, context_dict, new_hash, content_changed
-
-    def invalidate(self, user_id: UUID | str) -> bool:
+        A background revalidation for the user is cancelled, and fetches already
+        in flight are not written back, so no pre-invalidation context returns.
+        """
         cache_key = str(user_id)
         entry = self._cache.pop(cache_key, None)
+        self._negative.pop(cache_key, None)
+        if cache_key in self._fetching:
+            self._overtaken.add(cache_key)
+        refresh = self._refreshing.pop(cache_key, None)
+        if refresh is not None and not refresh.done():
+            refresh.cancel()
+        if self._shared is not None:
+            await self._shared.delete(cache_key)
         if entry is not None:
             logger.info("user_context_cache.invalidate user_id=%s", user_id)
             return True
@@ -220,6 +470,8 @@ class UserContextCache:
     def invalidate_all(self) -> int:
         count = len(self._cache)
         self._cache.clear()
+        self._negative.clear()
+        self._overtaken.update(self._fetching)
         self._locks.clear()
         logger.info("user_context_cache.invalidate_all count=%d", count)
         return count
@@ -231,13 +483,23 @@ class UserContextCache:
 
         return {
             "total_entries": len(entries),
+            "max_entries": self._max_entries,
+            "negative_entries": len(self._negative),
+            "refreshing": len(self._refreshing),
+            "shared_tier": self._shared is not None,
+            "locks": self._locks.stats(),
             "ttl_seconds": self._ttl_seconds,
+            "stale_seconds": self._stale_seconds,
             "avg_age_seconds": sum(ages) / len(ages) if ages else 0,
             "oldest_age_seconds": max(ages) if ages else 0,
             "newest_age_seconds": min(ages) if ages else 0,
         }
 
 
+def _first_not_none(*values: Any) -> Any:
+    return next(v for v in values if v is not None)
+
+
 _user_context_cache: UserContextCache | None = None
 
 
@@ -89,7 +89,7 @@ class TestGuestRoutes:
         thread_id = "test-thread-id"
         mock_queue = AsyncMock()
 
-        with patch("app.api.routes_guest.get_sse_queue", return_value=mock_queue), contextlib.suppress(Exception):
+        with patch("app.api.routes_guest.attach_sse_queue", return_value=mock_queue), contextlib.suppress(Exception):
             resp = client.get(f"/guest/sse/{thread_id}", timeout=1.0)
             # Content type check if response returned
             if resp is not None and hasattr(resp, "headers"):
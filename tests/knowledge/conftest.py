@@ -103,7 +103,7 @@ def temp_log_file(tmp_path):
 
 @pytest.fixture
 def mock_bedrock_embeddings(mocker):
-    mock = mocker.patch('app.knowledge.document_service.BedrockEmbeddings')
+    mock = mocker.patch('app.knowledge.document_service.get_embedding_service')
     mock_instance = MagicMock()
     mock_instance.embed_documents.return_value = [[0.1] * 1536 for _ in range(10)]
     mock_instance.embed_query.return_value = [0.1] * 1536
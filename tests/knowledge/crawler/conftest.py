@@ -1,13 +1,13 @@
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
 
 @pytest.fixture
 def mock_recursive_loader(mocker):
-    mock = mocker.patch('app.knowledge.crawler.loaders.recursive_loader.RecursiveUrlLoader')
+    mock = mocker.patch('app.knowledge.crawler.loaders.recursive_loader.AsyncCrawler')
     mock_instance = MagicMock()
-    mock_instance.load.return_value = []
+    mock_instance.crawl = AsyncMock(return_value=[])
     mock.return_value = mock_instance
     return mock_instance
 
@@ -1,6 +1,8 @@
+from unittest.mock import AsyncMock
+
 import pytest
-from langchain_core.documents import Document
 
+from app.knowledge.crawler.async_crawler import CrawledPage
 from app.knowledge.crawler.loaders.recursive_loader import RecursiveLoader
 
 
@@ -12,39 +14,44 @@ class TestRecursiveLoader:
         return RecursiveLoader(sample_source)
 
     @pytest.fixture
-    def mock_langchain_loader(self, mocker):
+    def mock_crawler_class(self, mocker):
         mock = mocker.patch(
-            'app.knowledge.crawler.loaders.recursive_loader.RecursiveUrlLoader'
+            'app.knowledge.crawler.loaders.recursive_loader.AsyncCrawler'
         )
-        mock_instance = mocker.MagicMock()
-        mock_instance.load.return_value = []
-        mock.return_value = mock_instance
-        return mock_instance
+        mock.return_value.crawl = AsyncMock(return_value=[])
+        return mock
 
     @pytest.mark.asyncio
-    async def test_load_documents_success(self, recursive_loader, mock_langchain_loader, sample_documents):
-        mock_langchain_loader.load.return_value = sample_documents
+    async def test_load_documents_success(self, recursive_loader, mock_crawler_class, sample_documents):
+        mock_crawler_class.return_value.crawl.return_value = [
+            CrawledPage(url=doc.metadata["source"], content=doc.page_content, depth=0)
+            for doc in sample_documents
+        ]
 
         docs = await recursive_loader.load_documents()
 
         assert len(docs) == len(sample_documents)
+        assert docs[0].metadata["url"] == "https://example.com/page0"
+        assert docs[0].metadata["loader"] == "recursive"
+        assert docs[0].metadata["source_id"] == "test123"
 
     @pytest.mark.asyncio
-    async def test_load_documents_respects_max_pages(self, recursive_loader, mock_langchain_loader, mocker):
-        docs = [
-            Document(page_content=f"Content {i}", metadata={})
-            for i in range(100)
-        ]
-        mock_langchain_loader.load.return_value = docs
+    async def test_load_documents_passes_budget_to_crawler(self, recursive_loader, mock_crawler_class):
         recursive_loader.source.total_max_pages = 10
+        recursive_loader.source.recursion_depth = 3
+        recursive_loader.source.exclude_path_patterns = "/careers, /legal"
 
-        result = await recursive_loader.load_documents()
+        await recursive_loader.load_documents()
 
-        assert len(result) <= 10
+        args, kwargs = mock_crawler_class.call_args
+        assert args[0] == "https://example.com"
+        assert args[1].max_pages == 10
+        assert args[1].max_depth == 3
+        assert kwargs["exclude_patterns"] == ["/careers", "/legal"]
 
     @pytest.mark.asyncio
-    async def test_load_documents_exception_handling(self, recursive_loader, mock_langchain_loader):
-        mock_langchain_loader.load.side_effect = Exception("Crawl error")
+    async def test_load_documents_exception_handling(self, recursive_loader, mock_crawler_class):
+        mock_crawler_class.return_value.crawl.side_effect = Exception("Crawl error")
 
         result = await recursive_loader.load_documents()
 
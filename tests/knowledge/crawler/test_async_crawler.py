@@ -0,0 +1,308 @@
+import asyncio
+import functools
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from app.knowledge.crawler.async_crawler import AsyncCrawler, CrawlBudget, CrawlValidatorCache
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def page(title, *links):
+    anchors = "".join(f'<a href="{link}">{link}</a>' for link in links)
+    return f"<html><head><title>{title}</title></head><body><h1>{title}</h1>{anchors}</body></html>"
+
+
+def extract_title(html):
+    return html.split("<title>")[1].split("</title>")[0]
+
+
+@pytest.fixture
+def site(tmp_path):
+    """Serve ``tmp_path`` over HTTP on an ephemeral port; tests write the pages."""
+    handler = functools.partial(QuietHandler, directory=str(tmp_path))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield tmp_path, f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def write(root, path, html):
+    target = root / path.lstrip("/")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(html)
+
+
+def make_crawler(url, budget=None, **kwargs):
+    kwargs.setdefault("cache", CrawlValidatorCache(100))
+    kwargs.setdefault("use_sitemaps", False)
+    return AsyncCrawler(url, budget or CrawlBudget(max_pages=50, max_depth=3), extract=extract_title, **kwargs)
+
+
+@pytest.mark.unit
+class TestAsyncCrawlerBudgets:
+
+    @pytest.mark.asyncio
+    async def test_stops_scheduling_at_max_pages(self, site):
+        root, base = site
+        write(root, "index.html", page("Home", *[f"/p{i}.html" for i in range(30)]))
+        for i in range(30):
+            write(root, f"p{i}.html", page(f"Page {i}"))
+
+        crawler = make_crawler(f"{base}/index.html", CrawlBudget(max_pages=5, max_depth=2), concurrency=2)
+        pages = await crawler.crawl()
+
+        assert len(pages) == 5
+        assert pages[0].content == "Home"
+        assert crawler.stats.stop_reason == "max_pages"
+        # robots.txt + the pages kept + at most one in-flight fetch per worker
+        assert crawler.stats.requests <= 1 + 5 + 2
+
+    @pytest.mark.asyncio
+    async def test_respects_max_depth(self, site):
+        root, base = site
+        write(root, "index.html", page("Home", "/a.html"))
+        write(root, "a.html", page("A", "/b.html"))
+        write(root, "b.html", page("B", "/c.html"))
+        write(root, "c.html", page("C"))
+
+        pages = await make_crawler(f"{base}/", CrawlBudget(max_pages=10, max_depth=2)).crawl()
+
+        assert sorted(p.content for p in pages) == ["A", "Home"]
+
+    @pytest.mark.asyncio
+    async def test_pages_ordered_by_depth_then_url(self, site):
+        root, base = site
+        write(root, "index.html", page("Home", "/c.html", "/a.html", "/b.html"))
+        for name in ("a", "b", "c"):
+            write(root, f"{name}.html", page(name.upper()))
+
+        pages = await make_crawler(f"{base}/", CrawlBudget(max_pages=10, max_depth=2), concurrency=3).crawl()
+
+        assert [p.content for p in pages] == ["Home", "A", "B", "C"]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("max_depth,expected", [
+        (1, ["Home"]),
+        (2, ["A", "Home"]),
+        (3, ["A", "B", "Home"]),
+    ])
+    async def test_depth_boundary_matches_recursive_url_loader(self, max_depth, expected):
+        links = {"/": "/a", "/a": "/b", "/b": "/c", "/c": None}
+        requested = []
+
+        def handler(request):
+            requested.append(request.url.path)
+            link = links.get(request.url.path)
+            title = {"/": "Home"}.get(request.url.path, request.url.path.strip("/").upper())
+            return httpx.Response(200, html=page(title, *([link] if link else [])))
+
+        crawler = make_crawler(
+            "http://depth.test/", CrawlBudget(max_pages=10, max_depth=max_depth),
+            respect_robots=False, transport=httpx.MockTransport(handler),
+        )
+        pages = await crawler.crawl()
+
+        assert sorted(p.content for p in pages) == expected
+        assert len(requested) == len(expected)
+
+    @pytest.mark.asyncio
+    async def test_sitemap_not_seeded_when_only_root_is_in_depth(self, site):
+        root, base = site
+        write(root, "robots.txt", f"User-agent: *\nAllow: /\nSitemap: {base}/maps/pages.xml\n")
+        write(root, "maps/pages.xml", f"<urlset><url><loc>{base}/orphan.html</loc></url></urlset>")
+        write(root, "index.html", page("Home"))
+        write(root, "orphan.html", page("Orphan"))
+
+        pages = await make_crawler(f"{base}/", CrawlBudget(max_pages=10, max_depth=1), use_sitemaps=True).crawl()
+
+        assert [p.content for p in pages] == ["Home"]
+
+    @pytest.mark.asyncio
+    async def test_skips_pages_over_page_byte_limit(self, site):
+        root, base = site
+        write(root, "index.html", page("Home", "/big.html", "/small.html"))
+        write(root, "big.html", page("Big") + "x" * 5000)
+        write(root, "small.html", page("Small"))
+
+        pages = await make_crawler(f"{base}/", CrawlBudget(max_pages=10, max_depth=2, max_page_bytes=2000)).crawl()
+
+        assert sorted(p.content for p in pages) == ["Home", "Small"]
+
+    @pytest.mark.asyncio
+    async def test_stops_when_byte_budget_spent(self, site):
+        root, base = site
+        write(root, "index.html", page("Home", *[f"/p{i}.html" for i in range(10)]) + "x" * 1000)
+        for i in range(10):
+            write(root, f"p{i}.html", page(f"Page {i}") + "x" * 1000)
+
+        crawler = make_crawler(f"{base}/", CrawlBudget(max_pages=20, max_depth=2, max_bytes=2500), concurrency=1)
+        pages = await crawler.crawl()
+
+        assert crawler.stats.stop_reason == "max_bytes"
+        assert len(pages) < 11
+
+    @pytest.mark.asyncio
+    async def test_stops_at_time_budget(self):
+        async def slow(request):
+            await asyncio.sleep(5)
+            return httpx.Response(200, html=page("Slow"))
+
+        crawler = make_crawler(
+            "http://slow.test/",
+            CrawlBudget(max_pages=10, time_budget_seconds=0.2),
+            respect_robots=False,
+            transport=httpx.MockTransport(slow),
+        )
+        pages = await asyncio.wait_for(crawler.crawl(), timeout=3)
+
+        assert pages == []
+        assert crawler.stats.stop_reason == "time_budget"
+
+
+@pytest.mark.unit
+class TestAsyncCrawlerScope:
+
+    @pytest.mark.asyncio
+    async def test_stays_under_root_and_applies_exclusions(self, site):
+        root, base = site
+        write(root, "docs/index.html", page("Docs", "/docs/a.html", "/docs/careers/x.html", "/other.html", "/docs/style.css", "https://elsewhere.test/docs/"))
+        write(root, "docs/a.html", page("A"))
+        write(root, "docs/careers/x.html", page("Careers"))
+        write(root, "other.html", page("Other"))
+
+        pages = await make_crawler(f"{base}/docs/index.html", exclude_patterns=["/careers"]).crawl()
+
+        assert sorted(p.content for p in pages) == ["A", "Docs"]
+
+    @pytest.mark.asyncio
+    async def test_honours_robots_disallow(self, site):
+        root, base = site
+        write(root, "robots.txt", "User-agent: *\nDisallow: /private/\n")
+        write(root, "index.html", page("Home", "/private/secret.html", "/public.html"))
+        write(root, "private/secret.html", page("Secret"))
+        write(root, "public.html", page("Public"))
+
+        crawler = make_crawler(f"{base}/")
+        pages = await crawler.crawl()
+
+        assert sorted(p.content for p in pages) == ["Home", "Public"]
+        assert crawler.stats.robots_blocked == 1
+
+    @pytest.mark.asyncio
+    async def test_seeds_frontier_from_sitemap(self, site):
+        root, base = site
+        write(root, "robots.txt", f"User-agent: *\nAllow: /\nSitemap: {base}/maps/index.xml\n")
+        write(root, "maps/index.xml", f"<sitemapindex><sitemap><loc>{base}/maps/pages.xml</loc></sitemap></sitemapindex>")
+        write(root, "maps/pages.xml", f"<urlset><url><loc>{base}/orphan.html</loc></url></urlset>")
+        write(root, "index.html", page("Home"))
+        write(root, "orphan.html", page("Orphan"))
+
+        pages = await make_crawler(f"{base}/", use_sitemaps=True).crawl()
+
+        assert sorted(p.content for p in pages) == ["Home", "Orphan"]
+
+
+@pytest.mark.unit
+class TestAsyncCrawlerRequests:
+
+    @pytest.mark.asyncio
+    async def test_revisit_uses_last_modified_and_cached_content(self, site):
+        root, base = site
+        write(root, "index.html", page("Home", "/a.html"))
+        write(root, "a.html", page("A"))
+        cache = CrawlValidatorCache(100)
+
+        first = make_crawler(f"{base}/", cache=cache)
+        await first.crawl()
+        second = make_crawler(f"{base}/", cache=cache)
+        pages = await second.crawl()
+
+        assert sorted(p.content for p in pages) == ["A", "Home"]
+        assert all(p.not_modified for p in pages)
+        assert second.stats.not_modified == 2
+
+    @pytest.mark.asyncio
+    async def test_revisit_sends_etag(self):
+        seen_headers = []
+
+        def handler(request):
+            seen_headers.append(request.headers.get("if-none-match"))
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, html=page("Home"), headers={"ETag": '"v1"'})
+
+        cache = CrawlValidatorCache(100)
+        for _ in range(2):
+            crawler = make_crawler("http://etag.test/", cache=cache, respect_robots=False, transport=httpx.MockTransport(handler))
+            pages = await crawler.crawl()
+
+        assert seen_headers == [None, '"v1"']
+        assert pages[0].content == "Home"
+        assert pages[0].not_modified is True
+
+    @pytest.mark.asyncio
+    async def test_limits_concurrent_requests_per_host(self):
+        active = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            if request.url.path == "/":
+                return httpx.Response(200, html=page("Home", *[f"/p{i}" for i in range(12)]))
+            return httpx.Response(200, html=page(request.url.path))
+
+        crawler = make_crawler(
+            "http://busy.test/",
+            concurrency=6,
+            per_host_concurrency=2,
+            respect_robots=False,
+            transport=httpx.MockTransport(handler),
+        )
+        pages = await crawler.crawl()
+
+        assert len(pages) == 13
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_ignores_non_html_responses(self):
+        def handler(request):
+            if request.url.path == "/":
+                return httpx.Response(200, html=page("Home", "/data"))
+            return httpx.Response(200, json={"not": "html"})
+
+        pages = await make_crawler("http://json.test/", respect_robots=False, transport=httpx.MockTransport(handler)).crawl()
+
+        assert [p.content for p in pages] == ["Home"]
+
+
+@pytest.mark.unit
+class TestCrawlValidatorCache:
+
+    def test_evicts_least_recently_used(self):
+        from app.knowledge.crawler.async_crawler import _CachedPage
+
+        cache = CrawlValidatorCache(2)
+        entry = _CachedPage(etag="e", last_modified=None, content="c", links=[])
+        cache.put("a", entry)
+        cache.put("b", entry)
+        cache.get("a")
+        cache.put("c", entry)
+
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") is entry
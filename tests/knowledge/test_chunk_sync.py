@@ -0,0 +1,125 @@
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.documents import Document
+
+from app.knowledge.chunk_sync import diff_source_chunks, sync_source_chunks
+from app.knowledge.vector_store.service import S3VectorStoreService
+
+
+def _chunk(content_hash, **metadata):
+    return Document(
+        page_content=f"text {content_hash}",
+        metadata={"source_id": "src", "content_hash": content_hash, "name": "Source", **metadata},
+    )
+
+
+def _stored(key, chunk):
+    return {"key": key, "metadata": S3VectorStoreService.build_vector_metadata(chunk, 0)}
+
+
+@pytest.mark.unit
+class TestDiffSourceChunks:
+
+    def test_new_source_adds_everything(self):
+        chunks = [_chunk("h1"), _chunk("h2")]
+
+        diff = diff_source_chunks([], chunks, S3VectorStoreService.build_vector_metadata)
+
+        assert diff.to_add == chunks
+        assert diff.to_delete == []
+        assert diff.unchanged == 0
+
+    def test_repeated_chunks_are_indexed_once(self):
+        chunks = [_chunk("h1"), _chunk("h1"), _chunk("h2")]
+
+        diff = diff_source_chunks([], chunks, S3VectorStoreService.build_vector_metadata)
+
+        assert [c.metadata["content_hash"] for c in diff.to_add] == ["h1", "h2"]
+
+    def test_repeated_chunk_keeps_its_page_whatever_the_crawl_order(self):
+        on_a = _chunk("h1", parent_id="page-a", start_index=40)
+        on_b = _chunk("h1", parent_id="page-b", start_index=0)
+        stored = _stored("k1", on_a)
+
+        for chunks in ([on_a, on_b], [on_b, on_a]):
+            diff = diff_source_chunks([stored], chunks, S3VectorStoreService.build_vector_metadata)
+
+            assert diff.unchanged == 1
+            assert diff.to_delete == []
+
+    def test_metadata_change_refreshes_chunk_without_embedding(self):
+        stored = _stored("k1", _chunk("h1", category="old"))
+        updated = _chunk("h1", category="new")
+
+        diff = diff_source_chunks([stored], [updated], S3VectorStoreService.build_vector_metadata)
+
+        assert diff.to_add == []
+        assert diff.to_refresh == [(updated, "k1")]
+        assert diff.to_delete == ["k1"]
+
+    def test_duplicate_stored_vectors_are_pruned(self):
+        chunk = _chunk("h1")
+
+        diff = diff_source_chunks(
+            [_stored("k1", chunk), _stored("k2", chunk)], [chunk], S3VectorStoreService.build_vector_metadata
+        )
+
+        assert diff.unchanged == 1
+        assert diff.to_add == []
+        assert diff.to_delete == ["k2"]
+
+
+@pytest.mark.unit
+class TestSyncSourceChunks:
+
+    @pytest.fixture
+    def vector_store(self):
+        store = MagicMock()
+        store.build_vector_metadata.side_effect = S3VectorStoreService.build_vector_metadata
+        store.delete_vectors_by_keys.side_effect = lambda keys, label="", source_id=None: {
+            "vectors_deleted": len(keys),
+            "vectors_failed": 0,
+        }
+        return store
+
+    def test_refreshed_chunk_reuses_stored_embedding_and_key(self, vector_store):
+        vector_store.list_source_vectors.return_value = [_stored("doc_src_h1_0", _chunk("h1", parent_id="p1", start_index=0))]
+        vector_store.get_vector_embeddings.return_value = {"doc_src_h1_0": [0.5]}
+        vector_store.add_documents.return_value = ["doc_src_h1_0"]
+        document_service = MagicMock()
+
+        result = sync_source_chunks(
+            "src", [_chunk("h1", parent_id="p1", start_index=40)], vector_store=vector_store, document_service=document_service
+        )
+
+        assert result.chunks_refreshed == 1
+        assert result.embedding_calls == 0
+        document_service.generate_embeddings.assert_not_called()
+        assert vector_store.add_documents.call_args[0][1] == [[0.5]]
+        vector_store.delete_vectors_by_keys.assert_not_called()
+
+    def test_refresh_embeds_when_stored_embedding_missing(self, vector_store):
+        vector_store.list_source_vectors.return_value = [_stored("k1", _chunk("h1", category="old"))]
+        vector_store.get_vector_embeddings.return_value = {}
+        vector_store.add_documents.return_value = ["k2"]
+        document_service = MagicMock()
+        document_service.generate_embeddings.return_value = [[0.1]]
+
+        result = sync_source_chunks(
+            "src", [_chunk("h1", category="new")], vector_store=vector_store, document_service=document_service
+        )
+
+        assert result.chunks_embedded == 1
+        assert vector_store.delete_vectors_by_keys.call_args[0][0] == ["k1"]
+
+    def test_delete_failures_are_reported_not_raised(self, vector_store):
+        vector_store.list_source_vectors.return_value = [_stored("k1", _chunk("h1"))]
+        vector_store.delete_vectors_by_keys.side_effect = None
+        vector_store.delete_vectors_by_keys.return_value = {"vectors_deleted": 0, "vectors_failed": 1}
+
+        result = sync_source_chunks("src", [], vector_store=vector_store, document_service=MagicMock())
+
+        assert result.delete_failures == 1
+        assert result.embedding_calls == 0
+        vector_store.add_documents.assert_not_called()
@@ -11,7 +11,7 @@ class TestDocumentService:
 
     @pytest.fixture
     def mock_bedrock_embeddings(self, mocker):
-        mock = mocker.patch('app.knowledge.document_service.BedrockEmbeddings')
+        mock = mocker.patch('app.knowledge.document_service.get_embedding_service')
         mock_instance = MagicMock()
 
         def embed_documents(texts):
@@ -97,6 +97,31 @@ class TestDocumentService:
         assert hash1 == hash2
         assert len(hash1) == 64
 
+    def test_chunks_reference_parent_instead_of_copying_it(self, document_service, mock_text_splitter, sample_source):
+        docs = [
+            Document(page_content="Page one " * 20, metadata={"source": "https://example.com/a"}),
+            Document(page_content="Page two " * 20, metadata={"source": "https://example.com/b"}),
+        ]
+
+        chunks = document_service.split_documents(docs, sample_source)
+
+        parents = {}
+        for chunk in chunks:
+            parents.setdefault(chunk.metadata["section_url"], set()).add(chunk.metadata["parent_id"])
+
+        assert all("content" not in chunk.metadata for chunk in chunks)
+        assert all(len(ids) == 1 for ids in parents.values())
+        assert parents["https://example.com/a"] != parents["https://example.com/b"]
+
+    def test_assemble_parent_text_drops_overlap(self):
+        page = "alpha beta gamma delta epsilon"
+        chunks = [
+            {"content": page[11:], "start_index": 11},
+            {"content": page[:16], "start_index": 0},
+        ]
+
+        assert DocumentService.assemble_parent_text(chunks) == page
+
     def test_empty_document_list(self, document_service, sample_source):
         chunks = document_service.split_documents([], sample_source)
         assert chunks == []
@@ -133,7 +158,7 @@ class TestDocumentServiceSubcategory:
 
     @pytest.fixture
     def mock_bedrock_embeddings(self, mocker):
-        mock = mocker.patch('app.knowledge.document_service.BedrockEmbeddings')
+        mock = mocker.patch('app.knowledge.document_service.get_embedding_service')
         mock_instance = MagicMock()
         mock_instance.embed_documents.return_value = [[0.1] * 1536 for _ in range(10)]
         mock.return_value = mock_instance
@@ -1,9 +1,14 @@
+import hashlib
+import threading
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from langchain_core.documents import Document
 
+from app.knowledge.document_service import DocumentService
 from app.knowledge.models import Source
 from app.knowledge.service import KnowledgeService
+from app.knowledge.vector_store.service import S3VectorStoreService
 
 
 @pytest.mark.unit
@@ -25,7 +30,18 @@ class TestKnowledgeService:
             "message": "No vectors found to delete"
         }
         mock_instance.add_documents.return_value = None
+        mock_instance.list_source_vectors.return_value = []
+        mock_instance.build_vector_metadata.side_effect = S3VectorStoreService.build_vector_metadata
+        mock_instance.delete_vectors_by_keys.side_effect = lambda keys, label="", source_id=None: {
+            "success": True,
+            "vectors_found": len(keys),
+            "vectors_deleted": len(keys),
+            "vectors_failed": 0,
+        }
         mock_instance.similarity_search.return_value = []
+        mock_instance.list_source_manifests.return_value = None
+        mock_instance.get_source_summary.return_value = None
+        mock_instance.manifest_covers_index.return_value = False
         mock.return_value = mock_instance
         return mock_instance
 
@@ -36,6 +52,7 @@ class TestKnowledgeService:
         mock_instance.split_documents.return_value = []
         mock_instance.generate_embeddings.return_value = []
         mock_instance.generate_query_embedding.return_value = [0.1] * 1536
+        mock_instance.assemble_parent_text.side_effect = DocumentService.assemble_parent_text
         mock.return_value = mock_instance
         return mock_instance
 
@@ -172,6 +189,32 @@ class TestKnowledgeService:
         assert result["is_new_source"] is True
         assert result["documents_added"] == 20
 
+    @pytest.mark.asyncio
+    async def test_upsert_source_runs_each_step_under_pipeline_stage(
+        self,
+        knowledge_service,
+        mock_crawler_service,
+        mock_document_service,
+        sample_source,
+        sample_documents
+    ):
+        from langchain_core.documents import Document
+
+        from app.knowledge.sync_pipeline import SyncPipeline
+
+        mock_crawler_service.crawl_source.return_value = {"documents": sample_documents}
+        mock_document_service.split_documents.return_value = [
+            Document(page_content="Chunk", metadata={"source_id": sample_source.id, "content_hash": "hash0"})
+        ]
+        mock_document_service.generate_embeddings.return_value = [[0.1] * 1536]
+        pipeline = SyncPipeline()
+
+        result = await knowledge_service.upsert_source(sample_source, pipeline=pipeline)
+
+        assert result["success"] is True
+        stages = pipeline.report()["stages"]
+        assert [stages[name]["calls"] for name in ("fetch", "split", "embed", "write")] == [1, 1, 1, 1]
+
     @pytest.mark.asyncio
     async def test_upsert_source_no_documents_from_crawler(
         self,
@@ -189,6 +232,183 @@ class TestKnowledgeService:
         assert result["success"] is True
         assert result["documents_added"] == 0
 
+    @pytest.mark.asyncio
+    async def test_search_hydrates_parents_once_and_caches(
+        self,
+        knowledge_service,
+        mock_vector_store,
+    ):
+        mock_vector_store.similarity_search.return_value = [
+            {"content": "beta", "metadata": {"source_id": "s1", "parent_id": "p1", "start_index": 6}, "score": 0.9},
+            {"content": "alpha", "metadata": {"source_id": "s1", "parent_id": "p1", "start_index": 0}, "score": 0.8},
+            {"content": "other", "metadata": {"source_id": "s2"}, "score": 0.7},
+        ]
+        mock_vector_store.get_parent_chunks.return_value = [
+            {"content": "alpha", "start_index": 0},
+            {"content": "beta", "start_index": 6},
+        ]
+
+        results = await knowledge_service.search("query", hydrate_parents=True)
+        await knowledge_service.search("another query", hydrate_parents=True)
+
+        assert results[0]["parent_content"] == "alpha\nbeta"
+        assert results[1]["parent_content"] == "alpha\nbeta"
+        assert "parent_content" not in results[2]
+        mock_vector_store.get_parent_chunks.assert_called_once_with("p1", "s1")
+        mock_vector_store.query_parent_chunks.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_parent_without_manifest_is_cached_per_query(self, knowledge_service, mock_vector_store):
+        mock_vector_store.similarity_search.return_value = [
+            {"content": "beta", "metadata": {"source_id": "s1", "parent_id": "p1", "start_index": 6}, "score": 0.9},
+        ]
+        mock_vector_store.get_parent_chunks.return_value = None
+        mock_vector_store.query_parent_chunks.side_effect = [
+            [{"content": "beta", "start_index": 6}],
+            [{"content": "alpha", "start_index": 0}, {"content": "beta", "start_index": 6}],
+        ]
+
+        first = await knowledge_service.search("query", hydrate_parents=True)
+        second = await knowledge_service.search("another query", hydrate_parents=True)
+
+        assert first[0]["parent_content"] == "beta"
+        assert second[0]["parent_content"] == "alpha\nbeta"
+        assert mock_vector_store.query_parent_chunks.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_parent_cache_invalidated_by_index_writes(self, knowledge_service, mock_vector_store):
+        from app.knowledge.vector_store.service import bump_index_generation
+
+        mock_vector_store.similarity_search.return_value = [
+            {"content": "beta", "metadata": {"source_id": "s1", "parent_id": "p1", "start_index": 6}, "score": 0.9},
+        ]
+        mock_vector_store.get_parent_chunks.return_value = [{"content": "beta", "start_index": 6}]
+
+        await knowledge_service.search("query", hydrate_parents=True)
+        bump_index_generation()
+        await knowledge_service.search("another query", hydrate_parents=True)
+
+        assert mock_vector_store.get_parent_chunks.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_search_does_not_hydrate_by_default(self, knowledge_service, mock_vector_store):
+        mock_vector_store.similarity_search.return_value = [
+            {"content": "beta", "metadata": {"parent_id": "p1", "start_index": 6}, "score": 0.9},
+        ]
+
+        results = await knowledge_service.search("query")
+
+        assert results[0]["parent_id"] == "p1"
+        assert "parent_content" not in results[0]
+        mock_vector_store.get_parent_chunks.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_search_runs_blocking_calls_off_the_event_loop(self, knowledge_service, mock_vector_store):
+        loop_thread = threading.current_thread()
+        calls = []
+        mock_vector_store.similarity_search.side_effect = lambda *a, **kw: calls.append(threading.current_thread()) or []
+
+        await knowledge_service.search("query")
+
+        assert calls and calls[0] is not loop_thread
+
+    @pytest.mark.asyncio
+    async def test_search_caches_results_by_normalized_query_and_filter(
+        self, knowledge_service, mock_vector_store, mock_document_service
+    ):
+        mock_vector_store.similarity_search.return_value = [
+            {"content": "alpha", "metadata": {"source_id": "s1"}, "score": 0.9},
+        ]
+
+        first = await knowledge_service.search("What is a 401k?", filter={"content_source": "external"})
+        first[0]["content"] = "mutated by caller"
+        second = await knowledge_service.search("  what is a   401K? ", filter={"content_source": "external"})
+        await knowledge_service.search("what is a 401k?", filter={"content_source": "internal"})
+
+        assert second[0]["content"] == "alpha"
+        mock_document_service.generate_query_embedding.assert_called_once_with("what is a 401k?")
+        assert mock_vector_store.similarity_search.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_search_cache_expires_after_ttl(self, knowledge_service, mock_vector_store, mock_document_service, mocker):
+        mocker.patch('app.knowledge.service.config.KB_SEARCH_CACHE_TTL_SECONDS', 60)
+        clock = mocker.patch('app.knowledge.service.time.monotonic', return_value=1000.0)
+
+        await knowledge_service.search("query")
+        clock.return_value = 1061.0
+        await knowledge_service.search("query")
+
+        assert mock_vector_store.similarity_search.call_count == 2
+        mock_document_service.generate_query_embedding.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_search_cache_disabled_still_reuses_query_embedding(
+        self, knowledge_service, mock_vector_store, mock_document_service, mocker
+    ):
+        mocker.patch('app.knowledge.service.config.KB_SEARCH_CACHE_TTL_SECONDS', 0)
+
+        await knowledge_service.search("query")
+        await knowledge_service.search("query")
+
+        assert mock_vector_store.similarity_search.call_count == 2
+        mock_document_service.generate_query_embedding.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_search_does_not_cache_failures(self, knowledge_service, mock_vector_store):
+        mock_vector_store.similarity_search.side_effect = [
+            Exception("S3 Vectors unavailable"),
+            [{"content": "alpha", "metadata": {}, "score": 0.9}],
+        ]
+
+        assert await knowledge_service.search("query") == []
+        results = await knowledge_service.search("query")
+
+        assert results[0]["content"] == "alpha"
+
+    @pytest.mark.asyncio
+    async def test_search_cache_invalidated_when_upsert_changes_index(
+        self,
+        knowledge_service,
+        mock_crawler_service,
+        mock_document_service,
+        mock_vector_store,
+        sample_source,
+        sample_documents,
+    ):
+        await knowledge_service.search("query")
+
+        mock_crawler_service.crawl_source.return_value = {"documents": sample_documents, "documents_loaded": 5}
+        mock_document_service.split_documents.return_value = [
+            Document(page_content="Chunk", metadata={"source_id": sample_source.id, "content_hash": "hash0"})
+        ]
+        mock_document_service.generate_embeddings.return_value = [[0.1] * 1536]
+        await knowledge_service.upsert_source(sample_source)
+
+        await knowledge_service.search("query")
+
+        assert mock_vector_store.similarity_search.call_count == 2
+        mock_document_service.generate_query_embedding.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_search_cache_invalidated_by_vector_store_writes(self, knowledge_service, mock_vector_store):
+        """Writers that bypass KnowledgeService (e.g. the S3 file sync) still invalidate cached results."""
+        from app.knowledge.vector_store.service import bump_index_generation
+
+        await knowledge_service.search("query")
+        bump_index_generation()
+        await knowledge_service.search("query")
+
+        assert mock_vector_store.similarity_search.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_search_cache_invalidated_by_other_instances(self, knowledge_service, mock_vector_store):
+        await knowledge_service.search("query")
+
+        KnowledgeService().delete_source_vectors_by_id("s1")
+        await knowledge_service.search("query")
+
+        assert mock_vector_store.similarity_search.call_count == 2
+
     def test_get_sources(self, knowledge_service, mocker):
         mocker.patch.object(
             knowledge_service,
@@ -251,6 +471,27 @@ class TestKnowledgeService:
             assert item["content"] == "Test content"
             assert item["source_id"] == "s1"
 
+    @staticmethod
+    def _stored_vector(key, chunk, source):
+        metadata = S3VectorStoreService.build_vector_metadata(chunk, 0)
+        metadata["source_id"] = source.id
+        return {"key": key, "metadata": metadata}
+
+    @staticmethod
+    def _chunk(text, source):
+        return Document(
+            page_content=text,
+            metadata={
+                "source_id": source.id,
+                "content_hash": hashlib.sha256(text.encode()).hexdigest(),
+                "section_url": source.url,
+                "name": source.name,
+                "type": source.type,
+                "category": source.category,
+                "content_source": "external",
+            },
+        )
+
     @pytest.mark.asyncio
     async def test_upsert_source_updates_existing_source(
         self,
@@ -259,37 +500,53 @@ class TestKnowledgeService:
         mock_vector_store,
         mock_crawler_service,
         sample_source,
-        mocker
     ):
-        """Test that updating an existing source deletes old vectors and adds new ones."""
-        from langchain_core.documents import Document
+        """Only new chunks are embedded and written; vanished chunks are deleted, kept ones untouched."""
+        kept = self._chunk("kept paragraph", sample_source)
+        vanished = self._chunk("removed paragraph", sample_source)
+        added = self._chunk("new paragraph", sample_source)
+        mock_vector_store.list_source_vectors.return_value = [
+            self._stored_vector("k_kept", kept, sample_source),
+            self._stored_vector("k_vanished", vanished, sample_source),
+        ]
+        mock_vector_store.add_documents.return_value = ["k_added"]
+        mock_document_service.split_documents.return_value = [kept, added]
+        mock_document_service.generate_embeddings.return_value = [[0.1] * 1536]
+        mock_crawler_service.crawl_source.return_value = {
+            "documents": [Document(page_content="doc", metadata={})],
+            "documents_loaded": 1
+        }
 
-        mocker.patch.object(
-            knowledge_service,
-            'get_vector_sources',
-            return_value={
-                'sources': [{'source_id': sample_source.id, 'url': sample_source.url}],
-                'total_sources': 1
-            }
-        )
+        result = await knowledge_service.upsert_source(sample_source)
 
-        # Mock deletion result
-        mock_vector_store.delete_documents_by_source_id.return_value = {
-            "success": True,
-            "vectors_found": 10,
-            "vectors_deleted": 10,
-            "message": "Successfully deleted all 10 vectors"
-        }
+        assert result["success"] is True
+        assert result["is_new_source"] is False
+        assert result["documents_added"] == 1
+        assert result["documents_deleted"] == 1
+        assert result["documents_unchanged"] == 1
+        assert result["chunks_embedded"] == 1
+        assert result["embedding_calls"] == 1
+        mock_document_service.generate_embeddings.assert_called_once_with(["new paragraph"])
+        mock_vector_store.add_documents.assert_called_once()
+        assert mock_vector_store.add_documents.call_args[0][0] == [added]
+        mock_vector_store.delete_vectors_by_keys.assert_called_once()
+        assert mock_vector_store.delete_vectors_by_keys.call_args[0][0] == ["k_vanished"]
+        mock_vector_store.delete_documents_by_source_id.assert_not_called()
 
-        # Prepare new chunks
-        chunks = [
-            Document(page_content="new content 1", metadata={"content_hash": "new_h1"}),
-            Document(page_content="new content 2", metadata={"content_hash": "new_h2"}),
+    @pytest.mark.asyncio
+    async def test_upsert_source_unchanged_source_skips_embeddings_and_writes(
+        self,
+        knowledge_service,
+        mock_document_service,
+        mock_vector_store,
+        mock_crawler_service,
+        sample_source,
+    ):
+        chunks = [self._chunk(f"paragraph {i}", sample_source) for i in range(3)]
+        mock_vector_store.list_source_vectors.return_value = [
+            self._stored_vector(f"k{i}", chunk, sample_source) for i, chunk in enumerate(chunks)
         ]
         mock_document_service.split_documents.return_value = chunks
-        mock_document_service.generate_embeddings.return_value = [[0.1] * 1536] * 2
-
-        # Mock crawler
         mock_crawler_service.crawl_source.return_value = {
             "documents": [Document(page_content="doc", metadata={})],
             "documents_loaded": 1
@@ -298,12 +555,33 @@ class TestKnowledgeService:
         result = await knowledge_service.upsert_source(sample_source)
 
         assert result["success"] is True
-        assert result["is_new_source"] is False
-        assert result["documents_added"] == 2
-        # Verify deletion was called
-        mock_vector_store.delete_documents_by_source_id.assert_called_once_with(sample_source.id)
-        # Verify new documents were added
-        knowledge_service.vector_store_service.add_documents.assert_called_once()
+        assert result["documents_added"] == 0
+        assert result["documents_unchanged"] == 3
+        assert result["embedding_calls"] == 0
+        mock_document_service.generate_embeddings.assert_not_called()
+        mock_vector_store.add_documents.assert_not_called()
+        mock_vector_store.delete_vectors_by_keys.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_upsert_source_listing_failure_does_not_write(
+        self,
+        knowledge_service,
+        mock_document_service,
+        mock_vector_store,
+        mock_crawler_service,
+        sample_source,
+    ):
+        mock_vector_store.list_source_vectors.side_effect = Exception("list failed")
+        mock_document_service.split_documents.return_value = [self._chunk("text", sample_source)]
+        mock_crawler_service.crawl_source.return_value = {
+            "documents": [Document(page_content="doc", metadata={})],
+            "documents_loaded": 1
+        }
+
+        result = await knowledge_service.upsert_source(sample_source)
+
+        assert result["success"] is False
+        mock_vector_store.add_documents.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_upsert_source_applies_chunk_limit(
@@ -391,3 +669,29 @@ class TestKnowledgeService:
             assert len(result["chunks"]) == expected_chunks
             if has_vectors and not vector_error:
                 assert result["chunks"][0]["url"] == "https://example.com/section1"
+
+    def test_get_vector_sources_reads_manifests_without_listing_index(self, knowledge_service, mock_vector_store):
+        from app.knowledge.vector_store.manifest import SourceManifest
+
+        small = SourceManifest.from_vectors("small", [{"key": "k1", "metadata": {"name": "Small", "url": "https://s"}}])
+        large = SourceManifest.from_vectors("large", [
+            {"key": f"k{i}", "metadata": {"name": "Large", "url": f"https://l/{i}", "content": "x"}} for i in range(3)
+        ])
+        empty = SourceManifest(source_id="empty")
+        mock_vector_store.list_source_manifests.return_value = [small, large, empty]
+
+        result = knowledge_service.get_vector_sources()
+
+        assert result["total_sources"] == 2
+        assert [s["source_id"] for s in result["sources"]] == ["large", "small"]
+        assert result["sources"][0]["total_chunks"] == 3
+        mock_vector_store.get_all_vectors_metadata.assert_not_called()
+
+    def test_get_source_details_unknown_source_with_complete_manifests(self, knowledge_service, mock_vector_store, mocker):
+        mock_vector_store.manifest_covers_index.return_value = True
+        get_vector_sources = mocker.patch.object(knowledge_service, 'get_vector_sources')
+
+        result = knowledge_service.get_source_details("missing")
+
+        assert result == {"error": "Source with id missing not found"}
+        get_vector_sources.assert_not_called()
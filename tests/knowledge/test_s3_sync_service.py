@@ -5,8 +5,10 @@ from unittest.mock import Mock, patch
 
 import pytest
 from botocore.exceptions import ClientError
+from langchain_core.documents import Document
 
 from app.knowledge.s3_sync_service import S3SyncService
+from app.knowledge.sync_pipeline import SyncPipeline
 
 
 class TestS3SyncServiceHelpers:
@@ -223,6 +225,30 @@ class TestS3SyncServiceList:
         call_args = mock_paginator.paginate.call_args
         assert call_args[1]["Prefix"] == "guides/"
 
+    @patch('app.knowledge.s3_sync_service.boto3.client')
+    def test_list_files_skips_vector_manifests(self, mock_boto_client, mocker):
+        """Manifests stored in the knowledge bucket are not synced as files."""
+
+        mock_s3 = Mock()
+        mock_paginator = Mock()
+        mock_s3.get_paginator.return_value = mock_paginator
+        mock_paginator.paginate.return_value = [{
+            "Contents": [
+                {"Key": "_kb_manifest/abc.json", "Size": 10, "LastModified": datetime(2024, 1, 1)},
+                {"Key": "guide.md", "Size": 10, "LastModified": datetime(2024, 1, 1)},
+            ]
+        }]
+
+        mock_boto_client.return_value = mock_s3
+        service = S3SyncService()
+        service.bucket_name = "kb-files"
+        mocker.patch('app.knowledge.s3_sync_service.config.KB_MANIFEST_BUCKET', "kb-files")
+        mocker.patch('app.knowledge.s3_sync_service.config.KB_MANIFEST_PREFIX', "_kb_manifest/")
+
+        files = service.list_files()
+
+        assert [f["s3_key"] for f in files] == ["guide.md"]
+
     @patch('app.knowledge.s3_sync_service.boto3.client')
     def test_list_files_empty_bucket(self, mock_boto_client):
         """Test listing empty bucket."""
@@ -315,6 +341,57 @@ class TestS3SyncServiceDelete:
         assert "error" in result
 
 
+@pytest.mark.unit
+class TestS3SyncServiceSyncAll:
+    """Test bulk sync of S3 files through the sync pipeline."""
+
+    @pytest.mark.asyncio
+    @patch('app.knowledge.s3_sync_service.boto3.client')
+    async def test_sync_all_isolates_failing_files(self, mock_boto_client):
+        """A file that raises is reported as failed without stopping the others."""
+        service = S3SyncService()
+        service.list_files = Mock(return_value=[{"s3_key": f"doc{i}.md"} for i in range(3)])
+
+        async def sync_file(s3_key, pipeline=None):
+            if s3_key == "doc1.md":
+                raise RuntimeError("read failed")
+            return {"success": True, "s3_key": s3_key, "chunk_count": 2}
+
+        service.sync_file = sync_file
+
+        result = await service.sync_all()
+
+        assert result["succeeded"] == 2
+        assert result["failed"] == 1
+        assert [d["s3_key"] for d in result["details"]] == ["doc0.md", "doc1.md", "doc2.md"]
+        assert result["details"][1]["error"] == "read failed"
+        assert result["pipeline"]["items_failed"] == 1
+
+    @pytest.mark.asyncio
+    @patch('app.knowledge.s3_sync_service.boto3.client')
+    async def test_sync_file_runs_stages_in_pipeline(self, mock_boto_client):
+        """Reading, splitting, embedding and writing each count against their stage."""
+        mock_boto_client.return_value.get_object.return_value = {"Body": Mock(read=Mock(return_value=b"# Title\n\nBody text"))}
+        service = S3SyncService()
+        service._vector_service = Mock()
+        service._vector_service.list_source_vectors.return_value = []
+        service._vector_service.build_vector_metadata.return_value = {}
+        service._vector_service.add_documents.return_value = ["k0"]
+        service._document_service = Mock()
+        service._document_service.split_documents.return_value = [
+            Document(page_content="Body text", metadata={"content_hash": "h0"})
+        ]
+        service._document_service.generate_embeddings.return_value = [[0.1]]
+        pipeline = SyncPipeline()
+
+        result = await service.sync_file("doc.md", pipeline=pipeline)
+
+        assert result["success"] is True
+        assert result["chunks_embedded"] == 1
+        stages = pipeline.report()["stages"]
+        assert [stages[name]["calls"] for name in ("fetch", "split", "embed", "write")] == [1, 1, 1, 1]
+
+
 @pytest.mark.unit
 class TestS3SyncServiceSubcategory:
 
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.knowledge.sync_pipeline import STAGES, SyncPipeline
+
+
+@pytest.mark.unit
+class TestSyncPipeline:
+
+    @pytest.mark.asyncio
+    async def test_stage_limits_concurrency(self):
+        pipeline = SyncPipeline(concurrency={"fetch": 2})
+        active = 0
+        peak = 0
+
+        async def handler(item):
+            nonlocal active, peak
+            async with pipeline.stage("fetch"):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+            return item
+
+        await pipeline.map(list(range(8)), handler)
+
+        assert peak == 2
+        assert pipeline.report()["stages"]["fetch"]["peak_in_flight"] == 2
+        assert pipeline.report()["stages"]["fetch"]["calls"] == 8
+
+    @pytest.mark.asyncio
+    async def test_map_preserves_order_and_isolates_failures(self):
+        pipeline = SyncPipeline(concurrency={"fetch": 3})
+
+        async def handler(item):
+            await asyncio.sleep(0.001 * (5 - item))
+            if item == 2:
+                raise ValueError("boom")
+            return item * 10
+
+        outcomes = await pipeline.map([0, 1, 2, 3, 4], handler)
+
+        assert outcomes[:2] == [0, 10]
+        assert isinstance(outcomes[2], ValueError)
+        assert outcomes[3:] == [30, 40]
+        report = pipeline.report()
+        assert report["items"] == 5
+        assert report["items_failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_admission_bounds_items_in_flight(self):
+        pipeline = SyncPipeline(concurrency={"fetch": 4}, max_in_flight=2)
+        active = 0
+        peak = 0
+
+        async def handler(item):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        await pipeline.map(list(range(6)), handler)
+
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_run_blocking_uses_worker_thread_and_counts_failures(self):
+        pipeline = SyncPipeline()
+        loop_thread = threading.get_ident()
+
+        thread_id = await pipeline.run_blocking("split", threading.get_ident)
+
+        def fail():
+            raise RuntimeError("embed failed")
+
+        with pytest.raises(RuntimeError):
+            await pipeline.run_blocking("embed", fail)
+
+        stages = pipeline.report()["stages"]
+        assert thread_id != loop_thread
+        assert stages["split"]["calls"] == 1
+        assert stages["embed"]["failures"] == 1
+
+    def test_report_covers_every_stage(self):
+        report = SyncPipeline(concurrency={"embed": 3}).report()
+
+        assert list(report["stages"]) == list(STAGES)
+        assert report["stages"]["embed"]["concurrency"] == 3
+        assert report["max_in_flight"] == 6
@@ -1,3 +1,4 @@
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
@@ -263,7 +264,7 @@ class TestKnowledgeBaseSyncService:
         ]
         mock_external_repository.get_all.return_value = external_sources
 
-        async def upsert_side_effect(source: Source):
+        async def upsert_side_effect(source: Source, **kwargs):
             if source.url == "https://ex2.com":
                 raise Exception("upsert failed")
             return {"success": True, "is_new_source": True, "documents_added": 1}
@@ -308,3 +309,37 @@ class TestKnowledgeBaseSyncService:
         # Ensure the processed source was enabled
         processed_url = mock_knowledge_service.upsert_source.call_args.args[0].url
         assert processed_url in {"https://ex2.com", "https://ex4.com"}
+
+    @pytest.mark.asyncio
+    async def test_sync_all_upserts_sources_concurrently(
+        self,
+        sync_service,
+        mock_external_repository,
+        mock_knowledge_service
+    ):
+        external_sources = [
+            Source(id=f"s{i}", name=f"S{i}", url=f"https://ex{i}.com")
+            for i in range(4)
+        ]
+        mock_external_repository.get_all.return_value = external_sources
+        active = 0
+        peak = 0
+
+        async def upsert_side_effect(source: Source, **kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return {"success": True, "is_new_source": True, "documents_added": 1}
+
+        mock_knowledge_service.upsert_source.side_effect = upsert_side_effect
+
+        result = await sync_service.sync_all()
+
+        assert peak > 1
+        assert result["sources_created"] == 4
+        assert result["pipeline"]["items"] == 4
+        assert "embed" in result["pipeline"]["stages"]
+        pipeline = mock_knowledge_service.upsert_source.call_args.kwargs["pipeline"]
+        assert pipeline is not None
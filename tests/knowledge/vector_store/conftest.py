@@ -1,6 +1,11 @@
+import hashlib
+import json
+import threading
+import time
 from unittest.mock import MagicMock
 
 import pytest
+from botocore.exceptions import ClientError
 
 
 @pytest.fixture
@@ -39,3 +44,179 @@ def mock_paginator(mocker):
         }
     ]
     return mock_paginator
+
+
+class FakeS3VectorsClient:
+    """In-memory stand-in for the s3vectors client that enforces request limits.
+
+    ``put_vectors`` rejects more than ``max_put_vectors`` vectors or a body over
+    ``max_payload_bytes``; ``delete_vectors`` rejects more than ``max_delete_keys``.
+    ``throttle`` maps a key to how many calls containing it are throttled first,
+    and ``reject`` holds keys whose calls always fail validation.
+    """
+
+    def __init__(self, max_put_vectors=500, max_delete_keys=500, max_payload_bytes=20 * 1024 * 1024, latency=0.0):
+        self.vectors = {}
+        self.max_put_vectors = max_put_vectors
+        self.max_delete_keys = max_delete_keys
+        self.max_payload_bytes = max_payload_bytes
+        self.latency = latency
+        self.throttle = {}
+        self.reject = set()
+        self.calls = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.list_calls = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _error(code, status, operation):
+        return ClientError(
+            {"Error": {"Code": code, "Message": code}, "ResponseMetadata": {"HTTPStatusCode": status}},
+            operation,
+        )
+
+    def _enter(self, operation, keys):
+        with self._lock:
+            self.calls.append((operation, list(keys)))
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            throttled = next((k for k in keys if self.throttle.get(k, 0) > 0), None)
+            if throttled is not None:
+                self.throttle[throttled] -= 1
+        if self.latency:
+            time.sleep(self.latency)
+        if throttled is not None:
+            self._exit()
+            raise self._error("ThrottlingException", 429, operation)
+        if any(k in self.reject for k in keys):
+            self._exit()
+            raise self._error("ValidationException", 400, operation)
+
+    def _exit(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def put_vectors(self, vectorBucketName, indexName, vectors):
+        if len(vectors) > self.max_put_vectors:
+            raise self._error("ValidationException", 400, "PutVectors")
+        if len(json.dumps(vectors, separators=(",", ":"))) > self.max_payload_bytes:
+            raise self._error("RequestEntityTooLargeException", 413, "PutVectors")
+        self._enter("PutVectors", [v["key"] for v in vectors])
+        with self._lock:
+            for vector in vectors:
+                self.vectors[vector["key"]] = vector
+        self._exit()
+        return {"ResponseMetadata": {"HTTPStatusCode": 200}}
+
+    def delete_vectors(self, vectorBucketName, indexName, keys):
+        if len(keys) > self.max_delete_keys:
+            raise self._error("ValidationException", 400, "DeleteVectors")
+        self._enter("DeleteVectors", keys)
+        with self._lock:
+            for key in keys:
+                self.vectors.pop(key, None)
+        self._exit()
+        return {"ResponseMetadata": {"HTTPStatusCode": 200}}
+
+    def get_vectors(self, vectorBucketName, indexName, keys, returnData=False, returnMetadata=False):
+        found = []
+        for key in keys:
+            vector = self.vectors.get(key)
+            if vector is None:
+                continue
+            item = {"key": key}
+            if returnData:
+                item["data"] = vector["data"]
+            if returnMetadata:
+                item["metadata"] = vector.get("metadata", {})
+            found.append(item)
+        return {"vectors": found}
+
+    def get_paginator(self, operation):
+        client = self
+        self.list_calls += 1
+
+        class Paginator:
+            def paginate(self, **kwargs):
+                page_size = kwargs.get("PaginationConfig", {}).get("PageSize", 1000)
+                items = [
+                    {"key": v["key"], "metadata": v.get("metadata", {})}
+                    for v in list(client.vectors.values())
+                ]
+                for i in range(0, len(items), page_size):
+                    yield {"vectors": items[i:i + page_size]}
+
+        return Paginator()
+
+    def calls_for(self, operation):
+        return [keys for name, keys in self.calls if name == operation]
+
+
+@pytest.fixture
+def fake_s3vectors(mocker):
+    client = FakeS3VectorsClient()
+    mocker.patch('boto3.client', return_value=client)
+    return client
+
+
+class FakeS3Client:
+    """In-memory S3 object store for manifest tests; ``fail_puts`` makes put_object raise.
+
+    Honours ``IfMatch``/``IfNoneMatch`` like S3 conditional writes; ``before_put``
+    is called with the key ahead of every put so tests can slip in a racing write.
+    """
+
+    def __init__(self):
+        self.objects = {}
+        self.fail_puts = False
+        self.before_put = None
+
+    @staticmethod
+    def _etag(body):
+        return f'"{hashlib.md5(body).hexdigest()}"'
+
+    def _check(self, Bucket, Key, IfMatch=None, IfNoneMatch=None, operation="PutObject"):
+        current = self.objects.get((Bucket, Key))
+        if (IfMatch is not None and (current is None or self._etag(current) != IfMatch)) or (
+            IfNoneMatch == "*" and current is not None
+        ):
+            raise ClientError({"Error": {"Code": "PreconditionFailed", "Message": "changed"}}, operation)
+
+    def get_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise ClientError({"Error": {"Code": "NoSuchKey", "Message": "missing"}}, "GetObject")
+        body = self.objects[(Bucket, Key)]
+        return {"Body": MagicMock(read=MagicMock(return_value=body)), "ETag": self._etag(body)}
+
+    def put_object(self, Bucket, Key, Body, ContentType=None, IfMatch=None, IfNoneMatch=None):
+        if self.fail_puts:
+            raise ClientError({"Error": {"Code": "InternalError", "Message": "down"}}, "PutObject")
+        if self.before_put is not None:
+            self.before_put(Key)
+        self._check(Bucket, Key, IfMatch, IfNoneMatch)
+        self.objects[(Bucket, Key)] = Body
+        return {"ETag": self._etag(Body)}
+
+    def delete_object(self, Bucket, Key, IfMatch=None):
+        if (Bucket, Key) in self.objects:
+            self._check(Bucket, Key, IfMatch, operation="DeleteObject")
+        self.objects.pop((Bucket, Key), None)
+
+    def get_paginator(self, operation):
+        client = self
+
+        class Paginator:
+            def paginate(self, Bucket, Prefix=""):
+                keys = sorted(k for b, k in client.objects if b == Bucket and k.startswith(Prefix))
+                yield {"Contents": [{"Key": k} for k in keys]} if keys else {}
+
+        return Paginator()
+
+    def object_keys(self):
+        return sorted(k for _, k in self.objects)
+
+
+@pytest.fixture
+def fake_s3():
+    return FakeS3Client()
@@ -0,0 +1,233 @@
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.documents import Document
+
+from app.knowledge.chunk_sync import sync_source_chunks
+from app.knowledge.vector_store.manifest import SourceManifest, VectorManifestStore
+from app.knowledge.vector_store.service import S3VectorStoreService
+
+
+def chunk(source_id, content_hash, url="https://example.com/a"):
+    return Document(
+        page_content=f"text {content_hash}",
+        metadata={"source_id": source_id, "content_hash": content_hash, "section_url": url, "name": source_id},
+    )
+
+
+def embed(texts):
+    return [[0.1, 0.2] for _ in texts]
+
+
+@pytest.mark.unit
+class TestSourceManifest:
+
+    def test_apply_and_summary_without_chunk_text(self):
+        manifest = SourceManifest.from_vectors("src", [
+            {"key": "k1", "metadata": {"source_id": "src", "name": "Src", "url": "https://a", "content": "long text", "last_sync": "2024-01-01"}},
+        ])
+        manifest.apply(
+            upserts={"k2": {"source_id": "src", "url": "https://b", "last_sync": "2024-02-01"}},
+            deletes=["missing"],
+        )
+
+        assert "content" not in manifest.vectors["k1"]
+        summary = manifest.summary()
+        assert summary["total_chunks"] == 2
+        assert summary["name"] == "Src"
+        assert summary["last_sync"] == "2024-02-01"
+        assert summary["section_urls"] == ["https://a", "https://b"]
+        assert SourceManifest.from_dict(manifest.to_dict()).vectors == manifest.vectors
+
+    def test_empty_manifest_has_no_summary(self):
+        assert SourceManifest(source_id="src").summary() is None
+
+
+@pytest.mark.unit
+class TestVectorStoreManifest:
+
+    @pytest.fixture
+    def s3(self, fake_s3):
+        return fake_s3
+
+    @pytest.fixture
+    def vector_store(self, fake_s3vectors, s3):
+        store = S3VectorStoreService()
+        store.write_retry_backoff = 0
+        store.manifest = VectorManifestStore("kb-files", "_kb_manifest/", client=s3)
+        return store
+
+    def test_sync_keeps_manifest_in_step_and_skips_index_listing(self, vector_store, fake_s3vectors, s3):
+        document_service = MagicMock(generate_embeddings=MagicMock(side_effect=embed))
+        vector_store.add_documents([chunk("other", "o1")], [[0.3, 0.3]])
+
+        sync_source_chunks("src", [chunk("src", "h1"), chunk("src", "h2")], vector_store=vector_store, document_service=document_service)
+        assert fake_s3vectors.list_calls == 1  # first sight of the source: listed once, then backfilled
+        assert "_kb_manifest/src.json" in s3.object_keys()
+
+        result = sync_source_chunks("src", [chunk("src", "h2"), chunk("src", "h3")], vector_store=vector_store, document_service=document_service)
+
+        assert fake_s3vectors.list_calls == 1
+        assert result.chunks_added == 1
+        assert result.chunks_deleted == 1
+        stored = {k for k, v in fake_s3vectors.vectors.items() if v["metadata"]["source_id"] == "src"}
+        assert set(vector_store.manifest.get("src").keys) == stored
+        assert {v["metadata"]["content_hash"] for v in vector_store.list_source_vectors("src")} == {"h2", "h3"}
+
+    def test_complete_manifests_answer_unknown_sources_without_listing(self, vector_store, fake_s3vectors):
+        vector_store.add_documents([chunk("src", "h1")], [[0.1, 0.2]])
+        vector_store.list_source_manifests()
+        listed = fake_s3vectors.list_calls
+
+        assert vector_store.list_source_vectors("never-synced") == []
+        assert fake_s3vectors.list_calls == listed
+
+    def test_list_source_manifests_rebuilds_once_then_reads_manifests(self, vector_store, fake_s3vectors):
+        vector_store.add_documents([chunk("a", "h1"), chunk("a", "h2"), chunk("b", "h3")], [[0.1, 0.2]] * 3)
+
+        first = vector_store.list_source_manifests()
+        second = vector_store.list_source_manifests()
+
+        assert fake_s3vectors.list_calls == 1
+        assert vector_store.manifest_covers_index() is True
+        assert sorted((m.source_id, len(m.keys)) for m in second) == [("a", 2), ("b", 1)]
+        assert sorted(m.source_id for m in first) == ["a", "b"]
+
+    def test_failed_manifest_write_invalidates_it(self, vector_store, fake_s3vectors, s3):
+        vector_store.add_documents([chunk("src", "h1")], [[0.1, 0.2]])
+        vector_store.list_source_manifests()
+
+        s3.fail_puts = True
+        vector_store.add_documents([chunk("src", "h2")], [[0.1, 0.2]])
+        s3.fail_puts = False
+
+        assert vector_store.manifest.get("src") is None
+        assert vector_store.manifest_covers_index() is False
+        assert {v["metadata"]["content_hash"] for v in vector_store.list_source_vectors("src")} == {"h1", "h2"}
+
+    def test_delete_documents_by_source_id_uses_manifest_and_removes_it(self, vector_store, fake_s3vectors, s3):
+        vector_store.add_documents([chunk("src", "h1"), chunk("src", "h2"), chunk("keep", "h3")], [[0.1, 0.2]] * 3)
+        vector_store.list_source_manifests()
+        listed = fake_s3vectors.list_calls
+
+        result = vector_store.delete_documents_by_source_id("src")
+
+        assert result["vectors_deleted"] == 2
+        assert fake_s3vectors.list_calls == listed
+        assert vector_store.manifest.get("src") is None
+        assert [v["metadata"]["source_id"] for v in fake_s3vectors.vectors.values()] == ["keep"]
+
+    def test_source_details_come_from_manifest_keys(self, vector_store, fake_s3vectors):
+        vector_store.add_documents([chunk("src", "h1", url="https://example.com/x")], [[0.1, 0.2]])
+        vector_store.list_source_manifests()
+        listed = fake_s3vectors.list_calls
+
+        summary = vector_store.get_source_summary("src")
+        vectors = list(vector_store._iterate_vectors_by_source_id("src"))
+
+        assert summary["total_chunks"] == 1
+        assert vectors[0]["metadata"]["content"] == "text h1"
+        assert fake_s3vectors.list_calls == listed
+
+    def test_delete_all_vectors_resets_manifests(self, vector_store, fake_s3vectors, s3):
+        vector_store.add_documents([chunk("src", "h1")], [[0.1, 0.2]])
+        vector_store.list_source_manifests()
+
+        vector_store.delete_all_vectors()
+
+        assert vector_store.manifest_covers_index() is True
+        assert vector_store.manifest.list_all() == []
+
+    def _write_during_scan(self, vector_store, write):
+        scan = vector_store._scan_all_vectors
+
+        def scan_then_write():
+            vectors = list(scan())
+            write()
+            yield from vectors
+
+        vector_store._scan_all_vectors = scan_then_write
+
+    def test_new_source_written_during_rebuild_leaves_manifests_incomplete(self, vector_store, fake_s3vectors):
+        vector_store.add_documents([chunk("a", "h1")], [[0.1, 0.2]])
+        self._write_during_scan(vector_store, lambda: vector_store.add_documents([chunk("late", "h2")], [[0.1, 0.2]]))
+
+        rebuilt = vector_store.list_source_manifests()
+
+        assert [m.source_id for m in rebuilt] == ["a"]
+        assert vector_store.manifest_covers_index() is False
+        assert [v["metadata"]["content_hash"] for v in vector_store.list_source_vectors("late")] == ["h2"]
+
+    def test_rebuild_keeps_manifest_written_after_scan_started(self, vector_store, fake_s3vectors):
+        vector_store.add_documents([chunk("a", "h1")], [[0.1, 0.2]])
+        vector_store.list_source_manifests()
+        vector_store.manifest.mark_complete(False)
+        self._write_during_scan(vector_store, lambda: vector_store.add_documents([chunk("a", "h2")], [[0.1, 0.2]]))
+
+        vector_store.list_source_manifests()
+
+        assert {m["content_hash"] for m in vector_store.manifest.get("a").vectors.values()} == {"h1", "h2"}
+        assert vector_store.manifest_covers_index() is False
+
+    def test_concurrent_writers_on_one_source_keep_each_others_keys(self, vector_store, fake_s3vectors, s3):
+        vector_store.add_documents([chunk("src", "h1")], [[0.1, 0.2]])
+        vector_store.list_source_manifests()
+        manifest_puts = []
+
+        def racing_write(key):
+            if key != "_kb_manifest/src.json":
+                return
+            manifest_puts.append(key)
+            if len(manifest_puts) == 2:  # the first writer is about to record its keys
+                s3.before_put = None
+                vector_store.add_documents([chunk("src", "h3")], [[0.1, 0.2]])
+
+        s3.before_put = racing_write
+        vector_store.add_documents([chunk("src", "h2")], [[0.1, 0.2]])
+
+        manifest = vector_store.manifest.get("src")
+        assert {m["content_hash"] for m in manifest.vectors.values()} == {"h1", "h2", "h3"}
+        assert manifest.pending == {}
+        assert vector_store.manifest_covers_index() is True
+
+    def test_writer_dying_after_index_write_leaves_source_to_be_rescanned(self, vector_store, fake_s3vectors, s3):
+        vector_store.add_documents([chunk("src", "h1")], [[0.1, 0.2]])
+        vector_store.list_source_manifests()
+        record = vector_store._record_in_manifest
+        vector_store._record_in_manifest = lambda *args, **kwargs: None
+
+        vector_store.add_documents([chunk("src", "h2")], [[0.1, 0.2]])
+        vector_store._record_in_manifest = record
+
+        assert vector_store.manifest.get("src").pending
+        assert {v["metadata"]["content_hash"] for v in vector_store.list_source_vectors("src")} == {"h1", "h2"}
+        result = vector_store.delete_documents_by_source_id("src")
+        assert result["vectors_deleted"] == 2
+        assert fake_s3vectors.vectors == {}
+
+    def test_backfill_drops_pending_writes_that_died(self, vector_store, fake_s3vectors, s3):
+        vector_store.list_source_manifests()
+        vector_store.manifest.put(SourceManifest(source_id="src", pending={"dead": "2020-01-01T00:00:00+00:00"}))
+        fake_s3vectors.vectors["k1"] = {"key": "k1", "metadata": {"source_id": "src", "content_hash": "h1"}}
+
+        assert [v["key"] for v in vector_store.list_source_vectors("src")] == ["k1"]
+
+        manifest = vector_store.manifest.get("src")
+        assert manifest.pending == {}
+        assert manifest.keys == ["k1"]
+
+    def test_parent_chunks_come_complete_from_manifest(self, vector_store, fake_s3vectors):
+        vector_store.list_source_manifests()
+        pages = [
+            Document(
+                page_content=f"part {i}",
+                metadata={"source_id": "src", "content_hash": f"p{i}", "parent_id": "page-1" if i < 40 else "page-2", "start_index": i * 10},
+            )
+            for i in range(45)
+        ]
+        vector_store.add_documents(pages, [[0.1, 0.2]] * 45)
+
+        chunks = vector_store.get_parent_chunks("page-1", "src")
+
+        assert sorted(c["start_index"] for c in chunks) == [i * 10 for i in range(40)]
+        assert vector_store.get_parent_chunks("page-1", "unknown-source") is None
@@ -3,7 +3,19 @@ from unittest.mock import MagicMock
 import pytest
 from langchain_core.documents import Document
 
-from app.knowledge.vector_store.service import S3VectorStoreService
+from app.knowledge.vector_store.service import (
+    S3VectorStoreService,
+    VectorWriteError,
+    index_generation,
+    split_into_batches,
+)
+
+
+def fail_second_batch(**kwargs):
+    """delete_vectors stand-in that rejects the batch holding key_100 (batches run in parallel)."""
+    if "key_100" in kwargs["keys"]:
+        raise Exception("Delete failed")
+    return {"ResponseMetadata": {"HTTPStatusCode": 200}}
 
 
 @pytest.mark.unit
@@ -75,7 +87,7 @@ class TestS3VectorStoreService:
     @pytest.mark.parametrize("key_count,delete_side_effect,expected_success,expected_deleted,expected_failed,expected_msg_part", [
         (50, None, True, 50, 0, None),  # Success
         (0, None, True, 0, 0, "No vectors found"),  # Empty index
-        (150, [{"ResponseMetadata": {"HTTPStatusCode": 200}}, Exception("Delete failed")], False, 100, 50, "Partially successful"),  # Partial success
+        (150, "fail_second_batch", False, 100, 50, "Partially successful"),  # Partial success
         (5, Exception("Delete failed"), False, 0, 5, "Failed to delete any vectors"),  # Complete failure
     ])
     def test_delete_all_vectors_scenarios(
@@ -96,7 +108,9 @@ class TestS3VectorStoreService:
             return_value=[f"key_{i}" for i in range(key_count)]
         )
 
-        if delete_side_effect:
+        if delete_side_effect == "fail_second_batch":
+            mock_s3_client.delete_vectors.side_effect = fail_second_batch
+        elif delete_side_effect:
             mock_s3_client.delete_vectors.side_effect = delete_side_effect
 
         result = vector_store.delete_all_vectors()
@@ -215,10 +229,7 @@ class TestS3VectorStoreService:
             return_value=[f"key_{i}" for i in range(150)]
         )
 
-        mock_s3_client.delete_vectors.side_effect = [
-            {"ResponseMetadata": {"HTTPStatusCode": 200}},
-            Exception("Delete failed")
-        ]
+        mock_s3_client.delete_vectors.side_effect = fail_second_batch
 
         result = vector_store.delete_all_vectors()
 
@@ -292,10 +303,7 @@ class TestS3VectorStoreService:
         )
 
 
-        mock_s3_client.delete_vectors.side_effect = [
-            {"ResponseMetadata": {"HTTPStatusCode": 200}},
-            Exception("Delete failed")
-        ]
+        mock_s3_client.delete_vectors.side_effect = fail_second_batch
 
         result = vector_store.delete_documents_by_source_id("test123")
 
@@ -393,3 +401,151 @@ class TestS3VectorStoreService:
         keys = vector_store._get_vector_keys_by_source_id("test123")
 
         assert keys == ['vector1', 'vector2']
+
+    def test_list_source_vectors_raises_on_listing_error(self, vector_store, mock_s3_client):
+        mock_s3_client.get_paginator.return_value.paginate.side_effect = Exception("list failed")
+
+        with pytest.raises(Exception, match="list failed"):
+            vector_store.list_source_vectors("test123")
+
+        assert list(vector_store._iterate_vectors_by_source_id("test123")) == []
+
+    def test_delete_vectors_by_keys_batches(self, vector_store, mock_s3_client):
+        keys = [f"doc_key_{i}" for i in range(250)]
+
+        result = vector_store.delete_vectors_by_keys(keys)
+
+        assert mock_s3_client.delete_vectors.call_count == 3
+        assert result["success"] is True
+        assert result["vectors_deleted"] == 250
+
+    def test_add_documents_returns_written_keys(self, vector_store, sample_embedding):
+        docs = [Document(page_content="Content", metadata={"source_id": "test123", "content_hash": "hash456"})]
+
+        keys = vector_store.add_documents(docs, [sample_embedding])
+
+        assert keys == ["doc_test123_hash456_0"]
+
+
+def make_documents(count, source_id="src1", content="Content"):
+    return [
+        Document(page_content=f"{content} {i}", metadata={"source_id": source_id, "content_hash": f"hash{i:05d}"})
+        for i in range(count)
+    ]
+
+
+@pytest.mark.unit
+class TestS3VectorStoreBatching:
+
+    @pytest.fixture
+    def vector_store(self, fake_s3vectors):
+        store = S3VectorStoreService()
+        store.write_retry_backoff = 0
+        return store
+
+    def test_split_into_batches_bounds_count_and_bytes(self):
+        batches = split_into_batches(list(range(10)), max_count=4)
+        assert [len(b) for b in batches] == [4, 4, 2]
+
+        sized = split_into_batches(["aa", "bbb", "c", "dddd", "e"], max_count=10, max_bytes=4, size_of=len)
+        assert sized == [["aa"], ["bbb", "c"], ["dddd"], ["e"]]
+
+    def test_add_documents_splits_by_vector_count(self, vector_store, fake_s3vectors):
+        keys = vector_store.add_documents(make_documents(1200), [[0.1, 0.2]] * 1200)
+
+        assert len(keys) == 1200
+        assert len(fake_s3vectors.vectors) == 1200
+        assert sorted(len(batch) for batch in fake_s3vectors.calls_for("PutVectors")) == [200, 500, 500]
+
+    def test_add_documents_splits_by_payload_bytes(self, vector_store, fake_s3vectors):
+        fake_s3vectors.max_payload_bytes = 20_000
+        vector_store.put_batch_max_bytes = 20_000
+        documents = make_documents(60, content="x" * 1000)
+
+        vector_store.add_documents(documents, [[0.5] * 16] * 60)
+
+        assert len(fake_s3vectors.vectors) == 60
+        assert len(fake_s3vectors.calls_for("PutVectors")) > 1
+
+    def test_add_documents_halves_batches_the_service_rejects_as_too_large(self, vector_store, fake_s3vectors):
+        fake_s3vectors.max_payload_bytes = 20_000
+        documents = make_documents(60, content="x" * 1000)
+
+        vector_store.add_documents(documents, [[0.5] * 16] * 60)
+
+        assert len(fake_s3vectors.vectors) == 60
+
+    def test_add_documents_runs_batches_with_bounded_parallelism(self, vector_store, fake_s3vectors):
+        fake_s3vectors.latency = 0.02
+        vector_store.put_batch_max_vectors = 10
+        vector_store.write_concurrency = 3
+
+        vector_store.add_documents(make_documents(100), [[0.1]] * 100)
+
+        assert len(fake_s3vectors.calls_for("PutVectors")) == 10
+        assert fake_s3vectors.peak_in_flight == 3
+
+    def test_add_documents_retries_only_throttled_batch(self, vector_store, fake_s3vectors):
+        vector_store.put_batch_max_vectors = 10
+        fake_s3vectors.throttle["doc_src1_hash00015_15"] = 2
+
+        vector_store.add_documents(make_documents(50), [[0.1]] * 50)
+
+        calls = fake_s3vectors.calls_for("PutVectors")
+        assert len(calls) == 5 + 2
+        assert sum(1 for keys in calls if "doc_src1_hash00015_15" in keys) == 3
+        assert len(fake_s3vectors.vectors) == 50
+
+    def test_add_documents_reports_only_the_failed_slice(self, vector_store, fake_s3vectors):
+        vector_store.put_batch_max_vectors = 10
+        fake_s3vectors.reject.add("doc_src1_hash00023_23")
+
+        with pytest.raises(VectorWriteError) as exc_info:
+            vector_store.add_documents(make_documents(40), [[0.1]] * 40)
+
+        assert exc_info.value.failed_keys == ["doc_src1_hash00023_23"]
+        assert len(exc_info.value.written_keys) == 39
+        assert len(fake_s3vectors.vectors) == 39
+
+    def test_add_documents_stops_halving_on_systematic_validation_error(self, vector_store, fake_s3vectors):
+        vector_store.put_batch_max_vectors = 500
+        documents = make_documents(500)
+        fake_s3vectors.reject.update(f"doc_src1_hash{i:05d}_{i}" for i in range(500))
+
+        with pytest.raises(VectorWriteError, match="ValidationException") as exc_info:
+            vector_store.add_documents(documents, [[0.1]] * 500)
+
+        assert len(exc_info.value.failed_keys) == 500
+        # the batch, then each half once - not a call per vector
+        assert len(fake_s3vectors.calls_for("PutVectors")) == 3
+
+    def test_writes_and_deletes_bump_index_generation(self, vector_store, fake_s3vectors):
+        before = index_generation()
+        keys = vector_store.add_documents(make_documents(3), [[0.1]] * 3)
+        after_write = index_generation()
+        vector_store.delete_vectors_by_keys(keys)
+
+        assert before < after_write < index_generation()
+
+    def test_add_documents_gives_up_after_max_attempts(self, vector_store, fake_s3vectors):
+        vector_store.write_max_attempts = 2
+        fake_s3vectors.throttle["doc_src1_hash00000_0"] = 5
+
+        with pytest.raises(VectorWriteError, match="ThrottlingException"):
+            vector_store.add_documents(make_documents(3), [[0.1]] * 3)
+
+        assert len(fake_s3vectors.calls_for("PutVectors")) == 2
+
+    def test_delete_documents_by_source_id_deletes_in_bounded_batches(self, vector_store, fake_s3vectors):
+        vector_store.add_documents(make_documents(1200, source_id="src1"), [[0.1]] * 1200)
+        vector_store.add_documents(make_documents(30, source_id="src2"), [[0.1]] * 30)
+        fake_s3vectors.throttle["doc_src1_hash00042_42"] = 1
+
+        result = vector_store.delete_documents_by_source_id("src1")
+
+        assert result["success"] is True
+        assert result["vectors_deleted"] == 1200
+        deletes = fake_s3vectors.calls_for("DeleteVectors")
+        assert max(len(keys) for keys in deletes) <= vector_store.delete_batch_size
+        assert len(deletes) == 12 + 1
+        assert len(fake_s3vectors.vectors) == 30
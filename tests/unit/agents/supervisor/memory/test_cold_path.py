@@ -4,8 +4,9 @@ Unit tests for app.agents.supervisor.memory.cold_path module.
 Tests cover:
 - _trigger_decide function
 - _search_neighbors function
-- _do_update and _do_recreate functions
-- _same_fact_classify function
+- _do_update and _recreate_memory functions
+- _same_fact_classify and _same_fact_classify_batch functions
+- _is_near_exact_match
 - _compose_summaries and _compose_display_summaries
 - _normalize_summary_text
 - _derive_nudge_metadata
@@ -16,19 +17,23 @@ Tests cover:
 - _emit_sse_safe
 """
 
+import json
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 from app.agents.supervisor.memory.cold_path import (
     _compose_display_summaries,
     _compose_summaries,
     _derive_nudge_metadata,
-    _do_recreate,
     _do_update,
     _emit_sse_safe,
     _has_min_token_overlap,
+    _is_near_exact_match,
     _normalize_summary_text,
     _numeric_overlap_or_step,
+    _recreate_memory,
     _same_fact_classify,
+    _same_fact_classify_batch,
     _sanitize_semantic_time_phrases,
     _search_neighbors,
     _trigger_decide,
@@ -168,13 +173,14 @@ class TestDoUpdate:
             )
 
             mock_store.put.assert_called_once()
+            mock_store.patch_values.assert_not_called()
             call_args = mock_store.put.call_args
             assert call_args[0][2]["summary"] == "New longer summary text"
             assert call_args[0][2]["display_summary"] == "New display"
 
     def test_do_update_without_existing_item(self):
         """Test updating when existing item is fetched from store."""
-        mock_store = MagicMock()
+        mock_store = MagicMock(spec=["get", "put"])
         existing_item = MagicMock()
         existing_item.value = {"summary": "Old summary"}
         mock_store.get.return_value = existing_item
@@ -189,11 +195,48 @@ class TestDoUpdate:
         mock_store.get.assert_called_once()
         mock_store.put.assert_called_once()
 
+    def test_do_update_with_unchanged_summary_patches_metadata_only(self):
+        """An exact match keeps the indexed summary, so only changed metadata is patched, without re-embedding."""
+        mock_store = MagicMock()
+        mock_store.patch_values.return_value = 1
+        existing_item = MagicMock()
+        existing_item.value = {"summary": "User likes coffee", "display_summary": "Old display", "importance": 2}
 
-class TestDoRecreate:
-    """Test _do_recreate function."""
+        with patch("app.agents.supervisor.memory.cold_path._utc_now_iso", return_value="2024-01-01T00:00:00Z"):
+            merged = _do_update(
+                mock_store,
+                ("user", "semantic"),
+                "key-123",
+                "user likes coffee",
+                existing_item=existing_item,
+                candidate_value={"display_summary": "New display"},
+            )
 
-    def test_do_recreate_merges_values(self):
+        mock_store.patch_values.assert_called_once_with(
+            ("user", "semantic"),
+            {"key-123": {"last_accessed": "2024-01-01T00:00:00Z", "display_summary": "New display"}},
+        )
+        mock_store.put.assert_not_called()
+        assert merged["summary"] == "User likes coffee"
+        assert merged["importance"] == 2
+
+    def test_do_update_falls_back_to_put_when_patch_finds_nothing(self):
+        """A memory missing from the index is written in full."""
+        mock_store = MagicMock()
+        mock_store.patch_values.return_value = 0
+        existing_item = MagicMock()
+        existing_item.value = {"summary": "User likes coffee"}
+
+        _do_update(mock_store, ("user", "semantic"), "key-123", "User likes coffee", existing_item=existing_item)
+
+        mock_store.put.assert_called_once()
+        assert mock_store.put.call_args.kwargs["index"] == ["summary"]
+
+
+class TestRecreateMemory:
+    """Test _recreate_memory function."""
+
+    def test_recreate_memory_merges_values(self):
         """Test recreating memory with merged values."""
         mock_store = MagicMock()
         existing_item = MagicMock()
@@ -217,7 +260,7 @@ class TestDoRecreate:
         with patch("app.agents.supervisor.memory.cold_path._compose_summaries") as mock_compose:
             mock_compose.return_value = "Composed summary"
 
-            new_id = _do_recreate(
+            recreated = _recreate_memory(
                 mock_store,
                 ("user", "semantic"),
                 "old-key",
@@ -227,7 +270,7 @@ class TestDoRecreate:
                 candidate_value,
             )
 
-            assert new_id is not None
+            assert recreated["id"]
             mock_store.put.assert_called_once()
             mock_store.delete.assert_called_once()
             call_args = mock_store.put.call_args
@@ -283,6 +326,65 @@ class TestSameFactClassify:
         assert result is False
 
 
+class TestSameFactClassifyBatch:
+    """Test _same_fact_classify_batch function."""
+
+    @staticmethod
+    def _client_returning(text: str) -> MagicMock:
+        mock_client = MagicMock()
+        payload = {"output": {"message": {"content": [{"text": text}]}}}
+        mock_client.invoke_model.return_value = {"body": MagicMock(read=MagicMock(return_value=json.dumps(payload).encode()))}
+        return mock_client
+
+    @patch("app.agents.supervisor.memory.cold_path.get_bedrock_runtime_client")
+    @patch("app.agents.supervisor.memory.cold_path.prompt_loader")
+    def test_batch_returns_first_match_with_one_call(self, mock_prompt_loader, mock_get_client):
+        mock_client = self._client_returning('{"same_fact": [3, 2]}')
+        mock_get_client.return_value = mock_client
+        mock_prompt_loader.load.return_value = "Test prompt"
+
+        result = _same_fact_classify_batch(["Lives in Austin", "Has two kids", "Has 2 children"], "Has 2 kids", "Personal")
+
+        assert result == 1
+        mock_client.invoke_model.assert_called_once()
+        assert mock_prompt_loader.load.call_args[0][0] == "memory_same_fact_batch_classifier"
+
+    @patch("app.agents.supervisor.memory.cold_path.get_bedrock_runtime_client")
+    @patch("app.agents.supervisor.memory.cold_path.prompt_loader")
+    def test_batch_ignores_out_of_range_and_malformed(self, mock_prompt_loader, mock_get_client):
+        mock_prompt_loader.load.return_value = "Test prompt"
+        mock_get_client.return_value = self._client_returning('{"same_fact": [0, 7, true, "2"]}')
+        assert _same_fact_classify_batch(["a", "b"], "c", "Personal") is None
+
+        mock_get_client.return_value = self._client_returning("no json here")
+        assert _same_fact_classify_batch(["a", "b"], "c", "Personal") is None
+
+    def test_batch_single_neighbor_uses_pairwise_classifier(self):
+        with patch("app.agents.supervisor.memory.cold_path._same_fact_classify", return_value=True) as mock_pair:
+            assert _same_fact_classify_batch(["Has two kids"], "Has 2 kids", "Personal") == 0
+            mock_pair.assert_called_once_with("Has two kids", "Has 2 kids", "Personal")
+
+    def test_batch_empty(self):
+        assert _same_fact_classify_batch([], "Has 2 kids", "Personal") is None
+
+
+class TestIsNearExactMatch:
+    """Test _is_near_exact_match function."""
+
+    def test_case_and_punctuation_only(self):
+        assert _is_near_exact_match("User likes coffee.", "user likes Coffee") is True
+
+    def test_different_value_is_not_near_exact(self):
+        assert _is_near_exact_match("Luna is 3 years old", "Luna is 4 years old") is False
+
+    def test_negation_is_not_near_exact(self):
+        existing = "The user really enjoys long morning runs along the river before work on most weekdays"
+        assert _is_near_exact_match(existing, existing.replace("really", "really not")) is False
+
+    def test_empty(self):
+        assert _is_near_exact_match("", "User likes coffee") is False
+
+
 class TestComposeSummaries:
     """Test _compose_summaries function."""
 
@@ -552,6 +654,107 @@ class TestRunSemanticMemoryJob:
             mock_emit_sse.assert_called_once()
 
 
+    @staticmethod
+    def _run_with_neighbors(neighbors, summary, merge_mode="update"):
+        mock_store = MagicMock()
+        mock_store.search.return_value = neighbors
+        with patch("app.agents.supervisor.memory.cold_path._trigger_decide") as mock_decide, \
+             patch("app.agents.supervisor.memory.cold_path._create_memory_sync") as mock_create, \
+             patch("app.agents.supervisor.memory.cold_path._emit_sse_safe") as mock_emit_sse, \
+             patch("app.agents.supervisor.memory.cold_path._profile_sync_from_memory_sync"), \
+             patch("app.agents.supervisor.memory.cold_path._same_fact_classify_batch", return_value=1) as mock_batch, \
+             patch("app.agents.supervisor.memory.cold_path._same_fact_classify") as mock_pair, \
+             patch("app.agents.supervisor.memory.cold_path._compose_summaries", return_value="Composed") as mock_compose, \
+             patch("app.agents.supervisor.memory.cold_path.MERGE_MODE", merge_mode), \
+             patch("app.agents.supervisor.memory.cold_path.AUTO_UPDATE", 0.95), \
+             patch("app.agents.supervisor.memory.cold_path.CHECK_LOW", 0.6), \
+             patch("app.agents.supervisor.memory.cold_path.FALLBACK_ENABLED", True), \
+             patch("app.agents.supervisor.memory.cold_path.FALLBACK_LOW", 0.3), \
+             patch("app.agents.supervisor.memory.cold_path.FALLBACK_TOPK", 3), \
+             patch("app.agents.supervisor.memory.cold_path.FALLBACK_RECENCY_DAYS", 365), \
+             patch("app.agents.supervisor.memory.cold_path.FALLBACK_CATEGORIES", None):
+            mock_decide.return_value = {
+                "should_create": True,
+                "type": "semantic",
+                "category": "Personal",
+                "summary": summary,
+                "importance": 3,
+            }
+            run_semantic_memory_job(
+                user_id="user-123",
+                thread_id="thread-123",
+                user_context={},
+                conversation_window=[{"role": "user", "content": summary}],
+                event_loop=MagicMock(),
+                store=mock_store,
+            )
+        return SimpleNamespace(
+            store=mock_store,
+            create=mock_create,
+            emit=mock_emit_sse,
+            batch=mock_batch,
+            pair=mock_pair,
+            compose=mock_compose,
+        )
+
+    @staticmethod
+    def _neighbor(key, summary, score):
+        return SimpleNamespace(
+            key=key,
+            score=score,
+            value={"id": key, "summary": summary, "category": "Personal", "created_at": "2024-01-01T00:00:00+00:00"},
+            created_at="2024-01-01T00:00:00+00:00",
+            updated_at="2099-01-01T00:00:00+00:00",
+        )
+
+    def test_neighbors_judged_in_one_batch_and_written_once(self):
+        neighbors = [
+            self._neighbor("k1", "User lives in Austin", 0.8),
+            self._neighbor("k2", "User has two kids", 0.7),
+            self._neighbor("k3", "User has kids in school", 0.4),
+        ]
+
+        run = self._run_with_neighbors(neighbors, "User has 2 kids")
+
+        run.batch.assert_called_once()
+        assert run.batch.call_args[0][0] == ["User lives in Austin", "User has two kids", "User has kids in school"]
+        run.pair.assert_not_called()
+        run.store.put.assert_not_called()
+        run.store.patch_values.assert_called_once()
+        assert list(run.store.patch_values.call_args[0][1]) == ["k2"]
+        run.store.get.assert_not_called()
+        run.create.assert_not_called()
+        event = run.emit.call_args[0]
+        assert event[2] == "memory.updated"
+        assert event[3]["id"] == "k2"
+
+    def test_near_exact_match_skips_llm_and_updates_in_place(self):
+        neighbors = [self._neighbor("k1", "User likes coffee.", 0.5)]
+
+        run = self._run_with_neighbors(neighbors, "user likes coffee", merge_mode="recreate")
+
+        run.batch.assert_not_called()
+        run.compose.assert_not_called()
+        run.store.delete.assert_not_called()
+        run.store.put.assert_not_called()
+        run.store.patch_values.assert_called_once()
+        assert list(run.store.patch_values.call_args[0][1]) == ["k1"]
+        run.store.get.assert_not_called()
+
+    def test_recreate_emits_new_key_without_read_back(self):
+        neighbors = [self._neighbor("k1", "User lives in Austin", 0.8), self._neighbor("k2", "User has two kids", 0.7)]
+
+        run = self._run_with_neighbors(neighbors, "User has 2 kids", merge_mode="recreate")
+
+        run.compose.assert_called_once()
+        run.store.delete.assert_called_once_with(("user-123", "semantic"), "k2")
+        new_key = run.store.put.call_args[0][1]
+        assert new_key != "k2"
+        run.store.get.assert_not_called()
+        assert run.emit.call_args[0][3]["id"] == new_key
+        assert run.emit.call_args[0][3]["value"]["summary"] == "Composed"
+
+
 class TestRunEpisodicMemoryJob:
     """Test run_episodic_memory_job function."""
 
@@ -327,6 +327,53 @@ class TestTimedSearch:
         assert result == mock_results
         mock_store.search.assert_called_once_with(("user", "semantic"), query="test query", filter=None, limit=5)
 
+    @pytest.mark.asyncio
+    async def test_timed_search_uses_precomputed_vector(self):
+        """Test timed search skips per-search embedding when given a vector."""
+        mock_store = MagicMock()
+        mock_store.asearch_by_vector = AsyncMock(return_value=[MagicMock()])
+
+        result = await _timed_search(
+            mock_store, ("user", "semantic"), query="test query", limit=5, label="test", query_vector=[0.1, 0.2]
+        )
+
+        assert len(result) == 1
+        mock_store.asearch_by_vector.assert_awaited_once_with(("user", "semantic"), [0.1, 0.2], filter=None, limit=5)
+        mock_store.search.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_memory_context_embeds_query_once_for_all_searches(self):
+        """Test semantic, episodic and procedural searches share one query embedding."""
+
+        class VectorStore:
+            aembed_query = AsyncMock(return_value=[0.5])
+            asearch_by_vector = AsyncMock(return_value=[])
+            search = MagicMock()
+
+        from langchain_core.messages import HumanMessage
+
+        store = VectorStore()
+        state = {"messages": [HumanMessage(content="how is my budget")]}
+        config = MagicMock()
+        config.configurable = {"user_id": str(uuid4())}
+
+        with patch("app.agents.supervisor.memory.context.get_store", return_value=store), \
+             patch("app.agents.supervisor.memory.context.memory_service"), \
+             patch("app.agents.supervisor.memory.context.CONTEXT_TOPN", 2), \
+             patch("app.agents.supervisor.memory.context.CONTEXT_TOPK", 5), \
+             patch("app.agents.supervisor.memory.context.PROCEDURAL_TOPK", 3), \
+             patch("app.agents.supervisor.memory.context.PROCEDURAL_MIN_SCORE", 0.5):
+            await memory_context(state, config)
+
+        VectorStore.aembed_query.assert_awaited_once_with("how is my budget")
+        assert VectorStore.asearch_by_vector.await_count == 3
+        assert {c.args[0][1] for c in VectorStore.asearch_by_vector.await_args_list} == {
+            "semantic",
+            "episodic",
+            "supervisor_procedural",
+        }
+        VectorStore.search.assert_not_called()
+
 
 class TestExtractRoutingExamples:
     """Test _extract_routing_examples function."""
@@ -0,0 +1,85 @@
+"""Tests for the local cold-path trigger gate."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.agents.supervisor.memory.cold_path import _trigger_decide
+from app.agents.supervisor.memory.trigger_gate import TriggerGate, extract_features
+
+
+@pytest.fixture
+def gate():
+    return TriggerGate.from_file()
+
+
+class TestExtractFeatures:
+    def test_self_disclosure_and_life_facts(self):
+        features = extract_features("My wife and I just moved to Denver")
+        assert features["first_person"] == 1.0
+        assert features["self_disclosure"] == 1.0
+        assert features["life_fact"] == 1.0
+        assert features["question_only"] == 0.0
+
+    def test_question_request(self):
+        features = extract_features("How do index funds work?")
+        assert features["question_only"] == 1.0
+        assert features["request_lead"] == 1.0
+        assert features["self_disclosure"] == 0.0
+
+
+class TestTriggerGate:
+    @pytest.mark.parametrize("text", ["Hello", "thanks!", "ok thanks", "   ", "👍"])
+    def test_acknowledgements_are_skipped(self, gate, text):
+        assert gate.decide(text).skip is True
+
+    @pytest.mark.parametrize("text", ["What's my balance?", "how do index funds work?", "what is an ETF"])
+    def test_plain_questions_are_skipped(self, gate, text):
+        decision = gate.decide(text)
+        assert decision.skip is True
+        assert decision.reason == "low_score"
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "I love coffee",
+            "My wife is pregnant",
+            "Can you help me plan a budget? I earn 5000 a month",
+            "Mi esposa se llama Ana",
+        ],
+    )
+    def test_possible_facts_go_to_llm(self, gate, text):
+        assert gate.decide(text).skip is False
+
+    def test_disabled_gate_never_skips(self):
+        gate = TriggerGate.from_file(enabled=False)
+        assert gate.decide("Hello").skip is False
+
+    def test_stats_report_hit_rate(self, gate):
+        gate.decide("Hello")
+        gate.decide("I love coffee")
+
+        stats = gate.get_stats()
+
+        assert stats["evaluated"] == 2
+        assert stats["skipped"] == 1
+        assert stats["passed_to_llm"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["skip_reasons"] == {"ack_only": 1}
+
+    def test_model_file_overrides_weights(self, tmp_path):
+        path = tmp_path / "model.json"
+        path.write_text(json.dumps({"bias": 5.0, "weights": {}, "skip_below": 0.5}))
+
+        assert TriggerGate.from_file(path).decide("what is an ETF").skip is False
+
+
+class TestTriggerDecideGate:
+    @patch("app.agents.supervisor.memory.cold_path.get_bedrock_runtime_client")
+    def test_skipped_turn_makes_no_llm_call(self, mock_get_client):
+        mock_client = MagicMock()
+        mock_get_client.return_value = mock_client
+
+        assert _trigger_decide("thanks!") == {"should_create": False}
+        mock_client.invoke_model.assert_not_called()
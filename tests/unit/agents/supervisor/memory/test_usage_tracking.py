@@ -1,17 +1,25 @@
 """Tests for memory usage tracking (last_used_at timestamps)."""
 
+import asyncio
 from datetime import datetime
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
 from app.agents.supervisor.memory.usage_tracking import (
-    _update_last_used_async,
+    MemoryUsageLedger,
     _utc_now_iso,
     update_memory_usage_tracking,
 )
 
 
+async def _flush_usage(store, keys):
+    """Record usage of ``keys`` for user-123 in a fresh ledger and write it out."""
+    ledger = MemoryUsageLedger(flush_interval_seconds=60, max_pending=100)
+    ledger.record(store, ("user-123", "semantic"), keys)
+    await ledger.aclose()
+
+
 def test_utc_now_iso():
     """Test UTC timestamp generation."""
     result = _utc_now_iso()
@@ -23,7 +31,7 @@ def test_utc_now_iso():
 @pytest.mark.asyncio
 async def test_update_last_used_at_success():
     """Test successful update of last_used_at field."""
-    mock_store = Mock()
+    mock_store = Mock(spec=["aget", "aput"])
     mock_item = Mock()
     mock_item.value = {
         "id": "test-key",
@@ -33,11 +41,7 @@ async def test_update_last_used_at_success():
     mock_store.aget = AsyncMock(return_value=[mock_item])
     mock_store.aput = AsyncMock()
 
-    await _update_last_used_async(
-        mock_store,
-        "user-123",
-        ["test-key"]
-    )
+    await _flush_usage(mock_store, ["test-key"])
 
     mock_store.aget.assert_called_once()
     mock_store.aput.assert_called_once()
@@ -51,7 +55,7 @@ async def test_update_last_used_at_success():
 @pytest.mark.asyncio
 async def test_update_last_used_at_preserves_other_fields():
     """Test that update preserves all other fields."""
-    mock_store = Mock()
+    mock_store = Mock(spec=["aget", "aput"])
     mock_item = Mock()
     original_value = {
         "id": "test-key",
@@ -65,11 +69,7 @@ async def test_update_last_used_at_preserves_other_fields():
     mock_store.aget = AsyncMock(return_value=[mock_item])
     mock_store.aput = AsyncMock()
 
-    await _update_last_used_async(
-        mock_store,
-        "user-123",
-        ["test-key"]
-    )
+    await _flush_usage(mock_store, ["test-key"])
 
     call_args = mock_store.aput.call_args
     updated_value = call_args[0][2]
@@ -84,15 +84,11 @@ async def test_update_last_used_at_preserves_other_fields():
 @pytest.mark.asyncio
 async def test_update_last_used_at_empty_list():
     """Test that empty list is handled gracefully."""
-    mock_store = Mock()
+    mock_store = Mock(spec=["aget", "aput"])
     mock_store.aget = AsyncMock()
     mock_store.aput = AsyncMock()
 
-    await _update_last_used_async(
-        mock_store,
-        "user-123",
-        []
-    )
+    await _flush_usage(mock_store, [])
 
     mock_store.aget.assert_not_called()
     mock_store.aput.assert_not_called()
@@ -101,15 +97,11 @@ async def test_update_last_used_at_empty_list():
 @pytest.mark.asyncio
 async def test_update_last_used_at_missing_memory():
     """Test handling of missing memory."""
-    mock_store = Mock()
+    mock_store = Mock(spec=["aget", "aput"])
     mock_store.aget = AsyncMock(return_value=[])
     mock_store.aput = AsyncMock()
 
-    await _update_last_used_async(
-        mock_store,
-        "user-123",
-        ["missing-key"]
-    )
+    await _flush_usage(mock_store, ["missing-key"])
 
     mock_store.aget.assert_called_once()
     mock_store.aput.assert_not_called()
@@ -118,15 +110,11 @@ async def test_update_last_used_at_missing_memory():
 @pytest.mark.asyncio
 async def test_update_last_used_at_error_handling():
     """Test error handling during update."""
-    mock_store = Mock()
+    mock_store = Mock(spec=["aget", "aput"])
     mock_store.aget = AsyncMock(side_effect=Exception("S3 error"))
     mock_store.aput = AsyncMock()
 
-    await _update_last_used_async(
-        mock_store,
-        "user-123",
-        ["test-key"]
-    )
+    await _flush_usage(mock_store, ["test-key"])
 
     mock_store.aput.assert_not_called()
 
@@ -134,7 +122,7 @@ async def test_update_last_used_at_error_handling():
 @pytest.mark.asyncio
 async def test_update_last_used_at_multiple_keys():
     """Test updating multiple memories."""
-    mock_store = Mock()
+    mock_store = Mock(spec=["aget", "aput"])
     mock_item1 = Mock()
     mock_item1.value = {"id": "key-1", "summary": "Memory 1", "last_used_at": None}
     mock_item2 = Mock()
@@ -143,11 +131,7 @@ async def test_update_last_used_at_multiple_keys():
     mock_store.aget = AsyncMock(side_effect=[[mock_item1], [mock_item2]])
     mock_store.aput = AsyncMock()
 
-    await _update_last_used_async(
-        mock_store,
-        "user-123",
-        ["key-1", "key-2"]
-    )
+    await _flush_usage(mock_store, ["key-1", "key-2"])
 
     assert mock_store.aget.call_count == 2
     assert mock_store.aput.call_count == 2
@@ -156,122 +140,195 @@ async def test_update_last_used_at_multiple_keys():
 @pytest.mark.asyncio
 async def test_update_last_used_at_partial_failure():
     """Test handling partial failures in batch."""
-    mock_store = Mock()
+    mock_store = Mock(spec=["aget", "aput"])
     mock_item = Mock()
     mock_item.value = {"id": "key-1", "summary": "Memory 1", "last_used_at": None}
 
     mock_store.aget = AsyncMock(side_effect=[[mock_item], Exception("Error"), [mock_item]])
     mock_store.aput = AsyncMock()
 
-    await _update_last_used_async(
-        mock_store,
-        "user-123",
-        ["key-1", "key-2", "key-3"]
-    )
+    await _flush_usage(mock_store, ["key-1", "key-2", "key-3"])
 
     assert mock_store.aget.call_count == 3
     assert mock_store.aput.call_count == 2
 
 
+@pytest.fixture
+def ledger():
+    """Fresh ledger installed as the process-wide one."""
+    instance = MemoryUsageLedger(flush_interval_seconds=60, max_pending=100)
+    with patch("app.agents.supervisor.memory.usage_tracking._memory_usage_ledger", instance):
+        yield instance
+
+
 @pytest.mark.asyncio
-async def test_update_memory_usage_tracking():
-    """Test updating memory usage tracking."""
+async def test_update_memory_usage_tracking(ledger):
+    """Test usage is buffered in the ledger instead of written inline."""
     mock_store = Mock()
-    mock_item = Mock()
-    mock_item.value = {"summary": "Test", "last_used_at": None}
-    mock_store.aget = AsyncMock(return_value=[mock_item])
-    mock_store.aput = AsyncMock()
+    mock_store.apatch_values = AsyncMock(return_value=2)
 
-    mock_items = [
-        Mock(key="key-1"),
-        Mock(key="key-2"),
-    ]
+    update_memory_usage_tracking(mock_store, "user-123", [Mock(key="key-1"), Mock(key="key-2")])
 
-    with patch("app.agents.supervisor.memory.usage_tracking.asyncio.create_task") as mock_create_task:
-        update_memory_usage_tracking(
-            mock_store,
-            "user-123",
-            mock_items
-        )
+    assert ledger.pending_count() == 2
+    mock_store.apatch_values.assert_not_called()
+    await ledger.aclose()
 
-        mock_create_task.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_spawn_update_no_keys(ledger):
+    """Test that nothing is buffered when there are no keys."""
+    update_memory_usage_tracking(Mock(), "user-123", [])
+
+    assert ledger.pending_count() == 0
 
 
 @pytest.mark.asyncio
-async def test_spawn_update_no_keys():
-    """Test that no updates happen when no keys."""
+async def test_spawn_update_mixed_items(ledger):
+    """Test handling mix of items with and without keys."""
     mock_store = Mock()
-    mock_items = []
+    mock_store.apatch_values = AsyncMock(return_value=2)
 
-    with patch("app.agents.supervisor.memory.usage_tracking.asyncio.create_task") as mock_create_task:
-        update_memory_usage_tracking(
-            mock_store,
-            "user-123",
-            mock_items
-        )
+    update_memory_usage_tracking(mock_store, "user-123", [Mock(key="key-1"), Mock(spec=[]), Mock(key="key-2")])
 
-        mock_create_task.assert_not_called()
+    assert ledger.pending_count() == 2
+    await ledger.aclose()
 
 
 @pytest.mark.asyncio
-async def test_spawn_update_no_key_attribute():
-    """Test handling items without key attribute."""
+async def test_spawn_update_error_handling():
+    """Test errors while recording are swallowed."""
+    with patch("app.agents.supervisor.memory.usage_tracking.get_memory_usage_ledger", side_effect=Exception("Error")):
+        update_memory_usage_tracking(Mock(), "user-123", [Mock(key="test")])
+
+
+@pytest.mark.asyncio
+async def test_ledger_merges_events_into_one_metadata_write(ledger):
+    """Repeated usage of a key collapses into one patch with a usage_count delta."""
     mock_store = Mock()
-    mock_items = [Mock(spec=[])]
+    mock_store.apatch_values = AsyncMock(return_value=2)
 
-    with patch("app.agents.supervisor.memory.usage_tracking.asyncio.create_task") as mock_create_task:
-        update_memory_usage_tracking(
-            mock_store,
-            "user-123",
-            mock_items
-        )
+    ledger.record(mock_store, ("user-123", "semantic"), ["key-1", "key-2"], "2025-01-01T00:00:00+00:00")
+    ledger.record(mock_store, ("user-123", "semantic"), ["key-1"], "2025-01-02T00:00:00+00:00")
+    updated = await ledger.flush()
 
-        mock_create_task.assert_not_called()
+    assert updated == 2
+    mock_store.apatch_values.assert_awaited_once_with(
+        ("user-123", "semantic"),
+        {"key-1": {"last_used_at": "2025-01-02T00:00:00+00:00"}, "key-2": {"last_used_at": "2025-01-01T00:00:00+00:00"}},
+        {"key-1": {"usage_count": 2}, "key-2": {"usage_count": 1}},
+    )
+    mock_store.aput.assert_not_called()
+    assert ledger.pending_count() == 0
 
 
 @pytest.mark.asyncio
-async def test_spawn_update_mixed_items():
-    """Test handling mix of items with and without keys."""
+async def test_ledger_flushes_in_background_after_interval():
+    """Buffered usage is written by the scheduled flush task."""
+    ledger = MemoryUsageLedger(flush_interval_seconds=0.01, max_pending=100)
     mock_store = Mock()
-    mock_item = Mock()
-    mock_item.value = {"summary": "Test", "last_used_at": None}
-    mock_store.aget = AsyncMock(return_value=[mock_item])
-    mock_store.aput = AsyncMock()
+    mock_store.apatch_values = AsyncMock(return_value=1)
+
+    ledger.record(mock_store, ("user-123", "semantic"), ["key-1"])
+    await asyncio.sleep(0.05)
+
+    mock_store.apatch_values.assert_awaited_once()
+    assert ledger.pending_count() == 0
 
-    mock_items = [
-        Mock(key="key-1"),
-        Mock(spec=[]),
-        Mock(key="key-2"),
-    ]
 
-    with patch("app.agents.supervisor.memory.usage_tracking.asyncio.create_task") as mock_create_task:
-        update_memory_usage_tracking(
-            mock_store,
-            "user-123",
-            mock_items
-        )
+def _blocking_patch_store():
+    """Store whose first apatch_values call blocks until ``release`` is set; ``calls`` lists completed writes."""
+    started, release = asyncio.Event(), asyncio.Event()
+    calls = []
 
-        mock_create_task.assert_called_once()
+    async def apatch_values(namespace, values, increments):
+        if not started.is_set():
+            started.set()
+            await release.wait()
+        calls.append(dict(increments))
+        return len(values)
+
+    store = Mock()
+    store.apatch_values = apatch_values
+    return store, calls, started, release
 
 
 @pytest.mark.asyncio
-async def test_spawn_update_error_handling():
-    """Test error handling in update function."""
-    mock_store = Mock()
-    mock_items = [Mock(key="test")]
+async def test_ledger_immediate_flush_does_not_cancel_in_flight_flush():
+    """Hitting max_pending mid-flush chains a follow-up flush instead of dropping the one in flight."""
+    ledger = MemoryUsageLedger(flush_interval_seconds=0.01, max_pending=2)
+    store, calls, started, release = _blocking_patch_store()
+
+    ledger.record(store, ("user-123", "semantic"), ["key-1"])
+    await started.wait()
+    ledger.record(store, ("user-123", "semantic"), ["key-2", "key-3"])
+    release.set()
+    await asyncio.sleep(0.05)
+
+    assert calls == [{"key-1": {"usage_count": 1}}, {"key-2": {"usage_count": 1}, "key-3": {"usage_count": 1}}]
+    assert ledger.pending_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_ledger_aclose_waits_for_in_flight_flush():
+    """Shutdown during a flush lets it finish rather than cancelling it."""
+    ledger = MemoryUsageLedger(flush_interval_seconds=0.01, max_pending=100)
+    store, calls, started, release = _blocking_patch_store()
+
+    ledger.record(store, ("user-123", "semantic"), ["key-1"])
+    await started.wait()
+    closing = asyncio.create_task(ledger.aclose())
+    await asyncio.sleep(0)
+    release.set()
+    await closing
+
+    assert calls == [{"key-1": {"usage_count": 1}}]
+    assert ledger.pending_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_ledger_cancelled_mid_flush_rebuffers_entries(ledger):
+    """Entries a cancelled flush had taken are put back, merged with newer usage."""
+    store, calls, started, release = _blocking_patch_store()
+    ledger.record(store, ("user-123", "semantic"), ["key-1"], "2025-01-01T00:00:00+00:00")
+
+    flush = asyncio.create_task(ledger.flush())
+    await started.wait()
+    ledger.record(store, ("user-123", "semantic"), ["key-1"], "2025-01-02T00:00:00+00:00")
+    flush.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await flush
 
-    with patch("app.agents.supervisor.memory.usage_tracking.asyncio.create_task", side_effect=Exception("Error")):
-        update_memory_usage_tracking(
-            mock_store,
-            "user-123",
-            mock_items
-        )
+    assert ledger.pending_count() == 1
+    release.set()
+    assert await ledger.flush() == 1
+    assert calls[-1] == {"key-1": {"usage_count": 2}}
+
+
+@pytest.mark.asyncio
+async def test_ledger_falls_back_to_rewrite_for_plain_stores(ledger):
+    """Stores without apatch_values get a per-item rewrite of the usage fields only, never re-embedded."""
+    mock_store = Mock(spec=["aget", "aput"])
+    mock_item = Mock()
+    mock_item.value = {"summary": "Test", "last_used_at": None, "usage_count": 3}
+    mock_store.aget = AsyncMock(return_value=[mock_item])
+    mock_store.aput = AsyncMock()
+
+    ledger.record(mock_store, ("user-123", "semantic"), ["key-1"], "2025-01-01T00:00:00+00:00")
+    ledger.record(mock_store, ("user-123", "semantic"), ["key-1"], "2025-01-02T00:00:00+00:00")
+    assert await ledger.flush() == 1
+
+    mock_store.aput.assert_awaited_once_with(
+        ("user-123", "semantic"),
+        "key-1",
+        {"summary": "Test", "last_used_at": "2025-01-02T00:00:00+00:00", "usage_count": 5},
+        index=False,
+    )
 
 
 @pytest.mark.asyncio
 async def test_update_last_used_at_updates_timestamp():
     """Test that timestamp is actually updated to a new value."""
-    mock_store = Mock()
+    mock_store = Mock(spec=["aget", "aput"])
     old_timestamp = "2025-01-01T00:00:00+00:00"
     mock_item = Mock()
     mock_item.value = {
@@ -282,11 +339,7 @@ async def test_update_last_used_at_updates_timestamp():
     mock_store.aget = AsyncMock(return_value=[mock_item])
     mock_store.aput = AsyncMock()
 
-    await _update_last_used_async(
-        mock_store,
-        "user-123",
-        ["test-key"]
-    )
+    await _flush_usage(mock_store, ["test-key"])
 
     call_args = mock_store.aput.call_args
     updated_value = call_args[0][2]
@@ -296,17 +349,13 @@ async def test_update_last_used_at_updates_timestamp():
 @pytest.mark.asyncio
 async def test_update_last_used_at_correct_namespace():
     """Test that correct namespace is used."""
-    mock_store = Mock()
+    mock_store = Mock(spec=["aget", "aput"])
     mock_item = Mock()
     mock_item.value = {"id": "test-key", "summary": "Test", "last_used_at": None}
     mock_store.aget = AsyncMock(return_value=[mock_item])
     mock_store.aput = AsyncMock()
 
-    await _update_last_used_async(
-        mock_store,
-        "user-123",
-        ["test-key"]
-    )
+    await _flush_usage(mock_store, ["test-key"])
 
     get_call_args = mock_store.aget.call_args
     namespace = get_call_args[0][0]
@@ -314,27 +363,24 @@ async def test_update_last_used_at_correct_namespace():
 
 
 @pytest.mark.asyncio
-async def test_update_last_used_at_indexes_summary():
-    """Test that summary is indexed when updating."""
-    mock_store = Mock()
+async def test_update_last_used_at_does_not_reindex():
+    """Test that the rewrite leaves the embedding alone."""
+    mock_store = Mock(spec=["aget", "aput"])
     mock_item = Mock()
     mock_item.value = {"id": "test-key", "summary": "Test summary", "last_used_at": None}
     mock_store.aget = AsyncMock(return_value=[mock_item])
     mock_store.aput = AsyncMock()
 
-    await _update_last_used_async(
-        mock_store,
-        "user-123",
-        ["test-key"]
-    )
+    await _flush_usage(mock_store, ["test-key"])
 
     mock_store.aput.assert_called_once()
+    assert mock_store.aput.call_args.kwargs["index"] is False
 
 
 @pytest.mark.asyncio
 async def test_update_last_used_at_removes_duplicate():
     """Test that old last_used_at is removed to prevent duplication."""
-    mock_store = Mock()
+    mock_store = Mock(spec=["aget", "aput"])
     mock_item = Mock()
     mock_item.value = {
         "id": "test-key",
@@ -345,11 +391,7 @@ async def test_update_last_used_at_removes_duplicate():
     mock_store.aget = AsyncMock(return_value=[mock_item])
     mock_store.aput = AsyncMock()
 
-    await _update_last_used_async(
-        mock_store,
-        "user-123",
-        ["test-key"]
-    )
+    await _flush_usage(mock_store, ["test-key"])
 
     call_args = mock_store.aput.call_args
     updated_value = call_args[0][2]
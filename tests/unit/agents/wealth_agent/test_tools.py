@@ -188,7 +188,9 @@ class TestSearchKB:
         parsed = json.loads(result)
 
         assert isinstance(parsed, list)
-        mock_knowledge_service.search.assert_called_once_with(query, filter={'content_source': 'external'})
+        mock_knowledge_service.search.assert_called_once_with(
+            query, filter={'content_source': 'external'}, hydrate_parents=False
+        )
 
     @pytest.mark.asyncio
     async def test_search_kb_includes_subcategory_when_present(self, mock_knowledge_service):
@@ -226,3 +228,24 @@ class TestSearchKB:
         assert "subcategory" in parsed[0]["metadata"]
         assert parsed[0]["metadata"]["subcategory"] == "reports"
         assert "subcategory" not in parsed[1]["metadata"]
+
+    @pytest.mark.asyncio
+    async def test_search_kb_attaches_parent_window_when_enabled(self, mock_knowledge_service, mocker):
+        """Test search_kb requests parent hydration and trims the page around the chunk."""
+        mocker.patch("app.agents.supervisor.wealth_agent.tools.config.KB_PARENT_CONTEXT_MAX_CHARS", 10)
+        mock_knowledge_service.search = AsyncMock(
+            return_value=[
+                {
+                    "content": "chunk",
+                    "section_url": "https://example.com/page",
+                    "parent_content": "0123456789chunk0123456789",
+                    "start_index": 10,
+                }
+            ]
+        )
+
+        result = await search_kb.ainvoke({"query": "test"})
+        parsed = json.loads(result)
+
+        assert mock_knowledge_service.search.call_args.kwargs["hydrate_parents"] is True
+        assert parsed[0]["document_context"] == "789chunk01"
@@ -59,13 +59,14 @@ def mock_boto3_session():
 def reset_app_state_globals():
     """Reset app_state global variables before each test."""
     import app.core.app_state as app_state
+    from app.core.runtime_registry import RuntimeRegistry, queue_is_idle
 
     original_values = {
         '_onboarding_agent': app_state._onboarding_agent,
         '_supervisor_graph': app_state._supervisor_graph,
         '_user_sessions': app_state._user_sessions.copy(),
         '_onboarding_threads': app_state._onboarding_threads.copy(),
-        '_sse_queues': app_state._sse_queues.copy(),
+        '_sse_queues': app_state._sse_queues,
         '_thread_locks': app_state._thread_locks.copy(),
         '_last_emitted_text': app_state._last_emitted_text.copy(),
         '_finance_samples_cache': app_state._finance_samples_cache.copy(),
@@ -84,7 +85,9 @@ def reset_app_state_globals():
     app_state._supervisor_graph = None
     app_state._user_sessions = {}
     app_state._onboarding_threads = {}
-    app_state._sse_queues = {}
+    app_state._sse_queues = RuntimeRegistry(
+        "sse_queues", max_entries=100, idle_ttl_seconds=3600, is_evictable=queue_is_idle
+    )
     app_state._thread_locks = {}
     app_state._last_emitted_text = {}
     app_state._finance_samples_cache = {}
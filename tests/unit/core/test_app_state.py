@@ -155,6 +155,30 @@ class TestSSEQueueManagement:
         """Test dropping nonexistent queue doesn't raise error."""
         app_state.drop_sse_queue("nonexistent-thread")
 
+    def test_attached_sse_queue_survives_eviction_until_detached(self, reset_app_state_globals):
+        """An idle queue with a stream attached is pinned; the last detach drops it."""
+        thread_id = "test-thread-123"
+        queue = app_state.attach_sse_queue(thread_id)
+        app_state.attach_sse_queue(thread_id)
+
+        app_state._sse_queues._clock = lambda: 10**9  # long past the idle TTL
+        assert app_state._sse_queues.sweep() == 0
+        assert app_state.get_sse_queue(thread_id) is queue
+
+        app_state.detach_sse_queue(thread_id)
+        assert app_state.get_sse_queue(thread_id) is queue
+        app_state.detach_sse_queue(thread_id)
+        assert thread_id not in app_state._sse_queues
+
+    def test_detach_without_drop_keeps_queue(self, reset_app_state_globals):
+        """Streams that outlive their connection keep the queue for the next one."""
+        thread_id = "test-thread-123"
+        queue = app_state.attach_sse_queue(thread_id)
+
+        app_state.detach_sse_queue(thread_id, drop=False)
+
+        assert app_state._sse_queues.get(thread_id) is queue
+
 
 class TestThreadLocks:
     """Test thread lock management."""
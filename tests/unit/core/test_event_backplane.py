@@ -0,0 +1,106 @@
+"""Tests for the per-thread SSE event backplane and its queue adapter."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from app.core import app_state
+from app.core.event_backplane import BackplaneSSEQueue, InMemoryEventBackplane
+
+
+@pytest.fixture
+def backplane():
+    return InMemoryEventBackplane(retention=10)
+
+
+class TestInMemoryEventBackplane:
+    @pytest.mark.asyncio
+    async def test_read_returns_events_after_id(self, backplane):
+        first = await backplane.publish("t1", {"event": "a"})
+        await backplane.publish("t1", {"event": "b"})
+
+        assert [item for _, item in await backplane.read("t1", None, block=0)] == [{"event": "a"}, {"event": "b"}]
+        assert [item for _, item in await backplane.read("t1", first, block=0)] == [{"event": "b"}]
+
+    @pytest.mark.asyncio
+    async def test_read_blocks_until_publish(self, backplane):
+        reader = asyncio.create_task(backplane.read("t1", None, block=1))
+        await asyncio.sleep(0)
+        await backplane.publish("t1", "hello")
+
+        assert [item for _, item in await reader] == ["hello"]
+
+    @pytest.mark.asyncio
+    async def test_read_times_out_empty(self, backplane):
+        assert await backplane.read("t1", None, block=0.01) == []
+
+    @pytest.mark.asyncio
+    async def test_retention_drops_oldest(self):
+        backplane = InMemoryEventBackplane(retention=2)
+        for i in range(3):
+            await backplane.publish("t1", i)
+
+        assert [item for _, item in await backplane.read("t1", None, block=0)] == [1, 2]
+
+
+class TestBackplaneSSEQueue:
+    @pytest.mark.asyncio
+    async def test_events_published_elsewhere_are_delivered(self, backplane):
+        # The POST and the SSE GET use different adapters, as they would on different replicas.
+        publisher = BackplaneSSEQueue(backplane, "t1")
+        consumer = BackplaneSSEQueue(backplane, "t1", block=0.01)
+
+        await publisher.put({"event": "message.completed", "data": {"text": "hi"}})
+
+        assert await consumer.get() == {"event": "message.completed", "data": {"text": "hi"}}
+
+    @pytest.mark.asyncio
+    async def test_new_connection_resumes_after_delivered_events(self, backplane):
+        publisher = BackplaneSSEQueue(backplane, "t1")
+        for i in range(3):
+            await publisher.put(i)
+
+        first = BackplaneSSEQueue(backplane, "t1", block=0.01)
+        assert await first.get() == 0
+
+        reconnected = BackplaneSSEQueue(backplane, "t1", block=0.01)
+        assert await reconnected.get() == 1
+        assert await reconnected.get() == 2
+
+    @pytest.mark.asyncio
+    async def test_resume_after_replays_from_last_event_id(self, backplane):
+        publisher = BackplaneSSEQueue(backplane, "t1")
+        for i in range(3):
+            await publisher.put(i)
+        consumer = BackplaneSSEQueue(backplane, "t1", block=0.01)
+        first_id, _ = await consumer.get_with_id()
+        await consumer.get()
+        await consumer.get()
+
+        replay = BackplaneSSEQueue(backplane, "t1", block=0.01)
+        replay.resume_after(first_id)
+
+        assert await replay.get() == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_get_does_not_lose_events(self, backplane):
+        consumer = BackplaneSSEQueue(backplane, "t1", block=0.01)
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(consumer.get(), timeout=0.05)
+
+        await BackplaneSSEQueue(backplane, "t1").put("late")
+
+        assert await consumer.get() == "late"
+
+
+class TestGetSseQueueBackend:
+    def test_backplane_backend_returns_adapter(self):
+        app_state._sse_queues.pop("bp-thread", None)
+        with patch("app.core.event_backplane._backplane", InMemoryEventBackplane()), patch(
+            "app.core.config.config.SSE_EVENT_BACKEND", "memory"
+        ):
+            queue = app_state.get_sse_queue("bp-thread")
+        app_state.drop_sse_queue("bp-thread")
+
+        assert isinstance(queue, BackplaneSSEQueue)
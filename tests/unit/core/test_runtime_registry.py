@@ -0,0 +1,122 @@
+"""Tests for the bounded per-thread runtime registry."""
+
+import asyncio
+
+import pytest
+
+from app.core.runtime_registry import RuntimeRegistry, lock_is_idle, queue_is_idle
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestRuntimeRegistry:
+    def test_behaves_like_a_dict(self, clock):
+        registry = RuntimeRegistry("t", max_entries=10, idle_ttl_seconds=60, clock=clock)
+
+        registry["a"] = 1
+        registry["b"] = 2
+
+        assert registry["a"] == 1
+        assert registry.get("missing") is None
+        assert "b" in registry
+        assert registry.pop("b") == 2
+        assert registry.copy() == {"a": 1}
+        registry.clear()
+        assert len(registry) == 0
+
+    def test_idle_entries_are_evicted_on_write(self, clock):
+        registry = RuntimeRegistry("t", max_entries=10, idle_ttl_seconds=60, clock=clock)
+        registry["old"] = 1
+        registry["recent"] = 2
+
+        clock.now = 50
+        _ = registry["recent"]
+        clock.now = 100
+        registry["new"] = 3
+
+        assert list(registry) == ["recent", "new"]
+        assert registry.stats()["evicted_idle"] == 1
+
+    def test_size_cap_evicts_least_recently_used(self, clock):
+        registry = RuntimeRegistry("t", max_entries=2, idle_ttl_seconds=3600, clock=clock)
+        registry["a"] = 1
+        registry["b"] = 2
+        _ = registry["a"]
+
+        registry["c"] = 3
+
+        assert sorted(registry) == ["a", "c"]
+        stats = registry.stats()
+        assert stats["evicted_lru"] == 1
+        assert stats["high_water"] == 2
+
+    def test_in_use_entries_are_never_evicted(self, clock):
+        registry = RuntimeRegistry(
+            "t", max_entries=1, idle_ttl_seconds=60, is_evictable=lambda value: value != "busy", clock=clock
+        )
+        registry["busy"] = "busy"
+        clock.now = 100
+
+        registry["idle"] = "idle"
+
+        assert "busy" in registry
+        assert registry.sweep() == 0
+
+    def test_pinned_entries_are_never_evicted(self, clock):
+        registry = RuntimeRegistry("t", max_entries=10, idle_ttl_seconds=60, clock=clock)
+        registry["stream"] = "idle queue"
+        registry.pin("stream")
+        registry.pin("stream")
+        clock.now = 100
+
+        assert registry.sweep() == 0
+        assert registry.unpin("stream") == 1
+        assert registry.sweep() == 0
+        assert registry.unpin("stream") == 0
+
+        clock.now = 200
+        assert registry.sweep() == 1
+        assert "stream" not in registry
+
+    def test_sweep_removes_all_idle_entries(self, clock):
+        registry = RuntimeRegistry("t", max_entries=100, idle_ttl_seconds=10, clock=clock)
+        for i in range(50):
+            registry[f"k{i}"] = i
+        clock.now = 20
+
+        assert registry.sweep() == 50
+        assert len(registry) == 0
+
+
+class TestEvictionPredicates:
+    @pytest.mark.asyncio
+    async def test_queue_with_items_or_waiters_is_busy(self):
+        queue = asyncio.Queue()
+        assert queue_is_idle(queue)
+
+        await queue.put("x")
+        assert not queue_is_idle(queue)
+        await queue.get()
+
+        waiter = asyncio.create_task(queue.get())
+        await asyncio.sleep(0)
+        assert not queue_is_idle(queue)
+        waiter.cancel()
+
+    @pytest.mark.asyncio
+    async def test_held_lock_is_busy(self):
+        lock = asyncio.Lock()
+        assert lock_is_idle(lock)
+        async with lock:
+            assert not lock_is_idle(lock)
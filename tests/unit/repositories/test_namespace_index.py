@@ -0,0 +1,110 @@
+"""Tests for the memory store namespace index."""
+
+from unittest.mock import MagicMock
+
+from app.repositories.namespace_index import (
+    InMemoryNamespaceIndex,
+    RedisNamespaceIndex,
+    namespace_sort_score,
+)
+
+NS = ("user-123", "semantic")
+
+
+class TestNamespaceSortScore:
+    def test_prefers_last_accessed_over_created_at(self):
+        value = {"last_accessed": "2024-02-01T00:00:00+00:00", "created_at": "2024-01-01T00:00:00+00:00"}
+        assert namespace_sort_score(value, "2020-01-01T00:00:00+00:00") > namespace_sort_score(
+            {"created_at": "2024-01-01T00:00:00+00:00"}, "2020-01-01T00:00:00+00:00"
+        )
+
+    def test_invalid_timestamp_uses_fallback(self):
+        fallback = "2024-01-01T00:00:00+00:00"
+        assert namespace_sort_score({"last_accessed": "not-a-date"}, fallback) == namespace_sort_score({}, fallback)
+
+
+class TestInMemoryNamespaceIndex:
+    def test_not_ready_until_rebuilt(self):
+        index = InMemoryNamespaceIndex()
+        index.record_put(NS, "a", 1.0)
+        assert not index.is_ready(NS)
+
+        index.rebuild(NS, [("a", 1.0)])
+        assert index.is_ready(NS)
+
+    def test_orders_keys_by_score(self):
+        index = InMemoryNamespaceIndex()
+        index.rebuild(NS, [("b", 2.0), ("a", 1.0)])
+        index.record_put(NS, "c", 0.5)
+
+        assert index.keys(NS) == ["c", "a", "b"]
+        assert index.keys(NS, limit=2) == ["c", "a"]
+        assert index.oldest(NS) == "c"
+        assert index.newest(NS) == "b"
+        assert index.count(NS) == 3
+
+    def test_rebuild_dropped_when_write_recorded_since_epoch(self):
+        index = InMemoryNamespaceIndex()
+        epoch = index.write_epoch(NS)
+        index.record_put(NS, "during-scan", 2.0)
+
+        assert index.rebuild(NS, [("a", 1.0)], epoch=epoch) is False
+        assert not index.is_ready(NS)
+        assert index.keys(NS) == ["during-scan"]
+
+        assert index.rebuild(NS, [("a", 1.0), ("during-scan", 2.0)], epoch=index.write_epoch(NS)) is True
+        index.invalidate(NS)
+        assert not index.is_ready(NS)
+
+    def test_record_delete(self):
+        index = InMemoryNamespaceIndex()
+        index.rebuild(NS, [("a", 1.0), ("b", 2.0)])
+        index.record_delete(NS, ["a", "missing"])
+
+        assert index.keys(NS) == ["b"]
+        assert index.count(("other", "semantic")) == 0
+
+
+class TestRedisNamespaceIndex:
+    def test_rebuild_replaces_sorted_set_and_marks_ready(self):
+        client = MagicMock()
+        pipe = client.pipeline.return_value
+        index = RedisNamespaceIndex(client, prefix="s3v:nsidx:bucket/index")
+
+        index.rebuild(NS, [("a", 1.0)])
+
+        pipe.delete.assert_called_once_with("s3v:nsidx:bucket/index:keys:user-123|semantic")
+        pipe.zadd.assert_called_once_with("s3v:nsidx:bucket/index:keys:user-123|semantic", {"a": 1.0})
+        pipe.set.assert_called_once_with("s3v:nsidx:bucket/index:ready:user-123|semantic", "1")
+        pipe.execute.assert_called_once()
+
+    def test_rebuild_skipped_when_epoch_moved(self):
+        client = MagicMock()
+        pipe = client.pipeline.return_value
+        pipe.get.return_value = b"3"
+        index = RedisNamespaceIndex(client)
+
+        assert index.rebuild(NS, [("a", 1.0)], epoch=2) is False
+
+        pipe.watch.assert_called_once_with("s3v:nsidx:epoch:user-123|semantic")
+        pipe.execute.assert_not_called()
+        pipe.reset.assert_called_once()
+
+    def test_writes_bump_epoch_with_the_sorted_set(self):
+        client = MagicMock()
+        pipe = client.pipeline.return_value
+        index = RedisNamespaceIndex(client)
+
+        index.record_put(NS, "a", 1.0)
+
+        pipe.zadd.assert_called_once_with("s3v:nsidx:keys:user-123|semantic", {"a": 1.0})
+        pipe.incr.assert_called_once_with("s3v:nsidx:epoch:user-123|semantic")
+        pipe.execute.assert_called_once()
+
+    def test_reads_decode_members(self):
+        client = MagicMock()
+        client.zrange.return_value = [b"a", b"b"]
+        index = RedisNamespaceIndex(client)
+
+        assert index.keys(NS, limit=2) == ["a", "b"]
+        client.zrange.assert_called_with("s3v:nsidx:keys:user-123|semantic", 0, 1)
@@ -1,6 +1,9 @@
 """Tests for S3VectorsStore."""
 
+import asyncio
 import json
+import threading
+import time
 from datetime import datetime
 from unittest.mock import MagicMock, patch
 from uuid import UUID
@@ -820,3 +823,266 @@ class TestListByNamespace:
 
         assert len(results) == 1
         assert results[0].key == "mem-001"
+
+
+class TestAsyncOffloading:
+    """Test that the async API keeps blocking client calls off the event loop."""
+
+    @staticmethod
+    def _slow_store(delay: float) -> S3VectorsStore:
+        def slow_embed(**_kwargs):
+            time.sleep(delay)
+            body = MagicMock()
+            body.read.return_value = json.dumps({"embedding": [0.1] * 8})
+            return {"body": body}
+
+        def slow_query(**_kwargs):
+            time.sleep(delay)
+            return {"vectors": []}
+
+        def slow_put(**_kwargs):
+            time.sleep(delay)
+
+        s3v = MagicMock()
+        s3v.query_vectors.side_effect = slow_query
+        s3v.put_vectors.side_effect = slow_put
+        bedrock = MagicMock()
+        bedrock.invoke_model.side_effect = slow_embed
+        return S3VectorsStore(
+            s3v_client=s3v,
+            bedrock_client=bedrock,
+            vector_bucket_name="bucket",
+            index_name="index",
+            dims=8,
+            model_id="model",
+            io_max_workers=8,
+        )
+
+    @pytest.mark.asyncio
+    async def test_async_calls_run_off_the_event_loop_thread(self, s3_store, sample_namespace):
+        loop_thread = threading.get_ident()
+        seen: list[int] = []
+
+        def record(**_kwargs):
+            seen.append(threading.get_ident())
+
+        s3_store._s3v.delete_vectors.side_effect = record
+
+        await s3_store.adelete(sample_namespace, "key-001")
+
+        assert seen and seen[0] != loop_thread
+
+    @pytest.mark.asyncio
+    async def test_loop_lag_p99_stays_low_under_concurrent_turns(self):
+        store = self._slow_store(delay=0.05)
+        lags: list[float] = []
+        stop = asyncio.Event()
+
+        async def probe(interval: float = 0.005) -> None:
+            while not stop.is_set():
+                t0 = time.perf_counter()
+                await asyncio.sleep(interval)
+                lags.append(time.perf_counter() - t0 - interval)
+
+        async def turn(i: int) -> None:
+            await store.asearch(("user", "semantic"), query=f"q{i}", limit=3)
+            await store.aput(("user", "semantic"), f"k{i}", {"summary": f"s{i}"})
+
+        probe_task = asyncio.create_task(probe())
+        try:
+            await asyncio.gather(*(turn(i) for i in range(8)))
+        finally:
+            stop.set()
+            await probe_task
+            store.close()
+
+        lags.sort()
+        p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))]
+        # Each stubbed call blocks for 50ms; running them on the loop would show that as lag.
+        assert p99 < 0.04
+
+    @pytest.mark.asyncio
+    async def test_abatch_returns_results_in_order(self, s3_store):
+        s3_store._s3v.get_vectors.return_value = {"vectors": []}
+        s3_store._s3v.query_vectors.return_value = {"vectors": []}
+        ops = [
+            MagicMock(op="get", args=(("user", "semantic"), "key-1"), kwargs={}),
+            MagicMock(op="search", args=(("user", "semantic"),), kwargs={"query": "test"}),
+        ]
+
+        results = await s3_store.abatch(ops)
+
+        assert results == [None, []]
+
+
+class TestNamespaceIndexedListing:
+    """Test list/count/oldest served from the namespace index."""
+
+    @pytest.fixture
+    def indexed_store(self, mock_s3v_client, mock_bedrock_client):
+        from app.repositories.namespace_index import InMemoryNamespaceIndex
+
+        return S3VectorsStore(
+            s3v_client=mock_s3v_client,
+            bedrock_client=mock_bedrock_client,
+            vector_bucket_name="test-bucket",
+            index_name="test-index",
+            dims=1024,
+            model_id="amazon.titan-embed-text-v1",
+            distance="COSINE",
+            default_index_fields=["summary"],
+            namespace_index=InMemoryNamespaceIndex(),
+        )
+
+    @staticmethod
+    def _vector(namespace, doc_key, last_accessed):
+        return {
+            "key": str(_compose_point_uuid(namespace, doc_key)),
+            "metadata": {
+                "ns_0": namespace[0],
+                "ns_1": namespace[1],
+                "doc_key": doc_key,
+                "value_json": json.dumps({"summary": doc_key, "last_accessed": last_accessed}),
+                "created_at": "2024-01-01T00:00:00+00:00",
+                "updated_at": "2024-01-01T00:00:00+00:00",
+            },
+        }
+
+    def test_first_listing_scans_and_later_listings_use_index(self, indexed_store, sample_namespace):
+        newer = self._vector(sample_namespace, "mem-new", "2024-03-01T00:00:00+00:00")
+        older = self._vector(sample_namespace, "mem-old", "2024-02-01T00:00:00+00:00")
+        indexed_store._s3v.list_vectors.return_value = {"vectors": [newer, older], "nextToken": None}
+        indexed_store._s3v.get_vectors.return_value = {"vectors": [newer, older]}
+
+        first = indexed_store.list_by_namespace(sample_namespace)
+        second = indexed_store.list_by_namespace(sample_namespace)
+
+        assert {item.key for item in first} == {"mem-new", "mem-old"}
+        assert [item.key for item in second] == ["mem-old", "mem-new"]
+        assert indexed_store._s3v.list_vectors.call_count == 1
+        indexed_store._s3v.get_vectors.assert_called_once()
+
+    def test_count_and_oldest_follow_writes_without_scanning(self, indexed_store, sample_namespace):
+        indexed_store._s3v.list_vectors.return_value = {"vectors": [], "nextToken": None}
+        assert indexed_store.count_by_namespace(sample_namespace) == 0
+
+        indexed_store.put(sample_namespace, "mem-a", {"summary": "a", "last_accessed": "2024-02-01T00:00:00+00:00"})
+        indexed_store.put(sample_namespace, "mem-b", {"summary": "b", "last_accessed": "2024-01-01T00:00:00+00:00"})
+        indexed_store._s3v.get_vectors.return_value = {
+            "vectors": [self._vector(sample_namespace, "mem-b", "2024-01-01T00:00:00+00:00")]
+        }
+
+        assert indexed_store.count_by_namespace(sample_namespace) == 2
+        assert indexed_store.get_oldest_in_namespace(sample_namespace).key == "mem-b"
+
+        indexed_store.delete(sample_namespace, "mem-b")
+        assert indexed_store.count_by_namespace(sample_namespace) == 1
+        assert indexed_store._s3v.list_vectors.call_count == 1
+
+    def test_stale_index_entries_are_pruned(self, indexed_store, sample_namespace):
+        indexed_store._ns_index.rebuild(sample_namespace, [("mem-gone", 1.0), ("mem-kept", 2.0)])
+        kept = self._vector(sample_namespace, "mem-kept", "2024-01-01T00:00:00+00:00")
+        indexed_store._s3v.get_vectors.return_value = {"vectors": [kept]}
+
+        oldest = indexed_store.get_oldest_in_namespace(sample_namespace)
+
+        assert oldest.key == "mem-kept"
+        assert indexed_store._ns_index.keys(sample_namespace) == ["mem-kept"]
+
+    def test_write_during_scan_keeps_namespace_unready(self, indexed_store, sample_namespace):
+        listed = self._vector(sample_namespace, "mem-old", "2024-02-01T00:00:00+00:00")
+
+        def list_then_write(**kwargs):
+            indexed_store.put(sample_namespace, "mem-new", {"summary": "new"})
+            return {"vectors": [listed], "nextToken": None}
+
+        indexed_store._s3v.list_vectors.side_effect = list_then_write
+
+        indexed_store.list_by_namespace(sample_namespace)
+
+        assert indexed_store._namespace_index_ready(sample_namespace) is False
+        assert "mem-new" in indexed_store._ns_index.keys(sample_namespace)
+
+    def test_index_failure_after_vector_write_invalidates_instead_of_raising(self, indexed_store, sample_namespace):
+        indexed_store._ns_index.rebuild(sample_namespace, [])
+        indexed_store._ns_index.record_put = MagicMock(side_effect=ConnectionError("redis down"))
+
+        indexed_store.put(sample_namespace, "mem-a", {"summary": "a"})
+
+        indexed_store._s3v.put_vectors.assert_called_once()
+        assert indexed_store._namespace_index_ready(sample_namespace) is False
+
+    def test_wildcard_namespace_keeps_scanning(self, indexed_store):
+        indexed_store._s3v.list_vectors.return_value = {"vectors": [], "nextToken": None}
+
+        indexed_store.list_by_namespace(("user-123", None))
+        indexed_store.list_by_namespace(("user-123", None))
+
+        assert indexed_store._s3v.list_vectors.call_count == 2
+        indexed_store._s3v.get_vectors.assert_not_called()
+
+
+class TestPatchValues:
+    """Test metadata-only value updates."""
+
+    def test_patch_values_rewrites_existing_vector_without_embedding(self, s3_store, sample_namespace):
+        point_id = str(_compose_point_uuid(sample_namespace, "mem-1"))
+        s3_store._s3v.get_vectors.return_value = {
+            "vectors": [
+                {
+                    "key": point_id,
+                    "data": {"float32": [0.5] * 1024},
+                    "metadata": {
+                        "doc_key": "mem-1",
+                        "value_json": json.dumps({"summary": "s", "usage_count": 3}),
+                        "created_at": "2024-01-01T00:00:00+00:00",
+                        "updated_at": "2024-01-01T00:00:00+00:00",
+                    },
+                }
+            ]
+        }
+
+        updated = s3_store.patch_values(
+            sample_namespace,
+            {"mem-1": {"last_used_at": "2025-01-01T00:00:00+00:00"}, "mem-gone": {"last_used_at": "x"}},
+            {"mem-1": {"usage_count": 2}},
+        )
+
+        assert updated == 1
+        s3_store._bedrock.invoke_model.assert_not_called()
+        written = s3_store._s3v.put_vectors.call_args.kwargs["vectors"]
+        assert written[0]["key"] == point_id
+        assert written[0]["data"] == {"float32": [0.5] * 1024}
+        assert written[0]["metadata"]["updated_at"] == "2024-01-01T00:00:00+00:00"
+        value = json.loads(written[0]["metadata"]["value_json"])
+        assert value == {"summary": "s", "usage_count": 5, "last_used_at": "2025-01-01T00:00:00+00:00"}
+
+    def test_patch_values_with_no_keys_is_noop(self, s3_store, sample_namespace):
+        assert s3_store.patch_values(sample_namespace, {}) == 0
+        s3_store._s3v.get_vectors.assert_not_called()
+
+
+class TestSearchByVector:
+    """Test searching with a precomputed query vector."""
+
+    def test_search_by_vector_skips_embedding(self, s3_store, sample_namespace):
+        s3_store._s3v.query_vectors.return_value = {"vectors": []}
+
+        s3_store.search_by_vector(sample_namespace, [0.3] * 1024, limit=4)
+
+        s3_store._bedrock.invoke_model.assert_not_called()
+        assert s3_store._s3v.query_vectors.call_args.kwargs["queryVector"] == {"float32": [0.3] * 1024}
+
+    @pytest.mark.asyncio
+    async def test_one_embedding_fans_out_to_many_namespaces(self, s3_store):
+        s3_store._s3v.query_vectors.return_value = {"vectors": []}
+
+        vector = await s3_store.aembed_query("budget")
+        await asyncio.gather(
+            s3_store.asearch_by_vector(("u", "semantic"), vector, limit=5),
+            s3_store.asearch_by_vector(("u", "episodic"), vector, limit=3),
+            s3_store.asearch_by_vector(("system", "supervisor_procedural"), vector, limit=3),
+        )
+
+        assert s3_store._bedrock.invoke_model.call_count == 1
+        assert s3_store._s3v.query_vectors.call_count == 3
@@ -1,12 +1,27 @@
-"""Tests for InMemorySessionStore."""
+"""Tests for InMemorySessionStore and RedisSessionStore."""
 
 import asyncio
 from datetime import datetime, timedelta
+from typing import Any
 from unittest.mock import patch
 
 import pytest
+from redis.exceptions import WatchError
 
-from app.repositories.session_store import InMemorySessionStore, get_session_store
+from app.agents.supervisor.memory.cold_path import _persist_session_ctrl_sync
+from app.repositories.session_store import (
+    RECENT_THREADS_PER_USER,
+    InMemorySessionStore,
+    RedisSessionStore,
+    get_session_store,
+)
+
+
+async def _set_session_at(store, session_id, context, when):
+    """Write a session as if it had been last touched at ``when``."""
+    with patch("app.repositories.session_store.datetime") as mock_datetime:
+        mock_datetime.now.return_value = when
+        await store.set_session(session_id, context)
 
 
 class TestInMemorySessionStoreInitialization:
@@ -257,6 +272,50 @@ class TestGetUserThreads:
         assert threads == []
 
 
+class TestRecentUserThreads:
+    """Test the per-user most-recent-thread list."""
+
+    @pytest.mark.asyncio
+    async def test_recent_threads_are_newest_first_and_bounded(self):
+        """Rewriting a thread moves it to the front; the list keeps a fixed number of threads."""
+        store = InMemorySessionStore()
+        for i in range(RECENT_THREADS_PER_USER + 2):
+            await store.set_session(f"thread-{i}", {"user_id": "u1"})
+        await store.set_session("thread-3", {"user_id": "u1"})
+
+        recent = await store.get_recent_user_threads("u1")
+
+        assert recent[0] == "thread-3"
+        assert recent[1] == f"thread-{RECENT_THREADS_PER_USER + 1}"
+        assert len(recent) == RECENT_THREADS_PER_USER
+
+    @pytest.mark.asyncio
+    async def test_expired_threads_leave_recent_list(self):
+        """Expired sessions are dropped from the recent list with their user mapping."""
+        store = InMemorySessionStore(ttl_hours=1)
+        await store.set_session("thread-1", {"user_id": "u1"})
+        await store.set_session("thread-2", {"user_id": "u1"})
+        store.sessions["thread-2"]["last_accessed"] = datetime.now() - timedelta(hours=2)
+
+        assert await store.get_session("thread-2") is None
+        assert await store.get_recent_user_threads("u1") == ["thread-1"]
+
+    @pytest.mark.asyncio
+    async def test_update_session_fields_does_not_reorder_recent(self):
+        """Background field updates neither bump recency nor the access time."""
+        store = InMemorySessionStore()
+        await store.set_session("thread-1", {"user_id": "u1"})
+        await store.set_session("thread-2", {"user_id": "u1"})
+        accessed = store.sessions["thread-1"]["last_accessed"]
+
+        assert await store.update_session_fields("thread-1", {"conversation_summary": "s"}) is True
+
+        assert store.sessions["thread-1"]["conversation_summary"] == "s"
+        assert store.sessions["thread-1"]["last_accessed"] == accessed
+        assert await store.get_recent_user_threads("u1") == ["thread-2", "thread-1"]
+        assert await store.update_session_fields("missing", {"x": 1}) is False
+
+
 class TestUpdateSessionAccess:
     """Test update_session_access method."""
 
@@ -302,9 +361,7 @@ class TestCleanupExpired:
         session2 = "expired-session"
 
         await store.set_session(session1, {"user_id": "user-1"})
-        await store.set_session(session2, {"user_id": "user-2"})
-
-        store.sessions[session2]["last_accessed"] = datetime.now() - timedelta(hours=2)
+        await _set_session_at(store, session2, {"user_id": "user-2"}, datetime.now() - timedelta(hours=2))
 
         await store.cleanup_expired()
 
@@ -321,9 +378,7 @@ class TestCleanupExpired:
         session2 = "remove-session"
 
         await store.set_session(session1, {"user_id": user_id})
-        await store.set_session(session2, {"user_id": user_id})
-
-        store.sessions[session2]["last_accessed"] = datetime.now() - timedelta(hours=2)
+        await _set_session_at(store, session2, {"user_id": user_id}, datetime.now() - timedelta(hours=2))
 
         await store.cleanup_expired()
 
@@ -338,10 +393,8 @@ class TestCleanupExpired:
         user_id = "user-no-sessions"
         session_id = "only-session"
 
-        await store.set_session(session_id, {"user_id": user_id})
-
         # Make session expired
-        store.sessions[session_id]["last_accessed"] = datetime.now() - timedelta(hours=2)
+        await _set_session_at(store, session_id, {"user_id": user_id}, datetime.now() - timedelta(hours=2))
 
         await store.cleanup_expired()
 
@@ -351,28 +404,30 @@ class TestCleanupExpired:
 class TestCleanupUserThreadMapping:
     """Test _cleanup_user_thread_mapping method."""
 
-    def test_cleanup_user_thread_mapping_removes_session(self):
+    @pytest.mark.asyncio
+    async def test_cleanup_user_thread_mapping_removes_session(self):
         """Test that _cleanup_user_thread_mapping removes session from mapping."""
         store = InMemorySessionStore()
         user_id = "user-mapping"
         session1 = "session-1"
         session2 = "session-2"
 
-        # Manually set up user_threads
-        store.user_threads[user_id] = {session1, session2}
+        await store.set_session(session1, {"user_id": user_id})
+        await store.set_session(session2, {"user_id": user_id})
 
         store._cleanup_user_thread_mapping(session1)
 
         assert session1 not in store.user_threads[user_id]
         assert session2 in store.user_threads[user_id]
 
-    def test_cleanup_user_thread_mapping_removes_empty_users(self):
+    @pytest.mark.asyncio
+    async def test_cleanup_user_thread_mapping_removes_empty_users(self):
         """Test that _cleanup_user_thread_mapping removes empty user entries."""
         store = InMemorySessionStore()
         user_id = "user-cleanup-empty"
         session_id = "only-session"
 
-        store.user_threads[user_id] = {session_id}
+        await store.set_session(session_id, {"user_id": user_id})
 
         store._cleanup_user_thread_mapping(session_id)
 
@@ -403,3 +458,354 @@ class TestPeriodicCleanup:
 
         await store.stop()
         assert store.cleanup_task is None
+
+
+class TestExpiryIndex:
+    """Test the per-shard expiry heap and incremental cleanup."""
+
+    @pytest.mark.asyncio
+    async def test_touched_session_is_rescheduled_not_evicted(self):
+        store = InMemorySessionStore(ttl_hours=1, shards=1)
+        await _set_session_at(store, "s1", {"user_id": "u1"}, datetime.now() - timedelta(hours=2))
+        await store.update_session_access("s1")
+
+        assert await store.cleanup_expired() == 0
+        assert "s1" in store.sessions
+        assert len(store._shards[0].expiry) == 1
+
+    @pytest.mark.asyncio
+    async def test_batched_cleanup_removes_every_due_session(self):
+        store = InMemorySessionStore(ttl_hours=1, shards=2)
+        stale = datetime.now() - timedelta(hours=2)
+        for i in range(7):
+            await _set_session_at(store, f"s{i}", {"user_id": "u1"}, stale)
+        await store.set_session("fresh", {"user_id": "u1"})
+
+        assert await store.cleanup_expired(batch_size=2) == 7
+        assert list(store.sessions) == ["fresh"]
+        assert await store.get_user_threads("u1") == ["fresh"]
+
+    @pytest.mark.asyncio
+    async def test_reassigned_session_moves_between_users(self):
+        store = InMemorySessionStore()
+        await store.set_session("s1", {"user_id": "u1"})
+        await store.set_session("s1", {"user_id": "u2"})
+
+        assert await store.get_user_threads("u1") == []
+        assert await store.get_user_threads("u2") == ["s1"]
+
+
+class TestMemoryCounters:
+    """Test in-place memory counter operations."""
+
+    @pytest.mark.asyncio
+    async def test_increment_requires_seeded_counter(self):
+        store = InMemorySessionStore()
+        await store.set_session("s1", {"user_id": "u1"})
+
+        assert await store.increment_memory_counter("s1", "semantic") is None
+
+        await store.set_memory_counter("s1", "semantic", 1)
+        assert await store.increment_memory_counter("s1", "semantic", delta=2) == 3
+        assert await store.increment_memory_counter("s1", "semantic", delta=-10) == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_increments_are_not_lost(self):
+        store = InMemorySessionStore()
+        await store.set_memory_counter("s1", "episodic", 0)
+
+        await asyncio.gather(*(store.increment_memory_counter("s1", "episodic") for _ in range(50)))
+
+        assert await store.get_memory_counter("s1", "episodic") == 50
+
+    @pytest.mark.asyncio
+    async def test_counters_live_in_session_context(self):
+        store = InMemorySessionStore()
+        await store.set_session("s1", {"user_id": "u1"})
+        await store.set_memory_counter("s1", "semantic", 4)
+
+        ctx = await store.get_session("s1")
+        assert ctx["memory_counters"]["semantic"]["count"] == 4
+
+        await store.invalidate_memory_counter("s1")
+        assert await store.get_memory_counter("s1", "semantic") is None
+
+
+class TestPeekSession:
+    """Test peek_session method."""
+
+    @pytest.mark.asyncio
+    async def test_peek_session_does_not_refresh_access_time(self):
+        store = InMemorySessionStore()
+        await store.set_session("s1", {"user_id": "u1"})
+        accessed = datetime.now() - timedelta(hours=1)
+        store.sessions["s1"]["last_accessed"] = accessed
+
+        ctx = await store.peek_session("s1")
+
+        assert ctx["last_accessed"] == accessed
+
+    @pytest.mark.asyncio
+    async def test_peek_session_hides_expired_sessions(self):
+        store = InMemorySessionStore(ttl_hours=1)
+        await store.set_session("s1", {"user_id": "u1"})
+        store.sessions["s1"]["last_accessed"] = datetime.now() - timedelta(hours=2)
+
+        assert await store.peek_session("s1") is None
+
+
+class FakePipeline:
+    def __init__(self, client: "FakeAsyncRedis") -> None:
+        self._client = client
+        self._calls: list[tuple[str, tuple, dict]] = []
+        self._watched: dict[str, int] | None = None
+        self._queuing = False
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self._reset()
+
+    def __getattr__(self, name: str):
+        def record(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return record
+
+    def _reset(self) -> None:
+        self._calls.clear()
+        self._watched = None
+        self._queuing = False
+
+    async def watch(self, *keys: str) -> None:
+        self._watched = {key: self._client.versions.get(key, 0) for key in keys}
+
+    def get(self, key: str):
+        # After WATCH and before MULTI, commands run immediately, as in redis-py.
+        if self._watched is not None and not self._queuing:
+            return self._client.get(key)
+        return self.__getattr__("get")(key)
+
+    def multi(self) -> None:
+        self._queuing = True
+
+    async def execute(self) -> list[Any]:
+        watched = self._watched or {}
+        if any(self._client.versions.get(key, 0) != version for key, version in watched.items()):
+            self._reset()
+            raise WatchError("watched key changed")
+        results = [await getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in self._calls]
+        self._reset()
+        return results
+
+
+class FakeAsyncRedis:
+    """Just enough of redis.asyncio for RedisSessionStore."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+        self.ttls: dict[str, int] = {}
+        self.versions: dict[str, int] = {}
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    async def set(
+        self, key: str, value: str, ex: int | None = None, keepttl: bool = False, xx: bool = False
+    ) -> bool | None:
+        if xx and key not in self.data:
+            return None
+        self.data[key] = value.encode()
+        self.versions[key] = self.versions.get(key, 0) + 1
+        if not keepttl:
+            self.ttls[key] = ex
+        return True
+
+    async def get(self, key: str) -> bytes | None:
+        return self.data.get(key)
+
+    async def exists(self, key: str) -> int:
+        return int(key in self.data)
+
+    async def expire(self, key: str, ttl: int) -> bool:
+        self.ttls[key] = ttl
+        return key in self.data
+
+    async def delete(self, *keys: str) -> int:
+        for key in keys:
+            self.versions[key] = self.versions.get(key, 0) + 1
+        return sum(1 for k in keys if self.data.pop(k, None) is not None)
+
+    async def sadd(self, key: str, *members: str) -> int:
+        self.data.setdefault(key, set()).update(m.encode() for m in members)
+        return len(members)
+
+    async def smembers(self, key: str) -> "set[bytes]":
+        return set(self.data.get(key) or set())
+
+    async def srem(self, key: str, *members: str) -> int:
+        stored = self.data.get(key) or set()
+        before = len(stored)
+        stored.difference_update(m.encode() for m in members)
+        return before - len(stored)
+
+    async def zadd(self, key: str, mapping: dict[str, float]) -> int:
+        self.data.setdefault(key, {}).update({m.encode(): score for m, score in mapping.items()})
+        return len(mapping)
+
+    def _zsorted(self, key: str) -> list[bytes]:
+        stored = self.data.get(key) or {}
+        return sorted(stored, key=lambda m: stored[m])
+
+    async def zrevrange(self, key: str, start: int, end: int) -> list[bytes]:
+        return list(reversed(self._zsorted(key)))[start : end + 1]
+
+    async def zremrangebyrank(self, key: str, start: int, end: int) -> int:
+        members = self._zsorted(key)
+        doomed = members[start : (end + 1) or None] if end < 0 else members[start : end + 1]
+        for member in doomed:
+            self.data[key].pop(member, None)
+        return len(doomed)
+
+    async def zrem(self, key: str, *members: str) -> int:
+        stored = self.data.get(key) or {}
+        return sum(1 for m in members if stored.pop(m.encode(), None) is not None)
+
+    async def hset(self, key: str, mapping: dict[str, Any]) -> int:
+        self.data.setdefault(key, {}).update({k: str(v).encode() for k, v in mapping.items()})
+        return len(mapping)
+
+    async def hget(self, key: str, field: str) -> bytes | None:
+        return (self.data.get(key) or {}).get(field)
+
+    async def hexists(self, key: str, field: str) -> bool:
+        return field in (self.data.get(key) or {})
+
+    async def hincrby(self, key: str, field: str, amount: int) -> int:
+        stored = self.data.setdefault(key, {})
+        value = int(stored.get(field, b"0")) + amount
+        stored[field] = str(value).encode()
+        return value
+
+    async def hdel(self, key: str, *fields: str) -> int:
+        stored = self.data.get(key) or {}
+        return sum(1 for f in fields if stored.pop(f, None) is not None)
+
+
+class TestRedisSessionStore:
+    """Test RedisSessionStore against a minimal fake client."""
+
+    @pytest.fixture
+    def client(self):
+        return FakeAsyncRedis()
+
+    @pytest.fixture
+    def store(self, client):
+        return RedisSessionStore(client=client, prefix="sess", ttl_hours=1)
+
+    @pytest.mark.asyncio
+    async def test_session_round_trip_is_visible_to_other_instances(self, client, store):
+        await store.set_session("s1", {"user_id": "u1", "conversation_messages": [{"role": "user", "content": "hi"}]})
+
+        other_replica = RedisSessionStore(client=client, prefix="sess", ttl_hours=1)
+        ctx = await other_replica.get_session("s1")
+
+        assert ctx["conversation_messages"] == [{"role": "user", "content": "hi"}]
+        assert isinstance(ctx["last_accessed"], datetime)
+        assert client.ttls["sess:ctx:s1"] == 3600
+
+    @pytest.mark.asyncio
+    async def test_peek_session_restores_stored_access_time(self, store):
+        await store.set_session("s1", {"user_id": "u1"})
+
+        ctx = await store.peek_session("s1")
+
+        assert isinstance(ctx["last_accessed"], datetime)
+        assert await store.peek_session("missing") is None
+
+    @pytest.mark.asyncio
+    async def test_user_threads_drop_expired_sessions(self, client, store):
+        await store.set_session("s1", {"user_id": "u1"})
+        await store.set_session("s2", {"user_id": "u1"})
+        client.data.pop("sess:ctx:s1")
+
+        assert await store.get_user_threads("u1") == ["s2"]
+        assert client.data["sess:user_threads:u1"] == {b"s2"}
+
+    @pytest.mark.asyncio
+    async def test_recent_user_threads_newest_first_and_skip_expired(self, client, store):
+        for thread_id in ("s1", "s2", "s3"):
+            await store.set_session(thread_id, {"user_id": "u1"})
+            await asyncio.sleep(0.001)
+        client.data.pop("sess:ctx:s2")
+
+        assert await store.get_recent_user_threads("u1") == ["s3", "s1"]
+        assert await store.get_recent_user_threads("nobody") == []
+
+    @pytest.mark.asyncio
+    async def test_update_session_fields_keeps_ttl_and_skips_missing(self, client, store):
+        await store.set_session("s1", {"user_id": "u1"})
+        client.ttls["sess:ctx:s1"] = 42
+
+        assert await store.update_session_fields("s1", {"conversation_summary": "hi"}) is True
+        assert (await store.peek_session("s1"))["conversation_summary"] == "hi"
+        assert client.ttls["sess:ctx:s1"] == 42
+        assert await store.update_session_fields("missing", {"x": 1}) is False
+
+    @pytest.mark.asyncio
+    async def test_update_session_fields_retries_over_concurrent_set_session(self, client, store):
+        await store.set_session("s1", {"user_id": "u1", "conversation_messages": []})
+        read = client.get
+        raced = False
+
+        async def get_then_race(key):
+            nonlocal raced
+            raw = await read(key)
+            if not raced:
+                raced = True
+                await store.set_session("s1", {"user_id": "u1", "conversation_messages": [{"role": "user", "content": "hi"}]})
+            return raw
+
+        client.get = get_then_race
+
+        assert await store.update_session_fields("s1", {"conversation_summary": "sum"}) is True
+
+        ctx = await store.peek_session("s1")
+        assert ctx["conversation_messages"] == [{"role": "user", "content": "hi"}]
+        assert ctx["conversation_summary"] == "sum"
+
+    @pytest.mark.asyncio
+    async def test_cold_path_control_persist_keeps_turns_stored_meanwhile(self, store):
+        await store.set_session("s1", {"user_id": "u1", "conversation_messages": []})
+        snapshot = await store.get_session("s1")
+
+        # process_message stores a turn while the cold path is still working from its snapshot
+        live = await store.get_session("s1")
+        live["conversation_messages"].append({"role": "user", "content": "hi"})
+        await store.set_session("s1", live)
+        loop = asyncio.get_running_loop()
+        await asyncio.to_thread(_persist_session_ctrl_sync, store, "s1", snapshot, {"turns_since_last": 0}, loop)
+
+        ctx = await store.peek_session("s1")
+        assert ctx["conversation_messages"] == [{"role": "user", "content": "hi"}]
+        assert ctx["episodic_control"] == {"turns_since_last": 0}
+
+    @pytest.mark.asyncio
+    async def test_memory_counters_are_atomic_and_seeded(self, store):
+        assert await store.increment_memory_counter("s1", "semantic") is None
+
+        await store.set_memory_counter("s1", "semantic", 2)
+        assert await store.increment_memory_counter("s1", "semantic") == 3
+        assert await store.increment_memory_counter("s1", "semantic", delta=-5) == 0
+        assert await store.get_memory_counter("s1", "semantic") == 0
+
+        await store.invalidate_memory_counter("s1", "semantic")
+        assert await store.get_memory_counter("s1", "semantic") is None
+
+    def test_get_session_store_selects_backend(self):
+        with patch("app.repositories.session_store._session_store", None), patch(
+            "app.core.config.config.SESSION_STORE_BACKEND", "redis"
+        ):
+            assert isinstance(get_session_store(), RedisSessionStore)
@@ -49,6 +49,13 @@ def mock_config():
         mock_cfg.TITLE_GENERATOR_TEMPERATURE = 0.1
         mock_cfg.FOS_SERVICE_URL = "https://fos.example.com"
         mock_cfg.FOS_API_KEY = "test-api-key"
+        mock_cfg.FOS_HTTP_TIMEOUT_SECONDS = 15.0
+        mock_cfg.FOS_HTTP_MAX_CONNECTIONS = 100
+        mock_cfg.FOS_HTTP_MAX_KEEPALIVE = 20
+        mock_cfg.FOS_HTTP_MAX_CONCURRENCY = 32
+        mock_cfg.FOS_HTTP2_ENABLED = False
+        mock_cfg.FOS_HTTP_MAX_RETRIES = 2
+        mock_cfg.FOS_HTTP_RETRY_BACKOFF_SECONDS = 0.0
 
     yield mocks[0]  # Return first mock for convenience
 
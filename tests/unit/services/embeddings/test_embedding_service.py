@@ -0,0 +1,120 @@
+"""Tests for the shared embedding service and its cache."""
+
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.embeddings import EmbeddingCache, EmbeddingService, make_cache_key
+
+
+def _bedrock_client(delay: float = 0.0) -> MagicMock:
+    def invoke_model(*, modelId, body):
+        if delay:
+            time.sleep(delay)
+        text = json.loads(body)["inputText"]
+        payload = MagicMock()
+        payload.read.return_value = json.dumps({"embedding": [float(len(text)), 1.0, 0.5]})
+        return {"body": payload}
+
+    client = MagicMock()
+    client.invoke_model.side_effect = invoke_model
+    return client
+
+
+class TestEmbeddingCache:
+    def test_cache_key_depends_on_model_and_text(self):
+        assert make_cache_key("m1", "hello") == make_cache_key("m1", "hello")
+        assert make_cache_key("m1", "hello") != make_cache_key("m2", "hello")
+        assert make_cache_key("m1", "hello") != make_cache_key("m1", "hello!")
+
+    def test_memory_tier_is_bounded_lru(self):
+        cache = EmbeddingCache(max_entries=2)
+        cache.put("a", [1.0])
+        cache.put("b", [2.0])
+        assert cache.get("a") == [1.0]
+        cache.put("c", [3.0])
+
+        assert cache.get("b") is None
+        assert cache.get("a") == [1.0]
+        assert cache.get("c") == [3.0]
+
+    def test_disk_tier_survives_new_instance(self, tmp_path):
+        path = str(tmp_path / "embeddings.sqlite")
+        first = EmbeddingCache(disk_path=path)
+        first.put("k", [0.25, 0.5])
+        first.close()
+
+        second = EmbeddingCache(disk_path=path)
+
+        assert second.get("k") == [0.25, 0.5]
+        assert second.get_stats()["hits_disk"] == 1
+        second.close()
+
+
+class TestEmbeddingService:
+    def test_repeat_texts_hit_cache(self):
+        client = _bedrock_client()
+        service = EmbeddingService(bedrock_client=client, model_id="titan")
+
+        first = service.embed_documents(["alpha", "beta", "alpha"])
+        second = service.embed_documents(["beta", "alpha"])
+
+        assert first == [[5.0, 1.0, 0.5], [4.0, 1.0, 0.5], [5.0, 1.0, 0.5]]
+        assert second == [first[1], first[0]]
+        assert client.invoke_model.call_count == 2
+        assert service.get_stats()["cache_hits"] == 2
+
+    def test_concurrent_identical_requests_share_one_call(self):
+        client = _bedrock_client(delay=0.05)
+        service = EmbeddingService(bedrock_client=client, model_id="titan")
+        results: list[list[float]] = []
+
+        def worker():
+            results.append(service.embed_query("same text"))
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(results) == 6
+        assert client.invoke_model.call_count == 1
+        assert service.get_stats()["inflight_joins"] == 5
+
+    def test_misses_are_fanned_out_in_parallel(self):
+        client = _bedrock_client(delay=0.05)
+        service = EmbeddingService(bedrock_client=client, model_id="titan", max_concurrency=8)
+
+        t0 = time.perf_counter()
+        service.embed_documents([f"text {i}" for i in range(8)])
+        elapsed = time.perf_counter() - t0
+
+        assert client.invoke_model.call_count == 8
+        assert elapsed < 0.3
+
+    def test_failures_are_not_cached(self):
+        client = MagicMock()
+        client.invoke_model.side_effect = RuntimeError("throttled")
+        service = EmbeddingService(bedrock_client=client, model_id="titan")
+
+        with pytest.raises(RuntimeError):
+            service.embed_query("x")
+        with pytest.raises(RuntimeError):
+            service.embed_query("x")
+
+        assert client.invoke_model.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_async_callers_dedupe_in_flight(self):
+        client = _bedrock_client(delay=0.05)
+        service = EmbeddingService(bedrock_client=client, model_id="titan")
+
+        results = await asyncio.gather(*(service.aembed_query("shared") for _ in range(4)))
+
+        assert all(r == results[0] for r in results)
+        assert client.invoke_model.call_count == 1
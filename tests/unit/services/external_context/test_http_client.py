@@ -8,13 +8,31 @@ Tests focus on valuable business logic:
 - Error handling for HTTP errors and connection failures
 - Header building with and without API key
 - URL construction
+- Connection reuse, retries, circuit breaker and GET coalescing
 """
+import asyncio
+import threading
 from unittest.mock import AsyncMock, Mock, patch
 
 import httpx
 import pytest
 
-from app.services.external_context.http_client import FOSHttpClient
+from app.services.external_context.http_client import (
+    FOSCircuitBreaker,
+    FOSConnectionPool,
+    FOSHttpClient,
+    close_fos_http_pool,
+    get_fos_pool,
+    reset_fos_http_state,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_fos_pools():
+    """Each test starts without cached pools and with a closed circuit."""
+    reset_fos_http_state()
+    yield
+    reset_fos_http_state()
 
 
 class TestFOSHttpClientInitialization:
@@ -93,7 +111,6 @@ class TestGet:
 
         with patch("app.services.external_context.http_client.httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client.__aenter__.return_value = mock_client
             mock_client.get.return_value = mock_response
             mock_client_class.return_value = mock_client
 
@@ -114,7 +131,6 @@ class TestGet:
 
         with patch("app.services.external_context.http_client.httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client.__aenter__.return_value = mock_client
             mock_client.get.return_value = mock_response
             mock_client_class.return_value = mock_client
 
@@ -133,7 +149,6 @@ class TestGet:
 
         with patch("app.services.external_context.http_client.httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client.__aenter__.return_value = mock_client
             mock_client.get.return_value = mock_response
             mock_client_class.return_value = mock_client
 
@@ -164,7 +179,6 @@ class TestGet:
 
         with patch("app.services.external_context.http_client.httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client.__aenter__.return_value = mock_client
             mock_client.get.return_value = mock_response
             mock_client_class.return_value = mock_client
 
@@ -178,7 +192,6 @@ class TestGet:
         """Should return None on connection failure."""
         with patch("app.services.external_context.http_client.httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client.__aenter__.return_value = mock_client
             mock_client.get.side_effect = httpx.ConnectError("Connection failed")
             mock_client_class.return_value = mock_client
 
@@ -200,7 +213,6 @@ class TestPost:
 
         with patch("app.services.external_context.http_client.httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client.__aenter__.return_value = mock_client
             mock_client.post.return_value = mock_response
             mock_client_class.return_value = mock_client
 
@@ -236,7 +248,6 @@ class TestPost:
 
         with patch("app.services.external_context.http_client.httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client.__aenter__.return_value = mock_client
             mock_client.post.return_value = mock_response
             mock_client_class.return_value = mock_client
 
@@ -258,7 +269,6 @@ class TestPut:
 
         with patch("app.services.external_context.http_client.httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client.__aenter__.return_value = mock_client
             mock_client.put.return_value = mock_response
             mock_client_class.return_value = mock_client
 
@@ -275,7 +285,6 @@ class TestPut:
 
         with patch("app.services.external_context.http_client.httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client.__aenter__.return_value = mock_client
             mock_client.put.return_value = mock_response
             mock_client_class.return_value = mock_client
 
@@ -289,7 +298,6 @@ class TestPut:
         """Should return None on exception."""
         with patch("app.services.external_context.http_client.httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client.__aenter__.return_value = mock_client
             mock_client.put.side_effect = Exception("Network error")
             mock_client_class.return_value = mock_client
 
@@ -311,7 +319,6 @@ class TestPatch:
 
         with patch("app.services.external_context.http_client.httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client.__aenter__.return_value = mock_client
             mock_client.patch.return_value = mock_response
             mock_client_class.return_value = mock_client
 
@@ -343,7 +350,6 @@ class TestDelete:
 
         with patch("app.services.external_context.http_client.httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client.__aenter__.return_value = mock_client
             mock_client.delete.return_value = mock_response
             mock_client_class.return_value = mock_client
 
@@ -367,7 +373,6 @@ class TestDelete:
         """Should return None on exception."""
         with patch("app.services.external_context.http_client.httpx.AsyncClient") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client.__aenter__.return_value = mock_client
             mock_client.delete.side_effect = Exception("Error")
             mock_client_class.return_value = mock_client
 
@@ -375,3 +380,169 @@ class TestDelete:
             result = await client.delete("/endpoint")
 
             assert result is None
+
+
+def _response(status_code: int, body=None) -> Mock:
+    resp = Mock()
+    resp.status_code = status_code
+    resp.text = ""
+    resp.json.return_value = body
+    if status_code >= 400:
+        resp.raise_for_status.side_effect = httpx.HTTPStatusError("error", request=Mock(), response=resp)
+    return resp
+
+
+class TestConnectionPool:
+    """Test pooled client reuse, retries, circuit breaker and coalescing."""
+
+    @pytest.mark.asyncio
+    async def test_client_is_reused_across_requests(self, mock_config):
+        """Should build one AsyncClient per event loop and reuse it."""
+        with patch("app.services.external_context.http_client.httpx.AsyncClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.get.return_value = _response(200, {"ok": True})
+            mock_client_class.return_value = mock_client
+
+            await FOSHttpClient().get("/a")
+            await FOSHttpClient().get("/b")
+
+            mock_client_class.assert_called_once()
+            assert mock_client.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_retries_transient_status(self, mock_config):
+        """Should retry idempotent requests on 503 and return the later success."""
+        with patch("app.services.external_context.http_client.httpx.AsyncClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.get.side_effect = [_response(503), _response(200, {"ok": True})]
+            mock_client_class.return_value = mock_client
+
+            result = await FOSHttpClient().get("/flaky")
+
+            assert result == {"ok": True}
+            assert mock_client.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_post_is_not_retried(self, mock_config):
+        """Should not retry non-idempotent POST requests."""
+        with patch("app.services.external_context.http_client.httpx.AsyncClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.post.side_effect = httpx.ConnectError("Connection failed")
+            mock_client_class.return_value = mock_client
+
+            result = await FOSHttpClient().post("/create", {})
+
+            assert result is None
+            mock_client.post.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_identical_concurrent_gets_are_coalesced(self, mock_config):
+        """Should issue one request for identical in-flight GETs and hand out independent copies."""
+        release = asyncio.Event()
+
+        async def slow_get(*args, **kwargs):
+            await release.wait()
+            return _response(200, {"items": [1]})
+
+        with patch("app.services.external_context.http_client.httpx.AsyncClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.get.side_effect = slow_get
+            mock_client_class.return_value = mock_client
+
+            client = FOSHttpClient()
+            tasks = [asyncio.create_task(client.get("/same", params={"q": 1})) for _ in range(5)]
+            await asyncio.sleep(0)
+            release.set()
+            results = await asyncio.gather(*tasks)
+
+            mock_client.get.assert_called_once()
+            assert all(r == {"items": [1]} for r in results)
+            results[0]["items"].append(2)
+            assert results[1] == {"items": [1]}
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self, mock_config):
+        """Should skip calls while the circuit is open."""
+        with patch("app.services.external_context.http_client.httpx.AsyncClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.get.side_effect = httpx.ConnectError("Connection failed")
+            mock_client_class.return_value = mock_client
+
+            breaker = FOSCircuitBreaker(failure_threshold=2, reset_seconds=60)
+            client = FOSHttpClient(pool=FOSConnectionPool(breaker=breaker))
+
+            assert await client.get("/down") is None
+            calls_before = mock_client.get.call_count
+            assert breaker.is_open
+
+            assert await client.get("/down") is None
+            assert mock_client.get.call_count == calls_before
+
+
+    @pytest.mark.asyncio
+    async def test_close_closes_pools_of_other_running_loops(self, mock_config):
+        """Shutdown closes a worker loop's pool on that loop instead of just forgetting it."""
+        worker_loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=worker_loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            async def create_pool():
+                return get_fos_pool()
+
+            worker_pool = asyncio.run_coroutine_threadsafe(create_pool(), worker_loop).result(timeout=5)
+            own_pool = get_fos_pool()
+
+            await close_fos_http_pool()
+
+            assert worker_pool.client.is_closed
+            assert own_pool.client.is_closed
+        finally:
+            worker_loop.call_soon_threadsafe(worker_loop.stop)
+            thread.join(timeout=5)
+            worker_loop.close()
+
+
+class TestCircuitBreaker:
+    """Test circuit breaker state transitions."""
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_releases_probe_slot(self, mock_config):
+        """A probe cancelled mid-request must not leave the circuit rejecting calls forever."""
+        started = asyncio.Event()
+
+        async def hanging_get(*args, **kwargs):
+            started.set()
+            await asyncio.Event().wait()
+
+        with patch("app.services.external_context.http_client.httpx.AsyncClient") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client_class.return_value = mock_client
+            breaker = FOSCircuitBreaker(failure_threshold=1, reset_seconds=0)
+            breaker.record_failure()
+            pool = FOSConnectionPool(breaker=breaker)
+
+            mock_client.get.side_effect = hanging_get
+            probe = asyncio.create_task(pool.request("GET", "https://fos.example.com/a"))
+            await started.wait()
+            probe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await probe
+
+            assert breaker.is_open
+            mock_client.get.side_effect = None
+            mock_client.get.return_value = _response(200, {"ok": True})
+            resp = await pool.request("GET", "https://fos.example.com/a")
+
+            assert resp.status_code == 200
+            assert not breaker.is_open
+
+    def test_probe_success_closes_circuit(self):
+        """A successful probe after the reset window should close the circuit."""
+        breaker = FOSCircuitBreaker(failure_threshold=1, reset_seconds=0)
+        breaker.record_failure()
+        assert breaker.is_open
+
+        breaker.before_call()
+        breaker.record_success()
+
+        assert not breaker.is_open
@@ -0,0 +1,76 @@
+"""Tests for concurrent user-context section assembly."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.external_context.user.context_sections import ContextSection, gather_context_sections
+
+
+class TestGatherContextSections:
+    """Test concurrent fetching, deadlines and partial results."""
+
+    @pytest.mark.asyncio
+    async def test_sections_run_concurrently(self):
+        """Total time should track the slowest section, not the sum."""
+
+        async def slow(value):
+            await asyncio.sleep(0.1)
+            return value
+
+        started = time.perf_counter()
+        result = await gather_context_sections(
+            [ContextSection(name, lambda name=name: slow(name)) for name in ("a", "b", "c", "d")],
+            default_timeout_seconds=1.0,
+        )
+        elapsed = time.perf_counter() - started
+
+        assert result == {"a": "a", "b": "b", "c": "c", "d": "d"}
+        assert result.missing == ()
+        assert elapsed < 0.3
+
+    @pytest.mark.asyncio
+    async def test_late_section_resolves_to_none(self):
+        """A section past its deadline should be dropped while the others are kept."""
+
+        async def fast():
+            return {"ok": True}
+
+        async def hanging():
+            await asyncio.sleep(10)
+
+        result = await gather_context_sections(
+            [ContextSection("fast", fast), ContextSection("slow", hanging, timeout_seconds=0.05)],
+            default_timeout_seconds=1.0,
+        )
+
+        assert result == {"fast": {"ok": True}, "slow": None}
+        assert result.missing == ("slow",)
+
+    @pytest.mark.asyncio
+    async def test_failed_section_resolves_to_none(self):
+        """A section that raises should not fail the whole assembly."""
+
+        async def broken():
+            raise RuntimeError("FOS down")
+
+        async def fine():
+            return "value"
+
+        result = await gather_context_sections([ContextSection("broken", broken), ContextSection("fine", fine)])
+
+        assert result == {"broken": None, "fine": "value"}
+        assert result.missing == ("broken",)
+
+    @pytest.mark.asyncio
+    async def test_empty_section_is_not_missing(self):
+        """A section that answers with nothing is complete, not degraded."""
+
+        async def empty():
+            return None
+
+        result = await gather_context_sections([ContextSection("empty", empty)])
+
+        assert result == {"empty": None}
+        assert result.missing == ()
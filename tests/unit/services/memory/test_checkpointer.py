@@ -0,0 +1,387 @@
+"""
+Unit tests for app.services.memory.checkpointer.KVRedisCheckpointer.
+
+Tests cover:
+- Round trip of checkpoints with per-channel blob storage
+- Unchanged channels are not rewritten on later steps
+- Compression of large payloads
+- Append-only pending writes
+- Legacy checkpoints with inline channel values
+- Per-thread locking
+- Indexed history listing and retention trimming
+"""
+
+import asyncio
+import fnmatch
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from app.services.memory.checkpointer import COMPRESSED_TYPE_PREFIX, KVRedisCheckpointer
+
+
+class FakePipeline:
+    def __init__(self, client: "FakeAsyncRedis") -> None:
+        self._client = client
+        self._calls: list[tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        def record(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return record
+
+    async def execute(self) -> list[Any]:
+        results = []
+        for name, args, kwargs in self._calls:
+            results.append(await getattr(self._client, name)(*args, **kwargs))
+        self._calls.clear()
+        return results
+
+
+class FakeAsyncRedis:
+    """Just enough of redis.asyncio for the checkpointer."""
+
+    def __init__(self) -> None:
+        self.data: dict[str, Any] = {}
+        self.commands: list[str] = []
+
+    @staticmethod
+    def _b(value: Any) -> bytes:
+        return value if isinstance(value, bytes) else str(value).encode()
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+    async def set(self, key: str, value: Any, ex: int | None = None) -> bool:
+        self.commands.append("set")
+        self.data[key] = self._b(value)
+        return True
+
+    async def get(self, key: str) -> bytes | None:
+        self.commands.append("get")
+        return self.data.get(key)
+
+    async def mget(self, keys: list[str]) -> list[bytes | None]:
+        self.commands.append("mget")
+        return [self.data.get(k) for k in keys]
+
+    async def hset(self, key: str, mapping: dict[str, Any]) -> int:
+        self.commands.append("hset")
+        self.data.setdefault(key, {}).update({self._b(k): self._b(v) for k, v in mapping.items()})
+        return len(mapping)
+
+    async def hgetall(self, key: str) -> dict[bytes, bytes]:
+        self.commands.append("hgetall")
+        return dict(self.data.get(key) or {})
+
+    async def hmget(self, key: str, *fields: str) -> list[bytes | None]:
+        self.commands.append("hmget")
+        stored = self.data.get(key) or {}
+        return [stored.get(self._b(f)) for f in fields]
+
+    async def rpush(self, key: str, *values: Any) -> int:
+        self.commands.append("rpush")
+        self.data.setdefault(key, []).extend(self._b(v) for v in values)
+        return len(self.data[key])
+
+    async def lrange(self, key: str, start: int, end: int) -> list[bytes]:
+        self.commands.append("lrange")
+        items = self.data.get(key) or []
+        return list(items[start:] if end == -1 else items[start : end + 1])
+
+    async def expire(self, key: str, ttl: int) -> bool:
+        self.commands.append("expire")
+        return key in self.data
+
+    def _zset(self, key: str) -> dict[str, float]:
+        return self.data.setdefault(key, {})
+
+    def _zsorted(self, key: str) -> list[tuple[str, float]]:
+        return sorted((self.data.get(key) or {}).items(), key=lambda kv: (kv[1], kv[0]))
+
+    async def zadd(self, key: str, mapping: dict[str, float]) -> int:
+        self.commands.append("zadd")
+        self._zset(key).update(mapping)
+        return len(mapping)
+
+    async def zcard(self, key: str) -> int:
+        self.commands.append("zcard")
+        return len(self.data.get(key) or {})
+
+    async def zrem(self, key: str, *members: str) -> int:
+        zset = self.data.get(key) or {}
+        return sum(1 for m in members if zset.pop(m, None) is not None)
+
+    async def zrange(self, key: str, start: int, end: int, withscores: bool = False) -> list:
+        items = self._zsorted(key)
+        picked = items[start:] if end == -1 else items[start : end + 1]
+        return [(m.encode(), sc) for m, sc in picked] if withscores else [m.encode() for m, _ in picked]
+
+    async def zrevrange(self, key: str, start: int, end: int) -> list[bytes]:
+        self.commands.append("zrevrange")
+        items = list(reversed(self._zsorted(key)))
+        picked = items[start:] if end == -1 else items[start : end + 1]
+        return [m.encode() for m, _ in picked]
+
+    async def zrevrank(self, key: str, member: str) -> int | None:
+        members = [m for m, _ in reversed(self._zsorted(key))]
+        return members.index(member) if member in members else None
+
+    async def zrangebyscore(self, key: str, low: str, high: str) -> list[bytes]:
+        limit = float(high.lstrip("("))
+        return [m.encode() for m, sc in self._zsorted(key) if (sc < limit if high.startswith("(") else sc <= limit)]
+
+    async def delete(self, *keys: str) -> int:
+        return sum(1 for k in keys if self.data.pop(k, None) is not None)
+
+    async def exists(self, key: str) -> int:
+        self.commands.append("exists")
+        return int(key in self.data)
+
+    async def scan_iter(self, match: str, count: int = 100):
+        for key in list(self.data):
+            if fnmatch.fnmatchcase(key, match):
+                yield key.encode()
+
+
+def _config(thread_id: str = "t1", checkpoint_id: str | None = None) -> dict:
+    configurable = {"thread_id": thread_id, "checkpoint_ns": ""}
+    if checkpoint_id:
+        configurable["checkpoint_id"] = checkpoint_id
+    return {"configurable": configurable}
+
+
+def _checkpoint(checkpoint_id: str, values: dict[str, Any], versions: dict[str, int]) -> dict:
+    return {
+        "v": 1,
+        "id": checkpoint_id,
+        "ts": f"2024-01-01T00:00:{int(checkpoint_id[2:]):02d}+00:00",
+        "channel_values": values,
+        "channel_versions": versions,
+        "versions_seen": {},
+    }
+
+
+@pytest.fixture
+def client() -> FakeAsyncRedis:
+    return FakeAsyncRedis()
+
+
+@pytest.fixture
+def saver(client) -> KVRedisCheckpointer:
+    return KVRedisCheckpointer(client=client, namespace="lg", default_ttl=3600, compression_min_bytes=256)
+
+
+def _blob_keys(client: FakeAsyncRedis) -> list[str]:
+    return sorted(k for k in client.data if k.startswith("lg:blob:"))
+
+
+class TestKVRedisCheckpointer:
+    @pytest.mark.asyncio
+    async def test_round_trip_restores_channel_values(self, saver):
+        cp = _checkpoint("cp1", {"messages": ["hi"], "user": {"name": "Ana"}}, {"messages": 1, "user": 1})
+        await saver.aput(_config(), cp, {"step": 1}, {"messages": 1, "user": 1})
+
+        loaded = await saver.aget_tuple(_config())
+
+        assert loaded is not None
+        assert loaded.checkpoint["channel_values"] == {"messages": ["hi"], "user": {"name": "Ana"}}
+        assert loaded.metadata == {"step": 1}
+        assert loaded.config["configurable"]["checkpoint_id"] == "cp1"
+
+    @pytest.mark.asyncio
+    async def test_unchanged_channels_are_shared_between_checkpoints(self, saver, client):
+        await saver.aput(
+            _config(),
+            _checkpoint("cp1", {"messages": ["hi"], "user": {"name": "Ana"}}, {"messages": 1, "user": 1}),
+            {},
+            {"messages": 1, "user": 1},
+        )
+        await saver.aput(
+            _config(checkpoint_id="cp1"),
+            _checkpoint("cp2", {"messages": ["hi", "hello"], "user": {"name": "Ana"}}, {"messages": 2, "user": 1}),
+            {},
+            {"messages": 2},
+        )
+
+        assert _blob_keys(client) == ["lg:blob:t1::messages:1", "lg:blob:t1::messages:2", "lg:blob:t1::user:1"]
+        latest = await saver.aget_tuple(_config())
+        first = await saver.aget_tuple(_config(checkpoint_id="cp1"))
+        assert latest.checkpoint["channel_values"]["messages"] == ["hi", "hello"]
+        assert latest.checkpoint["channel_values"]["user"] == {"name": "Ana"}
+        assert latest.parent_config["configurable"]["checkpoint_id"] == "cp1"
+        assert first.checkpoint["channel_values"]["messages"] == ["hi"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_unchanged_channel_is_rewritten_once(self, client):
+        first = KVRedisCheckpointer(client=client, namespace="lg", default_ttl=None)
+        await first.aput(_config(), _checkpoint("cp1", {"user": "Ana"}, {"user": 1}), {}, {"user": 1})
+        client.data.pop("lg:blob:t1::user:1")
+
+        # A fresh replica does not know the blob exists, so it writes it alongside the change.
+        second = KVRedisCheckpointer(client=client, namespace="lg", default_ttl=None)
+        await second.aput(
+            _config(checkpoint_id="cp1"),
+            _checkpoint("cp2", {"user": "Ana", "messages": ["x"]}, {"user": 1, "messages": 1}),
+            {},
+            {"messages": 1},
+        )
+
+        loaded = await second.aget_tuple(_config())
+        assert loaded.checkpoint["channel_values"] == {"user": "Ana", "messages": ["x"]}
+
+    @pytest.mark.asyncio
+    async def test_large_payloads_are_compressed(self, saver, client):
+        big = ["the same sentence repeated"] * 200
+        await saver.aput(_config(), _checkpoint("cp1", {"messages": big}, {"messages": 1}), {}, {"messages": 1})
+
+        raw = client.data["lg:blob:t1::messages:1"]
+        assert raw.startswith(COMPRESSED_TYPE_PREFIX.encode())
+        assert len(raw) < len(repr(big))
+        loaded = await saver.aget_tuple(_config())
+        assert loaded.checkpoint["channel_values"]["messages"] == big
+
+    @pytest.mark.asyncio
+    async def test_pending_writes_are_appended_without_reads(self, saver, client):
+        await saver.aput(_config(), _checkpoint("cp1", {}, {}), {}, {})
+        client.commands.clear()
+
+        await saver.aput_writes(_config(checkpoint_id="cp1"), [("messages", "a")], task_id="task-1")
+        await saver.aput_writes(_config(checkpoint_id="cp1"), [("messages", "b"), ("__error__", "boom")], "task-2")
+
+        assert client.commands == ["rpush", "expire", "rpush", "expire"]
+        loaded = await saver.aget_tuple(_config())
+        assert loaded.pending_writes[0] == ("task-2", "__error__", "boom")
+        assert ("task-1", "messages", "a") in loaded.pending_writes
+        assert ("task-2", "messages", "b") in loaded.pending_writes
+
+    @pytest.mark.asyncio
+    async def test_legacy_inline_checkpoint_still_loads(self, saver, client):
+        cp = _checkpoint("cp1", {"messages": ["old"]}, {"messages": 1})
+        checkpoint_type, checkpoint_bytes = saver.serde.dumps_typed(cp)
+        metadata_type, metadata_bytes = saver.serde.dumps_typed({"step": 0})
+        pending_type, pending_bytes = saver.serde.dumps_typed([("task-1", "messages", "w")])
+        await client.hset(
+            "lg:cp:t1::cp1",
+            mapping={
+                "checkpoint_type": checkpoint_type,
+                "checkpoint": checkpoint_bytes,
+                "metadata_type": metadata_type,
+                "metadata": metadata_bytes,
+                "pending_writes_type": pending_type,
+                "pending_writes": pending_bytes,
+            },
+        )
+        await client.set("lg:latest:t1:", "cp1")
+
+        loaded = await saver.aget_tuple(_config())
+
+        assert loaded.checkpoint["channel_values"] == {"messages": ["old"]}
+        assert loaded.pending_writes == [("task-1", "messages", "w")]
+
+    @pytest.mark.asyncio
+    async def test_alist_returns_newest_first(self, saver):
+        await saver.aput(_config(), _checkpoint("cp1", {"m": 1}, {"m": 1}), {}, {"m": 1})
+        await saver.aput(_config(checkpoint_id="cp1"), _checkpoint("cp2", {"m": 2}, {"m": 2}), {}, {"m": 2})
+
+        listed = [item async for item in saver.alist(_config())]
+
+        assert [item.checkpoint["id"] for item in listed] == ["cp2", "cp1"]
+        assert listed[1].checkpoint["channel_values"] == {"m": 1}
+
+    @pytest.mark.asyncio
+    async def test_alist_pushes_down_limit_and_before(self, saver, client):
+        for i in range(1, 8):
+            await saver.aput(
+                _config(checkpoint_id=f"cp{i - 1}" if i > 1 else None),
+                _checkpoint(f"cp{i}", {"m": i}, {"m": i}),
+                {"step": i},
+                {"m": i},
+            )
+        client.commands.clear()
+
+        listed = [item async for item in saver.alist(_config(), before=_config(checkpoint_id="cp5"), limit=2)]
+
+        assert [item.checkpoint["id"] for item in listed] == ["cp4", "cp3"]
+        assert client.commands.count("hgetall") == 2
+
+    @pytest.mark.asyncio
+    async def test_alist_applies_metadata_filter(self, saver):
+        for i in range(1, 5):
+            await saver.aput(_config(), _checkpoint(f"cp{i}", {}, {}), {"source": "loop" if i % 2 else "input"}, {})
+
+        listed = [item async for item in saver.alist(_config(), filter={"source": "input"})]
+
+        assert [item.checkpoint["id"] for item in listed] == ["cp4", "cp2"]
+
+    @pytest.mark.asyncio
+    async def test_history_is_trimmed_with_unreferenced_blobs(self, client):
+        saver = KVRedisCheckpointer(client=client, namespace="lg", default_ttl=None, max_history=3)
+        with patch("app.services.memory.checkpointer.HISTORY_TRIM_BATCH", 0):
+            for i in range(1, 7):
+                await saver.aput(
+                    _config(),
+                    _checkpoint(f"cp{i}", {"user": "Ana", "m": i}, {"user": 1, "m": i}),
+                    {},
+                    {"user": 1, "m": i} if i == 1 else {"m": i},
+                )
+
+        listed = [item.checkpoint["id"] async for item in saver.alist(_config())]
+        assert listed == ["cp6", "cp5", "cp4"]
+        assert not any(k.startswith("lg:cp:t1::cp1") for k in client.data)
+        # "user" never changed, so its first blob is still referenced by every retained checkpoint.
+        assert _blob_keys(client) == ["lg:blob:t1::m:4", "lg:blob:t1::m:5", "lg:blob:t1::m:6", "lg:blob:t1::user:1"]
+        oldest = await saver.aget_tuple(_config(checkpoint_id="cp4"))
+        assert oldest.checkpoint["channel_values"] == {"user": "Ana", "m": 4}
+
+    @pytest.mark.asyncio
+    async def test_alist_backfills_history_for_unindexed_threads(self, saver, client):
+        await saver.aput(_config(), _checkpoint("cp1", {"m": 1}, {"m": 1}), {}, {"m": 1})
+        await saver.aput(_config(), _checkpoint("cp2", {"m": 2}, {"m": 2}), {}, {"m": 2})
+        client.data.pop("lg:hist:t1:")
+        client.data.pop("lg:histidx:t1:")
+
+        listed = [item.checkpoint["id"] async for item in saver.alist(_config())]
+
+        assert listed == ["cp2", "cp1"]
+        assert set(client.data["lg:hist:t1:"]) == {"cp1", "cp2"}
+
+    @pytest.mark.asyncio
+    async def test_legacy_checkpoints_indexed_when_first_new_put_creates_history(self, client):
+        legacy = KVRedisCheckpointer(client=client, namespace="lg", default_ttl=None)
+        for i in (1, 2):
+            await legacy.aput(_config(), _checkpoint(f"cp{i}", {"m": i}, {"m": i}), {}, {"m": i})
+        # As written before the history set and its marker existed.
+        client.data.pop("lg:hist:t1:")
+        client.data.pop("lg:histidx:t1:")
+
+        saver = KVRedisCheckpointer(client=client, namespace="lg", default_ttl=None)
+        await saver.aput(_config(checkpoint_id="cp2"), _checkpoint("cp3", {"m": 3}, {"m": 3}), {}, {"m": 3})
+
+        assert set(client.data["lg:hist:t1:"]) == {"cp1", "cp2", "cp3"}
+        listed = [item.checkpoint["id"] async for item in saver.alist(_config(), before=_config(checkpoint_id="cp2"))]
+        assert listed == ["cp1"]
+
+    @pytest.mark.asyncio
+    async def test_new_thread_is_marked_indexed_without_scanning(self, saver, client):
+        with patch.object(saver, "_backfill_history") as backfill:
+            await saver.aput(_config(), _checkpoint("cp1", {"m": 1}, {"m": 1}), {}, {"m": 1})
+            _ = [item async for item in saver.alist(_config())]
+
+        backfill.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_locks_are_per_thread(self, saver):
+        lock_a = saver._thread_lock("a", "")
+        assert saver._thread_lock("a", "") is lock_a
+        assert saver._thread_lock("b", "") is not lock_a
+
+        async with lock_a:
+            # Another thread is not blocked while "a" holds its lock.
+            await asyncio.wait_for(
+                saver.aput(_config("b"), _checkpoint("cp1", {"m": 1}, {"m": 1}), {}, {"m": 1}),
+                timeout=1,
+            )
@@ -0,0 +1,209 @@
+"""
+Unit tests for app.services.memory.cold_path_queue and cold_path_worker.
+
+Tests cover:
+- Per-thread coalescing and single lease per thread
+- Visibility timeout redelivery
+- Retry scheduling and dead-lettering
+- Worker ack/retry/dead-letter flow
+- Manager enqueueing to a durable queue
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.memory.cold_path_manager import MemoryColdPathManager
+from app.services.memory.cold_path_queue import ColdPathJob, SQLiteColdPathQueue, create_cold_path_queue
+from app.services.memory.cold_path_worker import ColdPathWorker
+
+
+def _job(thread_id: str = "thread-1", text: str = "hi") -> ColdPathJob:
+    return ColdPathJob(
+        thread_id=thread_id,
+        user_id="user-1",
+        user_context={"name": "Ana"},
+        conversation_window=[{"role": "human", "content": text}],
+    )
+
+
+@pytest.fixture
+def queue():
+    q = SQLiteColdPathQueue(":memory:")
+    yield q
+    q.close()
+
+
+class TestSQLiteColdPathQueue:
+    def test_job_round_trips_through_json(self):
+        job = _job()
+        assert ColdPathJob.from_json(job.to_json()) == job
+
+    def test_pending_jobs_coalesce_per_thread(self, queue):
+        queue.enqueue(_job(text="first"))
+        queue.enqueue(_job(text="second"))
+
+        claimed = queue.claim("c1", visibility_timeout=30)
+
+        assert queue.pending_count() == 1
+        assert claimed.job.conversation_window[0]["content"] == "second"
+        assert claimed.attempts == 1
+
+    def test_one_lease_per_thread(self, queue):
+        queue.enqueue(_job(text="first"))
+        first = queue.claim("c1", visibility_timeout=30)
+        queue.enqueue(_job(text="second"))
+        queue.enqueue(_job(thread_id="thread-2"))
+
+        other = queue.claim("c2", visibility_timeout=30)
+
+        assert first is not None
+        assert other.job.thread_id == "thread-2"
+        assert queue.claim("c3", visibility_timeout=30) is None
+
+        queue.ack(first)
+        assert queue.claim("c3", visibility_timeout=30).job.conversation_window[0]["content"] == "second"
+
+    def test_expired_lease_is_redelivered(self, queue):
+        queue.enqueue(_job())
+        first = queue.claim("c1", visibility_timeout=0.01)
+        time.sleep(0.02)
+
+        again = queue.claim("c2", visibility_timeout=30)
+
+        assert again.job.job_id == first.job.job_id
+        assert again.attempts == 2
+        queue.ack(first)
+        assert queue.pending_count() == 1
+
+    def test_retry_delays_redelivery(self, queue):
+        queue.enqueue(_job())
+        claimed = queue.claim("c1", visibility_timeout=30)
+
+        queue.retry(claimed, delay_seconds=60)
+
+        assert queue.claim("c1", visibility_timeout=30) is None
+        assert queue.pending_count() == 1
+
+    def test_retry_is_dropped_when_superseded(self, queue):
+        queue.enqueue(_job(text="first"))
+        claimed = queue.claim("c1", visibility_timeout=30)
+        queue.enqueue(_job(text="second"))
+
+        queue.retry(claimed, delay_seconds=0)
+
+        assert queue.pending_count() == 1
+        assert queue.claim("c1", visibility_timeout=30).job.conversation_window[0]["content"] == "second"
+
+    def test_dead_letter_moves_job(self, queue):
+        queue.enqueue(_job())
+        claimed = queue.claim("c1", visibility_timeout=30)
+
+        queue.dead_letter(claimed, "boom")
+
+        assert queue.pending_count() == 0
+        assert queue.dead_letter_count() == 1
+
+    def test_jobs_survive_reopen(self, tmp_path):
+        path = str(tmp_path / "queue.sqlite3")
+        q1 = SQLiteColdPathQueue(path)
+        q1.enqueue(_job())
+        q1.close()
+
+        q2 = SQLiteColdPathQueue(path)
+        assert q2.claim("c1", visibility_timeout=30) is not None
+        q2.close()
+
+    def test_create_cold_path_queue_local_backend(self):
+        assert create_cold_path_queue("local") is None
+        with pytest.raises(ValueError):
+            create_cold_path_queue("kafka")
+
+
+class TestColdPathWorker:
+    def _worker(self, queue, **kwargs):
+        return ColdPathWorker(
+            queue,
+            store=MagicMock(),
+            event_loop=MagicMock(),
+            concurrency=1,
+            visibility_timeout=30,
+            max_retries=2,
+            retry_backoff_seconds=0,
+            **kwargs,
+        )
+
+    def test_run_once_acks_successful_job(self, queue):
+        queue.enqueue(_job())
+        worker = self._worker(queue)
+
+        with patch("app.services.memory.cold_path_manager.run_cold_path_turn") as mock_run:
+            assert worker.run_once() is True
+
+        mock_run.assert_called_once()
+        assert mock_run.call_args.kwargs["thread_id"] == "thread-1"
+        assert queue.pending_count() == 0
+        assert worker.run_once() is False
+
+    def test_failures_retry_then_dead_letter(self, queue):
+        queue.enqueue(_job())
+        worker = self._worker(queue)
+
+        with patch("app.services.memory.cold_path_manager.run_cold_path_turn", side_effect=Exception("boom")):
+            assert worker.run_once() is True
+            assert queue.pending_count() == 1
+            assert worker.run_once() is True
+
+        assert queue.pending_count() == 0
+        assert queue.dead_letter_count() == 1
+
+    def test_start_and_stop_drain_queue(self, queue):
+        queue.enqueue(_job())
+        worker = self._worker(queue, poll_interval=0.01)
+
+        with patch("app.services.memory.cold_path_manager.run_cold_path_turn") as mock_run:
+            worker.start()
+            deadline = time.time() + 2
+            while queue.pending_count() and time.time() < deadline:
+                time.sleep(0.01)
+            worker.stop(wait=True)
+
+        mock_run.assert_called_once()
+
+
+class TestManagerWithDurableQueue:
+    def test_submit_turn_enqueues_instead_of_running_inline(self, queue):
+        manager = MemoryColdPathManager(max_workers=1, queue=queue, inprocess_worker=False)
+
+        manager.submit_turn(
+            thread_id="thread-1",
+            user_id="user-1",
+            user_context={},
+            conversation_window=[{"role": "human", "content": "hi"}],
+            store=MagicMock(),
+            event_loop=MagicMock(),
+        )
+
+        assert queue.pending_count() == 1
+        assert manager._runners == {}
+        manager.shutdown()
+
+    def test_inprocess_worker_processes_enqueued_turn(self, queue):
+        manager = MemoryColdPathManager(max_workers=1, queue=queue, inprocess_worker=True)
+
+        with patch("app.services.memory.cold_path_manager.run_cold_path_turn") as mock_run:
+            manager.submit_turn(
+                thread_id="thread-1",
+                user_id="user-1",
+                user_context={},
+                conversation_window=[],
+                store=MagicMock(),
+                event_loop=MagicMock(),
+            )
+            deadline = time.time() + 2
+            while queue.pending_count() and time.time() < deadline:
+                time.sleep(0.01)
+            manager.shutdown(wait=True)
+
+        mock_run.assert_called_once()
@@ -0,0 +1,64 @@
+"""Tests for idle-triggered conversation summaries."""
+
+import asyncio
+
+import pytest
+
+from app.services.conversation_summaries import IdleSummaryScheduler, conversation_fingerprint
+
+
+class TestConversationFingerprint:
+    def test_fingerprint_changes_with_content(self):
+        pairs = [("user", "Hello"), ("assistant", "Hi!")]
+
+        assert conversation_fingerprint(pairs) == conversation_fingerprint(list(pairs))
+        assert conversation_fingerprint(pairs) != conversation_fingerprint(pairs + [("user", "Bye")])
+
+
+class TestIdleSummaryScheduler:
+    @pytest.mark.asyncio
+    async def test_job_runs_once_after_last_touch(self):
+        """Repeated touches restart the timer so the job runs once, after the thread goes idle."""
+        scheduler = IdleSummaryScheduler(idle_seconds=0.05)
+        runs: list[str] = []
+
+        async def job():
+            runs.append("t1")
+
+        scheduler.touch("t1", job)
+        await asyncio.sleep(0.02)
+        scheduler.touch("t1", job)
+        await asyncio.sleep(0.02)
+        assert runs == []
+
+        await asyncio.sleep(0.08)
+        assert runs == ["t1"]
+        assert scheduler.pending() == 0
+
+    @pytest.mark.asyncio
+    async def test_disabled_scheduler_never_runs(self):
+        scheduler = IdleSummaryScheduler(idle_seconds=0)
+        runs: list[str] = []
+
+        async def job():
+            runs.append("t1")
+
+        scheduler.touch("t1", job)
+        await asyncio.sleep(0.01)
+
+        assert runs == []
+        assert scheduler.pending() == 0
+
+    @pytest.mark.asyncio
+    async def test_stop_cancels_pending_jobs(self):
+        scheduler = IdleSummaryScheduler(idle_seconds=10)
+
+        async def job():
+            raise AssertionError("should not run")
+
+        scheduler.touch("t1", job)
+        assert scheduler.pending() == 1
+
+        await scheduler.stop()
+
+        assert scheduler.pending() == 0
@@ -302,3 +302,41 @@ class TestGetMemories:
 
             with pytest.raises(ValueError, match="memory_type must be one of"):
                 service.get_memories("u1", "invalid_type")
+
+
+class TestMemoryLimits:
+    """Test count and oldest-memory lookups used for limit enforcement."""
+
+    def test_count_memories_uses_store_count(self, mock_config, mock_s3_vectors_store):
+        """Counting should not list the namespace."""
+        mock_s3_vectors_store.count_by_namespace.return_value = 7
+
+        with patch("app.services.memory_service.create_s3_vectors_store_from_env", return_value=mock_s3_vectors_store):
+            service = MemoryService()
+
+            assert service.count_memories("user123", "semantic") == 7
+            mock_s3_vectors_store.count_by_namespace.assert_called_once_with(("user123", "semantic"))
+            mock_s3_vectors_store.list_by_namespace.assert_not_called()
+
+    def test_find_oldest_memory_uses_store_oldest(self, mock_config, mock_s3_vectors_store):
+        """Oldest lookup should come from the store's ordered index."""
+        oldest = MagicMock()
+        oldest.key = "old-key"
+        oldest.value = {"summary": "Old", "last_accessed": "2024-01-01T00:00:00Z"}
+        mock_s3_vectors_store.get_oldest_in_namespace.return_value = oldest
+
+        with patch("app.services.memory_service.create_s3_vectors_store_from_env", return_value=mock_s3_vectors_store):
+            service = MemoryService()
+
+            assert service.find_oldest_memory("user123", "semantic") == ("old-key", oldest.value)
+            mock_s3_vectors_store.list_by_namespace.assert_not_called()
+
+    def test_check_limit_skips_oldest_lookup_below_limit(self, mock_config, mock_s3_vectors_store):
+        """Below the limit only the count is needed."""
+        mock_s3_vectors_store.count_by_namespace.return_value = 0
+
+        with patch("app.services.memory_service.create_s3_vectors_store_from_env", return_value=mock_s3_vectors_store):
+            service = MemoryService()
+
+            assert service._check_limit_and_get_oldest("user123", "semantic") == (False, None)
+            mock_s3_vectors_store.get_oldest_in_namespace.assert_not_called()
@@ -10,6 +10,7 @@ Focus on valuable business logic:
 - Thread management
 """
 
+import asyncio
 import contextlib
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
@@ -23,6 +24,7 @@ from app.services.supervisor import (
     SupervisorService,
     _strip_emojis,
 )
+from app.services.user_context_cache import DegradedUserContextError
 
 
 @pytest.fixture
@@ -226,16 +228,37 @@ class TestLoadUserContextFromExternal:
 
     @pytest.mark.asyncio
     async def test_load_user_context_handles_external_error(self, supervisor_service, mock_user_id):
-        """Should fallback to empty context on external service error."""
-        with patch("app.services.supervisor.ExternalUserRepository") as mock_repo_class:
+        """Should report the failed section as degraded instead of returning a complete-looking context."""
+        with (
+            patch("app.services.supervisor.ExternalUserRepository") as mock_repo_class,
+            patch("app.services.supervisor.PersonalInformationService") as mock_info_class,
+            patch("app.services.supervisor.PaymentRemindersService") as mock_reminders_class,
+        ):
             mock_repo = AsyncMock()
             mock_repo.get_by_id.side_effect = Exception("External service error")
             mock_repo_class.return_value = mock_repo
+            mock_info_class.return_value = AsyncMock(
+                get_all_personal_info=AsyncMock(return_value=None), get_profile_details=AsyncMock(return_value=None)
+            )
+            mock_reminders_class.return_value = AsyncMock(get_payment_reminders=AsyncMock(return_value=None))
 
-            result = await supervisor_service._load_user_context_from_external(mock_user_id)
+            with pytest.raises(DegradedUserContextError) as exc_info:
+                await supervisor_service._load_user_context_from_external(mock_user_id)
 
-            # Should return fallback UserContext
-            assert result.user_id == mock_user_id
+            assert exc_info.value.context.user_id == mock_user_id
+            assert exc_info.value.missing == ("external_ctx",)
+
+    @pytest.mark.asyncio
+    async def test_load_user_context_raises_degraded_when_fos_unavailable(self, supervisor_service, mock_user_id):
+        """Should raise a degraded error carrying an empty context instead of returning it as real."""
+        with (
+            patch("app.services.supervisor.ExternalUserRepository", side_effect=RuntimeError("no client")),
+            pytest.raises(DegradedUserContextError) as exc_info,
+        ):
+            await supervisor_service._load_user_context_from_external(mock_user_id)
+
+        assert exc_info.value.context.user_id == mock_user_id
+        assert exc_info.value.context.preferred_name is None
 
     @pytest.mark.asyncio
     async def test_load_user_context_merges_profile_details(self, supervisor_service, mock_user_id):
@@ -263,6 +286,35 @@ class TestLoadUserContextFromExternal:
             assert result.location.region == "Texas"
             mock_normalizer.normalize.assert_called_once_with("Austin")
 
+    @pytest.mark.asyncio
+    async def test_load_user_context_keeps_sections_when_one_fails(self, supervisor_service, mock_user_id):
+        """Should still build the partial context from the other sections when the AI context call fails."""
+        with (
+            patch("app.services.supervisor.ExternalUserRepository") as mock_repo_class,
+            patch("app.services.supervisor.PersonalInformationService") as mock_info_class,
+            patch("app.services.supervisor.PaymentRemindersService") as mock_reminders_class,
+        ):
+            mock_repo = AsyncMock()
+            mock_repo.get_by_id.side_effect = Exception("External service error")
+            mock_repo_class.return_value = mock_repo
+
+            mock_info = MagicMock()
+            mock_info.get_all_personal_info = AsyncMock(return_value="Lives in Austin")
+            mock_info.get_profile_details = AsyncMock(return_value=None)
+            mock_info_class.return_value = mock_info
+
+            mock_reminders = MagicMock()
+            mock_reminders.get_payment_reminders = AsyncMock(return_value={"payment_reminders": [{"name": "Rent"}]})
+            mock_reminders_class.return_value = mock_reminders
+
+            with pytest.raises(DegradedUserContextError) as exc_info:
+                await supervisor_service._load_user_context_from_external(mock_user_id)
+
+            result = exc_info.value.context
+            assert result.personal_information == "Lives in Austin"
+            assert result.payment_reminders == [{"name": "Rent"}]
+            assert exc_info.value.missing == ("external_ctx",)
+
 
 class TestExportUserContextToExternal:
     """Test user context export to external service."""
@@ -385,36 +437,39 @@ class TestExportUserContextToExternal:
 class TestLoadConversationMessages:
     """Test conversation message loading from session."""
 
-    def test_load_conversation_messages_returns_messages(self, supervisor_service):
+    @pytest.mark.asyncio
+    async def test_load_conversation_messages_returns_messages(self, supervisor_service):
         """Should return conversation messages from session data."""
-        mock_store = Mock()
-        mock_store.sessions = {
+        mock_store = AsyncMock()
+        mock_store.peek_session.side_effect = {
             "thread-123": {
                 "conversation_messages": [{"role": "user", "content": "Hello"}, {"role": "assistant", "content": "Hi"}]
             }
-        }
+        }.get
 
-        result = supervisor_service._load_conversation_messages(mock_store, "thread-123")
+        result = await supervisor_service._load_conversation_messages(mock_store, "thread-123")
 
         assert len(result) == 2
         assert result[0]["role"] == "user"
         assert result[1]["role"] == "assistant"
 
-    def test_load_conversation_messages_handles_missing_thread(self, supervisor_service):
+    @pytest.mark.asyncio
+    async def test_load_conversation_messages_handles_missing_thread(self, supervisor_service):
         """Should return empty list for missing thread."""
-        mock_store = Mock()
-        mock_store.sessions = {}
+        mock_store = AsyncMock()
+        mock_store.peek_session.side_effect = {}.get
 
-        result = supervisor_service._load_conversation_messages(mock_store, "nonexistent")
+        result = await supervisor_service._load_conversation_messages(mock_store, "nonexistent")
 
         assert result == []
 
-    def test_load_conversation_messages_handles_missing_messages_key(self, supervisor_service):
+    @pytest.mark.asyncio
+    async def test_load_conversation_messages_handles_missing_messages_key(self, supervisor_service):
         """Should return empty list when conversation_messages key missing."""
-        mock_store = Mock()
-        mock_store.sessions = {"thread-123": {"user_id": "user-1"}}
+        mock_store = AsyncMock()
+        mock_store.peek_session.side_effect = {"thread-123": {"user_id": "user-1"}}.get
 
-        result = supervisor_service._load_conversation_messages(mock_store, "thread-123")
+        result = await supervisor_service._load_conversation_messages(mock_store, "thread-123")
 
         assert result == []
 
@@ -427,11 +482,11 @@ class TestFindLatestPriorThread:
         """Should return most recent thread excluding current."""
         mock_store = AsyncMock()
         mock_store.get_user_threads.return_value = ["thread-1", "thread-2", "thread-3"]
-        mock_store.sessions = {
+        mock_store.peek_session.side_effect = {
             "thread-1": {"last_accessed": datetime(2024, 1, 1)},
             "thread-2": {"last_accessed": datetime(2024, 1, 3)},  # Most recent
             "thread-3": {"last_accessed": datetime(2024, 1, 2)},
-        }
+        }.get
 
         result = await supervisor_service._find_latest_prior_thread(mock_store, "user-1", "thread-2")
 
@@ -443,10 +498,10 @@ class TestFindLatestPriorThread:
         """Should exclude current thread from results."""
         mock_store = AsyncMock()
         mock_store.get_user_threads.return_value = ["thread-1", "thread-2"]
-        mock_store.sessions = {
+        mock_store.peek_session.side_effect = {
             "thread-1": {"last_accessed": datetime(2024, 1, 1)},
             "thread-2": {"last_accessed": datetime(2024, 1, 5)},  # Current thread
-        }
+        }.get
 
         result = await supervisor_service._find_latest_prior_thread(mock_store, "user-1", "thread-2")
 
@@ -457,9 +512,9 @@ class TestFindLatestPriorThread:
         """Should return None when no other threads exist."""
         mock_store = AsyncMock()
         mock_store.get_user_threads.return_value = ["thread-1"]
-        mock_store.sessions = {
+        mock_store.peek_session.side_effect = {
             "thread-1": {"last_accessed": datetime(2024, 1, 1)},
-        }
+        }.get
 
         result = await supervisor_service._find_latest_prior_thread(mock_store, "user-1", "thread-1")
 
@@ -470,13 +525,68 @@ class TestFindLatestPriorThread:
         """Should return None when user has no threads."""
         mock_store = AsyncMock()
         mock_store.get_user_threads.return_value = []
-        mock_store.sessions = {}
+        mock_store.peek_session.side_effect = {}.get
 
         result = await supervisor_service._find_latest_prior_thread(mock_store, "user-1", "thread-1")
 
         assert result is None
 
 
+class TestPriorThreadFromRecentList:
+    """Test prior-thread lookup and summary reuse through the recent-thread list."""
+
+    @pytest.mark.asyncio
+    async def test_find_latest_prior_thread_uses_recent_list(self, supervisor_service):
+        """Should pick the newest non-current thread without scanning the user's threads."""
+        mock_store = AsyncMock()
+        mock_store.get_recent_user_threads.return_value = ["thread-current", "thread-9", "thread-3"]
+
+        result = await supervisor_service._find_latest_prior_thread(mock_store, "user-1", "thread-current")
+
+        assert result == "thread-9"
+        mock_store.get_user_threads.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_ensure_thread_summary_reuses_matching_fingerprint(self, supervisor_service):
+        """Should return the stored summary when the conversation has not changed."""
+        from app.services.conversation_summaries import conversation_fingerprint
+
+        messages = [{"role": "user", "content": "Hello"}, {"role": "assistant", "content": "Hi there!"}]
+        mock_store = AsyncMock()
+        mock_store.peek_session.return_value = {
+            "conversation_messages": messages,
+            "conversation_summary": "We said hi.",
+            "conversation_summary_fingerprint": conversation_fingerprint(
+                [("user", "Hello"), ("assistant", "Hi there!")]
+            ),
+        }
+
+        with patch("app.services.supervisor.call_llm") as mock_llm:
+            result = await supervisor_service._ensure_thread_summary(mock_store, "thread-1")
+
+        assert result == "We said hi."
+        mock_llm.assert_not_called()
+        mock_store.update_session_fields.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_ensure_thread_summary_stores_new_summary(self, supervisor_service):
+        """Should summarize a changed conversation once and store it with its fingerprint."""
+        mock_store = AsyncMock()
+        mock_store.peek_session.return_value = {
+            "conversation_messages": [{"role": "user", "content": "Budget help"}],
+            "conversation_summary": "Old summary",
+            "conversation_summary_fingerprint": "stale",
+        }
+
+        with patch("app.services.supervisor.call_llm", AsyncMock(return_value="We discussed budgeting.")):
+            result = await supervisor_service._ensure_thread_summary(mock_store, "thread-1")
+
+        assert result == "We discussed budgeting."
+        stored = mock_store.update_session_fields.call_args[0][1]
+        assert stored["conversation_summary"] == "We discussed budgeting."
+        assert stored["conversation_summary_fingerprint"] != "stale"
+
+
 class TestSummarizeConversation:
     """Tests for _summarize_conversation method."""
 
@@ -543,7 +653,7 @@ class TestGetPriorConversationSummary:
         """Should get and summarize prior conversation."""
         mock_store = AsyncMock()
         mock_store.get_user_threads.return_value = ["thread-1", "thread-2"]
-        mock_store.sessions = {
+        mock_store.peek_session.side_effect = {
             "thread-1": {
                 "last_accessed": 100,
                 "conversation_messages": [
@@ -552,7 +662,7 @@ class TestGetPriorConversationSummary:
                 ],
             },
             "thread-2": {"last_accessed": 50},
-        }
+        }.get
 
         with patch("app.services.supervisor.call_llm") as mock_llm:
             mock_llm.return_value = "We greeted each other."
@@ -568,7 +678,7 @@ class TestGetPriorConversationSummary:
         """Should return None when no prior thread exists."""
         mock_store = AsyncMock()
         mock_store.get_user_threads.return_value = ["current-thread"]
-        mock_store.sessions = {}
+        mock_store.peek_session.side_effect = {}.get
 
         result = await supervisor_service._get_prior_conversation_summary(
             mock_store, str(mock_user_id), "current-thread"
@@ -621,7 +731,7 @@ class TestInitialize:
                 return_value=UserContext(user_id=mock_user_id)
             )
 
-            result = await supervisor_service.initialize(user_id=mock_user_id)
+            result = await supervisor_service.initialize(user_id=mock_user_id, wait_for_welcome=True)
 
             assert "thread_id" in result
             assert "welcome" in result
@@ -646,12 +756,12 @@ class TestInitialize:
             mock_store.set_session = AsyncMock()
             mock_store.get_session.return_value = {"user_context": {}}
             mock_store.get_user_threads.return_value = ["thread-1", "thread-2"]
-            mock_store.sessions = {
+            mock_store.peek_session.side_effect = {
                 "thread-1": {
                     "last_accessed": 100,
                     "conversation_messages": [{"role": "user", "content": "Previous chat"}],
                 }
-            }
+            }.get
             mock_store_getter.return_value = mock_store
 
             mock_db_service = AsyncMock()
@@ -665,7 +775,7 @@ class TestInitialize:
                 return_value=UserContext(user_id=mock_user_id)
             )
 
-            result = await supervisor_service.initialize(user_id=mock_user_id)
+            result = await supervisor_service.initialize(user_id=mock_user_id, wait_for_welcome=True)
 
             assert result["prior_conversation_summary"] == "We talked about your goals last time."
 
@@ -702,7 +812,7 @@ class TestInitialize:
                 return_value=UserContext(user_id=mock_user_id)
             )
 
-            await supervisor_service.initialize(user_id=mock_user_id)
+            await supervisor_service.initialize(user_id=mock_user_id, wait_for_welcome=True)
 
             # Check that welcome was called with icebreaker hint
             mock_welcome.assert_awaited_once()
@@ -710,6 +820,52 @@ class TestInitialize:
             assert len(call_args) == 3  # user_context, prior_summary, icebreaker_hint
             assert call_args[2] == "Ask about their weekend plans"
 
+    @pytest.mark.asyncio
+    async def test_initialize_returns_before_welcome_and_streams_it(self, supervisor_service, mock_user_id):
+        """Should return the thread id without waiting for the welcome, then emit it over SSE."""
+        release_welcome = asyncio.Event()
+
+        async def slow_welcome(*args):
+            await release_welcome.wait()
+            return "Welcome to Vera!"
+
+        with (
+            patch("app.services.supervisor.get_sse_queue") as mock_queue,
+            patch("app.services.supervisor.get_session_store") as mock_store_getter,
+            patch("app.services.supervisor.get_database_service") as mock_db,
+            patch("app.services.supervisor.generate_personalized_welcome", side_effect=slow_welcome),
+        ):
+            mock_q = AsyncMock()
+            mock_queue.return_value = mock_q
+
+            mock_store = AsyncMock()
+            mock_store.get_user_threads.return_value = []
+            mock_store_getter.return_value = mock_store
+
+            mock_db_service = AsyncMock()
+            mock_db_service.get_session = AsyncMock()
+            mock_db.return_value = mock_db_service
+
+            supervisor_service._load_user_context_from_external = AsyncMock(
+                return_value=UserContext(user_id=mock_user_id)
+            )
+
+            result = await supervisor_service.initialize(user_id=mock_user_id)
+
+            assert result["welcome"] is None
+            mock_store.set_session.assert_awaited_once()
+            assert {"event": "message.completed", "data": {"text": "Welcome to Vera!"}} not in [
+                c.args[0] for c in mock_q.put.call_args_list
+            ]
+
+            release_welcome.set()
+            for _ in range(100):
+                if mock_q.put.await_count >= 2:
+                    break
+                await asyncio.sleep(0.01)
+
+            mock_q.put.assert_any_call({"event": "message.completed", "data": {"text": "Welcome to Vera!"}})
+
 
 class TestProcessMessage:
     """Tests for process_message method."""
@@ -791,7 +947,7 @@ class TestProcessMessage:
                 return ctx, ctx.model_dump(mode="json"), "hash123", True
 
             mock_cache.get_or_fetch = mock_get_or_fetch
-            mock_cache.invalidate = Mock()
+            mock_cache.ainvalidate = AsyncMock()
             mock_cache_getter.return_value = mock_cache
 
             await supervisor_service.process_message(thread_id="thread-1", text="Hello")
@@ -1032,7 +1188,7 @@ class TestProcessMessage:
                 return ctx, ctx.model_dump(mode="json"), "hash123", True
 
             mock_cache.get_or_fetch = mock_get_or_fetch
-            mock_cache.invalidate = Mock()
+            mock_cache.ainvalidate = AsyncMock()
             mock_cache_getter.return_value = mock_cache
 
             await supervisor_service.process_message(thread_id="thread-1", text="Hello")
@@ -1043,6 +1199,97 @@ class TestProcessMessage:
             assert exported_ctx.user_id == mock_user_id
             assert exported_ctx.preferred_name == "Test User"
 
+    @pytest.mark.asyncio
+    async def test_process_message_keeps_session_context_when_degraded(self, supervisor_service, mock_user_id):
+        """A degraded load must not replace the context the session already has."""
+        with (
+            patch("app.services.supervisor.get_sse_queue") as mock_queue,
+            patch("app.services.supervisor.get_session_store") as mock_store_getter,
+            patch("app.services.supervisor.get_supervisor_graph") as mock_graph,
+            patch("app.services.supervisor.get_user_context_cache") as mock_cache_getter,
+        ):
+            mock_queue.return_value = AsyncMock()
+
+            mock_store = AsyncMock()
+            user_context = UserContext(user_id=mock_user_id, preferred_name="Test User")
+            session_data = {
+                "user_id": str(mock_user_id),
+                "user_context": user_context.model_dump(mode="json"),
+                "user_context_hash": "hash123",
+                "conversation_messages": [],
+            }
+            mock_store.get_session.return_value = session_data
+            mock_store_getter.return_value = mock_store
+
+            mock_compiled = AsyncMock()
+
+            async def mock_stream(*args, **kwargs):
+                class MockMessage:
+                    def __init__(self):
+                        self.content = [{"type": "text", "text": "Response"}]
+
+                yield {"event": "on_chain_end", "name": "supervisor", "data": {"output": {"messages": [MockMessage()]}}}
+
+            mock_compiled.astream_events = mock_stream
+            mock_graph.return_value = mock_compiled
+
+            supervisor_service._export_user_context_to_external = AsyncMock()
+            supervisor_service._refresh_financial_data_flags = AsyncMock(return_value=(False, False, False))
+
+            mock_cache = AsyncMock()
+            mock_cache.get_or_fetch = AsyncMock(
+                side_effect=DegradedUserContextError(UserContext(user_id=mock_user_id))
+            )
+            mock_cache_getter.return_value = mock_cache
+
+            await supervisor_service.process_message(thread_id="thread-1", text="Hello")
+
+            assert session_data["user_context"]["preferred_name"] == "Test User"
+            assert session_data["user_context_hash"] == "hash123"
+            assert "user_context_degraded" not in session_data
+            exported_ctx = supervisor_service._export_user_context_to_external.call_args[0][0]
+            assert exported_ctx.preferred_name == "Test User"
+
+    @pytest.mark.asyncio
+    async def test_process_message_skips_export_for_degraded_new_session(self, supervisor_service, mock_user_id):
+        """A session with no context takes the degraded one for this turn but never exports it."""
+        with (
+            patch("app.services.supervisor.get_sse_queue") as mock_queue,
+            patch("app.services.supervisor.get_session_store") as mock_store_getter,
+            patch("app.services.supervisor.get_supervisor_graph") as mock_graph,
+            patch("app.services.supervisor.get_user_context_cache") as mock_cache_getter,
+        ):
+            mock_queue.return_value = AsyncMock()
+
+            mock_store = AsyncMock()
+            session_data = {"user_id": str(mock_user_id), "conversation_messages": []}
+            mock_store.get_session.return_value = session_data
+            mock_store_getter.return_value = mock_store
+
+            mock_compiled = AsyncMock()
+
+            async def mock_stream(*args, **kwargs):
+                yield {"event": "on_chain_end", "name": "supervisor", "data": {"output": {"messages": []}}}
+
+            mock_compiled.astream_events = mock_stream
+            mock_graph.return_value = mock_compiled
+
+            supervisor_service._export_user_context_to_external = AsyncMock()
+            supervisor_service._refresh_financial_data_flags = AsyncMock(return_value=(False, False, False))
+
+            mock_cache = AsyncMock()
+            mock_cache.get_or_fetch = AsyncMock(
+                side_effect=DegradedUserContextError(UserContext(user_id=mock_user_id, preferred_name="Partial"))
+            )
+            mock_cache_getter.return_value = mock_cache
+
+            await supervisor_service.process_message(thread_id="thread-1", text="Hello")
+
+            assert session_data["user_context"]["preferred_name"] == "Partial"
+            assert session_data["user_context_degraded"] is True
+            assert "user_context_hash" not in session_data
+            supervisor_service._export_user_context_to_external.assert_not_awaited()
+
 
 class TestRefreshFinancialDataFlags:
     """Tests for _refresh_financial_data_flags method."""
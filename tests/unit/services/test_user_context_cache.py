@@ -173,7 +173,7 @@ class TestCacheOperations:
 class TestCacheExpiration:
     @pytest.mark.asyncio
     async def test_expired_entry_triggers_refetch(self, mock_user_id, mock_user_context):
-        cache = user_context_cache_module.UserContextCache(ttl_seconds=1)
+        cache = user_context_cache_module.UserContextCache(ttl_seconds=1, stale_seconds=0)
         mock_fetch = AsyncMock(return_value=mock_user_context)
         mock_user_context.model_dump = MagicMock(return_value={"name": "Test"})
 
@@ -206,6 +206,241 @@ class TestCacheExpiration:
         assert cache._is_expired(entry) is False
 
 
+class TestStaleWhileRevalidate:
+    @pytest.mark.asyncio
+    async def test_stale_entry_served_while_refreshing_once(self, mock_user_id, mock_user_context):
+        cache = user_context_cache_module.UserContextCache(ttl_seconds=60, stale_seconds=60)
+        mock_fetch = AsyncMock(return_value=mock_user_context)
+        mock_user_context.model_dump = MagicMock(return_value={"name": "Test"})
+
+        await cache.get_or_fetch(mock_user_id, mock_fetch)
+        cache._cache[str(mock_user_id)].fetched_at -= 90
+
+        results = await asyncio.gather(*(cache.get_or_fetch(mock_user_id, mock_fetch) for _ in range(5)))
+
+        assert all(ctx == mock_user_context and changed is False for ctx, _, _, changed in results)
+        await asyncio.gather(*list(cache._refreshing.values()))
+        assert mock_fetch.call_count == 2
+        assert cache._is_expired(cache._cache[str(mock_user_id)]) is False
+
+    @pytest.mark.asyncio
+    async def test_entry_past_stale_window_is_refetched_inline(self, mock_user_id, mock_user_context):
+        cache = user_context_cache_module.UserContextCache(ttl_seconds=60, stale_seconds=60)
+        mock_fetch = AsyncMock(return_value=mock_user_context)
+        mock_user_context.model_dump = MagicMock(return_value={"name": "Test"})
+
+        await cache.get_or_fetch(mock_user_id, mock_fetch)
+        cache._cache[str(mock_user_id)].fetched_at -= 150
+
+        await cache.get_or_fetch(mock_user_id, mock_fetch)
+
+        assert mock_fetch.call_count == 2
+        assert not cache._refreshing
+
+    @pytest.mark.asyncio
+    async def test_unchanged_refresh_reuses_hash(self, cache, mock_user_id, mock_user_context, monkeypatch):
+        mock_fetch = AsyncMock(return_value=mock_user_context)
+        mock_user_context.model_dump = MagicMock(return_value={"name": "Test"})
+        _, _, first_hash, _ = await cache.get_or_fetch(mock_user_id, mock_fetch)
+
+        compute = MagicMock(side_effect=AssertionError("hash recomputed"))
+        monkeypatch.setattr(user_context_cache_module.UserContextCache, "compute_hash", compute)
+        _, _, second_hash, changed = await cache.get_or_fetch(mock_user_id, mock_fetch, force_refresh=True)
+
+        assert second_hash == first_hash
+        assert changed is False
+
+
+class TestNegativeCaching:
+    @pytest.mark.asyncio
+    async def test_failure_is_remembered_within_window(self, mock_user_id, mock_user_context):
+        cache = user_context_cache_module.UserContextCache(ttl_seconds=60, negative_ttl_seconds=60)
+        mock_fetch = AsyncMock(side_effect=Exception("Network error"))
+
+        for _ in range(3):
+            with pytest.raises(Exception, match="Network error"):
+                await cache.get_or_fetch(mock_user_id, mock_fetch)
+
+        assert mock_fetch.call_count == 1
+
+        mock_fetch.side_effect = None
+        mock_fetch.return_value = mock_user_context
+        mock_user_context.model_dump = MagicMock(return_value={"name": "Test"})
+        ctx, _, _, _ = await cache.get_or_fetch(mock_user_id, mock_fetch, force_refresh=True)
+
+        assert ctx == mock_user_context
+        assert str(mock_user_id) not in cache._negative
+
+    @pytest.mark.asyncio
+    async def test_failure_retried_after_window(self, mock_user_id):
+        cache = user_context_cache_module.UserContextCache(ttl_seconds=60, negative_ttl_seconds=60)
+        mock_fetch = AsyncMock(side_effect=ConnectionError("Network error"))
+
+        with pytest.raises(ConnectionError, match="Network error"):
+            await cache.get_or_fetch(mock_user_id, mock_fetch)
+        cache._negative[str(mock_user_id)] = (time.time() - 1, ConnectionError("old"))
+        with pytest.raises(ConnectionError, match="Network error"):
+            await cache.get_or_fetch(mock_user_id, mock_fetch)
+
+        assert mock_fetch.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_degraded_context_is_never_stored_or_shared(self, mock_user_id):
+        shared = AsyncMock()
+        shared.get = AsyncMock(return_value=None)
+        cache = user_context_cache_module.UserContextCache(ttl_seconds=60, negative_ttl_seconds=60, shared=shared)
+        partial = UserContext(user_id=mock_user_id)
+        mock_fetch = AsyncMock(side_effect=user_context_cache_module.DegradedUserContextError(partial, ["external_ctx"]))
+
+        with pytest.raises(user_context_cache_module.DegradedUserContextError) as exc_info:
+            await cache.get_or_fetch(mock_user_id, mock_fetch)
+
+        assert exc_info.value.context is partial
+        assert exc_info.value.missing == ("external_ctx",)
+        assert cache.get_cached(mock_user_id) is None
+        shared.set.assert_not_awaited()
+
+
+class TestBoundedCache:
+    @pytest.mark.asyncio
+    async def test_least_recently_used_entry_is_evicted(self, mock_user_context):
+        cache = user_context_cache_module.UserContextCache(ttl_seconds=60, max_entries=2)
+        mock_fetch = AsyncMock(return_value=mock_user_context)
+        mock_user_context.model_dump = MagicMock(return_value={"name": "Test"})
+        users = [UUID(int=i) for i in range(1, 4)]
+
+        await cache.get_or_fetch(users[0], mock_fetch)
+        await cache.get_or_fetch(users[1], mock_fetch)
+        await cache.get_or_fetch(users[0], mock_fetch)
+        await cache.get_or_fetch(users[2], mock_fetch)
+
+        assert list(cache._cache) == [str(users[0]), str(users[2])]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store: dict[str, str] = {}
+        self.expiries: dict[str, int] = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value
+        self.expiries[key] = ex
+
+    async def delete(self, key):
+        self.store.pop(key, None)
+
+
+class TestSharedTier:
+    @pytest.mark.asyncio
+    async def test_replica_reuses_shared_entry(self, mock_user_id):
+        redis = FakeRedis()
+        context = UserContext(user_id=mock_user_id, preferred_name="TestUser")
+        first = user_context_cache_module.UserContextCache(
+            ttl_seconds=60, stale_seconds=30, shared=user_context_cache_module.RedisUserContextTier(redis)
+        )
+        second = user_context_cache_module.UserContextCache(
+            ttl_seconds=60, stale_seconds=30, shared=user_context_cache_module.RedisUserContextTier(redis)
+        )
+        fetch = AsyncMock(return_value=context)
+
+        _, _, first_hash, _ = await first.get_or_fetch(mock_user_id, fetch)
+        ctx, _, second_hash, changed = await second.get_or_fetch(mock_user_id, fetch)
+
+        assert fetch.call_count == 1
+        assert ctx.preferred_name == "TestUser"
+        assert second_hash == first_hash
+        assert changed is False
+        assert redis.expiries[f"user_ctx:{mock_user_id}"] == 90
+
+    @pytest.mark.asyncio
+    async def test_invalidate_deletes_shared_entry(self, mock_user_id):
+        redis = FakeRedis()
+        cache = user_context_cache_module.UserContextCache(
+            ttl_seconds=60, shared=user_context_cache_module.RedisUserContextTier(redis)
+        )
+        await cache.get_or_fetch(mock_user_id, AsyncMock(return_value=UserContext(user_id=mock_user_id)))
+
+        await cache.ainvalidate(mock_user_id)
+
+        assert redis.store == {}
+
+    @pytest.mark.asyncio
+    async def test_invalidate_prevents_repromoting_stale_shared_entry(self, mock_user_id):
+        redis = FakeRedis()
+        shared = user_context_cache_module.RedisUserContextTier(redis)
+        cache = user_context_cache_module.UserContextCache(ttl_seconds=60, shared=shared)
+        await cache.get_or_fetch(mock_user_id, AsyncMock(return_value=UserContext(user_id=mock_user_id, preferred_name="Old")))
+
+        await cache.ainvalidate(mock_user_id)
+        ctx, _, _, _ = await cache.get_or_fetch(
+            mock_user_id, AsyncMock(return_value=UserContext(user_id=mock_user_id, preferred_name="New"))
+        )
+
+        assert ctx.preferred_name == "New"
+
+    @pytest.mark.asyncio
+    async def test_invalidate_discards_fetch_already_in_flight(self, mock_user_id):
+        redis = FakeRedis()
+        cache = user_context_cache_module.UserContextCache(
+            ttl_seconds=60, shared=user_context_cache_module.RedisUserContextTier(redis)
+        )
+        started, release = asyncio.Event(), asyncio.Event()
+
+        async def slow_fetch(user_id):
+            started.set()
+            await release.wait()
+            return UserContext(user_id=user_id, preferred_name="Old")
+
+        in_flight = asyncio.create_task(cache.get_or_fetch(mock_user_id, slow_fetch))
+        await started.wait()
+        await cache.ainvalidate(mock_user_id)
+        release.set()
+        ctx, _, _, _ = await in_flight
+
+        assert ctx.preferred_name == "Old"
+        assert cache.get_cached(mock_user_id) is None
+        assert redis.store == {}
+
+    @pytest.mark.asyncio
+    async def test_invalidate_cancels_background_revalidation(self, mock_user_id):
+        cache = user_context_cache_module.UserContextCache(ttl_seconds=60, stale_seconds=60)
+        await cache.get_or_fetch(mock_user_id, AsyncMock(return_value=UserContext(user_id=mock_user_id)))
+        cache._cache[str(mock_user_id)].fetched_at -= 90
+        release = asyncio.Event()
+
+        async def slow_fetch(user_id):
+            await release.wait()
+            return UserContext(user_id=user_id, preferred_name="Old")
+
+        await cache.get_or_fetch(mock_user_id, slow_fetch)
+        refresh = cache._refreshing[str(mock_user_id)]
+        await asyncio.sleep(0)
+        await cache.ainvalidate(mock_user_id)
+        release.set()
+        await asyncio.gather(refresh, return_exceptions=True)
+
+        assert refresh.cancelled()
+        assert cache.get_cached(mock_user_id) is None
+
+    @pytest.mark.asyncio
+    async def test_shared_tier_errors_fall_back_to_source(self, mock_user_id):
+        broken = MagicMock()
+        broken.get = AsyncMock(side_effect=ConnectionError("redis down"))
+        broken.set = AsyncMock(side_effect=ConnectionError("redis down"))
+        cache = user_context_cache_module.UserContextCache(
+            ttl_seconds=60, shared=user_context_cache_module.RedisUserContextTier(broken)
+        )
+        fetch = AsyncMock(return_value=UserContext(user_id=mock_user_id))
+
+        ctx, _, _, changed = await cache.get_or_fetch(mock_user_id, fetch)
+
+        assert ctx.user_id == mock_user_id
+        assert changed is True
+
+
 class TestCacheInvalidation:
     @pytest.mark.asyncio
     async def test_invalidate_removes_entry(self, cache, mock_user_id, mock_user_context):
@@ -215,7 +450,7 @@ class TestCacheInvalidation:
         await cache.get_or_fetch(mock_user_id, mock_fetch)
         assert len(cache._cache) == 1
 
-        result = cache.invalidate(mock_user_id)
+        result = await cache.ainvalidate(mock_user_id)
 
         assert result is True
         assert len(cache._cache) == 0
@@ -228,13 +463,14 @@ class TestCacheInvalidation:
         await cache.get_or_fetch(mock_user_id, mock_fetch)
         assert str(mock_user_id) in cache._locks
 
-        cache.invalidate(mock_user_id)
+        await cache.ainvalidate(mock_user_id)
 
         assert str(mock_user_id) in cache._locks
         assert str(mock_user_id) not in cache._cache
 
-    def test_invalidate_returns_false_if_not_found(self, cache, mock_user_id):
-        result = cache.invalidate(mock_user_id)
+    @pytest.mark.asyncio
+    async def test_invalidate_returns_false_if_not_found(self, cache, mock_user_id):
+        result = await cache.ainvalidate(mock_user_id)
         assert result is False
 
     @pytest.mark.asyncio
@@ -261,7 +497,7 @@ class TestCacheInvalidation:
 class TestCacheCleanup:
     @pytest.mark.asyncio
     async def test_cleanup_removes_expired_entries_but_preserves_locks(self, mock_user_context):
-        cache = user_context_cache_module.UserContextCache(ttl_seconds=1)
+        cache = user_context_cache_module.UserContextCache(ttl_seconds=1, stale_seconds=0)
         mock_fetch = AsyncMock(return_value=mock_user_context)
         mock_user_context.model_dump = MagicMock(return_value={"name": "Test"})
 